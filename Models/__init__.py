@@ -1,68 +1,115 @@
 """
 Models package - Clean imports for all Pydantic models
 Organized by domain for better maintainability and scalability
+
+Names are imported on first access (`from Models import X` or `Models.X`),
+so importing one domain, e.g. Models.accounts, does not load every other one.
 """
+import importlib
 
-# User models
-from .users import (
-    UserCreateRequest,
-    LoginRequest,
-    UserUpdateRequest,
-    UserResponse,
-    LoginResponse
-)
-
-# Account models
-from .accounts import (
-    AccountCreateRequest,
-    AccountUpdateRequest,
-    AccountResponse,
-    AccountBalanceResponse
-)
-
-# Category models
-from .categories import (
-    CategoryCreateRequest,
-    CategoryUpdateRequest,
-    UserCategoryAssignRequest,
-    CategoryResponse,
-    UserCategoryResponse,
-    CategorySummaryResponse
-)
-
-# Transaction models - Ready for Day 7
-from .transactions import (
-    TransactionCreateRequest,
-    TransactionUpdateRequest,
-    TransactionResponse,
-    TransactionSummaryResponse
-)
-
-__all__ = [
+# Exported name -> submodule that defines it
+_EXPORTS = {
     # User models
-    'UserCreateRequest',
-    'LoginRequest',
-    'UserUpdateRequest',
-    'UserResponse',
-    'LoginResponse',
-    
+    'UserCreateRequest': '.users',
+    'LoginRequest': '.users',
+    'UserUpdateRequest': '.users',
+    'UserResponse': '.users',
+    'LoginResponse': '.users',
+
     # Account models
-    'AccountCreateRequest',
-    'AccountUpdateRequest',
-    'AccountResponse',
-    'AccountBalanceResponse',
-    
+    'AccountCreateRequest': '.accounts',
+    'AccountUpdateRequest': '.accounts',
+    'AccountResponse': '.accounts',
+    'AccountBalanceResponse': '.accounts',
+    'AccountBalanceAsOfResponse': '.accounts',
+    'AccountBalanceHistoryResponse': '.accounts',
+    'NetWorthByType': '.accounts',
+    'NetWorthResponse': '.accounts',
+    'AdminNetWorthResponse': '.accounts',
+    'NetWorthHistoryResponse': '.accounts',
+
     # Category models
-    'CategoryCreateRequest',
-    'CategoryUpdateRequest',
-    'UserCategoryAssignRequest',
-    'CategoryResponse',
-    'UserCategoryResponse',
-    'CategorySummaryResponse',
-    
-    # Transaction models - will be added in Day 7
-    'TransactionCreateRequest',
-    'TransactionUpdateRequest',
-    'TransactionResponse',
-    'TransactionSummaryResponse'
-]
+    'CategoryCreateRequest': '.categories',
+    'CategoryUpdateRequest': '.categories',
+    'UserCategoryAssignRequest': '.categories',
+    'CategoryResponse': '.categories',
+    'UserCategoryResponse': '.categories',
+    'CategorySummaryResponse': '.categories',
+    'CategoryCacheStatsResponse': '.categories',
+
+    # Transaction models - Ready for Day 7
+    'TransactionCreateRequest': '.transactions',
+    'TransactionUpdateRequest': '.transactions',
+    'TransactionResponse': '.transactions',
+    'TransactionSummaryResponse': '.transactions',
+    'FacetBucket': '.transactions',
+    'TransactionFacets': '.transactions',
+    'TransactionSearchResponse': '.transactions',
+
+    # Budget models
+    'BudgetCreateRequest': '.budgets',
+    'BudgetUpdateRequest': '.budgets',
+    'BudgetResponse': '.budgets',
+    'BudgetStatusResponse': '.budgets',
+
+    # Recurring transaction models
+    'RecurringTransactionCreateRequest': '.recurring',
+    'RecurringTransactionUpdateRequest': '.recurring',
+    'RecurringTransactionResponse': '.recurring',
+
+    # Job models
+    'JobResponse': '.jobs',
+    'JobEnqueuedResponse': '.jobs',
+
+    # Analytics models
+    'CashFlowSeriesResponse': '.analytics',
+    'CategoryMixSeries': '.analytics',
+    'CategoryMixResponse': '.analytics',
+    'DashboardResponse': '.analytics',
+    'SignupMonth': '.analytics',
+    'AdminSignupsResponse': '.analytics',
+    'TransactionVolumeRow': '.analytics',
+    'AdminTransactionVolumeResponse': '.analytics',
+    'BalanceTotalRow': '.analytics',
+    'AdminBalanceTotalsResponse': '.analytics',
+
+    # FX models
+    'FxRateItem': '.fx',
+    'FxRateUploadRequest': '.fx',
+    'FxRateLoadResponse': '.fx',
+
+    # Investment models
+    'HoldingCreateRequest': '.investments',
+    'HoldingUpdateRequest': '.investments',
+    'PriceItem': '.investments',
+    'PriceUploadRequest': '.investments',
+    'HoldingResponse': '.investments',
+    'HoldingValuation': '.investments',
+    'AccountValuation': '.investments',
+    'PortfolioResponse': '.investments',
+    'PriceLoadResponse': '.investments',
+
+    # Batch models
+    'BatchSubRequest': '.batch',
+    'BatchRequest': '.batch',
+    'BatchSubResponse': '.batch',
+    'BatchResponse': '.batch',
+
+    # Sync models
+    'SyncTombstone': '.sync',
+    'SyncResponse': '.sync',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
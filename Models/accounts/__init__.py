@@ -11,7 +11,13 @@ from .requests import (
 # Response models  
 from .responses import (
     AccountResponse,
-    AccountBalanceResponse
+    AccountBalanceResponse,
+    AccountBalanceAsOfResponse,
+    AccountBalanceHistoryResponse,
+    NetWorthByType,
+    NetWorthResponse,
+    AdminNetWorthResponse,
+    NetWorthHistoryResponse
 )
 
 __all__ = [
@@ -21,5 +27,11 @@ __all__ = [
     
     # Responses
     'AccountResponse',
-    'AccountBalanceResponse'
+    'AccountBalanceResponse',
+    'AccountBalanceAsOfResponse',
+    'AccountBalanceHistoryResponse',
+    'NetWorthByType',
+    'NetWorthResponse',
+    'AdminNetWorthResponse',
+    'NetWorthHistoryResponse'
 ]
@@ -2,8 +2,8 @@
 Account-related response models (Pydantic models for API output)
 """
 from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional, Annotated
-from datetime import datetime
+from typing import Optional, Annotated, List
+from datetime import datetime, date
 from database.models import AccountType
 
 
@@ -30,3 +30,57 @@ class AccountBalanceResponse(BaseModel):
     calculated_balance: float
     currency: str
     last_updated: datetime
+
+
+class AccountBalanceAsOfResponse(BaseModel):
+    """Response model for an account's balance at a point in time"""
+    account_id: int
+    account_name: str
+    as_of: datetime
+    balance: float
+    currency: str
+
+
+class AccountBalanceHistoryResponse(BaseModel):
+    """Response model for daily closing balances (aligned lists, ready to chart)"""
+    account_id: int
+    account_name: str
+    currency: str
+    start_date: date
+    end_date: date
+    days: List[date]
+    closing_balances: List[float]
+
+
+class NetWorthByType(BaseModel):
+    """Balances of one account type, in the reporting currency"""
+    account_type: AccountType
+    total: float
+    account_count: int
+
+
+class NetWorthResponse(BaseModel):
+    """Response model for net worth (assets minus liabilities)"""
+    currency: str
+    assets: float
+    liabilities: float
+    net_worth: float
+    account_count: int
+    by_type: List[NetWorthByType]
+    as_of: datetime
+
+
+class AdminNetWorthResponse(NetWorthResponse):
+    """Response model for net worth summed across all users"""
+    user_count: int
+
+
+class NetWorthHistoryResponse(BaseModel):
+    """Response model for daily net worth (aligned lists, ready to chart)"""
+    currency: str
+    start_date: date
+    end_date: date
+    days: List[date]
+    assets: List[float]
+    liabilities: List[float]
+    net_worth: List[float]
@@ -0,0 +1,31 @@
+"""
+Analytics models package - Clean imports for analytics Pydantic models
+"""
+
+# Response models
+from .responses import (
+    CashFlowSeriesResponse,
+    CategoryMixSeries,
+    CategoryMixResponse,
+    DashboardResponse,
+    SignupMonth,
+    AdminSignupsResponse,
+    TransactionVolumeRow,
+    AdminTransactionVolumeResponse,
+    BalanceTotalRow,
+    AdminBalanceTotalsResponse
+)
+
+__all__ = [
+    # Responses
+    'CashFlowSeriesResponse',
+    'CategoryMixSeries',
+    'CategoryMixResponse',
+    'DashboardResponse',
+    'SignupMonth',
+    'AdminSignupsResponse',
+    'TransactionVolumeRow',
+    'AdminTransactionVolumeResponse',
+    'BalanceTotalRow',
+    'AdminBalanceTotalsResponse'
+]
@@ -0,0 +1,98 @@
+"""
+Analytics response models (Pydantic models for API output)
+
+Series are returned column-wise (one list per measure, aligned with
+`buckets`) so charts can plot them directly.
+"""
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import date, datetime
+from database.models.account import AccountType
+from database.models.transaction import TransactionType
+
+
+class CashFlowSeriesResponse(BaseModel):
+    """Inflow/outflow time series for one granularity"""
+    granularity: str
+    currency: Optional[str] = None   # Reporting currency of every amount
+    buckets: List[date]          # Start date of each bucket
+    inflow: List[float]
+    outflow: List[float]
+    net: List[float]
+    savings_rate: List[float]    # net / inflow per bucket (0 when there is no inflow)
+    rolling_window: int
+    rolling_inflow: List[float]
+    rolling_outflow: List[float]
+    rolling_net: List[float]
+    total_inflow: float
+    total_outflow: float
+    overall_savings_rate: float
+
+
+class CategoryMixSeries(BaseModel):
+    """Spending in one category over time"""
+    category_id: int
+    category_name: Optional[str]
+    total: float
+    share: float                 # Fraction of all spending in the range
+    series: List[float]          # Aligned with the response's buckets
+
+
+class CategoryMixResponse(BaseModel):
+    """Expense mix by category over time"""
+    granularity: str
+    currency: Optional[str] = None
+    buckets: List[date]
+    categories: List[CategoryMixSeries]
+
+
+class DashboardResponse(BaseModel):
+    """Everything the dashboard charts need, computed from one load"""
+    start_date: date
+    end_date: date
+    currency: Optional[str] = None
+    transaction_count: int
+    daily: CashFlowSeriesResponse
+    weekly: CashFlowSeriesResponse
+    monthly: CashFlowSeriesResponse
+    category_mix: CategoryMixResponse
+
+
+class SignupMonth(BaseModel):
+    month: date                  # First day of the month
+    user_count: int
+
+
+class AdminSignupsResponse(BaseModel):
+    """Users created per month, from the signup rollup"""
+    refreshed_through: Optional[datetime]   # Rollups include changes up to this time
+    total_users: int
+    months: List[SignupMonth]
+
+
+class TransactionVolumeRow(BaseModel):
+    month: date
+    transaction_type: TransactionType
+    currency: str                # Account currency; amounts are not converted
+    transaction_count: int
+    total_amount: float
+
+
+class AdminTransactionVolumeResponse(BaseModel):
+    """Transaction count and total per month, type and currency across all users"""
+    refreshed_through: Optional[datetime]
+    rows: List[TransactionVolumeRow]
+
+
+class BalanceTotalRow(BaseModel):
+    account_type: AccountType
+    currency: str
+    user_count: int
+    account_count: int
+    total_balance: float
+
+
+class AdminBalanceTotalsResponse(BaseModel):
+    """Account balances summed per account type and currency across all users"""
+    refreshed_through: Optional[datetime]
+    rows: List[BalanceTotalRow]
@@ -0,0 +1,25 @@
+"""
+Batch models package - Clean imports for batch request Pydantic models
+"""
+
+# Request models
+from .requests import (
+    BatchSubRequest,
+    BatchRequest
+)
+
+# Response models
+from .responses import (
+    BatchSubResponse,
+    BatchResponse
+)
+
+__all__ = [
+    # Requests
+    'BatchSubRequest',
+    'BatchRequest',
+
+    # Responses
+    'BatchSubResponse',
+    'BatchResponse'
+]
@@ -0,0 +1,28 @@
+"""
+Batch request models (Pydantic models for API input validation)
+"""
+from pydantic import BaseModel, Field, field_validator
+from typing import List, Literal, Optional
+
+MAX_SUB_REQUESTS = 20
+
+
+class BatchSubRequest(BaseModel):
+    """One call inside a batch; only reads are allowed"""
+    id: Optional[str] = Field(None, max_length=50)   # Echoed back to match responses
+    method: Literal["GET"] = "GET"
+    path: str = Field(..., min_length=1, max_length=2000)  # Path with optional query string, e.g. /transaction/get_all?limit=20
+
+    @field_validator("path")
+    @classmethod
+    def check_path(cls, path: str) -> str:
+        if not path.startswith("/") or path.startswith("//"):
+            raise ValueError("path must be an absolute API path")
+        if path.split("?")[0].rstrip("/") == "/batch":
+            raise ValueError("batch requests cannot be nested")
+        return path
+
+
+class BatchRequest(BaseModel):
+    """Request model for running several API calls in one round trip"""
+    requests: List[BatchSubRequest] = Field(..., min_length=1, max_length=MAX_SUB_REQUESTS)
@@ -0,0 +1,18 @@
+"""
+Batch response models (Pydantic models for API output)
+"""
+from pydantic import BaseModel
+from typing import Any, List, Optional
+
+
+class BatchSubResponse(BaseModel):
+    """Result of one sub-request, in request order"""
+    id: Optional[str] = None
+    path: str
+    status: int
+    body: Any = None
+
+
+class BatchResponse(BaseModel):
+    """Response model for a batch call"""
+    responses: List[BatchSubResponse]
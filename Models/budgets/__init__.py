@@ -0,0 +1,25 @@
+"""
+Budget models package - Clean imports for budget-related Pydantic models
+"""
+
+# Request models
+from .requests import (
+    BudgetCreateRequest,
+    BudgetUpdateRequest
+)
+
+# Response models
+from .responses import (
+    BudgetResponse,
+    BudgetStatusResponse
+)
+
+__all__ = [
+    # Requests
+    'BudgetCreateRequest',
+    'BudgetUpdateRequest',
+
+    # Responses
+    'BudgetResponse',
+    'BudgetStatusResponse'
+]
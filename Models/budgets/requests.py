@@ -0,0 +1,23 @@
+"""
+Budget-related request models (Pydantic models for API input validation)
+"""
+from pydantic import BaseModel, Field
+from typing import Optional, Annotated
+from database.models.budget import BudgetPeriod
+
+
+class BudgetCreateRequest(BaseModel):
+    """Request model for creating a new budget"""
+    name: str = Field(..., min_length=1, max_length=50)
+    amount: Annotated[float, Field(gt=0.0)]
+    period: BudgetPeriod = BudgetPeriod.MONTHLY
+    category_id: int
+
+
+class BudgetUpdateRequest(BaseModel):
+    """Request model for updating an existing budget (partial updates)"""
+    name: Optional[str] = Field(None, min_length=1, max_length=50)
+    amount: Optional[Annotated[float, Field(gt=0.0)]] = None
+    period: Optional[BudgetPeriod] = None
+    category_id: Optional[int] = None
+    is_active: Optional[bool] = None
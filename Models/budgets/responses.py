@@ -0,0 +1,37 @@
+"""
+Budget-related response models (Pydantic models for API output)
+"""
+from pydantic import BaseModel, ConfigDict
+from datetime import datetime, date
+from database.models.budget import BudgetPeriod
+
+
+class BudgetResponse(BaseModel):
+    """Response model for budget data"""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    name: str
+    amount: float
+    period: BudgetPeriod
+    category_id: int
+    user_id: int
+    is_active: bool
+    created_at: datetime
+    updated_at: datetime
+
+
+class BudgetStatusResponse(BaseModel):
+    """Response model for a budget's current-period spending"""
+    budget_id: int
+    name: str
+    category_id: int
+    period: BudgetPeriod
+    period_start: date
+    period_end: date
+    amount: float
+    spent: float
+    remaining: float
+    percent_used: float
+    transaction_count: int
+    is_exceeded: bool
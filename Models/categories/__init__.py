@@ -13,7 +13,8 @@ from .requests import (
 from .responses import (
     CategoryResponse,
     UserCategoryResponse,
-    CategorySummaryResponse
+    CategorySummaryResponse,
+    CategoryCacheStatsResponse
 )
 
 __all__ = [
@@ -25,5 +26,6 @@ __all__ = [
     # Responses
     'CategoryResponse',
     'UserCategoryResponse',
-    'CategorySummaryResponse'
+    'CategorySummaryResponse',
+    'CategoryCacheStatsResponse'
 ]
@@ -42,3 +42,16 @@ class CategorySummaryResponse(BaseModel):
     transaction_count: int
     total_amount: float
     last_used: Optional[datetime]
+
+
+class CategoryCacheStatsResponse(BaseModel):
+    """Size and hit/miss counters of the per-user /categories/my cache (this process)"""
+    users: int
+    rows: int
+    max_users: int
+    max_rows: int
+    hits: int
+    misses: int
+    hit_rate: float
+    evictions: int
+    invalidations: int
@@ -0,0 +1,49 @@
+"""
+Sparse fieldsets for list endpoints (?fields=id,amount,date)
+
+parse_fields() validates the requested names against a response model.
+subset_model() derives a response model with only those fields; it is
+cached per (model, fields), so each field set is built once per process.
+columns_for() gives the matching ORM columns, so the SQL query selects
+only what will be sent.
+"""
+from functools import lru_cache
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict, create_model
+
+# Always returned so clients can identify rows
+REQUIRED_FIELDS = ("id",)
+
+
+def parse_fields(fields: Optional[str], model: type[BaseModel]) -> Optional[tuple[str, ...]]:
+    """
+    Requested field names in the model's declared order, or None for all
+    fields. Raises ValueError naming any field the model doesn't have.
+    """
+    if not fields:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - set(model.model_fields)
+    if unknown:
+        raise ValueError(
+            f"Unknown fields: {', '.join(sorted(unknown))}. "
+            f"Available: {', '.join(model.model_fields)}"
+        )
+    requested.update(name for name in REQUIRED_FIELDS if name in model.model_fields)
+    return tuple(name for name in model.model_fields if name in requested)
+
+
+@lru_cache(maxsize=256)
+def subset_model(model: type[BaseModel], fields: tuple[str, ...]) -> type[BaseModel]:
+    """Response model with only `fields`, keeping each field's type and constraints"""
+    return create_model(
+        f"{model.__name__}Fields",
+        __config__=ConfigDict(from_attributes=True),
+        **{name: (model.model_fields[name].annotation, model.model_fields[name]) for name in fields}
+    )
+
+
+def columns_for(db_model, fields: tuple[str, ...]) -> list:
+    """ORM columns backing the requested fields (response field names match column names)"""
+    return [getattr(db_model, name) for name in fields]
@@ -0,0 +1,23 @@
+"""
+FX models package - Clean imports for exchange-rate Pydantic models
+"""
+
+# Request models
+from .requests import (
+    FxRateItem,
+    FxRateUploadRequest
+)
+
+# Response models
+from .responses import (
+    FxRateLoadResponse
+)
+
+__all__ = [
+    # Requests
+    'FxRateItem',
+    'FxRateUploadRequest',
+
+    # Responses
+    'FxRateLoadResponse'
+]
@@ -0,0 +1,18 @@
+"""
+FX rate request models (Pydantic models for API input validation)
+"""
+from pydantic import BaseModel, Field
+from typing import List, Annotated
+from datetime import date as Date
+
+
+class FxRateItem(BaseModel):
+    """One daily rate: units of `currency` per one unit of the pivot currency (USD)"""
+    currency: str = Field(..., min_length=3, max_length=3)
+    date: Date
+    rate: Annotated[float, Field(gt=0.0)]
+
+
+class FxRateUploadRequest(BaseModel):
+    """Request model for loading a batch of FX rates"""
+    rates: List[FxRateItem] = Field(..., min_length=1, max_length=100000)
@@ -0,0 +1,11 @@
+"""
+FX rate response models (Pydantic models for API output)
+"""
+from pydantic import BaseModel
+from typing import List
+
+
+class FxRateLoadResponse(BaseModel):
+    """Response model after loading FX rates"""
+    loaded: int
+    currencies: List[str]        # Every currency conversions can now use
@@ -0,0 +1,35 @@
+"""
+Investment models package - Clean imports for holdings and valuation Pydantic models
+"""
+
+# Request models
+from .requests import (
+    HoldingCreateRequest,
+    HoldingUpdateRequest,
+    PriceItem,
+    PriceUploadRequest
+)
+
+# Response models
+from .responses import (
+    HoldingResponse,
+    HoldingValuation,
+    AccountValuation,
+    PortfolioResponse,
+    PriceLoadResponse
+)
+
+__all__ = [
+    # Requests
+    'HoldingCreateRequest',
+    'HoldingUpdateRequest',
+    'PriceItem',
+    'PriceUploadRequest',
+
+    # Responses
+    'HoldingResponse',
+    'HoldingValuation',
+    'AccountValuation',
+    'PortfolioResponse',
+    'PriceLoadResponse'
+]
@@ -0,0 +1,33 @@
+"""
+Investment request models (Pydantic models for API input validation)
+"""
+from pydantic import BaseModel, Field
+from typing import List, Optional, Annotated
+from datetime import date as Date
+
+
+class HoldingCreateRequest(BaseModel):
+    """Request model for adding a holding to an investment account"""
+    account_id: int
+    symbol: str = Field(..., min_length=1, max_length=20)
+    quantity: Annotated[float, Field(gt=0.0)]
+    cost_basis: Annotated[float, Field(ge=0.0)] = 0.0   # Total paid, in the account currency
+
+
+class HoldingUpdateRequest(BaseModel):
+    """Request model for updating a holding (partial updates)"""
+    quantity: Optional[Annotated[float, Field(gt=0.0)]] = None
+    cost_basis: Optional[Annotated[float, Field(ge=0.0)]] = None
+
+
+class PriceItem(BaseModel):
+    """One closing price"""
+    symbol: str = Field(..., min_length=1, max_length=20)
+    date: Date
+    close: Annotated[float, Field(ge=0.0)]
+    currency: str = Field("USD", min_length=3, max_length=3)
+
+
+class PriceUploadRequest(BaseModel):
+    """Request model for loading a batch of security prices"""
+    prices: List[PriceItem] = Field(..., min_length=1, max_length=100000)
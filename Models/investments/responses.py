@@ -0,0 +1,59 @@
+"""
+Investment response models (Pydantic models for API output)
+"""
+from pydantic import BaseModel, ConfigDict
+from typing import List, Optional
+from datetime import date, datetime
+
+
+class HoldingResponse(BaseModel):
+    """Response model for holding data"""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    account_id: int
+    symbol: str
+    quantity: float
+    cost_basis: float
+    created_at: datetime
+    updated_at: datetime
+
+
+class HoldingValuation(BaseModel):
+    """One holding valued at its latest price, in the reporting currency"""
+    holding_id: int
+    account_id: int
+    symbol: str
+    quantity: float
+    price: Optional[float]            # Latest close in the security's currency; None when unpriced
+    price_date: Optional[date]
+    market_value: float               # Carried at cost when unpriced
+    cost_basis: float
+    unrealised_pnl: float
+    unrealised_pnl_pct: float
+
+
+class AccountValuation(BaseModel):
+    """Totals for one investment account"""
+    account_id: int
+    market_value: float
+    cost_basis: float
+    unrealised_pnl: float
+
+
+class PortfolioResponse(BaseModel):
+    """Response model for portfolio valuation and P&L"""
+    currency: str
+    market_value: float
+    cost_basis: float
+    unrealised_pnl: float
+    unrealised_pnl_pct: float
+    unpriced_count: int
+    accounts: List[AccountValuation]
+    holdings: List[HoldingValuation]
+
+
+class PriceLoadResponse(BaseModel):
+    """Response model after loading security prices"""
+    loaded: int
+    symbols: int                      # Distinct symbols in the upload
@@ -0,0 +1,15 @@
+"""
+Job models package - Clean imports for background job Pydantic models
+"""
+
+# Response models
+from .responses import (
+    JobResponse,
+    JobEnqueuedResponse
+)
+
+__all__ = [
+    # Responses
+    'JobResponse',
+    'JobEnqueuedResponse'
+]
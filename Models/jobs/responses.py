@@ -0,0 +1,33 @@
+"""
+Background job response models (Pydantic models for API output)
+"""
+from pydantic import BaseModel, ConfigDict
+from typing import Optional, Any
+from datetime import datetime
+from database.models.job import JobStatus
+
+
+class JobResponse(BaseModel):
+    """Response model for a background job's status and progress"""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    job_type: str
+    status: JobStatus
+    attempts: int
+    max_attempts: int
+    progress: float
+    progress_message: Optional[str] = None
+    result: Optional[Any] = None
+    last_error: Optional[str] = None
+    run_after: datetime
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+class JobEnqueuedResponse(BaseModel):
+    """Response model returned when work has been moved to the job queue"""
+    job_id: int
+    status: JobStatus
+    detail: str
@@ -0,0 +1,23 @@
+"""
+Recurring transaction models package - Clean imports for recurring-rule Pydantic models
+"""
+
+# Request models
+from .requests import (
+    RecurringTransactionCreateRequest,
+    RecurringTransactionUpdateRequest
+)
+
+# Response models
+from .responses import (
+    RecurringTransactionResponse
+)
+
+__all__ = [
+    # Requests
+    'RecurringTransactionCreateRequest',
+    'RecurringTransactionUpdateRequest',
+
+    # Responses
+    'RecurringTransactionResponse'
+]
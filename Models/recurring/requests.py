@@ -0,0 +1,45 @@
+"""
+Recurring transaction request models (Pydantic models for API input validation)
+"""
+from pydantic import BaseModel, Field, field_validator, model_validator
+from typing import Optional, Annotated
+from datetime import date
+from database.models.transaction import TransactionType
+from database.models.recurring import RecurrenceFrequency
+
+
+class RecurringTransactionCreateRequest(BaseModel):
+    """Request model for creating a recurring transaction rule"""
+    transaction_name: str
+    amount: Annotated[float, Field(gt=0.0)]
+    transaction_type: TransactionType
+    account_id: int
+    category_id: int
+    description: Optional[str] = None
+    to_account_id: Optional[int] = None  # For transfers
+    frequency: RecurrenceFrequency = RecurrenceFrequency.MONTHLY
+    interval: Annotated[int, Field(ge=1, le=366)] = 1
+    start_date: date
+    end_date: Optional[date] = None
+
+    @field_validator('to_account_id')
+    def clean_to_account_id(cls, v):
+        if v == 0 or v == "" or v is None:
+            return None
+        return v
+
+    @model_validator(mode='after')
+    def validate_date_range(self):
+        if self.end_date and self.end_date < self.start_date:
+            raise ValueError('end_date cannot be before start_date')
+        return self
+
+
+class RecurringTransactionUpdateRequest(BaseModel):
+    """Request model for updating a recurring rule (partial updates)"""
+    transaction_name: Optional[str] = None
+    amount: Optional[Annotated[float, Field(gt=0.0)]] = None
+    category_id: Optional[int] = None
+    description: Optional[str] = None
+    end_date: Optional[date] = None
+    is_active: Optional[bool] = None
@@ -0,0 +1,32 @@
+"""
+Recurring transaction response models (Pydantic models for API output)
+"""
+from pydantic import BaseModel, ConfigDict
+from typing import Optional
+from datetime import datetime, date
+from database.models.transaction import TransactionType
+from database.models.recurring import RecurrenceFrequency
+
+
+class RecurringTransactionResponse(BaseModel):
+    """Response model for a recurring transaction rule"""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    transaction_name: str
+    amount: float
+    transaction_type: TransactionType
+    account_id: int
+    to_account: Optional[int] = None
+    category_id: int
+    user_id: int
+    description: Optional[str] = None
+    frequency: RecurrenceFrequency
+    interval: int
+    start_date: date
+    end_date: Optional[date] = None
+    next_run_date: date
+    last_run_date: Optional[date] = None
+    is_active: bool
+    created_at: datetime
+    updated_at: datetime
@@ -0,0 +1,15 @@
+"""
+Sync models package - Clean imports for delta sync Pydantic models
+"""
+
+# Response models
+from .responses import (
+    SyncTombstone,
+    SyncResponse
+)
+
+__all__ = [
+    # Responses
+    'SyncTombstone',
+    'SyncResponse'
+]
@@ -0,0 +1,26 @@
+"""
+Sync response models (Pydantic models for API output)
+"""
+from pydantic import BaseModel
+from typing import List
+from database.models.change_log import SyncEntity
+from Models.accounts.responses import AccountResponse
+from Models.categories.responses import UserCategoryResponse
+from Models.transactions.responses import TransactionResponse
+
+
+class SyncTombstone(BaseModel):
+    """An entity the client should delete locally"""
+    entity: SyncEntity
+    id: int
+
+
+class SyncResponse(BaseModel):
+    """Changes since the client's cursor; pass `cursor` back on the next sync"""
+    cursor: str
+    has_more: bool           # More changes are waiting - sync again right away with the new cursor
+    reset: bool              # Full snapshot: the client should replace its local copy
+    transactions: List[TransactionResponse]
+    accounts: List[AccountResponse]
+    categories: List[UserCategoryResponse]
+    deleted: List[SyncTombstone]
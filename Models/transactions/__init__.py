@@ -1,5 +1,5 @@
 from .requests import TransactionCreateRequest,TransactionType,TransactionUpdateRequest
-from .responses import TransactionResponse,TransactionSummaryResponse,TransactionType
+from .responses import TransactionResponse,TransactionSummaryResponse,TransactionType,FacetBucket,TransactionFacets,TransactionSearchResponse
 
 
 
@@ -8,5 +8,8 @@ __all__ = [
     , "TransactionType", 
     "TransactionUpdateRequest", 
     "TransactionResponse", 
-    "TransactionSummaryResponse"
+    "TransactionSummaryResponse",
+    "FacetBucket",
+    "TransactionFacets",
+    "TransactionSearchResponse"
 ]
\ No newline at end of file
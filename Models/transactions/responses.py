@@ -2,7 +2,7 @@
 Transaction-related response models (Pydantic models for API output)
 """
 from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional, Annotated
+from typing import List, Optional, Annotated, Union
 from datetime import datetime
 from database.models.transaction import TransactionType
 
@@ -33,3 +33,26 @@ class TransactionSummaryResponse(BaseModel):
     transaction_count: int
     period_start: datetime
     period_end: datetime
+    currency: Optional[str] = None   # Reporting currency the totals are converted into
+
+
+class FacetBucket(BaseModel):
+    """Count and total of the matching transactions with one facet value, per account currency"""
+    value: Union[int, str]           # Category or account id, or transaction type
+    currency: str
+    count: int
+    total: float
+
+
+class TransactionFacets(BaseModel):
+    """Facet buckets; only the requested facets are filled in"""
+    category: Optional[List[FacetBucket]] = None
+    transaction_type: Optional[List[FacetBucket]] = None
+    account: Optional[List[FacetBucket]] = None
+
+
+class TransactionSearchResponse(BaseModel):
+    """One page of transactions, with facet counts over every match when requested"""
+    items: List[TransactionResponse]
+    total_count: Optional[int] = None   # Set when facets were requested
+    facets: Optional[TransactionFacets] = None
@@ -19,6 +19,16 @@ from database.models.user import User, Role, Gender
 from database.models.account import Account, AccountType
 from database.models.category import Category, CategoryType
 from database.models.transaction import Transaction, TransactionType
+from database.models.budget import Budget, BudgetSpend, BudgetPeriod
+from database.models.recurring import RecurringTransaction, RecurrenceFrequency
+from database.models.job import Job, JobStatus
+from database.models.balance_snapshot import AccountBalanceSnapshot
+from database.models.fx_rate import FxRate
+from database.models.investment import Holding, SecurityPrice
+from database.models.change_log import ChangeLog, SyncEntity, ChangeOperation
+from database.models.idempotency import IdempotencyKey
+from database.models.transaction_archive import TransactionArchive
+from database.models.admin_rollup import RollupWatermark, UserSignupRollup, TransactionVolumeRollup, BalanceRollup
 
 
 # this is the Alembic Config object, which provides
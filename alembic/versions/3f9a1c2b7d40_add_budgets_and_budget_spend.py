@@ -0,0 +1,57 @@
+"""Add budgets and budget spend counters
+
+Revision ID: 3f9a1c2b7d40
+Revises: dd8359da1607
+Create Date: 2026-10-19 09:12:41.204117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9a1c2b7d40'
+down_revision: Union[str, Sequence[str], None] = 'dd8359da1607'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('budgets',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('amount', sa.Float(), nullable=False),
+        sa.Column('period', sa.Enum('WEEKLY', 'MONTHLY', 'YEARLY', name='budgetperiod'), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('category_id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['category_id'], ['categories.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_budgets_id'), 'budgets', ['id'], unique=False)
+    op.create_index('ix_budgets_user_category', 'budgets', ['user_id', 'category_id'], unique=False)
+
+    op.create_table('budget_spend',
+        sa.Column('budget_id', sa.Integer(), nullable=False),
+        sa.Column('period_start', sa.Date(), nullable=False),
+        sa.Column('spent', sa.Float(), nullable=False),
+        sa.Column('transaction_count', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['budget_id'], ['budgets.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('budget_id', 'period_start')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('budget_spend')
+    op.drop_index('ix_budgets_user_category', table_name='budgets')
+    op.drop_index(op.f('ix_budgets_id'), table_name='budgets')
+    op.drop_table('budgets')
+    sa.Enum(name='budgetperiod').drop(op.get_bind(), checkfirst=True)
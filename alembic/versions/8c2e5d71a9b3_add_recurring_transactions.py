@@ -0,0 +1,71 @@
+"""Add recurring transaction rules
+
+Revision ID: 8c2e5d71a9b3
+Revises: 3f9a1c2b7d40
+Create Date: 2026-10-19 10:03:18.551902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c2e5d71a9b3'
+down_revision: Union[str, Sequence[str], None] = '3f9a1c2b7d40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('recurring_transactions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('transaction_name', sa.String(), nullable=False),
+        sa.Column('amount', sa.Float(), nullable=False),
+        sa.Column('transaction_type', postgresql.ENUM('INCOME', 'EXPENSE', 'TRANSFER', name='transactiontype', create_type=False), nullable=False),
+        sa.Column('to_account', sa.Integer(), nullable=True),
+        sa.Column('description', sa.String(), nullable=True),
+        sa.Column('frequency', sa.Enum('DAILY', 'WEEKLY', 'MONTHLY', 'YEARLY', name='recurrencefrequency'), nullable=False),
+        sa.Column('interval', sa.Integer(), nullable=False),
+        sa.Column('start_date', sa.Date(), nullable=False),
+        sa.Column('end_date', sa.Date(), nullable=True),
+        sa.Column('next_run_date', sa.Date(), nullable=False),
+        sa.Column('last_run_date', sa.Date(), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('account_id', sa.Integer(), nullable=False),
+        sa.Column('category_id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['account_id'], ['accounts.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['category_id'], ['categories.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_recurring_transactions_id'), 'recurring_transactions', ['id'], unique=False)
+    op.create_index('ix_recurring_transactions_due', 'recurring_transactions', ['is_active', 'next_run_date'], unique=False)
+    op.create_index('ix_recurring_transactions_user_id', 'recurring_transactions', ['user_id'], unique=False)
+
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('recurring_id', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('occurrence_date', sa.Date(), nullable=True))
+        batch_op.create_foreign_key('fk_transactions_recurring_id', 'recurring_transactions', ['recurring_id'], ['id'], ondelete='SET NULL')
+        batch_op.create_unique_constraint('uq_transactions_recurring_occurrence', ['recurring_id', 'occurrence_date'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_transactions_recurring_occurrence', type_='unique')
+        batch_op.drop_constraint('fk_transactions_recurring_id', type_='foreignkey')
+        batch_op.drop_column('occurrence_date')
+        batch_op.drop_column('recurring_id')
+
+    op.drop_index('ix_recurring_transactions_user_id', table_name='recurring_transactions')
+    op.drop_index('ix_recurring_transactions_due', table_name='recurring_transactions')
+    op.drop_index(op.f('ix_recurring_transactions_id'), table_name='recurring_transactions')
+    op.drop_table('recurring_transactions')
+    sa.Enum(name='recurrencefrequency').drop(op.get_bind(), checkfirst=True)
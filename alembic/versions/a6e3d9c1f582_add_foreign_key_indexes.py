@@ -0,0 +1,103 @@
+"""Index transactions and accounts foreign keys
+
+transactions (user_id, date), account_id, category_id, to_account and
+accounts.user_id. On PostgreSQL the indexes are built with CREATE INDEX
+CONCURRENTLY so writes keep flowing. The transactions table is partitioned
+there (e9b4f1a6c273), so each partition's index is built concurrently and
+attached to an index created ON ONLY the parent; partitions created later
+get theirs when they are attached. Its existing (user_id, date) index from
+d7a2c5e8f134 is renamed rather than duplicated.
+
+If a concurrent build fails it leaves an INVALID index behind: drop it by
+hand before retrying the upgrade.
+
+Revision ID: a6e3d9c1f582
+Revises: f4c8a2d6b913
+Create Date: 2026-10-19 19:26:50.418832
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6e3d9c1f582'
+down_revision: Union[str, Sequence[str], None] = 'f4c8a2d6b913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ('ix_transactions_user_id_date', 'transactions', ['user_id', 'date']),
+    ('ix_transactions_account_id', 'transactions', ['account_id']),
+    ('ix_transactions_category_id', 'transactions', ['category_id']),
+    ('ix_transactions_to_account', 'transactions', ['to_account']),
+    ('ix_accounts_user_id', 'accounts', ['user_id']),
+]
+PARTITIONED_USER_DATE_INDEX = 'ix_transactions_partitioned_user_id_date'
+
+
+def existing_indexes(bind, table: str) -> dict:
+    """Index name by column tuple"""
+    return {tuple(index['column_names']): index['name'] for index in sa.inspect(bind).get_indexes(table)}
+
+
+def partitions(bind, table: str) -> list:
+    return bind.execute(sa.text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid JOIN pg_class p ON p.oid = i.inhparent "
+        "WHERE p.relname = :parent ORDER BY c.relname"
+    ), {"parent": table}).scalars().all()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    existing = {table: existing_indexes(bind, table) for table in ('transactions', 'accounts')}
+    if bind.dialect.name != 'postgresql':
+        for name, table, columns in INDEXES:
+            if tuple(columns) not in existing[table]:
+                op.create_index(name, table, columns, unique=False)
+        return
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            current = existing[table].get(tuple(columns))
+            if current == name:
+                continue
+            if current is not None:
+                op.execute(f'ALTER INDEX "{current}" RENAME TO "{name}"')
+                continue
+
+            column_list = ", ".join(columns)
+            children = partitions(bind, table)
+            if not children:
+                op.execute(f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{name}" ON "{table}" ({column_list})')
+                continue
+            op.execute(f'CREATE INDEX IF NOT EXISTS "{name}" ON ONLY "{table}" ({column_list})')
+            for child in children:
+                child_index = f'{child}_{"_".join(columns)}_idx'
+                op.execute(f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{child_index}" ON "{child}" ({column_list})')
+                op.execute(f'ALTER INDEX "{name}" ATTACH PARTITION "{child_index}"')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table)
+        return
+
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            if not partitions(bind, table):
+                op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"')
+            elif name == 'ix_transactions_user_id_date':
+                # Created by d7a2c5e8f134 under its old name
+                op.execute(f'ALTER INDEX "{name}" RENAME TO "{PARTITIONED_USER_DATE_INDEX}"')
+            else:
+                # Partitioned index drops cascade to the partitions; no CONCURRENTLY form exists
+                op.execute(f'DROP INDEX IF EXISTS "{name}"')
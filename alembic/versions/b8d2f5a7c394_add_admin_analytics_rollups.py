@@ -0,0 +1,70 @@
+"""Add admin analytics rollup tables
+
+rollup_user_signups, rollup_transaction_volume and rollup_balances hold the
+system-wide aggregates behind the /admin/analytics endpoints; the refresh job
+(services/rollups.py) keeps its position in rollup_watermarks. users.created_at
+is indexed so new signups are read as a range.
+
+Revision ID: b8d2f5a7c394
+Revises: a6e3d9c1f582
+Create Date: 2026-10-19 20:12:41.905263
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8d2f5a7c394'
+down_revision: Union[str, Sequence[str], None] = 'a6e3d9c1f582'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('rollup_watermarks',
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('watermark', sa.DateTime(), nullable=False),
+        sa.Column('refreshed_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('name')
+    )
+    op.create_table('rollup_user_signups',
+        sa.Column('month', sa.Date(), nullable=False),
+        sa.Column('user_count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('month')
+    )
+    op.create_table('rollup_transaction_volume',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('month', sa.Date(), nullable=False),
+        sa.Column('transaction_type', postgresql.ENUM('INCOME', 'EXPENSE', 'TRANSFER', name='transactiontype', create_type=False), nullable=False),
+        sa.Column('currency', sa.String(length=3), nullable=False),
+        sa.Column('transaction_count', sa.Integer(), nullable=False),
+        sa.Column('total_amount', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id', 'month', 'transaction_type', 'currency')
+    )
+    op.create_index('ix_rollup_transaction_volume_month', 'rollup_transaction_volume', ['month'], unique=False)
+    op.create_table('rollup_balances',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('account_type', postgresql.ENUM('CHECKING', 'SAVINGS', 'CASH', 'INVESTMENT', 'PROPERTY', 'CREDIT_CARD', 'LOAN', name='accounttype', create_type=False), nullable=False),
+        sa.Column('currency', sa.String(length=3), nullable=False),
+        sa.Column('account_count', sa.Integer(), nullable=False),
+        sa.Column('total_balance', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id', 'account_type', 'currency')
+    )
+    op.create_index('ix_users_created_at', 'users', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_users_created_at', table_name='users')
+    op.drop_table('rollup_balances')
+    op.drop_index('ix_rollup_transaction_volume_month', table_name='rollup_transaction_volume')
+    op.drop_table('rollup_transaction_volume')
+    op.drop_table('rollup_user_signups')
+    op.drop_table('rollup_watermarks')
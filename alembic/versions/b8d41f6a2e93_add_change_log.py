@@ -0,0 +1,44 @@
+"""Add change_log table for delta sync
+
+Revision ID: b8d41f6a2e93
+Revises: f2b6d9e41c08
+Create Date: 2026-10-19 16:05:12.480211
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8d41f6a2e93'
+down_revision: Union[str, Sequence[str], None] = 'f2b6d9e41c08'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('change_log',
+        sa.Column('id', sa.BigInteger().with_variant(sa.Integer(), 'sqlite'), autoincrement=True, nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('entity', sa.Enum('TRANSACTION', 'ACCOUNT', 'CATEGORY', name='syncentity'), nullable=False),
+        sa.Column('entity_id', sa.Integer(), nullable=False),
+        sa.Column('operation', sa.Enum('UPSERT', 'DELETE', name='changeoperation'), nullable=False),
+        sa.Column('changed_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sqlite_autoincrement=True
+    )
+    op.create_index('ix_change_log_user_id_id', 'change_log', ['user_id', 'id'], unique=False)
+    op.create_index('ix_change_log_changed_at', 'change_log', ['changed_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_change_log_changed_at', table_name='change_log')
+    op.drop_index('ix_change_log_user_id_id', table_name='change_log')
+    op.drop_table('change_log')
+    sa.Enum(name='changeoperation').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='syncentity').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,34 @@
+"""Add pending_delete to users and accounts
+
+Set when a delete is requested; the row is hidden straight away and a
+background job deletes its dependent rows in batches (services/deletion.py).
+
+Revision ID: c3f7a1e9d456
+Revises: b8d2f5a7c394
+Create Date: 2026-10-19 20:58:07.214630
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f7a1e9d456'
+down_revision: Union[str, Sequence[str], None] = 'b8d2f5a7c394'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # A constant server default is a metadata-only change on PostgreSQL 11+, no table rewrite
+    op.add_column('users', sa.Column('pending_delete', sa.Boolean(), server_default=sa.false(), nullable=False))
+    op.add_column('accounts', sa.Column('pending_delete', sa.Boolean(), server_default=sa.false(), nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('accounts', 'pending_delete')
+    op.drop_column('users', 'pending_delete')
@@ -0,0 +1,39 @@
+"""Add daily account balance snapshots
+
+Revision ID: c7b19e4a2d63
+Revises: a41d7e0c9f52
+Create Date: 2026-10-19 12:41:52.330671
+
+Run `python manage.py rebuild-snapshots` once after upgrading to build
+snapshots for existing history; writes keep them current from then on.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7b19e4a2d63'
+down_revision: Union[str, Sequence[str], None] = 'a41d7e0c9f52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('account_balance_snapshots',
+        sa.Column('account_id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('closing_balance', sa.Float(), nullable=False),
+        sa.Column('net_change', sa.Float(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['account_id'], ['accounts.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('account_id', 'day')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('account_balance_snapshots')
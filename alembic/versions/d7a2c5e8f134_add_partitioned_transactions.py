@@ -0,0 +1,116 @@
+"""Add monthly-partitioned shadow of transactions with a mirroring trigger
+
+PostgreSQL only. Creates transactions_partitioned (PARTITION BY RANGE (date))
+with one partition per month that has rows, MONTHS_AHEAD future months and a
+default partition. A trigger mirrors every write on transactions into it. Existing
+rows are copied by `python manage.py backfill-partitions`; revision
+e9b4f1a6c273 then swaps the tables.
+
+Revision ID: d7a2c5e8f134
+Revises: c3e97a5d1f24
+Create Date: 2026-10-19 17:32:05.661904
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7a2c5e8f134'
+down_revision: Union[str, Sequence[str], None] = 'c3e97a5d1f24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MONTHS_AHEAD = 3
+
+
+def add_months(month: date, count: int) -> date:
+    year, index = divmod(month.year * 12 + month.month - 1 + count, 12)
+    return date(year, index + 1, 1)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    op.execute("""
+        CREATE TABLE transactions_partitioned (
+            LIKE transactions INCLUDING DEFAULTS INCLUDING CONSTRAINTS
+        ) PARTITION BY RANGE (date)
+    """)
+    # Unique constraints on a partitioned table must include the partition key.
+    # date is derived from occurrence_date for recurring rows, so uniqueness is unchanged.
+    op.execute("ALTER TABLE transactions_partitioned ADD CONSTRAINT transactions_partitioned_pkey PRIMARY KEY (id, date)")
+    op.execute("""
+        ALTER TABLE transactions_partitioned ADD CONSTRAINT uq_transactions_partitioned_recurring_occurrence
+        UNIQUE (recurring_id, occurrence_date, date)
+    """)
+    op.execute("ALTER TABLE transactions_partitioned ADD FOREIGN KEY (user_id) REFERENCES users (id)")
+    op.execute("ALTER TABLE transactions_partitioned ADD FOREIGN KEY (account_id) REFERENCES accounts (id)")
+    op.execute("ALTER TABLE transactions_partitioned ADD FOREIGN KEY (category_id) REFERENCES categories (id)")
+    op.execute("""
+        ALTER TABLE transactions_partitioned ADD FOREIGN KEY (recurring_id)
+        REFERENCES recurring_transactions (id) ON DELETE SET NULL
+    """)
+    op.execute("CREATE INDEX ix_transactions_partitioned_user_id_date ON transactions_partitioned (user_id, date)")
+
+    # One partition per month with rows, through MONTHS_AHEAD months from now
+    first, last = bind.execute(sa.text("SELECT min(date)::date, max(date)::date FROM transactions")).one()
+    this_month = date.today().replace(day=1)
+    month = (first or this_month).replace(day=1)
+    end = max((last or this_month).replace(day=1), add_months(this_month, MONTHS_AHEAD))
+    while month <= end:
+        following = add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE transactions_p{month.year:04d}_{month.month:02d} PARTITION OF transactions_partitioned "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{following.isoformat()}')"
+        )
+        month = following
+    op.execute("CREATE TABLE transactions_default PARTITION OF transactions_partitioned DEFAULT")
+
+    # Keep the copy current while the backfill runs
+    columns = [column["name"] for column in sa.inspect(bind).get_columns("transactions")]
+    assignments = ", ".join(f"{name} = EXCLUDED.{name}" for name in columns if name not in ("id", "date"))
+    op.execute(f"""
+        CREATE FUNCTION transactions_mirror() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                DELETE FROM transactions_partitioned WHERE id = OLD.id AND date = OLD.date;
+                RETURN OLD;
+            END IF;
+            IF TG_OP = 'UPDATE' THEN
+                IF NEW.date IS DISTINCT FROM OLD.date THEN
+                    DELETE FROM transactions_partitioned WHERE id = OLD.id AND date = OLD.date;
+                END IF;
+            END IF;
+            INSERT INTO transactions_partitioned SELECT (NEW).*
+                ON CONFLICT (id, date) DO UPDATE SET {assignments};
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER transactions_mirror AFTER INSERT OR UPDATE OR DELETE ON transactions
+        FOR EACH ROW EXECUTE FUNCTION transactions_mirror()
+    """)
+
+    op.create_table('transactions_partition_backfill',
+        sa.Column('last_id', sa.BigInteger(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.func.now(), nullable=False)
+    )
+    op.execute("INSERT INTO transactions_partition_backfill (last_id) VALUES (0)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("DROP TRIGGER IF EXISTS transactions_mirror ON transactions")
+    op.execute("DROP FUNCTION IF EXISTS transactions_mirror()")
+    op.drop_table('transactions_partition_backfill')
+    op.execute("DROP TABLE transactions_partitioned CASCADE")
@@ -0,0 +1,36 @@
+"""Add fx_rates table
+
+Revision ID: e5a3c8f10b27
+Revises: c7b19e4a2d63
+Create Date: 2026-10-19 14:05:11.804215
+
+Load rates with `python manage.py load-fx-rates FILE` or POST /admin/fx-rates.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a3c8f10b27'
+down_revision: Union[str, Sequence[str], None] = 'c7b19e4a2d63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('fx_rates',
+        sa.Column('currency', sa.String(length=3), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('rate', sa.Float(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('currency', 'day')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('fx_rates')
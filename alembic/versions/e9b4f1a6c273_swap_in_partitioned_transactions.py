@@ -0,0 +1,102 @@
+"""Swap in the partitioned transactions table
+
+PostgreSQL only. Under an exclusive lock this copies whatever the backfill
+has not reached yet, drops the mirror trigger and renames
+transactions -> transactions_unpartitioned and
+transactions_partitioned -> transactions. The old table is kept for
+verification; drop it by hand once satisfied.
+
+Run `python manage.py backfill-partitions` first on large tables: the
+upgrade refuses to copy more than MAX_CATCH_UP_ROWS under the lock.
+
+Revision ID: e9b4f1a6c273
+Revises: d7a2c5e8f134
+Create Date: 2026-10-19 17:58:44.012377
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e9b4f1a6c273'
+down_revision: Union[str, Sequence[str], None] = 'd7a2c5e8f134'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MAX_CATCH_UP_ROWS = 100000
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    op.execute("LOCK TABLE transactions IN ACCESS EXCLUSIVE MODE")
+    last_id = bind.execute(sa.text("SELECT last_id FROM transactions_partition_backfill")).scalar()
+    remaining = bind.execute(sa.text("SELECT count(*) FROM transactions WHERE id > :last_id"), {"last_id": last_id}).scalar()
+    if remaining > MAX_CATCH_UP_ROWS:
+        raise RuntimeError(
+            f"{remaining} transactions not backfilled yet; run `python manage.py backfill-partitions` "
+            "and retry the upgrade"
+        )
+    op.execute(sa.text(
+        "INSERT INTO transactions_partitioned SELECT * FROM transactions WHERE id > :last_id "
+        "ON CONFLICT (id, date) DO NOTHING"
+    ).bindparams(last_id=last_id))
+
+    op.execute("DROP TRIGGER transactions_mirror ON transactions")
+    op.execute("DROP FUNCTION transactions_mirror()")
+    op.execute("ALTER TABLE transactions RENAME TO transactions_unpartitioned")
+    op.execute("ALTER TABLE transactions_partitioned RENAME TO transactions")
+    op.execute("ALTER SEQUENCE transactions_id_seq OWNED BY transactions.id")
+    op.drop_table('transactions_partition_backfill')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    # Writes since the swap only exist in the partitioned table: copy everything back
+    op.execute("LOCK TABLE transactions IN ACCESS EXCLUSIVE MODE")
+    op.execute("ALTER SEQUENCE transactions_id_seq OWNED BY transactions_unpartitioned.id")
+    op.execute("TRUNCATE transactions_unpartitioned")
+    op.execute("INSERT INTO transactions_unpartitioned SELECT * FROM transactions")
+    op.execute("ALTER TABLE transactions RENAME TO transactions_partitioned")
+    op.execute("ALTER TABLE transactions_unpartitioned RENAME TO transactions")
+
+    # Back to the state after d7a2c5e8f134: mirror trigger on, backfill complete
+    columns = [column["name"] for column in sa.inspect(bind).get_columns("transactions")]
+    assignments = ", ".join(f"{name} = EXCLUDED.{name}" for name in columns if name not in ("id", "date"))
+    op.execute(f"""
+        CREATE FUNCTION transactions_mirror() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                DELETE FROM transactions_partitioned WHERE id = OLD.id AND date = OLD.date;
+                RETURN OLD;
+            END IF;
+            IF TG_OP = 'UPDATE' THEN
+                IF NEW.date IS DISTINCT FROM OLD.date THEN
+                    DELETE FROM transactions_partitioned WHERE id = OLD.id AND date = OLD.date;
+                END IF;
+            END IF;
+            INSERT INTO transactions_partitioned SELECT (NEW).*
+                ON CONFLICT (id, date) DO UPDATE SET {assignments};
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER transactions_mirror AFTER INSERT OR UPDATE OR DELETE ON transactions
+        FOR EACH ROW EXECUTE FUNCTION transactions_mirror()
+    """)
+    op.create_table('transactions_partition_backfill',
+        sa.Column('last_id', sa.BigInteger(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.func.now(), nullable=False)
+    )
+    op.execute("INSERT INTO transactions_partition_backfill (last_id) SELECT coalesce(max(id), 0) FROM transactions")
@@ -0,0 +1,55 @@
+"""Add holdings and security_prices tables
+
+Revision ID: f2b6d9e41c08
+Revises: e5a3c8f10b27
+Create Date: 2026-10-19 15:22:40.118392
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b6d9e41c08'
+down_revision: Union[str, Sequence[str], None] = 'e5a3c8f10b27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('holdings',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('symbol', sa.String(length=20), nullable=False),
+        sa.Column('quantity', sa.Float(), nullable=False),
+        sa.Column('cost_basis', sa.Float(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('account_id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['account_id'], ['accounts.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('account_id', 'symbol', name='uq_holdings_account_symbol')
+    )
+    op.create_index(op.f('ix_holdings_id'), 'holdings', ['id'], unique=False)
+    op.create_index('ix_holdings_user_id', 'holdings', ['user_id'], unique=False)
+
+    op.create_table('security_prices',
+        sa.Column('symbol', sa.String(length=20), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('close', sa.Float(), nullable=False),
+        sa.Column('currency', sa.String(length=3), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('symbol', 'day')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('security_prices')
+    op.drop_index('ix_holdings_user_id', table_name='holdings')
+    op.drop_index(op.f('ix_holdings_id'), table_name='holdings')
+    op.drop_table('holdings')
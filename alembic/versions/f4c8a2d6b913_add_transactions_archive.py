@@ -0,0 +1,58 @@
+"""Add transactions_archive for cold transaction history
+
+Revision ID: f4c8a2d6b913
+Revises: e9b4f1a6c273
+Create Date: 2026-10-19 18:40:12.337105
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4c8a2d6b913'
+down_revision: Union[str, Sequence[str], None] = 'e9b4f1a6c273'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('transactions_archive',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('transaction_name', sa.String(), nullable=False),
+        sa.Column('amount', sa.Float(), nullable=False),
+        sa.Column('transaction_type', postgresql.ENUM('INCOME', 'EXPENSE', 'TRANSFER', name='transactiontype', create_type=False), nullable=False),
+        sa.Column('to_account', sa.Integer(), nullable=True),
+        sa.Column('description', sa.String(), nullable=True),
+        sa.Column('date', sa.DateTime(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('account_id', sa.Integer(), nullable=False),
+        sa.Column('category_id', sa.Integer(), nullable=False),
+        sa.Column('recurring_id', sa.Integer(), nullable=True),
+        sa.Column('occurrence_date', sa.Date(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('archived_at', sa.DateTime(), server_default=sa.func.now(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_transactions_archive_user_id_date', 'transactions_archive', ['user_id', 'date'], unique=False)
+    op.create_index('ix_transactions_archive_account_id', 'transactions_archive', ['account_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Put archived rows back so no history is lost
+    op.execute(
+        "INSERT INTO transactions (id, transaction_name, amount, transaction_type, to_account, description, date, "
+        "user_id, account_id, category_id, recurring_id, occurrence_date, created_at, updated_at) "
+        "SELECT id, transaction_name, amount, transaction_type, to_account, description, date, "
+        "user_id, account_id, category_id, recurring_id, occurrence_date, created_at, updated_at "
+        "FROM transactions_archive"
+    )
+    op.drop_index('ix_transactions_archive_account_id', table_name='transactions_archive')
+    op.drop_index('ix_transactions_archive_user_id_date', table_name='transactions_archive')
+    op.drop_table('transactions_archive')
@@ -1,5 +1,5 @@
 from functools import wraps
-from fastapi import HTTPException, status, Depends
+from fastapi import HTTPException, status, Depends, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from database.session import get_db
@@ -11,11 +11,22 @@ from util import verify_token
 # Security scheme for token extraction
 security = HTTPBearer()
 
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_db)):
+def get_current_user(request: Request, credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_db)):
     """
     Dependency to get current user from JWT token with role information
     """
-    token = credentials.credentials
+    # Sub-requests of a /batch call reuse the principal the batch authenticated
+    batch_user = getattr(request.state, "batch_user", None)
+    if batch_user is not None:
+        return batch_user
+
+    return authenticate_token(credentials.credentials, db)
+
+def authenticate_token(token: str, db: Session) -> UserResponse:
+    """
+    Resolve a JWT to its user; raises 401 when the token or user is invalid.
+    Used directly by routes that can't take the bearer header (WebSocket, SSE).
+    """
     payload = verify_token(token)
     
     if payload is None:
@@ -36,7 +47,7 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
     
     # Find user by email from token
     user = db.query(DBUser).filter(DBUser.email == user_email).first()
-    if not user:
+    if not user or user.pending_delete:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found"
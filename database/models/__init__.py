@@ -2,10 +2,33 @@ from .user import User,Gender,Role
 from .account import Account, AccountType
 from .category import Category, CategoryType, user_category_association
 from .transaction import Transaction, TransactionType
+from .budget import Budget, BudgetPeriod, BudgetSpend
+from .recurring import RecurringTransaction, RecurrenceFrequency
+from .job import Job, JobStatus
+from .balance_snapshot import AccountBalanceSnapshot
+from .fx_rate import FxRate, FX_PIVOT_CURRENCY
+from .investment import Holding, SecurityPrice
+from .change_log import ChangeLog, SyncEntity, ChangeOperation
+from .idempotency import IdempotencyKey
+from .transaction_archive import TransactionArchive
+from .admin_rollup import RollupWatermark, UserSignupRollup, TransactionVolumeRollup, BalanceRollup
 
 __all__ = [
     "User", "Gender","Role",
     "Account", "AccountType",
     "Category", "CategoryType", "user_category_association",
-    "Transaction", "TransactionType"
+    "Transaction", "TransactionType",
+    "Budget", "BudgetPeriod", "BudgetSpend",
+    "RecurringTransaction", "RecurrenceFrequency",
+    "Job", "JobStatus",
+    "AccountBalanceSnapshot",
+    "FxRate", "FX_PIVOT_CURRENCY",
+    "Holding", "SecurityPrice",
+    "ChangeLog", "SyncEntity", "ChangeOperation",
+    "IdempotencyKey",
+    "TransactionArchive",
+    "RollupWatermark",
+    "UserSignupRollup",
+    "TransactionVolumeRollup",
+    "BalanceRollup"
 ]
\ No newline at end of file
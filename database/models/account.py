@@ -1,7 +1,7 @@
-from sqlalchemy import Boolean, Column, Integer, String, DateTime, Float, ForeignKey,CheckConstraint
+from sqlalchemy import Boolean, Column, Integer, String, DateTime, Float, ForeignKey,CheckConstraint, false
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
-from database.connection import Base
+from database.connection import Base, RELATIONSHIP_LAZY
 from sqlalchemy.types import Enum as SQLAlchemyEnum
 import enum
 
@@ -29,11 +29,13 @@ class Account(Base):
     description = Column(String, nullable=True)
     account_type = Column(SQLAlchemyEnum(AccountType), default=AccountType.SAVINGS)
     balance = Column(Float,CheckConstraint('balance >= 0'), default=0.0)
-    user_id = Column(Integer, ForeignKey("users.id",ondelete="CASCADE"), nullable=False)  # 🔥 FOREIGN KEY!
+    user_id = Column(Integer, ForeignKey("users.id",ondelete="CASCADE"), nullable=False, index=True)  # 🔥 FOREIGN KEY!
     currency = Column(String, default='INR')
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    # Set when deletion is requested; hidden from every lookup until the delete job removes it
+    pending_delete = Column(Boolean, default=False, server_default=false(), nullable=False)
     
     # Relationships
-    user = relationship("User", back_populates="accounts")  # 🔥 RELATIONSHIP!
-    transactions = relationship("Transaction", back_populates="account")
\ No newline at end of file
+    user = relationship("User", back_populates="accounts", lazy=RELATIONSHIP_LAZY)  # 🔥 RELATIONSHIP!
+    transactions = relationship("Transaction", back_populates="account", passive_deletes="all", lazy=RELATIONSHIP_LAZY)
\ No newline at end of file
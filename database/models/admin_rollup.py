@@ -0,0 +1,50 @@
+from sqlalchemy import Column, Integer, String, DateTime, Date, Float, ForeignKey, Index
+from sqlalchemy.sql import func
+from sqlalchemy.types import Enum
+from database.connection import Base
+from .account import AccountType
+from .transaction import TransactionType
+
+class RollupWatermark(Base):
+    """How far each rollup source has been folded in (services/rollups.py)"""
+    __tablename__ = "rollup_watermarks"
+
+    name = Column(String(50), primary_key=True)            # "users", "change_log"
+    watermark = Column(DateTime, nullable=False)            # Source rows up to this timestamp are included
+    refreshed_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
+
+class UserSignupRollup(Base):
+    """Users created per calendar month"""
+    __tablename__ = "rollup_user_signups"
+
+    month = Column(Date, primary_key=True)                  # First day of the month
+    user_count = Column(Integer, nullable=False, default=0)
+
+class TransactionVolumeRollup(Base):
+    """
+    Per-user monthly transaction count and total by type and account
+    currency. Rebuilt one user at a time, so edits, deletes and re-dated
+    transactions are always reflected once the user's changes are picked up.
+    """
+    __tablename__ = "rollup_transaction_volume"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    month = Column(Date, primary_key=True)
+    transaction_type = Column(Enum(TransactionType), primary_key=True)
+    currency = Column(String(3), primary_key=True)
+    transaction_count = Column(Integer, nullable=False, default=0)
+    total_amount = Column(Float, nullable=False, default=0.0)
+
+    __table_args__ = (
+        Index("ix_rollup_transaction_volume_month", "month"),
+    )
+
+class BalanceRollup(Base):
+    """Per-user account count and balance total by account type and currency"""
+    __tablename__ = "rollup_balances"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    account_type = Column(Enum(AccountType), primary_key=True)
+    currency = Column(String(3), primary_key=True)
+    account_count = Column(Integer, nullable=False, default=0)
+    total_balance = Column(Float, nullable=False, default=0.0)
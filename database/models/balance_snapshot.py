@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, DateTime, Date, Float, ForeignKey
+from sqlalchemy.sql import func
+from database.connection import Base
+
+class AccountBalanceSnapshot(Base):
+    """
+    Closing balance of an account at the end of a day.
+
+    Rows exist only for days on which the balance changed; the balance on any
+    other day is the closing balance of the latest earlier row. Before the
+    first row the balance was closing_balance - net_change of that row.
+    """
+    __tablename__ = "account_balance_snapshots"
+
+    account_id = Column(Integer, ForeignKey("accounts.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    closing_balance = Column(Float, nullable=False)
+    net_change = Column(Float, nullable=False, default=0.0)   # Sum of the day's balance changes
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
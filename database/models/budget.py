@@ -0,0 +1,51 @@
+from sqlalchemy import Boolean, Column, Integer, String, DateTime, Date, Float, ForeignKey, Index
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+from database.connection import Base, RELATIONSHIP_LAZY
+from sqlalchemy.types import Enum
+import enum
+
+class BudgetPeriod(enum.Enum):
+    WEEKLY = 'WEEKLY'      # Monday to Sunday
+    MONTHLY = 'MONTHLY'    # Calendar month
+    YEARLY = 'YEARLY'      # Calendar year
+
+class Budget(Base):
+    __tablename__ = "budgets"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, nullable=False)
+    amount = Column(Float, nullable=False)  # Spending limit per period
+    period = Column(Enum(BudgetPeriod), default=BudgetPeriod.MONTHLY, nullable=False)
+    is_active = Column(Boolean, default=True)
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    category_id = Column(Integer, ForeignKey("categories.id", ondelete="CASCADE"), nullable=False)
+
+    created_at = Column(DateTime, default=func.now())
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+    # Transaction writes look budgets up by (user, category)
+    __table_args__ = (
+        Index("ix_budgets_user_category", "user_id", "category_id"),
+    )
+
+    # Relationships
+    spend = relationship("BudgetSpend", back_populates="budget", cascade="all, delete-orphan", passive_deletes=True, lazy=RELATIONSHIP_LAZY)
+
+
+class BudgetSpend(Base):
+    """
+    Running "spent so far" counter for one budget period.
+    Maintained by the transaction write paths, so reading a budget's
+    status is a primary key lookup instead of a SUM over transactions.
+    """
+    __tablename__ = "budget_spend"
+
+    budget_id = Column(Integer, ForeignKey("budgets.id", ondelete="CASCADE"), primary_key=True)
+    period_start = Column(Date, primary_key=True)
+    spent = Column(Float, nullable=False, default=0.0)
+    transaction_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+    budget = relationship("Budget", back_populates="spend", lazy=RELATIONSHIP_LAZY)
@@ -1,7 +1,7 @@
 from sqlalchemy import Boolean, Column, Integer, String, DateTime, Table, ForeignKey
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
-from database.connection import Base
+from database.connection import Base, RELATIONSHIP_LAZY
 from sqlalchemy.types import Enum 
 import enum
 
@@ -35,5 +35,5 @@ class Category(Base):
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
     
     # 🔥 THE MAGIC LINE - Many-to-Many relationship
-    users = relationship("User", secondary=user_category_association, back_populates="categories")
-    transactions = relationship("Transaction", back_populates="category") 
+    users = relationship("User", secondary=user_category_association, back_populates="categories", lazy=RELATIONSHIP_LAZY)
+    transactions = relationship("Transaction", back_populates="category", lazy=RELATIONSHIP_LAZY) 
@@ -0,0 +1,38 @@
+from sqlalchemy import BigInteger, Column, Integer, DateTime, ForeignKey, Index
+from sqlalchemy.sql import func
+from sqlalchemy.types import Enum
+from database.connection import Base
+import enum
+
+class SyncEntity(enum.Enum):
+    TRANSACTION = 'TRANSACTION'
+    ACCOUNT = 'ACCOUNT'
+    CATEGORY = 'CATEGORY'   # A user's category assignment (custom name, active flag)
+
+class ChangeOperation(enum.Enum):
+    UPSERT = 'UPSERT'
+    DELETE = 'DELETE'
+
+class ChangeLog(Base):
+    """
+    One row per change to a user's synced data, in commit order.
+
+    `id` is the change sequence that sync cursors point into. DELETE rows
+    are the tombstones for hard-deleted transactions and accounts.
+    """
+    __tablename__ = "change_log"
+
+    # BIGINT on Postgres; SQLite only auto-increments INTEGER primary keys
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    entity = Column(Enum(SyncEntity), nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    operation = Column(Enum(ChangeOperation), nullable=False)
+    changed_at = Column(DateTime, default=func.now(), nullable=False)
+
+    # Sync reads are "WHERE user_id = ? AND id > ? ORDER BY id" - a range scan on this index
+    __table_args__ = (
+        Index("ix_change_log_user_id_id", "user_id", "id"),
+        Index("ix_change_log_changed_at", "changed_at"),
+        {"sqlite_autoincrement": True},   # never reuse ids, even after pruning
+    )
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, String, DateTime, Date, Float
+from sqlalchemy.sql import func
+from database.connection import Base
+
+# Every rate is quoted against this currency; cross rates are derived from two quotes
+FX_PIVOT_CURRENCY = "USD"
+
+class FxRate(Base):
+    """Units of `currency` per one unit of the pivot currency on `day`"""
+    __tablename__ = "fx_rates"
+
+    currency = Column(String(3), primary_key=True)
+    day = Column(Date, primary_key=True)
+    rate = Column(Float, nullable=False)
+    created_at = Column(DateTime, default=func.now())
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index, JSON, UniqueConstraint
+from sqlalchemy.sql import func
+from database.connection import Base
+
+class IdempotencyKey(Base):
+    """
+    A client-supplied Idempotency-Key and the response of the write it made.
+
+    Inserted in the same DB transaction as the write, so a key exists exactly
+    when its write committed. Retries with the same key get the stored
+    response back instead of repeating the write.
+    """
+    __tablename__ = "idempotency_keys"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    key = Column(String(255), nullable=False)
+    request_hash = Column(String(64), nullable=False)   # sha256 of method, path and body
+    status_code = Column(Integer, nullable=False)
+    response_body = Column(JSON, nullable=True)
+    created_at = Column(DateTime, default=func.now())
+    expires_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "key", name="uq_idempotency_keys_user_key"),
+        Index("ix_idempotency_keys_expires_at", "expires_at"),   # expiry sweep
+    )
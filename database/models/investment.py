@@ -0,0 +1,34 @@
+from sqlalchemy import Column, Integer, String, DateTime, Date, Float, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.sql import func
+from database.connection import Base
+
+class Holding(Base):
+    """A position in one security, held in an INVESTMENT account"""
+    __tablename__ = "holdings"
+
+    id = Column(Integer, primary_key=True, index=True)
+    symbol = Column(String(20), nullable=False)
+    quantity = Column(Float, nullable=False)
+    cost_basis = Column(Float, nullable=False, default=0.0)  # Total paid, in the account currency
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    account_id = Column(Integer, ForeignKey("accounts.id", ondelete="CASCADE"), nullable=False)
+
+    created_at = Column(DateTime, default=func.now())
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("account_id", "symbol", name="uq_holdings_account_symbol"),
+        Index("ix_holdings_user_id", "user_id"),
+    )
+
+
+class SecurityPrice(Base):
+    """Closing price of a security on one day"""
+    __tablename__ = "security_prices"
+
+    symbol = Column(String(20), primary_key=True)
+    day = Column(Date, primary_key=True)
+    close = Column(Float, nullable=False)
+    currency = Column(String(3), nullable=False, default="USD")
+    created_at = Column(DateTime, default=func.now())
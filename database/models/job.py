@@ -0,0 +1,52 @@
+from sqlalchemy import Column, Integer, String, DateTime, Float, ForeignKey, Index, JSON
+from sqlalchemy.sql import func
+from database.connection import Base
+from sqlalchemy.types import Enum
+import enum
+
+class JobStatus(enum.Enum):
+    QUEUED = 'QUEUED'          # Waiting for a worker (or for run_after on retry)
+    RUNNING = 'RUNNING'        # Claimed by a worker
+    SUCCEEDED = 'SUCCEEDED'
+    FAILED = 'FAILED'          # Gave up after max_attempts
+    CANCELLED = 'CANCELLED'
+
+class Job(Base):
+    """
+    Background job row. Workers poll this table with SELECT ... FOR UPDATE
+    SKIP LOCKED, so several workers can share it without an external broker.
+    """
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_type = Column(String, nullable=False)        # Registered handler name, e.g. "budgets.rebuild"
+    payload = Column(JSON, nullable=True)
+    status = Column(Enum(JobStatus), default=JobStatus.QUEUED, nullable=False)
+
+    # Retries
+    attempts = Column(Integer, default=0, nullable=False)
+    max_attempts = Column(Integer, default=5, nullable=False)
+    run_after = Column(DateTime, default=func.now(), nullable=False)
+    last_error = Column(String, nullable=True)
+
+    # Worker bookkeeping
+    locked_by = Column(String, nullable=True)
+    locked_at = Column(DateTime, nullable=True)
+
+    # Progress and outcome
+    progress = Column(Float, default=0.0, nullable=False)   # 0.0 - 1.0
+    progress_message = Column(String, nullable=True)
+    result = Column(JSON, nullable=True)
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)  # Who asked for it
+
+    # Timestamps
+    created_at = Column(DateTime, default=func.now())
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("ix_jobs_pollable", "status", "run_after"),
+        Index("ix_jobs_user_id", "user_id"),
+    )
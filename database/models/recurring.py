@@ -0,0 +1,50 @@
+from sqlalchemy import Boolean, Column, Integer, String, DateTime, Date, Float, ForeignKey, Index
+from sqlalchemy.sql import func
+from database.connection import Base
+from sqlalchemy.types import Enum
+from .transaction import TransactionType
+import enum
+
+class RecurrenceFrequency(enum.Enum):
+    DAILY = 'DAILY'
+    WEEKLY = 'WEEKLY'
+    MONTHLY = 'MONTHLY'    # Same day each month, clamped to the month end
+    YEARLY = 'YEARLY'
+
+class RecurringTransaction(Base):
+    """
+    Template for a transaction that repeats (rent, salary, subscriptions).
+    The scheduler posts one Transaction per occurrence and moves next_run_date forward.
+    """
+    __tablename__ = "recurring_transactions"
+
+    id = Column(Integer, primary_key=True, index=True)
+    transaction_name = Column(String, nullable=False)
+    amount = Column(Float, nullable=False)
+    transaction_type = Column(Enum(TransactionType), nullable=False)
+    to_account = Column(Integer, nullable=True)    # For transfers
+    description = Column(String, nullable=True)
+
+    # Schedule
+    frequency = Column(Enum(RecurrenceFrequency), default=RecurrenceFrequency.MONTHLY, nullable=False)
+    interval = Column(Integer, default=1, nullable=False)   # Every N days/weeks/months/years
+    start_date = Column(Date, nullable=False)
+    end_date = Column(Date, nullable=True)
+    next_run_date = Column(Date, nullable=False)            # Next occurrence not yet posted
+    last_run_date = Column(Date, nullable=True)
+    is_active = Column(Boolean, default=True)
+
+    # Foreign Keys
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    account_id = Column(Integer, ForeignKey("accounts.id", ondelete="CASCADE"), nullable=False)
+    category_id = Column(Integer, ForeignKey("categories.id"), nullable=False)
+
+    # Timestamps
+    created_at = Column(DateTime, default=func.now())
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+    # The scheduler only ever asks for active rules that are due
+    __table_args__ = (
+        Index("ix_recurring_transactions_due", "is_active", "next_run_date"),
+        Index("ix_recurring_transactions_user_id", "user_id"),
+    )
@@ -1,7 +1,7 @@
-from sqlalchemy import Boolean, Column, Integer, String, DateTime, Float, ForeignKey
+from sqlalchemy import Boolean, Column, Integer, String, DateTime, Date, Float, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
-from database.connection import Base
+from database.connection import Base, RELATIONSHIP_LAZY
 from sqlalchemy.types import Enum 
 import enum
 
@@ -17,7 +17,7 @@ class Transaction(Base):
     transaction_name = Column(String, nullable=False)  # "Grocery shopping", "Salary"
     amount = Column(Float, nullable=False)
     transaction_type = Column(Enum(TransactionType), nullable=False)
-    to_account = Column(Integer, nullable=True)    # For transfers
+    to_account = Column(Integer, nullable=True, index=True)    # For transfers
     description = Column(String, nullable=True)   # Extra details
     
     # Add this line:
@@ -25,14 +25,25 @@ class Transaction(Base):
     
     # Foreign Keys (Many-to-One relationships)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    account_id = Column(Integer, ForeignKey("accounts.id"), nullable=False) # from or to both
-    category_id = Column(Integer, ForeignKey("categories.id"), nullable=False)
+    account_id = Column(Integer, ForeignKey("accounts.id"), nullable=False, index=True) # from or to both
+    category_id = Column(Integer, ForeignKey("categories.id"), nullable=False, index=True)
+
+    # Set when the transaction was posted by a recurring rule
+    recurring_id = Column(Integer, ForeignKey("recurring_transactions.id", ondelete="SET NULL"), nullable=True)
+    occurrence_date = Column(Date, nullable=True)
     
     # Timestamps
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
     
+    # A rule posts each occurrence at most once, even if the scheduler restarts mid-run.
+    # (user_id, date) serves every per-user list/summary, newest first.
+    __table_args__ = (
+        UniqueConstraint("recurring_id", "occurrence_date", name="uq_transactions_recurring_occurrence"),
+        Index("ix_transactions_user_id_date", "user_id", "date"),
+    )
+    
     # Relationships (Many-to-One)
-    user = relationship("User", back_populates="transactions")
-    account = relationship("Account", back_populates="transactions")
-    category = relationship("Category", back_populates="transactions")
\ No newline at end of file
+    user = relationship("User", back_populates="transactions", lazy=RELATIONSHIP_LAZY)
+    account = relationship("Account", back_populates="transactions", lazy=RELATIONSHIP_LAZY)
+    category = relationship("Category", back_populates="transactions", lazy=RELATIONSHIP_LAZY)
\ No newline at end of file
@@ -0,0 +1,36 @@
+from sqlalchemy import Column, Integer, String, DateTime, Date, Float, Index
+from sqlalchemy.sql import func
+from database.connection import Base
+from sqlalchemy.types import Enum
+from .transaction import TransactionType
+
+class TransactionArchive(Base):
+    """
+    Transactions moved out of the hot table by services/archive.py.
+
+    Same columns as transactions (ids are kept), so reads can UNION ALL the
+    two. Archived rows are read-only history; no foreign keys, so accounts
+    and rules can still be deleted without touching the archive.
+    """
+    __tablename__ = "transactions_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    transaction_name = Column(String, nullable=False)
+    amount = Column(Float, nullable=False)
+    transaction_type = Column(Enum(TransactionType), nullable=False)
+    to_account = Column(Integer, nullable=True)
+    description = Column(String, nullable=True)
+    date = Column(DateTime, nullable=False)
+    user_id = Column(Integer, nullable=False)
+    account_id = Column(Integer, nullable=False)
+    category_id = Column(Integer, nullable=False)
+    recurring_id = Column(Integer, nullable=True)
+    occurrence_date = Column(Date, nullable=True)
+    created_at = Column(DateTime)
+    updated_at = Column(DateTime)
+    archived_at = Column(DateTime, default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("ix_transactions_archive_user_id_date", "user_id", "date"),
+        Index("ix_transactions_archive_account_id", "account_id"),
+    )
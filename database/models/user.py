@@ -1,6 +1,6 @@
-from sqlalchemy import Boolean, Column, Integer, String, DateTime
+from sqlalchemy import Boolean, Column, Integer, String, DateTime, false
 from sqlalchemy.sql import func
-from database.connection import Base
+from database.connection import Base, RELATIONSHIP_LAZY
 from sqlalchemy.orm import relationship
 from sqlalchemy.types import Enum
 from .category import user_category_association
@@ -32,11 +32,14 @@ class User(Base):
     is_verified = Column(Boolean, default=False)
     currency = Column(String, default="USD")
     location = Column(String, nullable=True)
-    created_at = Column(DateTime, default=func.now())
+    created_at = Column(DateTime, default=func.now(), index=True)  # Signup rollups read new users by this
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    # Set when deletion is requested; a job removes the user's data in batches (services/deletion.py)
+    pending_delete = Column(Boolean, default=False, server_default=false(), nullable=False)
     
     # Relationship declarations will go here later
-    accounts = relationship("Account", back_populates="user")
-    categories = relationship("Category", secondary=user_category_association, back_populates="users")
-    transactions = relationship("Transaction", back_populates="user")
+    # Never loaded to cascade a delete: services/deletion.py removes dependent rows in batches
+    accounts = relationship("Account", back_populates="user", passive_deletes="all", lazy=RELATIONSHIP_LAZY)
+    categories = relationship("Category", secondary=user_category_association, back_populates="users", passive_deletes=True, lazy=RELATIONSHIP_LAZY)
+    transactions = relationship("Transaction", back_populates="user", passive_deletes="all", lazy=RELATIONSHIP_LAZY)
     
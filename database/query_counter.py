@@ -0,0 +1,54 @@
+"""
+Count the SQL statements run inside a block of code.
+
+    with count_queries() as counter:
+        client.get("/transaction/get_all", headers=headers)
+    assert counter.count <= 3, counter.statements
+
+Counting hooks every Engine's before_cursor_execute, so it covers all
+sessions, raw connections and lazy loads. The active counter lives in a
+ContextVar, which follows the request into FastAPI's threadpool (sync
+dependencies and endpoints). QueryBudgetMiddleware
+(middleware/query_budget.py) uses it to hold each route to a budget.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Statements kept for the failure message; counting continues past this
+KEEP_STATEMENTS = 50
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+        self.statements: list[str] = []
+
+    def record(self, statement: str) -> None:
+        self.count += 1
+        if len(self.statements) < KEEP_STATEMENTS:
+            self.statements.append(" ".join(statement.split()))
+
+
+_current: ContextVar[Optional[QueryCounter]] = ContextVar("query_counter", default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    counter = _current.get()
+    if counter is not None:
+        counter.record(statement)
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryCounter]:
+    """Count statements run in this context (including threads it hands work to) until the block exits"""
+    counter = QueryCounter()
+    token = _current.set(counter)
+    try:
+        yield counter
+    finally:
+        _current.reset(token)
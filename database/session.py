@@ -1,12 +1,19 @@
+from fastapi import Request
 from database.connection import SessionLocal
 
-def get_db():
+def get_db(request: Request):
     """
     Dependency function to get a DB session that automatically closes
-    when the request is finished.
+    when the request is finished. Sub-requests of a /batch call share
+    the batch's session, which the batch endpoint closes.
     """
+    shared = getattr(request.state, "batch_db", None)
+    if shared is not None:
+        yield shared
+        return
+
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
@@ -1,118 +1,144 @@
-from fastapi import FastAPI, Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from datetime import datetime
-
-# Updated imports to use new model structure
-from Models.users import UserResponse, UserCreateRequest, LoginRequest
-from database.models import User as DBUser
-from database.models.user import Gender, Role
-from sqlalchemy.orm import Session
-from database.session import get_db
-from util import verify_password,get_password_hash,create_access_token,verify_token
-from auth.permissions import get_current_user, require_auth
-from routers import admin, account, category,transaction
-
-app = FastAPI(
-     title="FINANCE TARCKER API",
-     description="This api is handle user finance data and trasactiona and expenses."
-     )
-
-# Add this after your imports, before the routes
-security = HTTPBearer()
-
-# Include routers
-app.include_router(admin.router)
-app.include_router(account.router)
-app.include_router(category.router)
-app.include_router(transaction.router)
-
-@app.get("/",summary="Root Endpoint")
-async def read_root():
-    return {"message": "Finance Tracker API - LIVE UPDATES WORK!", "status": "running", "version": "1.0.0"}
-
-@app.get("/user/me")
-async def get_user_me(current_user: UserResponse = Depends(get_current_user)):
-    return current_user
-
-@app.post('/register')
-async def registration(new_user : UserCreateRequest, db : Session = Depends(get_db)):
-        
-        #first check if user is in database already
-        existing_user = db.query(DBUser).filter(DBUser.email == new_user.email).first()
-
-        if existing_user :
-            raise HTTPException(status.HTTP_400_BAD_REQUEST,"User Already Exist")
-        
-        hashed_password = get_password_hash(new_user.password)
-        user = DBUser(
-             name= new_user.name,
-             email=new_user.email,
-             password=hashed_password,
-             age= getattr(new_user,'age',None),
-             gender=getattr(new_user,'gender',Gender.MALE),
-             role=getattr(new_user,'role',Role.USER),  # Add role with default
-             is_verified=getattr(new_user,'is_verified',False),
-             currency=getattr(new_user,'currency','INR'),
-             location=getattr(new_user,'location','India'), 
-        )
-        
-        db.add(user)
-        db.commit()
-        db.refresh(user)
-    
-        return {
-             "status": status.HTTP_201_CREATED,
-             "message": "User Created Successfully",
-             "user": {
-                 "name":user.name,
-                 "email":user.email
-             }
-        }
-
-@app.post('/login')
-async def login(login_request: LoginRequest , db : Session = Depends(get_db)):
-     # try to fetch the user 
-     user = db.query(DBUser).filter(DBUser.email==login_request.email).first()
-     if not user :
-         raise HTTPException(status.HTTP_401_UNAUTHORIZED,"Not Have Account, please Sign Up!!")
-     
-     # Step 2: Verify Password
-     if verify_password(login_request.password,user.password):
-        # Step 3: Create JWT token with user data
-        token_data = {
-            "id": user.id,
-            "email": user.email,
-            "role": user.role.value  # Add role to JWT token
-        }
-        access_token = create_access_token(data=token_data)
-        # Step 4: Return success with real JWT
-        return {
-            'status': status.HTTP_200_OK,
-            'access_token': access_token,
-            'token_type': 'bearer',
-            'user': {
-                'id': user.id,
-                'name': user.name,
-                'email': user.email
-            }
-        }
-
-     else:
-         raise HTTPException(status.HTTP_401_UNAUTHORIZED,"Wrong Password!!")
-
-           
-
-@app.get("/health")
-async def health_check():
-    return {
-        "timestamp": datetime.now().isoformat(),
-        "status": "Api is Running with Live updates..."
-    }
-
-@app.get("/version")
-async def get_version():
-    return {
-        "version" : "1.0.0",
-        "description": "This is the version endpoint of the Finance API."
-    }
- 
\ No newline at end of file
+"""
+Finance Tracker API application factory.
+
+    uvicorn main:create_app --factory
+
+create_app(settings) builds the app; routers, middleware and schemas are
+imported inside it, so `import main` stays cheap (see `manage.py
+import-time`). The lifespan creates the engine and pool on startup, warms
+them up, and disposes them on shutdown. `main.app` is still available for
+tools that expect a module-level app; it is built on first access.
+"""
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from fastapi import FastAPI
+
+from settings import Settings
+
+
+def warm_up(app: FastAPI, settings: Settings) -> None:
+    """
+    Do the first-request work up front: import every schema module (building
+    its Pydantic validators), build the OpenAPI schema and open the pool's
+    connections.
+    """
+    import Models
+    for name in Models.__all__:
+        model = getattr(Models, name)
+        if not model.__pydantic_complete__:
+            model.model_rebuild()
+    app.openapi()
+
+    from sqlalchemy import text
+    from database.connection import get_engine
+    engine = get_engine()
+    connections = []
+    try:
+        for _ in range(max(1, settings.db_pool_size)):
+            connection = engine.connect()
+            connection.execute(text("SELECT 1"))
+            connections.append(connection)
+    finally:
+        # Back into the pool, ready for the first requests
+        for connection in connections:
+            connection.close()
+
+
+def create_app(settings: Optional[Settings] = None) -> FastAPI:
+    settings = settings or Settings.from_env()
+
+    from database.connection import configure_engine, dispose_engine, get_engine
+    configure_engine(settings.database_url, pool_size=settings.db_pool_size, max_overflow=settings.db_max_overflow)
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        get_engine()
+        if settings.warm_up:
+            warm_up(app, settings)
+        app.state.ready = True
+        yield
+        app.state.ready = False
+        dispose_engine()
+
+    app = FastAPI(
+         title="FINANCE TARCKER API",
+         description="This api is handle user finance data and trasactiona and expenses.",
+         lifespan=lifespan
+         )
+    app.state.settings = settings
+    app.state.ready = False
+
+    from middleware import RateLimit, RouteLimit, InMemoryRateLimitBackend, RateLimitMiddleware, CompressionMiddleware
+    from middleware import RouteBudget, QueryBudgetMiddleware
+    from services.idempotency import IdempotentReplay, idempotent_replay_handler
+    from routers import core, admin, account, category, transaction, budget, recurring, jobs, analytics, investments, batch, events, sync
+
+    # Rate limiting - per client IP plus per user (or IP when anonymous) and route
+    if settings.rate_limit_enabled:
+         app.add_middleware(
+              RateLimitMiddleware,
+              backend=InMemoryRateLimitBackend(),
+              default_limit=RateLimit.per_minute(300, burst=60),
+              ip_limit=RateLimit.per_minute(600, burst=120),
+              routes=[
+                   RouteLimit("login", "/login", RateLimit.per_minute(10, burst=5), frozenset({"POST"})),
+                   RouteLimit("register", "/register", RateLimit.per_minute(5, burst=5), frozenset({"POST"})),
+                   RouteLimit("transaction-list", "/transaction/get_all", RateLimit.per_minute(60, burst=10)),
+                   RouteLimit("analytics", "/analytics", RateLimit.per_minute(30, burst=10)),
+                   RouteLimit("admin", "/admin", RateLimit.per_minute(60, burst=20)),
+              ],
+              trust_forwarded_for=settings.trust_forwarded_for,
+         )
+
+    # Compress buffered responses of 1 KB or more (gzip, or brotli when installed)
+    app.add_middleware(CompressionMiddleware, minimum_size=settings.compression_min_size)
+
+    # Dev/test: SQL statements per request, failing any route over its budget (catches N+1 queries)
+    if settings.query_budget:
+         app.add_middleware(
+              QueryBudgetMiddleware,
+              default_budget=6,
+              routes=[
+                   # Writes also touch balances, budget counters, the change log and idempotency keys
+                   RouteBudget("/transaction", 16, frozenset({"POST", "PUT", "DELETE"})),
+                   RouteBudget("/account", 10, frozenset({"POST", "PUT", "PATCH", "DELETE"})),
+                   RouteBudget("/budgets", 10, frozenset({"POST", "PATCH"})),
+                   RouteBudget("/categories", 8),
+                   RouteBudget("/sync", 10),
+              ],
+         )
+
+    # Retried writes with a stored Idempotency-Key get the original response back
+    app.add_exception_handler(IdempotentReplay, idempotent_replay_handler)
+
+    # Include routers
+    app.include_router(core.router)
+    app.include_router(admin.router)
+    app.include_router(account.router)
+    app.include_router(category.router)
+    app.include_router(transaction.router)
+    app.include_router(budget.router)
+    app.include_router(recurring.router)
+    app.include_router(jobs.router)
+    app.include_router(analytics.router)
+    app.include_router(investments.router)
+    app.include_router(batch.router)
+    app.include_router(events.router)
+    app.include_router(sync.router)
+
+    return app
+
+
+def __getattr__(name):
+    # `main:app` (fastapi dev main.py, older deployments) builds the app from the environment
+    if name == "app":
+        global app
+        app = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    # Lets tools that discover the app via dir() (fastapi dev) find it
+    return sorted(set(globals()) | {"app"})
@@ -0,0 +1,381 @@
+"""
+Maintenance commands for the Finance Tracker API.
+
+Usage:
+    python manage.py create-tables
+    python manage.py rebuild-budgets [--user-id ID]
+    python manage.py run-scheduler [--once] [--interval SECONDS] [--batch-size N]
+    python manage.py run-worker [--processes N] [--once] [--job-type TYPE ...]
+    python manage.py rebuild-snapshots [--account-id ID ...]
+    python manage.py load-fx-rates FILE
+    python manage.py load-prices FILE
+    python manage.py prune-change-log [--days N]
+    python manage.py sweep-idempotency-keys [--chunk-size N]
+    python manage.py ensure-partitions [--months-ahead N]
+    python manage.py backfill-partitions [--batch-size N] [--pause SECONDS]
+    python manage.py archive-transactions [--older-than-days N] [--batch-size N]
+    python manage.py refresh-rollups [--full] [--force]
+    python manage.py import-time [--module NAME] [--budget-ms N] [--top N]
+    python manage.py check-query-plans [--query NAME ...] [--verbose]
+"""
+import argparse
+import os
+import sys
+import time
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+
+def create_tables(args):
+    from database.connection import create_tables
+    create_tables()
+
+
+def rebuild_budgets(args):
+    """Recompute budget spend counters from the transaction ledger"""
+    from database.connection import SessionLocal
+    from services.budgets import rebuild_budget_spend
+
+    db = SessionLocal()
+    try:
+        counters = rebuild_budget_spend(db, user_id=args.user_id)
+        db.commit()
+        print(f"✅ Rebuilt {counters} budget counters")
+    finally:
+        db.close()
+
+
+def rebuild_snapshots(args):
+    """Recompute daily balance snapshots from the transaction ledger"""
+    from database.connection import SessionLocal
+    from services.balance_history import rebuild_balance_snapshots
+
+    db = SessionLocal()
+    try:
+        rows = rebuild_balance_snapshots(db, account_ids=args.account_id)
+        print(f"✅ Wrote {rows} balance snapshot rows")
+    finally:
+        db.close()
+
+
+def load_fx_rates(args):
+    """Insert or replace FX rates from a CSV or JSON file"""
+    from database.connection import SessionLocal
+    from services.fx import fx_cache, parse_rates_file, upsert_fx_rates
+
+    rows = parse_rates_file(args.file)
+    db = SessionLocal()
+    try:
+        loaded = upsert_fx_rates(db, rows)
+        print(f"✅ Loaded {loaded} FX rates; currencies available: {', '.join(fx_cache.currencies())}")
+    finally:
+        db.close()
+
+
+def load_prices(args):
+    """Insert or replace security prices from a CSV or JSON file"""
+    from database.connection import SessionLocal
+    from services.investments import parse_prices_file, upsert_prices
+
+    rows = parse_prices_file(args.file)
+    db = SessionLocal()
+    try:
+        loaded = upsert_prices(db, rows)
+        print(f"✅ Loaded {loaded} prices for {len({row['symbol'] for row in rows})} symbols")
+    finally:
+        db.close()
+
+
+def prune_change_log(args):
+    """Delete sync change log rows older than --days (default: the retention period)"""
+    from datetime import datetime, timedelta
+    from database.connection import SessionLocal
+    from services.sync import RETENTION_DAYS, prune_change_log as prune
+
+    days = args.days or RETENTION_DAYS
+    db = SessionLocal()
+    try:
+        removed = prune(db, older_than=datetime.now() - timedelta(days=days))
+        db.commit()
+        print(f"✅ Removed {removed} change log rows older than {days} days")
+    finally:
+        db.close()
+
+
+def sweep_idempotency_keys(args):
+    """Delete expired Idempotency-Key records, one committed chunk at a time"""
+    from database.connection import SessionLocal
+    from services.idempotency import sweep_expired_keys
+
+    db = SessionLocal()
+    try:
+        removed = sweep_expired_keys(db, chunk_size=args.chunk_size)
+        print(f"✅ Removed {removed} expired idempotency keys")
+    finally:
+        db.close()
+
+
+def ensure_partitions(args):
+    """Create missing monthly transaction partitions (PostgreSQL, after migration d7a2c5e8f134)"""
+    from database.connection import SessionLocal
+    from services.partitions import ensure_partitions as ensure, partitioned_table
+
+    db = SessionLocal()
+    try:
+        if partitioned_table(db) is None:
+            print("⚠️ transactions is not partitioned on this database; nothing to do")
+            return
+        created = ensure(db, months_ahead=args.months_ahead)
+        print(f"✅ Created {len(created)} partitions{': ' + ', '.join(created) if created else ''}")
+    finally:
+        db.close()
+
+
+def backfill_partitions(args):
+    """Copy existing transactions into the partitioned table in committed batches"""
+    from database.connection import SessionLocal
+    from services.partitions import backfill, backfill_status
+
+    db = SessionLocal()
+    try:
+        status = backfill_status(db)
+        if status is None:
+            print("⚠️ No partition backfill pending (run migration d7a2c5e8f134 on PostgreSQL first)")
+            return
+        print(f"Backfilling ids {status['last_id'] + 1}..{status['max_id']}")
+        copied = backfill(
+            db, batch_size=args.batch_size, pause_seconds=args.pause,
+            progress=lambda last_id, max_id: print(f"  copied through id {last_id} of {max_id}")
+        )
+        print(f"✅ Copied {copied} transactions; ready for `alembic upgrade e9b4f1a6c273`")
+    finally:
+        db.close()
+
+
+def archive_transactions(args):
+    """Move old transactions into transactions_archive, one committed batch at a time"""
+    from database.connection import SessionLocal
+    from services.archive import archive_cutoff, archive_transactions as archive
+
+    db = SessionLocal()
+    try:
+        cutoff = archive_cutoff(args.older_than_days)
+        moved = archive(db, older_than_days=args.older_than_days, batch_size=args.batch_size)
+        print(f"✅ Archived {moved} transactions dated before {cutoff.date().isoformat()}")
+    finally:
+        db.close()
+
+
+def refresh_rollups(args):
+    """Bring the admin analytics rollups up to date (incrementally unless --full)"""
+    from database.connection import SessionLocal
+    from services.rollups import refresh_rollups as refresh
+
+    db = SessionLocal()
+    try:
+        stats = refresh(db, full=args.full, force=args.force)
+        if stats["mode"] == "deferred":
+            print("⚠️ Full rollup rebuild deferred until outside ADMIN_BUSINESS_HOURS (use --force to run now)")
+        else:
+            print(f"✅ Rollups refreshed ({stats['mode']}): {stats['months']} signup months, {stats['users']} users")
+    finally:
+        db.close()
+
+
+def import_time(args):
+    """Measure `import MODULE` in a fresh interpreter with -X importtime; exit 1 over the budget"""
+    import subprocess
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {args.module}"],
+        capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+    if result.returncode != 0:
+        print(result.stderr.strip().splitlines()[-1])
+        sys.exit(1)
+
+    # Lines look like "import time:  self [us] | cumulative | imported package"
+    timings = []
+    for line in result.stderr.splitlines():
+        parts = line.removeprefix("import time:").split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        timings.append((int(parts[0]), int(parts[1]), parts[2].strip()))
+    total_ms = next(cumulative for _, cumulative, name in reversed(timings) if name == args.module) / 1000
+
+    print(f"Slowest modules by self time importing {args.module}:")
+    for self_us, cumulative_us, name in sorted(timings, reverse=True)[:args.top]:
+        print(f"  {self_us / 1000:8.1f} ms  (cumulative {cumulative_us / 1000:8.1f} ms)  {name}")
+    if total_ms > args.budget_ms:
+        print(f"⚠️ import {args.module} took {total_ms:.0f} ms, over the {args.budget_ms} ms budget")
+        sys.exit(1)
+    print(f"✅ import {args.module} took {total_ms:.0f} ms (budget {args.budget_ms} ms)")
+
+
+def check_query_plans(args):
+    """EXPLAIN every hot query; exit 1 if any does a full scan of a large table"""
+    from database.connection import SessionLocal
+    from services.query_plans import check_plans
+
+    db = SessionLocal()
+    try:
+        results = check_plans(db, args.query)
+    finally:
+        db.close()
+
+    for result in results:
+        if result.ok:
+            print(f"✅ {result.name}")
+        else:
+            print(f"⚠️ {result.name}: full scan of {', '.join(result.full_scans)}")
+        if args.verbose or not result.ok:
+            for line in result.plan:
+                print(f"      {line}")
+    if not all(result.ok for result in results):
+        sys.exit(1)
+
+
+def run_scheduler(args):
+    """Post due recurring transactions, once or every --interval seconds"""
+    from database.connection import SessionLocal
+    from services.recurring import materialise_due
+    from services.partitions import ensure_partitions
+    from services.rollups import refresh_rollups
+
+    while True:
+        db = SessionLocal()
+        try:
+            # Next months' transaction partitions exist before anything is posted into them
+            created = ensure_partitions(db)
+            if created:
+                print(f"✅ Created partitions: {', '.join(created)}")
+            stats = materialise_due(db, batch_size=args.batch_size)
+            print(f"✅ Posted {stats['posted']} transactions from {stats['rules']} due rules")
+            if stats["failed_rules"]:
+                print(f"⚠️ Rules left due after failing: {stats['failed_rules']}")
+            # Incremental outside of a needed full rebuild, which waits for off-hours
+            rollups = refresh_rollups(db)
+            print(f"✅ Rollups refreshed ({rollups['mode']}): {rollups['users']} users")
+        finally:
+            db.close()
+
+        if args.once:
+            break
+        time.sleep(args.interval)
+
+
+def run_worker(args):
+    """Start background job worker processes"""
+    from services.jobs import work
+
+    if args.processes <= 1:
+        processed = work(poll_interval=args.poll_interval, once=args.once, job_types=args.job_type)
+        print(f"✅ Worker processed {processed} jobs")
+        return
+
+    import multiprocessing
+    workers = [
+        multiprocessing.Process(
+            target=_worker_process,
+            args=(args.poll_interval, args.once, args.job_type),
+            name=f"job-worker-{n}"
+        )
+        for n in range(args.processes)
+    ]
+    for process in workers:
+        process.start()
+    print(f"✅ Started {len(workers)} job workers")
+    for process in workers:
+        process.join()
+
+
+def _worker_process(poll_interval, once, job_types):
+    from database.connection import get_engine
+    # Don't share pooled connections inherited from the parent process
+    get_engine().dispose(close=False)
+
+    from services.jobs import work
+    work(poll_interval=poll_interval, once=once, job_types=job_types)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Finance Tracker maintenance commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("create-tables", help="Create all tables").set_defaults(func=create_tables)
+
+    rebuild = commands.add_parser("rebuild-budgets", help="Recompute budget counters from transactions")
+    rebuild.add_argument("--user-id", type=int, default=None, help="Only rebuild this user's budgets")
+    rebuild.set_defaults(func=rebuild_budgets)
+
+    snapshots = commands.add_parser("rebuild-snapshots", help="Recompute daily balance snapshots")
+    snapshots.add_argument("--account-id", type=int, action="append", default=None, help="Only rebuild these accounts")
+    snapshots.set_defaults(func=rebuild_snapshots)
+
+    fx = commands.add_parser("load-fx-rates", help="Load FX rates (units per USD) from a CSV or JSON file")
+    fx.add_argument("file", help="CSV with date,currency,rate columns or JSON")
+    fx.set_defaults(func=load_fx_rates)
+
+    prices = commands.add_parser("load-prices", help="Load security closing prices from a CSV or JSON file")
+    prices.add_argument("file", help="CSV with date,symbol,close[,currency] columns or JSON")
+    prices.set_defaults(func=load_prices)
+
+    prune = commands.add_parser("prune-change-log", help="Delete old sync change log rows and tombstones")
+    prune.add_argument("--days", type=int, default=None, help="Keep this many days of changes")
+    prune.set_defaults(func=prune_change_log)
+
+    sweep = commands.add_parser("sweep-idempotency-keys", help="Delete expired Idempotency-Key records")
+    sweep.add_argument("--chunk-size", type=int, default=1000, help="Rows deleted per transaction")
+    sweep.set_defaults(func=sweep_idempotency_keys)
+
+    partitions = commands.add_parser("ensure-partitions", help="Create upcoming monthly transaction partitions")
+    partitions.add_argument("--months-ahead", type=int, default=3, help="Months ahead of the current one")
+    partitions.set_defaults(func=ensure_partitions)
+
+    backfill = commands.add_parser("backfill-partitions", help="Copy transactions into the partitioned table")
+    backfill.add_argument("--batch-size", type=int, default=5000, help="Rows per committed batch")
+    backfill.add_argument("--pause", type=float, default=0.0, help="Seconds to sleep between batches")
+    backfill.set_defaults(func=backfill_partitions)
+
+    archive = commands.add_parser("archive-transactions", help="Move old transactions into the archive table")
+    archive.add_argument("--older-than-days", type=int, default=None,
+                         help="Archive transactions older than this (default TRANSACTION_ARCHIVE_AFTER_DAYS)")
+    archive.add_argument("--batch-size", type=int, default=5000, help="Rows per committed batch")
+    archive.set_defaults(func=archive_transactions)
+
+    rollups = commands.add_parser("refresh-rollups", help="Refresh the admin analytics rollup tables")
+    rollups.add_argument("--full", action="store_true", help="Rebuild every rollup from scratch")
+    rollups.add_argument("--force", action="store_true", help="Run a full rebuild even during business hours")
+    rollups.set_defaults(func=refresh_rollups)
+
+    importtime = commands.add_parser("import-time", help="Check a module's import time against a budget")
+    importtime.add_argument("--module", default="main", help="Module to import")
+    importtime.add_argument("--budget-ms", type=int, default=600, help="Fail above this many milliseconds")
+    importtime.add_argument("--top", type=int, default=10, help="Slowest modules to list")
+    importtime.set_defaults(func=import_time)
+
+    plans = commands.add_parser("check-query-plans", help="Fail if a hot query plan does a full scan of a large table")
+    plans.add_argument("--query", action="append", default=None, help="Only check these queries")
+    plans.add_argument("--verbose", action="store_true", help="Print every plan")
+    plans.set_defaults(func=check_query_plans)
+
+    scheduler = commands.add_parser("run-scheduler", help="Post due recurring transactions")
+    scheduler.add_argument("--once", action="store_true", help="Run a single pass and exit")
+    scheduler.add_argument("--interval", type=int, default=300, help="Seconds between passes")
+    scheduler.add_argument("--batch-size", type=int, default=1000, help="Rules per batch")
+    scheduler.set_defaults(func=run_scheduler)
+
+    worker = commands.add_parser("run-worker", help="Run background job workers")
+    worker.add_argument("--processes", type=int, default=1, help="Number of worker processes")
+    worker.add_argument("--once", action="store_true", help="Exit when the queue is empty")
+    worker.add_argument("--poll-interval", type=float, default=2.0, help="Seconds to wait when the queue is empty")
+    worker.add_argument("--job-type", action="append", default=None, help="Only run these job types")
+    worker.set_defaults(func=run_worker)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
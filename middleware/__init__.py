@@ -0,0 +1,23 @@
+from .rate_limit import (
+    RateLimit,
+    RouteLimit,
+    RateLimitBackend,
+    InMemoryRateLimitBackend,
+    RateLimitMiddleware
+)
+from .compression import CompressionMiddleware
+from .negotiation import negotiated_list
+from .query_budget import RouteBudget, QueryBudgetExceeded, QueryBudgetMiddleware
+
+__all__ = [
+    "RateLimit",
+    "RouteLimit",
+    "RateLimitBackend",
+    "InMemoryRateLimitBackend",
+    "RateLimitMiddleware",
+    "CompressionMiddleware",
+    "negotiated_list",
+    "RouteBudget",
+    "QueryBudgetExceeded",
+    "QueryBudgetMiddleware"
+]
@@ -0,0 +1,114 @@
+"""
+Response compression.
+
+Buffered responses of at least `minimum_size` bytes are compressed with
+brotli or gzip, whichever the client's Accept-Encoding prefers (brotli wins
+ties and needs the optional Brotli package). Streamed responses,
+event streams and bodies that are already encoded pass through untouched.
+"""
+import gzip
+from typing import Optional
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+SKIP_CONTENT_TYPES = (b"text/event-stream", b"application/x-ndjson", b"image/", b"video/", b"audio/", b"application/zip", b"application/gzip")
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Best of br/gzip allowed by an Accept-Encoding header, or None"""
+    weights = {}
+    for part in accept_encoding.split(","):
+        coding, *params = [piece.strip() for piece in part.split(";")]
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding:
+            weights[coding.lower()] = q
+
+    candidates = ["br", "gzip"] if brotli is not None else ["gzip"]
+    best, best_q = None, 0.0
+    for coding in candidates:
+        q = weights.get(coding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing buffered responses above a size threshold"""
+
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = ""
+        for name, value in scope.get("headers", ()):
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+        encoding = choose_encoding(accept_encoding)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                headers = dict(message.get("headers", ()))
+                content_type = headers.get(b"content-type", b"")
+                if b"content-encoding" in headers or content_type.startswith(SKIP_CONTENT_TYPES):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start_message = message
+                return
+
+            # First body chunk decides: streamed bodies are passed through as-is
+            body = message.get("body", b"")
+            if message.get("more_body", False) or len(body) < self.minimum_size:
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            compressed = self.compress(body, encoding)
+            headers = [
+                (name, value) for name, value in start_message.get("headers", ())
+                if name not in (b"content-length", b"vary")
+            ]
+            vary = [value for name, value in start_message.get("headers", ()) if name == b"vary"]
+            headers += [
+                (b"content-encoding", encoding.encode()),
+                (b"content-length", str(len(compressed)).encode()),
+                (b"vary", b", ".join(vary + [b"Accept-Encoding"])),
+            ]
+            await send({**start_message, "headers": headers})
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,113 @@
+"""
+Accept-header negotiation for list endpoints.
+
+Besides plain JSON, clients can ask for:
+    application/msgpack                     MessagePack, one map per row
+    application/msgpack; layout=columnar    MessagePack, one array per field
+    application/vnd.columnar+json           JSON, one array per field
+    application/x-ndjson                    JSON, one object per line
+
+The columnar layouts send each field name once rather than once per row.
+Endpoints that can stream NDJSON check wants_ndjson() and hand
+ndjson_stream() batches of rows, so a full dump is never held in memory.
+"""
+from functools import lru_cache
+from typing import Iterable, Sequence
+
+import msgpack
+from fastapi import Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, TypeAdapter
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+COLUMNAR_JSON = "application/vnd.columnar+json"
+NDJSON = "application/x-ndjson"
+
+MSGPACK_ALIASES = (MSGPACK, "application/x-msgpack", "application/vnd.msgpack")
+
+_columns_adapter = TypeAdapter(dict)
+
+
+def parse_accept(accept: str) -> list[tuple[str, dict, float]]:
+    """Media ranges from an Accept header as (type, params, q), highest q first"""
+    ranges = []
+    for position, part in enumerate(accept.split(",")):
+        media_type, *raw_params = [piece.strip() for piece in part.split(";")]
+        if not media_type:
+            continue
+        params = {}
+        for raw in raw_params:
+            name, _, value = raw.partition("=")
+            params[name.strip().lower()] = value.strip().strip('"')
+        try:
+            q = float(params.pop("q", 1.0))
+        except ValueError:
+            q = 0.0
+        ranges.append((media_type.lower(), params, q, position))
+    ranges.sort(key=lambda item: (-item[2], item[3]))
+    return [(media_type, params, q) for media_type, params, q, _ in ranges if q > 0]
+
+
+def preferred_format(accept: str) -> tuple[str, bool]:
+    """(media type, columnar) for the best supported match; JSON rows when nothing better matches"""
+    for media_type, params, _ in parse_accept(accept or ""):
+        if media_type in MSGPACK_ALIASES:
+            return MSGPACK, params.get("layout") == "columnar"
+        if media_type == COLUMNAR_JSON:
+            return COLUMNAR_JSON, True
+        if media_type == NDJSON:
+            return NDJSON, False
+        if media_type in (JSON, "application/*", "*/*"):
+            return JSON, False
+    return JSON, False
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(model: type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(list[model])
+
+
+@lru_cache(maxsize=None)
+def _item_adapter(model: type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(model)
+
+
+def wants_ndjson(request: Request) -> bool:
+    return preferred_format(request.headers.get("accept", ""))[0] == NDJSON
+
+
+def _ndjson_lines(batches: Iterable[list], model: type[BaseModel]):
+    adapter = _item_adapter(model)
+    for batch in batches:
+        yield b"".join(adapter.dump_json(model.model_validate(row)) + b"\n" for row in batch)
+
+
+def ndjson_stream(batches: Iterable[list], model: type[BaseModel]) -> StreamingResponse:
+    """Stream rows (ORM objects or Rows) as `model` NDJSON, one write per batch"""
+    return StreamingResponse(_ndjson_lines(batches, model), media_type=NDJSON, headers={"Vary": "Accept"})
+
+
+def to_columns(rows: list[dict], fields: Sequence[str]) -> dict:
+    return {"count": len(rows), "columns": {field: [row[field] for row in rows] for field in fields}}
+
+
+def negotiated_list(request: Request, items: list, model: type[BaseModel]) -> Response:
+    """Serialise a list of `model` instances (or ORM rows) in the format the client asked for"""
+    adapter = _list_adapter(model)
+    media_type, columnar = preferred_format(request.headers.get("accept", ""))
+    headers = {"Vary": "Accept"}
+
+    if media_type == JSON and not columnar:
+        return Response(adapter.dump_json(items), media_type=JSON, headers=headers)
+    if media_type == NDJSON:
+        item_adapter = _item_adapter(model)
+        body = b"".join(item_adapter.dump_json(model.model_validate(item)) + b"\n" for item in items)
+        return Response(body, media_type=NDJSON, headers=headers)
+
+    rows = adapter.dump_python(items, mode="json")
+    payload = to_columns(rows, list(model.model_fields)) if columnar else rows
+    if media_type == MSGPACK:
+        content_type = MSGPACK + ("; layout=columnar" if columnar else "")
+        return Response(msgpack.packb(payload), media_type=content_type, headers=headers)
+    return Response(_columns_adapter.dump_json(payload), media_type=COLUMNAR_JSON, headers=headers)
@@ -0,0 +1,75 @@
+"""
+Per-route SQL statement budgets, for development and tests.
+
+Each request's statements are counted (database/query_counter.py) and
+reported in an X-Query-Count header. When a request runs more than its
+route's budget, QueryBudgetExceeded is raised once the response is sent,
+listing the statements. TestClient re-raises it, so a test fails as soon as
+a change adds an N+1 query to a route. Enable it with QUERY_BUDGET=1. Pair it
+with ORM_LAZY_LOAD=raise (database/connection.py) so a relationship loaded
+lazily fails at the line that touches it.
+
+Budgets match on the route's path template, e.g. "/transaction/get/{transaction_id}".
+"""
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+from database.query_counter import count_queries
+
+
+@dataclass(frozen=True)
+class RouteBudget:
+    """Budget for requests whose route path starts with `path_prefix` (and method matches, if given)"""
+    path_prefix: str
+    max_queries: int
+    methods: Optional[frozenset] = None
+
+    def matches(self, method: str, path: str) -> bool:
+        return path.startswith(self.path_prefix) and (self.methods is None or method in self.methods)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised after a response whose request ran more statements than its budget"""
+
+    def __init__(self, method: str, path: str, count: int, budget: int, statements: list[str]):
+        listing = "\n".join(f"  {number}. {statement}" for number, statement in enumerate(statements, 1))
+        super().__init__(f"{method} {path} ran {count} SQL statements, budget is {budget}:\n{listing}")
+        self.count = count
+        self.budget = budget
+
+
+class QueryBudgetMiddleware:
+    """ASGI middleware counting each request's SQL statements against its route's budget"""
+
+    def __init__(self, app, default_budget: int = 10, routes: Sequence[RouteBudget] = ()):
+        self.app = app
+        self.default_budget = default_budget
+        self.routes = tuple(routes)
+
+    def budget_for(self, method: str, path: str) -> int:
+        for route in self.routes:
+            if route.matches(method, path):
+                return route.max_queries
+        return self.default_budget
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with count_queries() as counter:
+            async def send_wrapper(message):
+                if message["type"] == "http.response.start":
+                    headers = list(message.get("headers", ()))
+                    headers.append((b"x-query-count", str(counter.count).encode()))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)
+
+        # The router has filled in the matched route by now
+        route = scope.get("route")
+        path = getattr(route, "path", scope["path"])
+        budget = self.budget_for(scope["method"], path)
+        if counter.count > budget:
+            raise QueryBudgetExceeded(scope["method"], path, counter.count, budget, counter.statements)
@@ -0,0 +1,165 @@
+"""
+Token-bucket rate limiting.
+
+Every request takes one token from the client IP's bucket and one from the
+bucket of its identity (the JWT user, or the IP when anonymous) for the
+matching route rule. When either bucket is empty the response is 429 with
+Retry-After. Buckets live in a RateLimitBackend. The in-memory backend keeps
+two floats per key in an LRU capped at max_keys; a shared store (e.g. Redis)
+can implement the same consume() so limits hold across processes.
+"""
+import json
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+from util import verify_token
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """Bucket of `capacity` tokens refilled at `refill_rate` tokens per second"""
+    capacity: float
+    refill_rate: float
+
+    @classmethod
+    def per_minute(cls, requests: int, burst: Optional[int] = None) -> "RateLimit":
+        return cls(capacity=float(burst or requests), refill_rate=requests / 60.0)
+
+
+@dataclass(frozen=True)
+class RouteLimit:
+    """Limit for requests whose path starts with `path_prefix` (and method matches, if given)"""
+    name: str
+    path_prefix: str
+    limit: RateLimit
+    methods: Optional[frozenset] = None
+
+    def matches(self, method: str, path: str) -> bool:
+        return path.startswith(self.path_prefix) and (self.methods is None or method in self.methods)
+
+
+class RateLimitBackend(ABC):
+    """Where bucket state lives"""
+
+    @abstractmethod
+    async def consume(self, key: str, limit: RateLimit, cost: float = 1.0) -> tuple[bool, float]:
+        """Take `cost` tokens from `key`'s bucket; returns (allowed, seconds until allowed)"""
+
+
+class _Bucket:
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, tokens: float, updated: float):
+        self.tokens = tokens
+        self.updated = updated
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """Per-process buckets; least recently used keys are evicted past max_keys"""
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, _Bucket] = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def consume(self, key: str, limit: RateLimit, cost: float = 1.0) -> tuple[bool, float]:
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                # An evicted idle key had refilled to capacity anyway, so nothing is lost
+                bucket = self._buckets[key] = _Bucket(limit.capacity, now)
+                if len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+                bucket.tokens = min(limit.capacity, bucket.tokens + (now - bucket.updated) * limit.refill_rate)
+                bucket.updated = now
+
+            if bucket.tokens >= cost:
+                bucket.tokens -= cost
+                return True, 0.0
+            return False, (cost - bucket.tokens) / limit.refill_rate
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+class RateLimitMiddleware:
+    """ASGI middleware applying per-IP and per-user token buckets"""
+
+    def __init__(
+        self,
+        app,
+        backend: RateLimitBackend,
+        default_limit: RateLimit,
+        ip_limit: RateLimit,
+        routes: Sequence[RouteLimit] = (),
+        exempt_paths: Sequence[str] = ("/docs", "/openapi.json", "/redoc"),
+        trust_forwarded_for: bool = False,
+    ):
+        self.app = app
+        self.backend = backend
+        self.default_limit = default_limit
+        self.ip_limit = ip_limit
+        self.routes = tuple(routes)
+        self.exempt_paths = tuple(exempt_paths)
+        self.trust_forwarded_for = trust_forwarded_for
+
+    def client_ip(self, scope) -> str:
+        if self.trust_forwarded_for:
+            for name, value in scope.get("headers", ()):
+                if name == b"x-forwarded-for":
+                    return value.decode("latin-1").split(",")[0].strip()
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    @staticmethod
+    def user_key(scope) -> Optional[str]:
+        for name, value in scope.get("headers", ()):
+            if name == b"authorization":
+                scheme, _, token = value.decode("latin-1").partition(" ")
+                if scheme.lower() == "bearer" and token:
+                    payload = verify_token(token)
+                    if payload and payload.get("email"):
+                        return f"user:{payload['email']}"
+                return None
+        return None
+
+    def route_limit(self, method: str, path: str) -> tuple[str, RateLimit]:
+        for route in self.routes:
+            if route.matches(method, path):
+                return route.name, route.limit
+        return "default", self.default_limit
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith(self.exempt_paths):
+            await self.app(scope, receive, send)
+            return
+
+        ip = self.client_ip(scope)
+        identity = self.user_key(scope) or f"ip:{ip}"
+        route_name, limit = self.route_limit(scope["method"], scope["path"])
+
+        ip_allowed, ip_wait = await self.backend.consume(f"ip:{ip}", self.ip_limit)
+        allowed, wait = await self.backend.consume(f"{identity}:{route_name}", limit)
+        if ip_allowed and allowed:
+            await self.app(scope, receive, send)
+            return
+
+        body = json.dumps({"detail": "Rate limit exceeded, try again later"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(max(1, math.ceil(max(ip_wait, wait)))).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -1,14 +1,29 @@
 # This file contain routes regarding accounts
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
+from datetime import date, datetime, timedelta
 from pydantic import BaseModel
 from database.session import get_db
-from database.models import Account as DBAccount
+from database.models import Account as DBAccount, SyncEntity
 
 # Updated imports to use new model structure
-from Models.accounts import AccountResponse, AccountCreateRequest, AccountUpdateRequest
+from Models.accounts import (
+    AccountResponse, AccountCreateRequest, AccountUpdateRequest,
+    AccountBalanceAsOfResponse, AccountBalanceHistoryResponse,
+    NetWorthResponse, NetWorthHistoryResponse
+)
 from auth.permissions import require_auth, get_current_user
+from services.balance_history import BalanceChange, apply_balance_changes, balance_as_of, balance_history
+from services.fx import FxRateMissing, reporting_currency
+from services.net_worth import invalidate_net_worth, net_worth, net_worth_history
+from services.events import publish, make_event
+from services.sync import record_changes, upserted, deleted
+from services.idempotency import IdempotencyContext, idempotency
+from services.deletion import request_account_delete
+from Models.jobs import JobEnqueuedResponse
+from middleware.negotiation import negotiated_list
+from Models.fieldsets import parse_fields, subset_model, columns_for
 
 
 router = APIRouter(
@@ -18,7 +33,7 @@ router = APIRouter(
 )
 
 @router.post('/create')
-async def create_account(req_account : AccountCreateRequest,db: Session = Depends(get_db),current_user = Depends(get_current_user)):
+async def create_account(req_account : AccountCreateRequest,db: Session = Depends(get_db),current_user = Depends(get_current_user), idem: IdempotencyContext = Depends(idempotency)):
     # create account
     # step 1 check account already exist.
     # step 2 create account
@@ -43,24 +58,99 @@ async def create_account(req_account : AccountCreateRequest,db: Session = Depend
        
     )
     db.add(new_account)
+    db.flush()
+    record_changes(db, upserted(current_user.id, SyncEntity.ACCOUNT, new_account.id))
+    response = AccountResponse.model_validate(new_account)
+    idem.save(db, response.model_dump(mode="json"))
     db.commit()
-    db.refresh(new_account)
+    invalidate_net_worth(current_user.id)
 
-    return AccountResponse.model_validate(new_account)
+    await publish(current_user.id, [make_event("account.created", response.model_dump(mode="json"))])
+    return response
 
 @router.get('/get_all', response_model=List[AccountResponse])
-async def get_all_accounts(db: Session = Depends(get_db), current_user = Depends(get_current_user)):
-    accounts = db.query(DBAccount).filter(DBAccount.user_id == current_user.id).all()
+async def get_all_accounts(
+    request: Request,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,account_name,balance"),
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    try:
+        field_set = parse_fields(fields, AccountResponse)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    response_model = subset_model(AccountResponse, field_set) if field_set else AccountResponse
+
+    query = db.query(*columns_for(DBAccount, field_set)) if field_set else db.query(DBAccount)
+    accounts = query.filter(DBAccount.user_id == current_user.id, DBAccount.pending_delete == False).all()
     if not accounts:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No accounts found"
         )
-    return [AccountResponse.model_validate(account) for account in accounts]
+    return negotiated_list(request, [response_model.model_validate(account) for account in accounts], response_model)
+
+@router.get('/net-worth', response_model=NetWorthResponse)
+async def get_net_worth(
+    currency: Optional[str] = Query(None, pattern="^[A-Za-z]{3}$", description="Reporting currency, defaults to the user's"),
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """Assets minus liabilities across all of the user's accounts, in one aggregate query"""
+    try:
+        return NetWorthResponse(**net_worth(db, current_user.id, reporting_currency(current_user, currency)))
+    except FxRateMissing as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e)
+        )
+
+@router.get('/net-worth/history', response_model=NetWorthHistoryResponse)
+async def get_net_worth_history(
+    start_date: Optional[date] = Query(None, description="Defaults to 90 days before end_date"),
+    end_date: Optional[date] = Query(None, description="Defaults to today"),
+    currency: Optional[str] = Query(None, pattern="^[A-Za-z]{3}$", description="Reporting currency, defaults to the user's"),
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """Daily net worth for charting, read from the balance snapshots"""
+    end_date = end_date or date.today()
+    start_date = start_date or end_date - timedelta(days=89)
+    if start_date > end_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start_date must be before end_date"
+        )
+    if (end_date - start_date).days > 366 * 10:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Date range is limited to 10 years"
+        )
+
+    try:
+        history = net_worth_history(db, current_user.id, start_date, end_date, reporting_currency(current_user, currency))
+    except FxRateMissing as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e)
+        )
+    return NetWorthHistoryResponse(**history)
+
+def record_balance_edit(account: DBAccount, old_balance: float, db: Session):
+    """A balance edited by hand counts as an adjustment dated today in the snapshots"""
+    if account.balance != old_balance:
+        apply_balance_changes(
+            db,
+            [BalanceChange(account.id, date.today(), account.balance - old_balance)],
+            {account.id: account.balance}
+        )
 
 @router.get('/get/{account_id}', response_model=AccountResponse)
 async def get_account(account_id: int, db: Session = Depends(get_db), current_user = Depends(get_current_user)):
-    account = db.query(DBAccount).filter(DBAccount.id == account_id, DBAccount.user_id == current_user.id).first()
+    account = db.query(DBAccount).filter(DBAccount.id == account_id, DBAccount.user_id == current_user.id, DBAccount.pending_delete == False).first()
     if not account:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -68,8 +158,8 @@ async def get_account(account_id: int, db: Session = Depends(get_db), current_us
         )
     return AccountResponse.model_validate(account)
 @router.put('/update/{account_id}', response_model=AccountResponse)
-async def update_account(account_id: int, req_account: AccountCreateRequest, db: Session = Depends(get_db), current_user = Depends(get_current_user)):
-    account = db.query(DBAccount).filter(DBAccount.id == account_id, DBAccount.user_id == current_user.id).first()
+async def update_account(account_id: int, req_account: AccountCreateRequest, db: Session = Depends(get_db), current_user = Depends(get_current_user), idem: IdempotencyContext = Depends(idempotency)):
+    account = db.query(DBAccount).filter(DBAccount.id == account_id, DBAccount.user_id == current_user.id, DBAccount.pending_delete == False).first()
     if not account:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -77,39 +167,55 @@ async def update_account(account_id: int, req_account: AccountCreateRequest, db:
         )
     
     # Update fields
+    old_balance = account.balance
     account.account_name = req_account.account_name
     account.description = req_account.description
     account.balance = req_account.balance
     account.account_type = req_account.account_type
     account.currency = req_account.currency
+    record_balance_edit(account, old_balance, db)
+    record_changes(db, upserted(current_user.id, SyncEntity.ACCOUNT, account.id))
+    db.flush()
+    response = AccountResponse.model_validate(account)
+    idem.save(db, response.model_dump(mode="json"))
     
     db.commit()
-    db.refresh(account)
+    invalidate_net_worth(current_user.id)
     
-    return AccountResponse.model_validate(account)
+    await publish(current_user.id, [make_event("account.updated", response.model_dump(mode="json"))])
+    return response
 
-@router.delete('/delete/{account_id}', status_code=status.HTTP_204_NO_CONTENT)
-async def delete_account(account_id: int, db: Session = Depends(get_db), current_user = Depends(get_current_user)):
-    account = db.query(DBAccount).filter(DBAccount.id == account_id, DBAccount.user_id == current_user.id).first()
+@router.delete('/delete/{account_id}', response_model=JobEnqueuedResponse, status_code=status.HTTP_202_ACCEPTED)
+async def delete_account(account_id: int, db: Session = Depends(get_db), current_user = Depends(get_current_user), idem: IdempotencyContext = Depends(idempotency)):
+    """
+    Hide the account now and delete it with its transactions in the background (poll /jobs/{job_id})
+    """
+    account = db.query(DBAccount).filter(DBAccount.id == account_id, DBAccount.user_id == current_user.id, DBAccount.pending_delete == False).first()
     if not account:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Account not found"
         )
     
-    db.delete(account)
+    job = request_account_delete(db, account, requested_by=current_user.id)
+    record_changes(db, deleted(current_user.id, SyncEntity.ACCOUNT, account_id))
+    response = JobEnqueuedResponse(job_id=job.id, status=job.status, detail="Account deletion queued")
+    idem.save(db, response.model_dump(mode="json"), status_code=status.HTTP_202_ACCEPTED)
     db.commit()
+    invalidate_net_worth(current_user.id)
+    await publish(current_user.id, [make_event("account.deleted", {"id": account_id})])
     
-    return {"detail": "Account deleted successfully"}
+    return response
 
 @router.patch('/update/{account_id}', response_model=AccountResponse)  # ✅ PATCH for partial updates
 async def update_account(
     account_id: int, 
     req_account: AccountUpdateRequest,
     db: Session = Depends(get_db), 
-    current_user = Depends(get_current_user)
+    current_user = Depends(get_current_user),
+    idem: IdempotencyContext = Depends(idempotency)
 ):
-    account = db.query(DBAccount).filter(DBAccount.id == account_id, DBAccount.user_id == current_user.id).first()
+    account = db.query(DBAccount).filter(DBAccount.id == account_id, DBAccount.user_id == current_user.id, DBAccount.pending_delete == False).first()
     if not account:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -117,11 +223,80 @@ async def update_account(
         )
     
     # ✅ Smart way: only update provided fields
+    old_balance = account.balance
     update_data = req_account.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(account, field, value)
+    record_balance_edit(account, old_balance, db)
+    record_changes(db, upserted(current_user.id, SyncEntity.ACCOUNT, account.id))
+    db.flush()
+    response = AccountResponse.model_validate(account)
+    idem.save(db, response.model_dump(mode="json"))
     
     db.commit()
-    db.refresh(account)
+    invalidate_net_worth(current_user.id)
     
-    return AccountResponse.model_validate(account)
\ No newline at end of file
+    await publish(current_user.id, [make_event("account.updated", response.model_dump(mode="json"))])
+    return response
+
+@router.get('/{account_id}/balance/as-of', response_model=AccountBalanceAsOfResponse)
+async def get_balance_as_of(
+    account_id: int,
+    at: datetime = Query(..., description="Point in time to report the balance for"),
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """Balance at a point in time: nearest daily snapshot plus that day's transactions"""
+    account = db.query(DBAccount).filter(DBAccount.id == account_id, DBAccount.user_id == current_user.id, DBAccount.pending_delete == False).first()
+    if not account:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Account not found"
+        )
+
+    return AccountBalanceAsOfResponse(
+        account_id=account.id,
+        account_name=account.account_name,
+        as_of=at,
+        balance=round(balance_as_of(db, account, at), 2),
+        currency=account.currency
+    )
+
+@router.get('/{account_id}/balance/history', response_model=AccountBalanceHistoryResponse)
+async def get_balance_history(
+    account_id: int,
+    start_date: Optional[date] = Query(None, description="Defaults to 90 days before end_date"),
+    end_date: Optional[date] = Query(None, description="Defaults to today"),
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """Daily closing balances for charting, read from the snapshot table"""
+    account = db.query(DBAccount).filter(DBAccount.id == account_id, DBAccount.user_id == current_user.id, DBAccount.pending_delete == False).first()
+    if not account:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Account not found"
+        )
+
+    end_date = end_date or date.today()
+    start_date = start_date or end_date - timedelta(days=89)
+    if start_date > end_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start_date must be before end_date"
+        )
+    if (end_date - start_date).days > 366 * 10:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Date range is limited to 10 years"
+        )
+
+    history = balance_history(db, account, start_date, end_date)
+    return AccountBalanceHistoryResponse(
+        account_id=account.id,
+        account_name=account.account_name,
+        currency=account.currency,
+        start_date=start_date,
+        end_date=end_date,
+        **history
+    )
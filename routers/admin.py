@@ -1,16 +1,38 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
+from datetime import date, datetime
 from pydantic import BaseModel
+from sqlalchemy import func
 
 # Updated imports to use new model structure
-from Models.accounts import AccountResponse
+from Models.accounts import AccountResponse, AdminNetWorthResponse
 from Models.users import UserResponse
+from Models.fx import FxRateUploadRequest, FxRateLoadResponse
+from Models.investments import PriceUploadRequest, PriceLoadResponse
+from Models.analytics import (
+    SignupMonth, AdminSignupsResponse, TransactionVolumeRow, AdminTransactionVolumeResponse,
+    BalanceTotalRow, AdminBalanceTotalsResponse,
+)
 from database.session import get_db
 from database.models import User as DBUser
 from database.models import Account as DBAccount
 from database.models.user import Role
+from database.models.account import AccountType
+from database.models.transaction import TransactionType
+from database.models.admin_rollup import UserSignupRollup, TransactionVolumeRollup, BalanceRollup
 from auth.permissions import require_admin
+from services.fx import FX_PIVOT_CURRENCY, FxRateMissing, fx_cache, upsert_fx_rates
+from services.net_worth import invalidate_net_worth, net_worth_all_users
+from services.investments import normalise_symbol, upsert_prices
+from middleware.negotiation import negotiated_list, ndjson_stream, wants_ndjson
+from Models.fieldsets import parse_fields, subset_model, columns_for
+from services.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, add_next_link, iter_batches, keyset_page
+from services.rollups import refreshed_through
+from services.deletion import request_user_delete
+from services.category_cache import invalidate_user_categories, user_category_cache
+from Models.categories import CategoryCacheStatsResponse
+from Models.jobs import JobEnqueuedResponse
 
 router = APIRouter(
     prefix="/admin",
@@ -21,16 +43,41 @@ router = APIRouter(
 class RoleUpdate(BaseModel):
     role: Role
 
+# Keyset pagination: pass the previous page's last id (or follow the Link header)
+AFTER_ID_QUERY = Query(None, ge=0, description="Return rows with an id greater than this (from the Link header)")
+LIMIT_QUERY = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Rows per page")
+
 @router.get("/users", response_model=List[UserResponse])
 async def list_all_users(
+    request: Request,
+    role: Optional[Role] = Query(None, description="Only users with this role"),
+    created_from: Optional[datetime] = Query(None, description="Only users created at or after this"),
+    created_to: Optional[datetime] = Query(None, description="Only users created at or before this"),
+    after_id: Optional[int] = AFTER_ID_QUERY,
+    limit: int = LIMIT_QUERY,
     current_user: UserResponse = Depends(require_admin),
     db: Session = Depends(get_db)
 ):
     """
-    List all users in the system (admin only)
+    List users in id order, one page at a time (admin only); the Link header points at the next page.
+    Send Accept: application/x-ndjson to stream every matching user, one JSON object per line.
     """
-    users = db.query(DBUser).all()
-    return [UserResponse.model_validate(user) for user in users]
+    def users_query(session: Session):
+        query = session.query(*columns_for(DBUser, tuple(UserResponse.model_fields)))
+        if role:
+            query = query.filter(DBUser.role == role)
+        if created_from:
+            query = query.filter(DBUser.created_at >= created_from)
+        if created_to:
+            query = query.filter(DBUser.created_at <= created_to)
+        return query
+
+    if wants_ndjson(request):
+        return ndjson_stream(iter_batches(users_query, DBUser.id, after_id), UserResponse)
+
+    users, next_after_id = keyset_page(users_query(db), DBUser.id, after_id, limit)
+    response = negotiated_list(request, [UserResponse.model_validate(user) for user in users], UserResponse)
+    return add_next_link(response, request, next_after_id)
 
 @router.put("/users/{user_id}/role", response_model=UserResponse)
 async def update_user_role(
@@ -57,39 +104,79 @@ async def update_user_role(
     
     return UserResponse.model_validate(user)
 
-@router.delete("/users/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete("/users/{user_id}", response_model=JobEnqueuedResponse, status_code=status.HTTP_202_ACCEPTED)
 async def delete_user(
     user_id: int,
     current_user: UserResponse = Depends(require_admin),
     db: Session = Depends(get_db)
 ):
     """
-    Delete a user (admin only)
+    Delete a user (admin only): they are locked out now and their data is deleted in the background
     """
     # Find the user to delete
-    user = db.query(DBUser).filter(DBUser.id == user_id).first()
+    user = db.query(DBUser).filter(DBUser.id == user_id, DBUser.pending_delete == False).first()
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
     
-    # Delete the user
-    db.delete(user)
+    # Mark the user and queue the batched delete
+    job = request_user_delete(db, user, requested_by=current_user.id)
     db.commit()
+    invalidate_net_worth(user_id)
+    invalidate_user_categories(user_id)
     
-    return {"detail": "User deleted successfully"}
+    return JobEnqueuedResponse(job_id=job.id, status=job.status, detail="User deletion queued")
 
 # Admin can see all accounts from all users
 @router.get('/accounts', response_model=List[AccountResponse])
-async def get_all_accounts_admin(db: Session = Depends(get_db), current_user = Depends(require_admin)):
-    accounts = db.query(DBAccount).all()
-    if not accounts:
+async def get_all_accounts_admin(
+    request: Request,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,user_id,balance"),
+    account_type: Optional[AccountType] = Query(None, description="Only accounts of this type"),
+    min_balance: Optional[float] = Query(None, description="Only accounts with at least this balance"),
+    max_balance: Optional[float] = Query(None, description="Only accounts with at most this balance"),
+    after_id: Optional[int] = AFTER_ID_QUERY,
+    limit: int = LIMIT_QUERY,
+    db: Session = Depends(get_db),
+    current_user = Depends(require_admin)
+):
+    """
+    Accounts in id order, one page at a time; the Link header points at the next page.
+    Supports MessagePack and columnar JSON through the Accept header, and
+    application/x-ndjson to stream every matching account.
+    """
+    try:
+        field_set = parse_fields(fields, AccountResponse)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    response_model = subset_model(AccountResponse, field_set) if field_set else AccountResponse
+
+    def accounts_query(session: Session):
+        query = session.query(*columns_for(DBAccount, field_set or tuple(AccountResponse.model_fields)))
+        if account_type:
+            query = query.filter(DBAccount.account_type == account_type)
+        if min_balance is not None:
+            query = query.filter(DBAccount.balance >= min_balance)
+        if max_balance is not None:
+            query = query.filter(DBAccount.balance <= max_balance)
+        return query
+
+    if wants_ndjson(request):
+        return ndjson_stream(iter_batches(accounts_query, DBAccount.id, after_id), response_model)
+
+    accounts, next_after_id = keyset_page(accounts_query(db), DBAccount.id, after_id, limit)
+    if not accounts and after_id is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No accounts found"
         )
-    return [AccountResponse.model_validate(account) for account in accounts]
+    response = negotiated_list(request, [response_model.model_validate(account) for account in accounts], response_model)
+    return add_next_link(response, request, next_after_id)
 
 @router.get('/accounts/{user_id}', response_model=List[AccountResponse])
 async def get_account_admin(user_id: int, db: Session = Depends(get_db), current_user = Depends(require_admin)):
@@ -112,4 +199,131 @@ async def get_account_admin(user_id: int, db: Session = Depends(get_db), current
             detail="No accounts found for this user"
         )
     
-    return [AccountResponse.model_validate(account) for account in accounts]
\ No newline at end of file
+    return [AccountResponse.model_validate(account) for account in accounts]
+
+@router.post('/fx-rates', response_model=FxRateLoadResponse)
+async def load_fx_rates_admin(req: FxRateUploadRequest, db: Session = Depends(get_db), current_user = Depends(require_admin)):
+    """
+    Insert or replace daily FX rates (units per one USD); the rate cache reloads on next use
+    """
+    loaded = upsert_fx_rates(db, [
+        {"currency": item.currency.upper(), "day": item.date, "rate": item.rate}
+        for item in req.rates
+    ])
+    return FxRateLoadResponse(loaded=loaded, currencies=fx_cache.currencies())
+
+@router.post('/prices', response_model=PriceLoadResponse)
+async def load_prices_admin(req: PriceUploadRequest, db: Session = Depends(get_db), current_user = Depends(require_admin)):
+    """
+    Insert or replace security closing prices; portfolios revalue from the next request
+    """
+    rows = [
+        {"symbol": normalise_symbol(item.symbol), "day": item.date, "close": item.close, "currency": item.currency.upper()}
+        for item in req.prices
+    ]
+    loaded = upsert_prices(db, rows)
+    return PriceLoadResponse(loaded=loaded, symbols=len({row["symbol"] for row in rows}))
+
+@router.get('/net-worth', response_model=AdminNetWorthResponse)
+async def get_net_worth_admin(
+    currency: Optional[str] = Query(None, pattern="^[A-Za-z]{3}$", description="Reporting currency, defaults to USD"),
+    db: Session = Depends(get_db),
+    current_user = Depends(require_admin)
+):
+    """
+    Net worth summed over every user's accounts, aggregated in chunked passes
+    """
+    try:
+        return AdminNetWorthResponse(**net_worth_all_users(db, (currency or FX_PIVOT_CURRENCY).upper()))
+    except FxRateMissing as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e)
+        )
+
+# System-wide analytics, read from the rollup tables only (refreshed by the
+# analytics.refresh_rollups job), never from live transactions or accounts
+@router.get('/analytics/users-by-month', response_model=AdminSignupsResponse)
+async def get_signups_by_month_admin(
+    start_month: Optional[date] = Query(None, description="First month to include"),
+    end_month: Optional[date] = Query(None, description="Last month to include"),
+    db: Session = Depends(get_db),
+    current_user = Depends(require_admin)
+):
+    """
+    New users per calendar month
+    """
+    query = db.query(UserSignupRollup)
+    if start_month:
+        query = query.filter(UserSignupRollup.month >= start_month.replace(day=1))
+    if end_month:
+        query = query.filter(UserSignupRollup.month <= end_month)
+    months = [SignupMonth(month=row.month, user_count=row.user_count) for row in query.order_by(UserSignupRollup.month)]
+    return AdminSignupsResponse(
+        refreshed_through=refreshed_through(db),
+        total_users=sum(month.user_count for month in months),
+        months=months
+    )
+
+@router.get('/analytics/transaction-volume', response_model=AdminTransactionVolumeResponse)
+async def get_transaction_volume_admin(
+    start_month: Optional[date] = Query(None, description="First month to include"),
+    end_month: Optional[date] = Query(None, description="Last month to include"),
+    transaction_type: Optional[TransactionType] = Query(None, description="Only this transaction type"),
+    db: Session = Depends(get_db),
+    current_user = Depends(require_admin)
+):
+    """
+    Transaction count and total per month, type and account currency, across all users
+    """
+    query = db.query(
+        TransactionVolumeRollup.month,
+        TransactionVolumeRollup.transaction_type,
+        TransactionVolumeRollup.currency,
+        func.sum(TransactionVolumeRollup.transaction_count).label("transaction_count"),
+        func.sum(TransactionVolumeRollup.total_amount).label("total_amount")
+    )
+    if start_month:
+        query = query.filter(TransactionVolumeRollup.month >= start_month.replace(day=1))
+    if end_month:
+        query = query.filter(TransactionVolumeRollup.month <= end_month)
+    if transaction_type:
+        query = query.filter(TransactionVolumeRollup.transaction_type == transaction_type)
+    group = (TransactionVolumeRollup.month, TransactionVolumeRollup.transaction_type, TransactionVolumeRollup.currency)
+    rows = query.group_by(*group).order_by(*group).all()
+    return AdminTransactionVolumeResponse(
+        refreshed_through=refreshed_through(db),
+        rows=[TransactionVolumeRow.model_validate(row._asdict()) for row in rows]
+    )
+
+@router.get('/analytics/balances', response_model=AdminBalanceTotalsResponse)
+async def get_balance_totals_admin(
+    account_type: Optional[AccountType] = Query(None, description="Only this account type"),
+    db: Session = Depends(get_db),
+    current_user = Depends(require_admin)
+):
+    """
+    Account balances summed per account type and currency, across all users
+    """
+    query = db.query(
+        BalanceRollup.account_type,
+        BalanceRollup.currency,
+        func.count(BalanceRollup.user_id).label("user_count"),
+        func.sum(BalanceRollup.account_count).label("account_count"),
+        func.sum(BalanceRollup.total_balance).label("total_balance")
+    )
+    if account_type:
+        query = query.filter(BalanceRollup.account_type == account_type)
+    group = (BalanceRollup.account_type, BalanceRollup.currency)
+    rows = query.group_by(*group).order_by(*group).all()
+    return AdminBalanceTotalsResponse(
+        refreshed_through=refreshed_through(db),
+        rows=[BalanceTotalRow.model_validate(row._asdict()) for row in rows]
+    )
+
+@router.get('/cache/categories', response_model=CategoryCacheStatsResponse)
+async def get_category_cache_stats_admin(current_user = Depends(require_admin)):
+    """
+    Size and hit/miss statistics of this process's /categories/my cache
+    """
+    return CategoryCacheStatsResponse(**user_category_cache.stats())
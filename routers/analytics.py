@@ -0,0 +1,121 @@
+# This file contain routes for cash-flow analytics
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.orm import Session
+from typing import Optional
+from datetime import date, timedelta
+from database.session import get_db
+from database.models import Category as DBCategory
+
+from Models.analytics import CashFlowSeriesResponse, CategoryMixResponse, CategoryMixSeries, DashboardResponse
+from auth.permissions import require_auth, get_current_user
+from services.analytics import load_cash_flow, cash_flow_series, category_mix
+from services.fx import FxRateMissing, reporting_currency
+
+
+router = APIRouter(
+    prefix='/analytics',
+    tags=['Analytics'],
+    dependencies=[Depends(require_auth)]
+)
+
+GRANULARITY_PATTERN = "^(day|week|month)$"
+MAX_RANGE_DAYS = 366 * 10
+CURRENCY_PATTERN = "^[A-Za-z]{3}$"
+
+def resolve_range(start_date: Optional[date], end_date: Optional[date], default_days: int = 365):
+    end_date = end_date or date.today()
+    start_date = start_date or end_date - timedelta(days=default_days - 1)
+    if start_date > end_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start_date must be before end_date"
+        )
+    if (end_date - start_date).days > MAX_RANGE_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Date range is limited to 10 years"
+        )
+    return start_date, end_date
+
+def load_frame(db: Session, current_user, start_date: date, end_date: date, currency: Optional[str]):
+    """Load the user's cash flow converted into the reporting currency"""
+    try:
+        return load_cash_flow(db, current_user.id, start_date, end_date, reporting_currency(current_user, currency))
+    except FxRateMissing as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e)
+        )
+
+def build_category_mix(mix: dict, db: Session) -> CategoryMixResponse:
+    """Attach category names (one query) to the computed mix"""
+    names = {}
+    if mix["category_ids"]:
+        names = dict(db.query(DBCategory.id, DBCategory.name).filter(DBCategory.id.in_(mix["category_ids"])).all())
+    return CategoryMixResponse(
+        granularity=mix["granularity"],
+        currency=mix["currency"],
+        buckets=mix["buckets"],
+        categories=[
+            CategoryMixSeries(
+                category_id=category_id,
+                category_name=names.get(category_id),
+                total=total,
+                share=share,
+                series=series
+            )
+            for category_id, total, share, series in zip(mix["category_ids"], mix["totals"], mix["shares"], mix["series"])
+        ]
+    )
+
+@router.get('/cash-flow', response_model=CashFlowSeriesResponse)
+async def get_cash_flow(
+    granularity: str = Query("month", pattern=GRANULARITY_PATTERN, description="day, week or month"),
+    start_date: Optional[date] = Query(None, description="Defaults to one year before end_date"),
+    end_date: Optional[date] = Query(None, description="Defaults to today"),
+    window: int = Query(3, ge=1, le=90, description="Buckets in the rolling average"),
+    currency: Optional[str] = Query(None, pattern=CURRENCY_PATTERN, description="Reporting currency, defaults to the user's"),
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """Inflow, outflow, net, savings rate and rolling averages per bucket"""
+    start_date, end_date = resolve_range(start_date, end_date)
+    frame = load_frame(db, current_user, start_date, end_date, currency)
+    return CashFlowSeriesResponse(**cash_flow_series(frame, granularity, window))
+
+@router.get('/category-mix', response_model=CategoryMixResponse)
+async def get_category_mix(
+    granularity: str = Query("month", pattern=GRANULARITY_PATTERN, description="day, week or month"),
+    start_date: Optional[date] = Query(None, description="Defaults to one year before end_date"),
+    end_date: Optional[date] = Query(None, description="Defaults to today"),
+    currency: Optional[str] = Query(None, pattern=CURRENCY_PATTERN, description="Reporting currency, defaults to the user's"),
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """Expense totals per category over time"""
+    start_date, end_date = resolve_range(start_date, end_date)
+    frame = load_frame(db, current_user, start_date, end_date, currency)
+    return build_category_mix(category_mix(frame, granularity), db)
+
+@router.get('/dashboard', response_model=DashboardResponse)
+async def get_dashboard(
+    start_date: Optional[date] = Query(None, description="Defaults to one year before end_date"),
+    end_date: Optional[date] = Query(None, description="Defaults to today"),
+    window: int = Query(3, ge=1, le=90, description="Buckets in the rolling averages"),
+    currency: Optional[str] = Query(None, pattern=CURRENCY_PATTERN, description="Reporting currency, defaults to the user's"),
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """Daily, weekly and monthly series plus the monthly category mix from a single load"""
+    start_date, end_date = resolve_range(start_date, end_date)
+    frame = load_frame(db, current_user, start_date, end_date, currency)
+    return DashboardResponse(
+        start_date=start_date,
+        end_date=end_date,
+        currency=frame.currency,
+        transaction_count=len(frame),
+        daily=CashFlowSeriesResponse(**cash_flow_series(frame, "day", window)),
+        weekly=CashFlowSeriesResponse(**cash_flow_series(frame, "week", window)),
+        monthly=CashFlowSeriesResponse(**cash_flow_series(frame, "month", window)),
+        category_mix=build_category_mix(category_mix(frame, "month"), db)
+    )
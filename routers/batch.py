@@ -0,0 +1,129 @@
+# This file contain the batch route that runs several API calls in one round trip
+import asyncio
+import json
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy.orm import Session
+from starlette.routing import Match
+from database.session import get_db
+
+from Models.batch import BatchRequest, BatchSubRequest, BatchResponse, BatchSubResponse
+from auth.permissions import require_auth, get_current_user
+
+
+router = APIRouter(
+    prefix='/batch',
+    tags=['Batch'],
+    dependencies=[Depends(require_auth)]
+)
+
+# Outer request headers passed through to sub-requests
+FORWARDED_HEADERS = (b"authorization", b"user-agent", b"x-forwarded-for")
+
+# Routes that stream until the client goes away; as a sub-request one would never
+# finish, and the batch would hold its session and pooled connection the whole time
+STREAMING_ROUTE_PREFIXES = ("/events",)
+
+def sub_request_scope(request: Request, sub: BatchSubRequest, state: dict) -> dict:
+    path, _, query = sub.path.partition("?")
+    headers = [(name, value) for name, value in request.scope["headers"] if name in FORWARDED_HEADERS]
+    headers.append((b"accept", b"application/json"))   # plain JSON, uncompressed
+    return {
+        **{key: request.scope[key] for key in ("asgi", "http_version", "scheme", "server", "client", "root_path") if key in request.scope},
+        "type": "http",
+        "method": sub.method,
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "headers": headers,
+        "state": state,
+    }
+
+def matching_route(app, scope: dict):
+    """The route that will serve `scope`, or None for a 404/405"""
+    for route in app.router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route
+    return None
+
+def is_streaming(app, scope: dict) -> bool:
+    """True when the sub-request's path, or the route it matches, is under a streaming prefix"""
+    route = matching_route(app, scope)
+    paths = [scope["path"]] + ([route.path] if route is not None else [])
+    return any(path == prefix or path.startswith(prefix + "/") for path in paths for prefix in STREAMING_ROUTE_PREFIXES)
+
+def runs_on_event_loop(app, scope: dict) -> bool:
+    """
+    True when the matching endpoint is a coroutine. Those run on the event loop
+    thread, so they never touch the shared session at the same time.
+    """
+    route = matching_route(app, scope)
+    if route is None:
+        return True   # 404/405 responses do no database work
+    return asyncio.iscoroutinefunction(getattr(route, "endpoint", None))
+
+async def dispatch(app, scope: dict, sub: BatchSubRequest) -> BatchSubResponse:
+    """Run one sub-request through the full ASGI app and capture its response"""
+    response = {"status": 500, "headers": {}, "body": []}
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+            response["headers"] = {name.lower(): value for name, value in message.get("headers", ())}
+        elif message["type"] == "http.response.body":
+            response["body"].append(message.get("body", b""))
+
+    try:
+        await app(scope, receive, send)
+    except Exception:
+        # The error middleware has already sent a 500; keep the other results
+        response["status"] = 500
+
+    raw = b"".join(response["body"])
+    body = None
+    if raw:
+        if response["headers"].get(b"content-type", b"").startswith(b"application/json"):
+            body = json.loads(raw)
+        else:
+            body = raw.decode("utf-8", errors="replace")
+    return BatchSubResponse(id=sub.id, path=sub.path, status=response["status"], body=body)
+
+@router.post('', response_model=BatchResponse)
+async def run_batch(
+    req: BatchRequest,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    Run up to 20 GET sub-requests with this request's user and database session.
+    Results come back in request order, each with its own status and body.
+    Streaming routes (/events/*) can't be batched.
+    """
+    state = {**request.scope.get("state", {}), "batch_db": db, "batch_user": current_user}
+    scopes = [sub_request_scope(request, sub, state) for sub in req.requests]
+    app = request.app
+
+    streaming = [sub.path for sub, scope in zip(req.requests, scopes) if is_streaming(app, scope)]
+    if streaming:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Streaming routes cannot be batched: {', '.join(streaming)}"
+        )
+
+    results = [None] * len(scopes)
+    concurrent = [i for i, scope in enumerate(scopes) if runs_on_event_loop(app, scope)]
+    gathered = await asyncio.gather(*(dispatch(app, scopes[i], req.requests[i]) for i in concurrent))
+    for i, result in zip(concurrent, gathered):
+        results[i] = result
+
+    # Endpoints that would run in the threadpool go one at a time on the shared session
+    for i, scope in enumerate(scopes):
+        if results[i] is None:
+            results[i] = await dispatch(app, scope, req.requests[i])
+
+    return BatchResponse(responses=results)
@@ -0,0 +1,125 @@
+# This file contain routes regarding budgets
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+from typing import List
+from database.session import get_db
+from database.models import Budget as DBBudget, Category as DBCategory
+
+from Models.budgets import BudgetCreateRequest, BudgetUpdateRequest, BudgetResponse, BudgetStatusResponse
+from Models.jobs import JobEnqueuedResponse
+from auth.permissions import require_auth, get_current_user
+from services.budgets import budget_status, rebuild_budget_spend
+from services.jobs import enqueue
+
+
+router = APIRouter(
+    prefix='/budgets',
+    tags=['Budgets'],
+    dependencies=[Depends(require_auth)]
+)
+
+def get_user_budget(budget_id: int, db: Session, current_user) -> DBBudget:
+    budget = db.query(DBBudget).filter(
+        DBBudget.id == budget_id,
+        DBBudget.user_id == current_user.id
+    ).first()
+    if not budget:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Budget not found"
+        )
+    return budget
+
+def check_category(category_id: int, db: Session):
+    category = db.query(DBCategory).filter(DBCategory.id == category_id).first()
+    if not category:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Category not found"
+        )
+
+@router.post('/create', response_model=BudgetResponse)
+async def create_budget(req_budget: BudgetCreateRequest, db: Session = Depends(get_db), current_user = Depends(get_current_user)):
+    """Create a budget and seed its spend counters from existing transactions"""
+    check_category(req_budget.category_id, db)
+
+    new_budget = DBBudget(
+        name=req_budget.name,
+        amount=req_budget.amount,
+        period=req_budget.period,
+        category_id=req_budget.category_id,
+        user_id=current_user.id
+    )
+    db.add(new_budget)
+    db.flush()
+
+    # One scoped aggregate so spending before the budget existed is counted
+    rebuild_budget_spend(db, budget_ids=[new_budget.id])
+    db.commit()
+    db.refresh(new_budget)
+
+    return BudgetResponse.model_validate(new_budget)
+
+@router.get('/get_all', response_model=List[BudgetResponse])
+async def get_all_budgets(db: Session = Depends(get_db), current_user = Depends(get_current_user)):
+    budgets = db.query(DBBudget).filter(DBBudget.user_id == current_user.id).all()
+    return [BudgetResponse.model_validate(budget) for budget in budgets]
+
+@router.get('/status', response_model=List[BudgetStatusResponse])
+async def get_all_budget_status(db: Session = Depends(get_db), current_user = Depends(get_current_user)):
+    """Current-period status for every active budget"""
+    budgets = db.query(DBBudget).filter(
+        DBBudget.user_id == current_user.id,
+        DBBudget.is_active == True
+    ).all()
+    return [BudgetStatusResponse(**budget_status(db, budget)) for budget in budgets]
+
+@router.get('/{budget_id}/status', response_model=BudgetStatusResponse)
+async def get_budget_status(budget_id: int, db: Session = Depends(get_db), current_user = Depends(get_current_user)):
+    """Current-period status read from the budget's spend counter"""
+    budget = get_user_budget(budget_id, db, current_user)
+    return BudgetStatusResponse(**budget_status(db, budget))
+
+@router.get('/get/{budget_id}', response_model=BudgetResponse)
+async def get_budget(budget_id: int, db: Session = Depends(get_db), current_user = Depends(get_current_user)):
+    budget = get_user_budget(budget_id, db, current_user)
+    return BudgetResponse.model_validate(budget)
+
+@router.patch('/update/{budget_id}', response_model=BudgetResponse)
+async def update_budget(
+    budget_id: int,
+    req_budget: BudgetUpdateRequest,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    budget = get_user_budget(budget_id, db, current_user)
+
+    update_data = req_budget.model_dump(exclude_unset=True)
+    if 'category_id' in update_data:
+        check_category(update_data['category_id'], db)
+
+    for field, value in update_data.items():
+        setattr(budget, field, value)
+
+    # Counters are keyed by category and period, so those changes need a rebuild
+    if 'category_id' in update_data or 'period' in update_data:
+        db.flush()
+        rebuild_budget_spend(db, budget_ids=[budget.id])
+
+    db.commit()
+    db.refresh(budget)
+
+    return BudgetResponse.model_validate(budget)
+
+@router.delete('/delete/{budget_id}', status_code=status.HTTP_204_NO_CONTENT)
+async def delete_budget(budget_id: int, db: Session = Depends(get_db), current_user = Depends(get_current_user)):
+    budget = get_user_budget(budget_id, db, current_user)
+    db.delete(budget)
+    db.commit()
+
+@router.post('/rebuild', response_model=JobEnqueuedResponse, status_code=status.HTTP_202_ACCEPTED)
+async def rebuild_my_budgets(db: Session = Depends(get_db), current_user = Depends(get_current_user)):
+    """Queue a rebuild of the current user's budget counters from the transaction ledger"""
+    job = enqueue(db, "budgets.rebuild", {"user_id": current_user.id}, user_id=current_user.id)
+    db.commit()
+    return JobEnqueuedResponse(job_id=job.id, status=job.status, detail="Budget rebuild queued")
@@ -7,7 +7,7 @@ from sqlalchemy.orm import Session
 from typing import List
 from database.session import get_db
 from database.models.category import Category as DBCategory, user_category_association
-from database.models import User as DBUser
+from database.models import User as DBUser, SyncEntity
 from Models.categories import (
     CategoryCreateRequest,
     CategoryUpdateRequest,
@@ -17,6 +17,8 @@ from Models.categories import (
     CategorySummaryResponse
 )
 from auth.permissions import require_auth, get_current_user, require_admin
+from services.sync import record_changes, record_category_update, upserted
+from services.category_cache import invalidate_category, invalidate_user_categories, user_category_cache
 from sqlalchemy import select, and_
 
 router = APIRouter(
@@ -93,8 +95,10 @@ async def update_system_category(
     update_data = category_update.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(category, field, value)
+    record_category_update(db, category_id)
     
     db.commit()
+    invalidate_category(category_id)
     db.refresh(category)
     
     return CategoryResponse.model_validate(category)
@@ -104,12 +108,8 @@ async def update_system_category(
 # USER CATEGORIES (User's Personal Category Management)
 # =============================================================================
 
-@router.get('/my', response_model=List[UserCategoryResponse])
-async def get_my_categories(
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
-):
-    """Get current user's categories (both assigned and custom)"""
+def load_my_categories(db: Session, user_id: int) -> List[UserCategoryResponse]:
+    """The user's active categories, with their custom names"""
     # Complex query to get user's categories with custom names
     query = db.query(
         DBCategory,
@@ -120,7 +120,7 @@ async def get_my_categories(
         user_category_association,
         DBCategory.id == user_category_association.c.category_id
     ).filter(
-        user_category_association.c.user_id == current_user.id,
+        user_category_association.c.user_id == user_id,
         user_category_association.c.is_active == True
     ).all()
     
@@ -142,6 +142,15 @@ async def get_my_categories(
     return user_categories
 
 
+@router.get('/my', response_model=List[UserCategoryResponse])
+async def get_my_categories(
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """Get current user's categories (both assigned and custom); cached per user until they change"""
+    return user_category_cache.get_or_load(current_user.id, lambda: load_my_categories(db, current_user.id))
+
+
 @router.post('/assign', response_model=UserCategoryResponse)
 async def assign_category_to_user(
     assignment: UserCategoryAssignRequest,
@@ -179,7 +188,9 @@ async def assign_category_to_user(
         is_active=assignment.is_active
     )
     db.execute(stmt)
+    record_changes(db, upserted(current_user.id, SyncEntity.CATEGORY, assignment.category_id))
     db.commit()
+    invalidate_user_categories(current_user.id)
     
     # Return the user category response
     return UserCategoryResponse(
@@ -233,7 +244,9 @@ async def update_my_category(
         is_active=update_req.is_active
     )
     db.execute(stmt)
+    record_changes(db, upserted(current_user.id, SyncEntity.CATEGORY, category_id))
     db.commit()
+    invalidate_user_categories(current_user.id)
     
     # Get category details for response
     category = db.query(DBCategory).filter(DBCategory.id == category_id).first()
@@ -273,5 +286,7 @@ async def remove_my_category(
             detail="Category assignment not found"
         )
     
+    record_changes(db, upserted(current_user.id, SyncEntity.CATEGORY, category_id))
     db.commit()
+    invalidate_user_categories(current_user.id)
     return {"detail": "Category removed from your list"}
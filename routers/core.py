@@ -0,0 +1,112 @@
+# This file contain the root, health, registration and login routes
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import JSONResponse
+from datetime import datetime
+from sqlalchemy.orm import Session
+
+from Models.users import UserResponse, UserCreateRequest, LoginRequest
+from database.models import User as DBUser
+from database.models.user import Gender, Role
+from database.session import get_db
+from util import verify_password, get_password_hash, create_access_token
+from auth.permissions import get_current_user
+
+
+router = APIRouter()
+
+@router.get("/",summary="Root Endpoint")
+async def read_root():
+    return {"message": "Finance Tracker API - LIVE UPDATES WORK!", "status": "running", "version": "1.0.0"}
+
+@router.get("/user/me")
+async def get_user_me(current_user: UserResponse = Depends(get_current_user)):
+    return current_user
+
+@router.post('/register')
+async def registration(new_user : UserCreateRequest, db : Session = Depends(get_db)):
+
+        #first check if user is in database already
+        existing_user = db.query(DBUser).filter(DBUser.email == new_user.email).first()
+
+        if existing_user :
+            raise HTTPException(status.HTTP_400_BAD_REQUEST,"User Already Exist")
+
+        hashed_password = get_password_hash(new_user.password)
+        user = DBUser(
+             name= new_user.name,
+             email=new_user.email,
+             password=hashed_password,
+             age= getattr(new_user,'age',None),
+             gender=getattr(new_user,'gender',Gender.MALE),
+             role=getattr(new_user,'role',Role.USER),  # Add role with default
+             is_verified=getattr(new_user,'is_verified',False),
+             currency=getattr(new_user,'currency','INR'),
+             location=getattr(new_user,'location','India'),
+        )
+
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+
+        return {
+             "status": status.HTTP_201_CREATED,
+             "message": "User Created Successfully",
+             "user": {
+                 "name":user.name,
+                 "email":user.email
+             }
+        }
+
+@router.post('/login')
+async def login(login_request: LoginRequest , db : Session = Depends(get_db)):
+     # try to fetch the user
+     user = db.query(DBUser).filter(DBUser.email==login_request.email).first()
+     if not user or user.pending_delete:
+         raise HTTPException(status.HTTP_401_UNAUTHORIZED,"Not Have Account, please Sign Up!!")
+
+     # Step 2: Verify Password
+     if verify_password(login_request.password,user.password):
+        # Step 3: Create JWT token with user data
+        token_data = {
+            "id": user.id,
+            "email": user.email,
+            "role": user.role.value  # Add role to JWT token
+        }
+        access_token = create_access_token(data=token_data)
+        # Step 4: Return success with real JWT
+        return {
+            'status': status.HTTP_200_OK,
+            'access_token': access_token,
+            'token_type': 'bearer',
+            'user': {
+                'id': user.id,
+                'name': user.name,
+                'email': user.email
+            }
+        }
+
+     else:
+         raise HTTPException(status.HTTP_401_UNAUTHORIZED,"Wrong Password!!")
+
+
+
+@router.get("/health")
+async def health_check():
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "status": "Api is Running with Live updates..."
+    }
+
+@router.get("/ready")
+async def readiness_check(request: Request):
+    """503 until the app's startup warm-up has finished, for load balancer readiness probes"""
+    if not getattr(request.app.state, "ready", False):
+        return JSONResponse({"status": "starting"}, status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
+    return {"status": "ready"}
+
+@router.get("/version")
+async def get_version():
+    return {
+        "version" : "1.0.0",
+        "description": "This is the version endpoint of the Finance API."
+    }
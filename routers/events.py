@@ -0,0 +1,115 @@
+# This file contain the real-time push routes (WebSocket and Server-Sent Events)
+import asyncio
+import json
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from database.connection import SessionLocal
+
+from auth.permissions import authenticate_token
+from services.events import event_hub, ensure_started, HEARTBEAT_SECONDS
+
+
+router = APIRouter(
+    prefix='/events',
+    tags=['Events']
+)
+
+# Browsers can't set headers on EventSource/WebSocket, so a ?token= query param is accepted too
+optional_bearer = HTTPBearer(auto_error=False)
+
+def resolve_user(token: Optional[str]):
+    """Authenticate with a short-lived session; long-lived streams don't hold a DB connection"""
+    if not token:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
+    db = SessionLocal()
+    try:
+        return authenticate_token(token, db)
+    finally:
+        db.close()
+
+def bearer_token(authorization: Optional[str]) -> Optional[str]:
+    scheme, _, token = (authorization or "").partition(" ")
+    return token if scheme.lower() == "bearer" and token else None
+
+@router.websocket('/ws')
+async def events_websocket(websocket: WebSocket, token: Optional[str] = Query(None)):
+    """
+    Push this user's transaction/account/balance events as JSON messages.
+    Sends {"type": "heartbeat"} when idle and answers "ping" with "pong".
+    A client that can't keep up gets {"type": "dropped"} and is closed;
+    it should reconnect and re-read current state.
+    """
+    try:
+        user = resolve_user(token or bearer_token(websocket.headers.get("authorization")))
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    await ensure_started()
+    subscription = event_hub.subscribe(user.id)
+
+    async def receive_pings():
+        while True:
+            if await websocket.receive_text() == "ping":
+                await websocket.send_json({"type": "pong"})
+
+    async def send_events():
+        while not subscription.dropped:
+            event = await subscription.next_event(HEARTBEAT_SECONDS)
+            await websocket.send_json(event if event is not None else {"type": "heartbeat"})
+        await websocket.send_json({"type": "dropped"})
+        await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+
+    tasks = [asyncio.create_task(receive_pings()), asyncio.create_task(send_events())]
+    try:
+        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+        for task in done:
+            if task.exception() is not None and not isinstance(task.exception(), WebSocketDisconnect):
+                raise task.exception()
+    finally:
+        for task in tasks:
+            task.cancel()
+        event_hub.unsubscribe(subscription)
+
+@router.get('/stream')
+async def events_stream(
+    request: Request,
+    token: Optional[str] = Query(None),
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_bearer)
+):
+    """
+    Server-Sent Events version of /events/ws. Each event is sent as
+    `event: <type>` with its JSON as `data:`; idle periods get a comment
+    heartbeat. A consumer that falls behind gets a `dropped` event and the
+    stream ends.
+    """
+    user = resolve_user(token or (credentials.credentials if credentials else None))
+    await ensure_started()
+    subscription = event_hub.subscribe(user.id)
+
+    async def stream():
+        try:
+            yield ": connected\n\n"
+            while not subscription.dropped:
+                event = await subscription.next_event(HEARTBEAT_SECONDS)
+                if await request.is_disconnected():
+                    return
+                if event is None:
+                    yield ": heartbeat\n\n"
+                else:
+                    yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+            yield 'event: dropped\ndata: {"type": "dropped"}\n\n'
+        finally:
+            event_hub.unsubscribe(subscription)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,123 @@
+# This file contain routes for investment holdings and portfolio valuation
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from database.session import get_db
+from database.models import Account as DBAccount, Holding as DBHolding
+from database.models.account import AccountType
+
+from Models.investments import HoldingCreateRequest, HoldingUpdateRequest, HoldingResponse, PortfolioResponse
+from auth.permissions import require_auth, get_current_user
+from services.fx import FxRateMissing, reporting_currency
+from services.investments import load_holdings, normalise_symbol, value_holdings
+
+
+router = APIRouter(
+    prefix='/investments',
+    tags=['Investments'],
+    dependencies=[Depends(require_auth)]
+)
+
+def get_investment_account(account_id: int, db: Session, current_user) -> DBAccount:
+    account = db.query(DBAccount).filter(
+        DBAccount.id == account_id,
+        DBAccount.user_id == current_user.id,
+        DBAccount.pending_delete == False
+    ).first()
+    if not account:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Account not found"
+        )
+    if account.account_type != AccountType.INVESTMENT:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Holdings can only be added to INVESTMENT accounts"
+        )
+    return account
+
+def get_user_holding(holding_id: int, db: Session, current_user) -> DBHolding:
+    holding = db.query(DBHolding).filter(
+        DBHolding.id == holding_id,
+        DBHolding.user_id == current_user.id
+    ).first()
+    if not holding:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Holding not found"
+        )
+    return holding
+
+@router.post('/holdings/create', response_model=HoldingResponse)
+async def create_holding(req: HoldingCreateRequest, db: Session = Depends(get_db), current_user = Depends(get_current_user)):
+    account = get_investment_account(req.account_id, db, current_user)
+    symbol = normalise_symbol(req.symbol)
+
+    existing = db.query(DBHolding).filter(DBHolding.account_id == account.id, DBHolding.symbol == symbol).first()
+    if existing:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Account already holds this symbol; update the existing holding"
+        )
+
+    holding = DBHolding(
+        symbol=symbol,
+        quantity=req.quantity,
+        cost_basis=req.cost_basis,
+        account_id=account.id,
+        user_id=current_user.id
+    )
+    db.add(holding)
+    db.commit()
+    db.refresh(holding)
+
+    return HoldingResponse.model_validate(holding)
+
+@router.get('/holdings/get_all', response_model=List[HoldingResponse])
+async def get_all_holdings(
+    account_id: Optional[int] = Query(None, description="Filter by account ID"),
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    query = db.query(DBHolding).filter(DBHolding.user_id == current_user.id)
+    if account_id:
+        query = query.filter(DBHolding.account_id == account_id)
+    return [HoldingResponse.model_validate(holding) for holding in query.order_by(DBHolding.account_id, DBHolding.symbol).all()]
+
+@router.patch('/holdings/update/{holding_id}', response_model=HoldingResponse)
+async def update_holding(
+    holding_id: int,
+    req: HoldingUpdateRequest,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    holding = get_user_holding(holding_id, db, current_user)
+    for field, value in req.model_dump(exclude_unset=True).items():
+        setattr(holding, field, value)
+
+    db.commit()
+    db.refresh(holding)
+    return HoldingResponse.model_validate(holding)
+
+@router.delete('/holdings/delete/{holding_id}', status_code=status.HTTP_204_NO_CONTENT)
+async def delete_holding(holding_id: int, db: Session = Depends(get_db), current_user = Depends(get_current_user)):
+    holding = get_user_holding(holding_id, db, current_user)
+    db.delete(holding)
+    db.commit()
+
+@router.get('/portfolio', response_model=PortfolioResponse)
+async def get_portfolio(
+    account_id: Optional[int] = Query(None, description="Only this investment account"),
+    currency: Optional[str] = Query(None, pattern="^[A-Za-z]{3}$", description="Reporting currency, defaults to the user's"),
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """Market value and unrealised P&L of every holding at the latest prices"""
+    rows = load_holdings(db, current_user.id, account_id)
+    try:
+        return PortfolioResponse(**value_holdings(rows, reporting_currency(current_user, currency)))
+    except FxRateMissing as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e)
+        )
@@ -0,0 +1,70 @@
+# This file contain routes for checking on background jobs
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from database.session import get_db
+from database.models.job import Job as DBJob, JobStatus
+from database.models.user import Role
+
+from Models.jobs import JobResponse
+from auth.permissions import require_auth, get_current_user
+
+
+router = APIRouter(
+    prefix='/jobs',
+    tags=['Jobs'],
+    dependencies=[Depends(require_auth)]
+)
+
+def get_visible_job(job_id: int, db: Session, current_user) -> DBJob:
+    """Users see their own jobs; admins see every job"""
+    query = db.query(DBJob).filter(DBJob.id == job_id)
+    if current_user.role != Role.ADMIN:
+        query = query.filter(DBJob.user_id == current_user.id)
+    job = query.first()
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    return job
+
+@router.get('/get_all', response_model=List[JobResponse])
+async def get_my_jobs(
+    job_status: Optional[JobStatus] = Query(None, alias="status", description="Filter by status"),
+    limit: int = Query(50, ge=1, le=500, description="Number of records to return"),
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """Most recent jobs requested by the current user"""
+    query = db.query(DBJob).filter(DBJob.user_id == current_user.id)
+    if job_status:
+        query = query.filter(DBJob.status == job_status)
+    jobs = query.order_by(DBJob.id.desc()).limit(limit).all()
+    return [JobResponse.model_validate(job) for job in jobs]
+
+@router.get('/{job_id}', response_model=JobResponse)
+async def get_job(job_id: int, db: Session = Depends(get_db), current_user = Depends(get_current_user)):
+    """Status, progress and result of a job"""
+    job = get_visible_job(job_id, db, current_user)
+    return JobResponse.model_validate(job)
+
+@router.post('/{job_id}/cancel', response_model=JobResponse)
+async def cancel_job(job_id: int, db: Session = Depends(get_db), current_user = Depends(get_current_user)):
+    """Cancel a job that has not started yet"""
+    job = get_visible_job(job_id, db, current_user)
+
+    # Conditional update so a worker claiming it at the same moment wins cleanly
+    cancelled = db.query(DBJob).filter(
+        DBJob.id == job.id,
+        DBJob.status == JobStatus.QUEUED
+    ).update({DBJob.status: JobStatus.CANCELLED}, synchronize_session=False)
+    if not cancelled:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Job is {job.status.value} and can no longer be cancelled"
+        )
+    db.commit()
+    db.refresh(job)
+
+    return JobResponse.model_validate(job)
@@ -0,0 +1,143 @@
+# This file contain routes regarding recurring transaction rules
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+from typing import List
+from database.session import get_db
+from database.models import Account as DBAccount, Category as DBCategory, RecurringTransaction as DBRecurring
+from database.models.transaction import TransactionType
+
+from Models.recurring import (
+    RecurringTransactionCreateRequest,
+    RecurringTransactionUpdateRequest,
+    RecurringTransactionResponse
+)
+from auth.permissions import require_auth, get_current_user
+
+
+router = APIRouter(
+    prefix='/recurring',
+    tags=['Recurring Transactions'],
+    dependencies=[Depends(require_auth)]
+)
+
+def get_user_rule(rule_id: int, db: Session, current_user) -> DBRecurring:
+    rule = db.query(DBRecurring).filter(
+        DBRecurring.id == rule_id,
+        DBRecurring.user_id == current_user.id
+    ).first()
+    if not rule:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Recurring transaction not found"
+        )
+    return rule
+
+@router.post('/create', response_model=RecurringTransactionResponse)
+async def create_recurring_transaction(
+    req_rule: RecurringTransactionCreateRequest,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    Create a recurring rule. Occurrences from start_date onwards are posted
+    by the scheduler (python manage.py run-scheduler), including past ones.
+    """
+    account = db.query(DBAccount).filter(
+        DBAccount.id == req_rule.account_id,
+        DBAccount.user_id == current_user.id,
+        DBAccount.pending_delete == False
+    ).first()
+    if not account:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Account not found"
+        )
+
+    if req_rule.transaction_type == TransactionType.TRANSFER:
+        to_account = db.query(DBAccount).filter(
+            DBAccount.id == req_rule.to_account_id,
+            DBAccount.user_id == current_user.id,
+            DBAccount.pending_delete == False
+        ).first()
+        if not to_account:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="To account not found for transfer"
+            )
+
+    category = db.query(DBCategory).filter(DBCategory.id == req_rule.category_id).first()
+    if not category:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Category not found"
+        )
+
+    new_rule = DBRecurring(
+        transaction_name=req_rule.transaction_name,
+        amount=req_rule.amount,
+        transaction_type=req_rule.transaction_type,
+        account_id=req_rule.account_id,
+        to_account=req_rule.to_account_id,
+        category_id=req_rule.category_id,
+        description=req_rule.description,
+        frequency=req_rule.frequency,
+        interval=req_rule.interval,
+        start_date=req_rule.start_date,
+        end_date=req_rule.end_date,
+        next_run_date=req_rule.start_date,
+        user_id=current_user.id
+    )
+    db.add(new_rule)
+    db.commit()
+    db.refresh(new_rule)
+
+    return RecurringTransactionResponse.model_validate(new_rule)
+
+@router.get('/get_all', response_model=List[RecurringTransactionResponse])
+async def get_all_recurring_transactions(db: Session = Depends(get_db), current_user = Depends(get_current_user)):
+    rules = db.query(DBRecurring).filter(DBRecurring.user_id == current_user.id).all()
+    return [RecurringTransactionResponse.model_validate(rule) for rule in rules]
+
+@router.get('/get/{rule_id}', response_model=RecurringTransactionResponse)
+async def get_recurring_transaction(rule_id: int, db: Session = Depends(get_db), current_user = Depends(get_current_user)):
+    rule = get_user_rule(rule_id, db, current_user)
+    return RecurringTransactionResponse.model_validate(rule)
+
+@router.patch('/update/{rule_id}', response_model=RecurringTransactionResponse)
+async def update_recurring_transaction(
+    rule_id: int,
+    req_rule: RecurringTransactionUpdateRequest,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """Update a rule. Changes apply to occurrences that have not been posted yet."""
+    rule = get_user_rule(rule_id, db, current_user)
+
+    update_data = req_rule.model_dump(exclude_unset=True)
+    if 'category_id' in update_data:
+        category = db.query(DBCategory).filter(DBCategory.id == update_data['category_id']).first()
+        if not category:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Category not found"
+            )
+    if update_data.get('end_date') and update_data['end_date'] < rule.start_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="end_date cannot be before start_date"
+        )
+
+    for field, value in update_data.items():
+        setattr(rule, field, value)
+
+    db.commit()
+    db.refresh(rule)
+
+    return RecurringTransactionResponse.model_validate(rule)
+
+@router.delete('/delete/{rule_id}', status_code=status.HTTP_204_NO_CONTENT)
+async def delete_recurring_transaction(rule_id: int, db: Session = Depends(get_db), current_user = Depends(get_current_user)):
+    """Delete a rule. Transactions it already posted are kept."""
+    rule = get_user_rule(rule_id, db, current_user)
+    db.delete(rule)
+    db.commit()
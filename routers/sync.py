@@ -0,0 +1,37 @@
+# This file contain the delta sync route for offline clients
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+from typing import Optional
+from database.session import get_db
+
+from Models.sync import SyncResponse
+from auth.permissions import require_auth, get_current_user
+from services.sync import changes_since, decode_cursor, snapshot
+
+
+router = APIRouter(
+    prefix='/sync',
+    tags=['Sync'],
+    dependencies=[Depends(require_auth)]
+)
+
+@router.get('', response_model=SyncResponse)
+async def sync(
+    cursor: Optional[str] = Query(None, description="Cursor from the previous sync; omit for a full snapshot"),
+    limit: int = Query(500, ge=1, le=5000, description="Maximum changes per call"),
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    Transactions, accounts and category assignments changed since `cursor`,
+    plus tombstones for deletions. Without a cursor (or with one older than
+    the change log retention) the full current state comes back with
+    `reset: true`. Keep calling with the returned cursor while `has_more`.
+    """
+    if cursor is None:
+        return SyncResponse(**snapshot(db, current_user.id, reset=True))
+    try:
+        after_seq = decode_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return SyncResponse(**changes_since(db, current_user.id, after_seq, limit))
@@ -1,16 +1,28 @@
 # This file contain routes regarding transactions
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from datetime import datetime
+from datetime import date, datetime, timedelta
 from pydantic import BaseModel
+import numpy as np
 from database.session import get_db
-from database.models import Account as DBAccount, Category as DBCategory,Transaction as DBTransaction
+from database.models import Account as DBAccount, Category as DBCategory,Transaction as DBTransaction, SyncEntity
 
 # Updated imports to use new model structure
 from Models.accounts import AccountResponse, AccountCreateRequest, AccountUpdateRequest
 from auth.permissions import require_auth, get_current_user
-from Models.transactions import TransactionCreateRequest,TransactionType,TransactionResponse,TransactionUpdateRequest
+from Models.transactions import TransactionCreateRequest,TransactionType,TransactionResponse,TransactionUpdateRequest,TransactionSummaryResponse,TransactionSearchResponse
+from services.budgets import apply_budget_spend, expense_entries
+from services.balance_history import apply_balance_changes, transaction_changes
+from services.fx import FxRateMissing, account_currency, fx_cache, reporting_currency
+from services.net_worth import invalidate_net_worth
+from services.events import publish, make_event, balance_events
+from services.sync import record_changes, upserted, deleted
+from services.idempotency import IdempotencyContext, IdempotentReplay, idempotency
+from services.archive import find_archived, transaction_source
+from services.facets import faceted_page, parse_facets
+from middleware.negotiation import negotiated_list
+from Models.fieldsets import parse_fields, subset_model, columns_for
 
 
 router = APIRouter(
@@ -20,44 +32,133 @@ router = APIRouter(
 )
 
 # Helper functions for balance management
-def reverse_transaction_balance(transaction: DBTransaction, db: Session):
+def reverse_transaction_balance(account: DBAccount, amount: float, transaction_type: TransactionType, to_account: DBAccount = None):
     """Reverse the balance changes of a transaction"""
-    # Get the accounts
-    from_account = db.query(DBAccount).filter(DBAccount.id == transaction.account_id).first()
-    to_account = None
-    if transaction.to_account:
-        to_account = db.query(DBAccount).filter(DBAccount.id == transaction.to_account).first()
-    
-    # Reverse the balance changes
-    if transaction.transaction_type == TransactionType.INCOME:
-        from_account.balance -= transaction.amount
-    elif transaction.transaction_type == TransactionType.EXPENSE:
-        from_account.balance += transaction.amount
-    elif transaction.transaction_type == TransactionType.TRANSFER:
-        from_account.balance += transaction.amount  # Add back to source
+    if transaction_type == TransactionType.INCOME:
+        account.balance -= amount
+    elif transaction_type == TransactionType.EXPENSE:
+        account.balance += amount
+    elif transaction_type == TransactionType.TRANSFER:
+        account.balance += amount  # Add back to source
         if to_account:
-            to_account.balance -= transaction.amount  # Remove from destination
+            to_account.balance -= amount  # Remove from destination
 
-def apply_transaction_balance(transaction_data, from_account, to_account=None):
+def apply_transaction_balance(account: DBAccount, amount: float, transaction_type: TransactionType, to_account: DBAccount = None):
     """Apply balance changes for a transaction"""
-    if transaction_data.transaction_type == TransactionType.INCOME:
-        from_account.balance += transaction_data.amount
-    elif transaction_data.transaction_type == TransactionType.EXPENSE:
-        from_account.balance -= transaction_data.amount
-    elif transaction_data.transaction_type == TransactionType.TRANSFER:
-        from_account.balance -= transaction_data.amount
+    if transaction_type == TransactionType.INCOME:
+        account.balance += amount
+    elif transaction_type == TransactionType.EXPENSE:
+        account.balance -= amount
+    elif transaction_type == TransactionType.TRANSFER:
+        account.balance -= amount
         if to_account:
-            to_account.balance += transaction_data.amount
+            to_account.balance += amount
+
+def account_balances(*accounts) -> dict:
+    """Current in-session balances, keyed by account id"""
+    return {account.id: account.balance for account in accounts if account}
+
+def loaded_changes(changes: list, balances: dict) -> list:
+    """
+    The balance changes for accounts in `balances`. An account that wasn't
+    loaded (e.g. pending deletion) had its balance left alone, so its
+    snapshots are left alone too.
+    """
+    return [change for change in changes if change.account_id in balances]
+
+def get_to_account(account_id, db: Session, current_user):
+    """Load the destination account of a transfer, if any"""
+    if not account_id:
+        return None
+    return db.query(DBAccount).filter(
+        DBAccount.id == account_id,
+        DBAccount.user_id == current_user.id,
+        DBAccount.pending_delete == False
+    ).first()
+
+def date_bounds(query, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None, source=DBTransaction.__table__):
+    """
+    Restrict a transactions query to a date range. On the monthly-partitioned
+    table (services/partitions.py) the planner then only visits those months.
+    """
+    if start_date:
+        query = query.filter(source.c.date >= start_date)
+    if end_date:
+        query = query.filter(source.c.date <= end_date)
+    return query
+
+def transaction_filters(db: Session, current_user, account_id: Optional[int] = None, category_id: Optional[int] = None,
+                        transaction_type: Optional[TransactionType] = None, start_date: Optional[datetime] = None,
+                        end_date: Optional[datetime] = None):
+    """
+    The transactions source for the date range and the conditions matching the
+    list filters, as (source, conditions). 404 if `account_id` isn't the user's.
+    """
+    # Archived history is merged in only when the date range reaches it
+    source = transaction_source(db, current_user.id, start_date, end_date)
+    conditions = [source.c.user_id == current_user.id]
+    if account_id:
+        # Verify account belongs to user
+        account_check = db.query(DBAccount.id).filter(
+            DBAccount.id == account_id,
+            DBAccount.user_id == current_user.id,
+            DBAccount.pending_delete == False
+        ).first()
+        if not account_check:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Account not found"
+            )
+        conditions.append(source.c.account_id == account_id)
+    if category_id:
+        conditions.append(source.c.category_id == category_id)
+    if transaction_type:
+        conditions.append(source.c.transaction_type == transaction_type)
+    if start_date:
+        conditions.append(source.c.date >= start_date)
+    if end_date:
+        conditions.append(source.c.date <= end_date)
+    return source, conditions
+
+def find_transaction(db: Session, transaction_id: int, current_user, on_date: Optional[date] = None):
+    """The user's transaction by id; `on_date`, when the client knows it, narrows the search to one partition"""
+    query = db.query(DBTransaction).filter(
+        DBTransaction.id == transaction_id,
+        DBTransaction.user_id == current_user.id
+    )
+    if on_date:
+        day_start = datetime.combine(on_date, datetime.min.time())
+        query = query.filter(DBTransaction.date >= day_start, DBTransaction.date < day_start + timedelta(days=1))
+    return query.first()
+
+def find_writable_transaction(db: Session, transaction_id: int, current_user, on_date: Optional[date] = None):
+    """find_transaction() for write routes: 404 if missing, 409 if it has been archived"""
+    transaction = find_transaction(db, transaction_id, current_user, on_date)
+    if transaction:
+        return transaction
+    if find_archived(db, transaction_id, current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Transaction is archived and can no longer be changed"
+        )
+    raise HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="Transaction not found"
+    )
+
+# Optional ?date= on single-transaction routes
+ON_DATE_QUERY = Query(None, alias="date", description="The transaction's date, if known; speeds up the lookup")
 
 @router.post('/create')
-async def create_transaction(req_transaction: TransactionCreateRequest, db: Session = Depends(get_db), current_user = Depends(get_current_user)):
+async def create_transaction(req_transaction: TransactionCreateRequest, db: Session = Depends(get_db), current_user = Depends(get_current_user), idem: IdempotencyContext = Depends(idempotency)):
     """
     Create a new Transaction
     """
     # Step 1: Check if accounts exist
     from_account = db.query(DBAccount).filter(
         DBAccount.id == req_transaction.account_id,
-        DBAccount.user_id == current_user.id
+        DBAccount.user_id == current_user.id,
+        DBAccount.pending_delete == False
     ).first()
     
     if not from_account:
@@ -71,7 +172,8 @@ async def create_transaction(req_transaction: TransactionCreateRequest, db: Sess
     if req_transaction.to_account_id:
         to_account = db.query(DBAccount).filter(
             DBAccount.id == req_transaction.to_account_id,
-            DBAccount.user_id == current_user.id
+            DBAccount.user_id == current_user.id,
+            DBAccount.pending_delete == False
         ).first()
     
     # Step 3: Check category exists
@@ -109,8 +211,19 @@ async def create_transaction(req_transaction: TransactionCreateRequest, db: Sess
     elif req_transaction.transaction_type == TransactionType.TRANSFER:
         from_account.balance -= req_transaction.amount
         to_account.balance += req_transaction.amount
-    
-    # Step 7: Create transaction record
+
+    # Step 7: Update budget counters and balance snapshots in the same DB transaction
+    transaction_date = req_transaction.date or datetime.now()
+    apply_budget_spend(db, expense_entries(
+        current_user.id, req_transaction.category_id, req_transaction.transaction_type,
+        req_transaction.amount, transaction_date
+    ))
+    apply_balance_changes(db, transaction_changes(
+        req_transaction.transaction_type, req_transaction.amount, from_account.id,
+        to_account.id if to_account else None, transaction_date
+    ), account_balances(from_account, to_account))
+    
+    # Step 8: Create transaction record
     new_transaction = DBTransaction(
         transaction_name=req_transaction.transaction_name,
         account_id=req_transaction.account_id,
@@ -119,22 +232,38 @@ async def create_transaction(req_transaction: TransactionCreateRequest, db: Sess
         amount=req_transaction.amount,
         transaction_type=req_transaction.transaction_type,
         description=getattr(req_transaction,'description', None),
+        date=transaction_date,
         user_id=current_user.id
     )
     
     db.add(new_transaction)
+    db.flush()
+    record_changes(db, [
+        *upserted(current_user.id, SyncEntity.TRANSACTION, new_transaction.id),
+        *upserted(current_user.id, SyncEntity.ACCOUNT, from_account.id, to_account.id if to_account else None),
+    ])
+
+    # Step 9: Store the Idempotency-Key with its response in the same DB transaction
+    db.refresh(new_transaction)
+    response = TransactionResponse.model_validate(new_transaction)
+    idem.save(db, response.model_dump(mode="json"))
     db.commit()
+    invalidate_net_worth(current_user.id)
     
-    # Step 8: Refresh objects (only if they exist)
+    # Step 10: Refresh objects (only if they exist)
     db.refresh(from_account)
     if to_account:
         db.refresh(to_account)
-    db.refresh(new_transaction)
-    
-    return TransactionResponse.model_validate(new_transaction)
+
+    await publish(current_user.id, [
+        make_event("transaction.created", response.model_dump(mode="json")),
+        *balance_events(account_balances(from_account, to_account)),
+    ])
+    return response
 
 @router.get('/get_all', response_model=List[TransactionResponse])
 async def get_all_transactions(
+    request: Request,
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Number of records to return"),
     account_id: Optional[int] = Query(None, description="Filter by account ID"),
@@ -142,56 +271,142 @@ async def get_all_transactions(
     transaction_type: Optional[TransactionType] = Query(None, description="Filter by transaction type"),
     start_date: Optional[datetime] = Query(None, description="Filter from date"),
     end_date: Optional[datetime] = Query(None, description="Filter to date"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,amount,date"),
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
-    """Get all transactions for the current user with filtering and pagination"""
-    
-    # Base query - only user's transactions
-    query = db.query(DBTransaction).filter(DBTransaction.user_id == current_user.id)
-    
-    # Apply filters
-    if account_id:
-        # Verify account belongs to user
-        account_check = db.query(DBAccount).filter(
-            DBAccount.id == account_id,
-            DBAccount.user_id == current_user.id
-        ).first()
-        if not account_check:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Account not found"
-            )
-        query = query.filter(DBTransaction.account_id == account_id)
-    
-    if category_id:
-        query = query.filter(DBTransaction.category_id == category_id)
-    
-    if transaction_type:
-        query = query.filter(DBTransaction.transaction_type == transaction_type)
-    
-    if start_date:
-        query = query.filter(DBTransaction.date >= start_date)
+    """
+    Get all transactions for the current user with filtering and pagination.
+    Send Accept: application/msgpack or application/vnd.columnar+json for compact output.
+    """
+    try:
+        field_set = parse_fields(fields, TransactionResponse)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     
-    if end_date:
-        query = query.filter(DBTransaction.date <= end_date)
+    # Base query - only user's transactions, only the requested columns
+    source, conditions = transaction_filters(db, current_user, account_id, category_id, transaction_type, start_date, end_date)
+    if field_set:
+        response_model = subset_model(TransactionResponse, field_set)
+    else:
+        response_model = TransactionResponse
+    query = db.query(*columns_for(source.c, field_set or tuple(TransactionResponse.model_fields))).filter(*conditions)
     
     # Apply pagination and ordering (newest first)
-    transactions = query.order_by(DBTransaction.date.desc()).offset(skip).limit(limit).all()
+    transactions = query.order_by(source.c.date.desc()).offset(skip).limit(limit).all()
+    
+    return negotiated_list(request, [response_model.model_validate(transaction) for transaction in transactions], response_model)
+
+
+@router.get('/search', response_model=TransactionSearchResponse)
+async def search_transactions(
+    skip: int = Query(0, ge=0, description="Number of records to skip"),
+    limit: int = Query(100, ge=1, le=1000, description="Number of records to return"),
+    account_id: Optional[int] = Query(None, description="Filter by account ID"),
+    category_id: Optional[int] = Query(None, description="Filter by category ID"),
+    transaction_type: Optional[TransactionType] = Query(None, description="Filter by transaction type"),
+    start_date: Optional[datetime] = Query(None, description="Filter from date"),
+    end_date: Optional[datetime] = Query(None, description="Filter to date"),
+    facets: Optional[str] = Query(None, description="Comma-separated facets to count: category,transaction_type,account"),
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    The /get_all page plus, for each requested facet, the count and total of
+    every matching transaction per value and account currency. The page and
+    the facets come from one SQL statement (services/facets.py).
+    """
+    try:
+        facet_names = parse_facets(facets)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     
-    return [TransactionResponse.model_validate(transaction) for transaction in transactions]
+    source, conditions = transaction_filters(db, current_user, account_id, category_id, transaction_type, start_date, end_date)
+    fields = tuple(TransactionResponse.model_fields)
+    
+    # Without facets this is just the page
+    if not facet_names:
+        transactions = db.query(*columns_for(source.c, fields)).filter(*conditions).order_by(
+            source.c.date.desc(), source.c.id.desc()
+        ).offset(skip).limit(limit).all()
+        return TransactionSearchResponse(items=[TransactionResponse.model_validate(t) for t in transactions])
+    
+    items, buckets = faceted_page(db, source, conditions, fields, facet_names, skip, limit)
+    facet_values = {
+        name: [
+            {"value": getattr(value, "value", value), "currency": currency, "count": count, "total": round(total, 2)}
+            for value, currency, count, total in rows
+        ]
+        for name, rows in buckets.items()
+    }
+    # Every facet buckets all the matching rows, so any of them gives the total
+    total_count = sum(bucket["count"] for bucket in next(iter(facet_values.values())))
+    
+    return TransactionSearchResponse(
+        items=[TransactionResponse.model_validate(item) for item in items],
+        total_count=total_count,
+        facets=facet_values
+    )
+
+
+@router.get('/summary', response_model=TransactionSummaryResponse)
+async def get_transaction_summary(
+    start_date: Optional[datetime] = Query(None, description="Summarise from date"),
+    end_date: Optional[datetime] = Query(None, description="Summarise to date"),
+    account_id: Optional[int] = Query(None, description="Only this account"),
+    currency: Optional[str] = Query(None, pattern="^[A-Za-z]{3}$", description="Reporting currency, defaults to the user's"),
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    Income, expense and net totals across all of the user's accounts, each
+    transaction converted into the reporting currency at its own date's rate
+    """
+    currency = reporting_currency(current_user, currency)
+
+    source = transaction_source(db, current_user.id, start_date, end_date)
+    query = db.query(
+        source.c.amount, source.c.transaction_type, source.c.date, account_currency
+    ).select_from(source).join(DBAccount, DBAccount.id == source.c.account_id).filter(source.c.user_id == current_user.id)
+    if account_id:
+        query = query.filter(source.c.account_id == account_id)
+    rows = date_bounds(query, start_date, end_date, source).all()
 
+    amounts = np.array([row[0] for row in rows], dtype=np.float64)
+    kinds = np.array([row[1] for row in rows], dtype=object)
+    dates = [row[2] for row in rows]
+    try:
+        amounts = fx_cache.convert(amounts, [row[3] for row in rows], np.array(dates, dtype="datetime64[s]").astype("datetime64[D]"), currency)
+    except FxRateMissing as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e)
+        )
 
+    total_income = float(amounts[kinds == TransactionType.INCOME].sum())
+    total_expenses = float(amounts[kinds == TransactionType.EXPENSE].sum())
+    return TransactionSummaryResponse(
+        total_income=round(total_income, 2),
+        total_expenses=round(total_expenses, 2),
+        net_balance=round(total_income - total_expenses, 2),
+        transaction_count=len(rows),
+        period_start=start_date or (min(dates) if dates else datetime.now()),
+        period_end=end_date or (max(dates) if dates else datetime.now()),
+        currency=currency
+    )
 
 @router.get('/get/{transaction_id}', response_model=TransactionResponse)
-async def get_transaction(transaction_id: int, db: Session = Depends(get_db), current_user = Depends(get_current_user)):
+async def get_transaction(transaction_id: int, on_date: Optional[date] = ON_DATE_QUERY, db: Session = Depends(get_db), current_user = Depends(get_current_user)):
     """
-    Get a single transaction by ID
+    Get a single transaction by ID, including archived ones
     """
-    transaction = db.query(DBTransaction).filter(
-        DBTransaction.id == transaction_id,
-        DBTransaction.user_id == current_user.id
-    ).first()
+    transaction = find_transaction(db, transaction_id, current_user, on_date) or find_archived(db, transaction_id, current_user.id)
     
     if not transaction:
         raise HTTPException(
@@ -205,32 +420,29 @@ async def get_transaction(transaction_id: int, db: Session = Depends(get_db), cu
 async def update_transaction(
     transaction_id: int,
     request: TransactionUpdateRequest,
+    on_date: Optional[date] = ON_DATE_QUERY,
     db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    current_user = Depends(get_current_user),
+    idem: IdempotencyContext = Depends(idempotency)
 ):
     """Update a transaction with proper balance management"""
     
-    # Get existing transaction
-    existing_transaction = db.query(DBTransaction).filter(
-        DBTransaction.id == transaction_id,
-        DBTransaction.user_id == current_user.id
-    ).first()
-    
-    if not existing_transaction:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Transaction not found"
-        )
+    # Get existing transaction (archived ones are read-only)
+    existing_transaction = find_writable_transaction(db, transaction_id, current_user, on_date)
     
     # Store original values for balance reversal
     original_account_id = existing_transaction.account_id
     original_amount = existing_transaction.amount
     original_type = existing_transaction.transaction_type
+    original_category_id = existing_transaction.category_id
+    original_date = existing_transaction.date
+    original_to_account_id = existing_transaction.to_account
     
     # Get the account for the existing transaction
     original_account = db.query(DBAccount).filter(
         DBAccount.id == original_account_id,
-        DBAccount.user_id == current_user.id
+        DBAccount.user_id == current_user.id,
+        DBAccount.pending_delete == False
     ).first()
     
     if not original_account:
@@ -239,23 +451,30 @@ async def update_transaction(
             detail="Original account not found"
         )
     
+    original_to_account = get_to_account(existing_transaction.to_account, db, current_user)
+    
     # Reverse the original transaction's balance effect
-    reverse_transaction_balance(original_account, original_amount, original_type)
+    reverse_transaction_balance(original_account, original_amount, original_type, original_to_account)
     
-    # Update transaction fields
+    # Update transaction fields (request names differ from the column names for these two)
     update_data = request.model_dump(exclude_unset=True)
+    if 'transaction_date' in update_data:
+        update_data['date'] = update_data.pop('transaction_date') or original_date
+    if 'to_account_id' in update_data:
+        update_data['to_account'] = update_data.pop('to_account_id') or None
     
     # Validate new account if changed
     new_account_id = update_data.get('account_id', original_account_id)
     if new_account_id != original_account_id:
         new_account = db.query(DBAccount).filter(
             DBAccount.id == new_account_id,
-            DBAccount.user_id == current_user.id
+            DBAccount.user_id == current_user.id,
+            DBAccount.pending_delete == False
         ).first()
         
         if not new_account:
             # Restore original balance since we're failing
-            apply_transaction_balance(original_account, original_amount, original_type)
+            apply_transaction_balance(original_account, original_amount, original_type, original_to_account)
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="New account not found"
@@ -271,7 +490,7 @@ async def update_transaction(
         
         if not category:
             # Restore original balance since we're failing
-            apply_transaction_balance(original_account, original_amount, original_type)
+            apply_transaction_balance(original_account, original_amount, original_type, original_to_account)
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Category not found"
@@ -284,47 +503,69 @@ async def update_transaction(
     # Apply new transaction's balance effect
     new_amount = existing_transaction.amount
     new_type = existing_transaction.transaction_type
-    apply_transaction_balance(new_account, new_amount, new_type)
+    new_to_account = get_to_account(existing_transaction.to_account, db, current_user)
+    apply_transaction_balance(new_account, new_amount, new_type, new_to_account)
+
+    balances = account_balances(original_account, original_to_account, new_account, new_to_account)
     
     try:
+        # Move the spend between budget counters and re-date the balance change in the same DB transaction
+        apply_budget_spend(db, expense_entries(
+            current_user.id, original_category_id, original_type, original_amount, original_date, sign=-1
+        ) + expense_entries(
+            current_user.id, existing_transaction.category_id, new_type, new_amount, existing_transaction.date
+        ))
+        apply_balance_changes(db, loaded_changes(transaction_changes(
+            original_type, original_amount, original_account_id, original_to_account_id, original_date, sign=-1
+        ) + transaction_changes(
+            new_type, new_amount, new_account.id, existing_transaction.to_account, existing_transaction.date
+        ), balances), balances)
+        record_changes(db, [
+            *upserted(current_user.id, SyncEntity.TRANSACTION, existing_transaction.id),
+            *upserted(current_user.id, SyncEntity.ACCOUNT, *balances),
+        ])
+        db.flush()
+        response = TransactionResponse.model_validate(existing_transaction)
+        idem.save(db, response.model_dump(mode="json"))
         db.commit()
-        db.refresh(existing_transaction)
-        return TransactionResponse.model_validate(existing_transaction)
+        invalidate_net_worth(current_user.id)
     
+    except (IdempotentReplay, HTTPException):
+        raise
     except Exception as e:
         db.rollback()
         # Restore original balance state
-        reverse_transaction_balance(new_account, new_amount, new_type)
-        apply_transaction_balance(original_account, original_amount, original_type)
+        reverse_transaction_balance(new_account, new_amount, new_type, new_to_account)
+        apply_transaction_balance(original_account, original_amount, original_type, original_to_account)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to update transaction: {str(e)}"
         )
 
+    await publish(current_user.id, [
+        make_event("transaction.updated", response.model_dump(mode="json")),
+        *balance_events(balances),
+    ])
+    return response
+
 @router.delete('/{transaction_id}', status_code=status.HTTP_204_NO_CONTENT)
 async def delete_transaction(
     transaction_id: int,
+    on_date: Optional[date] = ON_DATE_QUERY,
     db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    current_user = Depends(get_current_user),
+    idem: IdempotencyContext = Depends(idempotency)
 ):
     """Delete a transaction with proper balance management"""
     
-    # Get the transaction to delete
-    transaction = db.query(DBTransaction).filter(
-        DBTransaction.id == transaction_id,
-        DBTransaction.user_id == current_user.id
-    ).first()
-    
-    if not transaction:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Transaction not found"
-        )
+    # Get the transaction to delete (archived ones are read-only)
+    transaction = find_writable_transaction(db, transaction_id, current_user, on_date)
     
     # Get the account to reverse balance changes
     account = db.query(DBAccount).filter(
         DBAccount.id == transaction.account_id,
-        DBAccount.user_id == current_user.id
+        DBAccount.user_id == current_user.id,
+        DBAccount.pending_delete == False
     ).first()
     
     if not account:
@@ -334,19 +575,44 @@ async def delete_transaction(
         )
     
     # Reverse the transaction's balance effect
-    reverse_transaction_balance(account, transaction.amount, transaction.transaction_type)
+    to_account = get_to_account(transaction.to_account, db, current_user)
+    reverse_transaction_balance(account, transaction.amount, transaction.transaction_type, to_account)
+    balances = account_balances(account, to_account)
     
     try:
-        # Delete the transaction
+        # Remove the spend from its budget counter and the change from the balance snapshots
+        apply_budget_spend(db, expense_entries(
+            current_user.id, transaction.category_id, transaction.transaction_type,
+            transaction.amount, transaction.date, sign=-1
+        ))
+        apply_balance_changes(db, loaded_changes(transaction_changes(
+            transaction.transaction_type, transaction.amount, transaction.account_id,
+            transaction.to_account, transaction.date, sign=-1
+        ), balances), balances)
+        
+        # Delete the transaction, leaving a tombstone for synced clients
         db.delete(transaction)
+        record_changes(db, [
+            *deleted(current_user.id, SyncEntity.TRANSACTION, transaction_id),
+            *upserted(current_user.id, SyncEntity.ACCOUNT, *balances),
+        ])
+        idem.save(db, status_code=status.HTTP_204_NO_CONTENT)
         db.commit()
+        invalidate_net_worth(current_user.id)
         
+    except (IdempotentReplay, HTTPException):
+        raise
     except Exception as e:
         db.rollback()
         # Restore balance if deletion failed
-        apply_transaction_balance(account, transaction.amount, transaction.transaction_type)
+        apply_transaction_balance(account, transaction.amount, transaction.transaction_type, to_account)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to delete transaction: {str(e)}"
         )
 
+
+    await publish(current_user.id, [
+        make_event("transaction.deleted", {"id": transaction_id}),
+        *balance_events(balances),
+    ])
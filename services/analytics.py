@@ -0,0 +1,184 @@
+"""
+Vectorised cash-flow analytics.
+
+load_cash_flow() pulls only the columns the series need, in one query, into
+NumPy arrays. Every series is then computed with array operations: bucket
+indices come from np.searchsorted against the bucket start dates and totals
+from np.bincount, so the cost is a few passes over contiguous arrays no
+matter how many years of history a user has.
+
+Pass `currency` to convert every amount into that reporting currency; the
+account currency comes from the same query and conversion is one vectorised
+multiply per source currency (see services.fx).
+"""
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+
+import numpy as np
+from sqlalchemy import String, select, type_coerce
+from sqlalchemy.orm import Session
+
+from database.models.account import Account
+from services.archive import transaction_source
+from services.fx import account_currency, fx_cache
+
+GRANULARITIES = ("day", "week", "month")
+
+INCOME, EXPENSE, TRANSFER = 1, -1, 0
+
+
+@dataclass
+class CashFlowFrame:
+    """Column arrays for a user's transactions in a date range"""
+    start: date
+    end: date
+    days: np.ndarray           # datetime64[D]
+    amounts: np.ndarray        # float64
+    kinds: np.ndarray          # int8: INCOME / EXPENSE / TRANSFER
+    category_ids: np.ndarray   # int64
+    currency: Optional[str] = None  # Reporting currency amounts were converted into
+
+    def __len__(self):
+        return len(self.amounts)
+
+
+def load_cash_flow(db: Session, user_id: int, start: date, end: date, currency: Optional[str] = None) -> CashFlowFrame:
+    """
+    Load date, amount, type and category for [start, end] in a single query,
+    converted into `currency` when given (raises services.fx.FxRateMissing).
+    """
+    lower = datetime.combine(start, time())
+    upper = datetime.combine(end + timedelta(days=1), time())
+    source = transaction_source(db, user_id, lower, upper)  # includes archived history when the range reaches it
+    columns = [
+        source.c.date,
+        source.c.amount,
+        type_coerce(source.c.transaction_type, String),  # raw enum name, no per-row Enum objects
+        source.c.category_id
+    ]
+    if not currency:
+        stmt = select(*columns)
+    else:
+        stmt = select(*columns, account_currency).join(Account, Account.id == source.c.account_id)
+    stmt = stmt.where(
+        source.c.user_id == user_id,
+        source.c.date >= lower,
+        source.c.date < upper
+    )
+    rows = db.execute(stmt).all()
+    if not currency:
+        return frame_from_rows(rows, start, end)
+
+    frame = frame_from_rows([row[:4] for row in rows], start, end)
+    if rows:
+        frame.amounts = fx_cache.convert(frame.amounts, [row[4] for row in rows], frame.days, currency)
+    frame.currency = currency
+    return frame
+
+
+def frame_from_rows(rows, start: date, end: date) -> CashFlowFrame:
+    """Build the column arrays from (date, amount, type, category_id) rows"""
+    if not rows:
+        return CashFlowFrame(
+            start, end,
+            np.empty(0, dtype="datetime64[D]"), np.empty(0, dtype=np.float64),
+            np.empty(0, dtype=np.int8), np.empty(0, dtype=np.int64)
+        )
+
+    dates, amounts, types, category_ids = zip(*rows)
+    types = np.array(types)
+    return CashFlowFrame(
+        start=start,
+        end=end,
+        days=np.array(dates, dtype="datetime64[s]").astype("datetime64[D]"),
+        amounts=np.array(amounts, dtype=np.float64),
+        kinds=np.select([types == "INCOME", types == "EXPENSE"], [INCOME, EXPENSE], TRANSFER).astype(np.int8),
+        category_ids=np.array(category_ids, dtype=np.int64),
+    )
+
+
+def bucket_edges(start: date, end: date, granularity: str) -> np.ndarray:
+    """Start date of every bucket that overlaps [start, end]"""
+    first = np.datetime64(start, "D")
+    last = np.datetime64(end, "D")
+    if granularity == "day":
+        return np.arange(first, last + 1, dtype="datetime64[D]")
+    if granularity == "week":
+        monday = first - np.timedelta64(start.weekday(), "D")
+        return np.arange(monday, last + 1, 7, dtype="datetime64[D]")
+    if granularity == "month":
+        return np.arange(first.astype("datetime64[M]"), last.astype("datetime64[M]") + 1).astype("datetime64[D]")
+    raise ValueError(f"Unknown granularity '{granularity}', expected one of {GRANULARITIES}")
+
+
+def bucket_index(frame: CashFlowFrame, edges: np.ndarray) -> np.ndarray:
+    """Bucket number of every transaction"""
+    return np.searchsorted(edges, frame.days, side="right") - 1
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing mean over `window` buckets (shorter at the start), via cumulative sums"""
+    if window <= 1 or len(values) == 0:
+        return values.copy()
+    sums = np.concatenate(([0.0], np.cumsum(values)))
+    idx = np.arange(1, len(values) + 1)
+    lower = np.maximum(idx - window, 0)
+    return (sums[idx] - sums[lower]) / (idx - lower)
+
+
+def cash_flow_series(frame: CashFlowFrame, granularity: str = "month", window: int = 3) -> dict:
+    """Inflow, outflow, net, savings rate and rolling averages per bucket"""
+    edges = bucket_edges(frame.start, frame.end, granularity)
+    n = len(edges)
+    idx = bucket_index(frame, edges)
+
+    inflow = np.bincount(idx, weights=np.where(frame.kinds == INCOME, frame.amounts, 0.0), minlength=n)
+    outflow = np.bincount(idx, weights=np.where(frame.kinds == EXPENSE, frame.amounts, 0.0), minlength=n)
+    net = inflow - outflow
+    savings_rate = np.divide(net, inflow, out=np.zeros(n), where=inflow > 0)
+
+    total_in = inflow.sum()
+    return {
+        "granularity": granularity,
+        "currency": frame.currency,
+        "buckets": edges.tolist(),
+        "inflow": np.round(inflow, 2).tolist(),
+        "outflow": np.round(outflow, 2).tolist(),
+        "net": np.round(net, 2).tolist(),
+        "savings_rate": np.round(savings_rate, 4).tolist(),
+        "rolling_window": window,
+        "rolling_inflow": np.round(rolling_mean(inflow, window), 2).tolist(),
+        "rolling_outflow": np.round(rolling_mean(outflow, window), 2).tolist(),
+        "rolling_net": np.round(rolling_mean(net, window), 2).tolist(),
+        "total_inflow": round(float(total_in), 2),
+        "total_outflow": round(float(outflow.sum()), 2),
+        "overall_savings_rate": round(float((total_in - outflow.sum()) / total_in), 4) if total_in > 0 else 0.0,
+    }
+
+
+def category_mix(frame: CashFlowFrame, granularity: str = "month") -> dict:
+    """Expense totals per category per bucket, plus each category's share of all spending"""
+    edges = bucket_edges(frame.start, frame.end, granularity)
+    n = len(edges)
+
+    expense = frame.kinds == EXPENSE
+    categories, cat_idx = np.unique(frame.category_ids[expense], return_inverse=True)
+    k = len(categories)
+    idx = bucket_index(frame, edges)[expense]
+
+    # One bincount over a combined (bucket, category) key gives the whole matrix
+    matrix = np.bincount(idx * k + cat_idx, weights=frame.amounts[expense], minlength=n * k).reshape(n, k) \
+        if k else np.zeros((n, 0))
+    totals = matrix.sum(axis=0)
+    grand_total = totals.sum()
+
+    return {
+        "granularity": granularity,
+        "currency": frame.currency,
+        "buckets": edges.tolist(),
+        "category_ids": categories.tolist(),
+        "totals": np.round(totals, 2).tolist(),
+        "shares": np.round(totals / grand_total, 4).tolist() if grand_total > 0 else [0.0] * k,
+        "series": np.round(matrix.T, 2).tolist(),   # one row per category
+    }
@@ -0,0 +1,135 @@
+"""
+Cold-history tier for transactions.
+
+archive_transactions() moves transactions older than ARCHIVE_AFTER_DAYS from
+`transactions` into `transactions_archive` in committed id batches, so the hot
+table and its indexes only hold recent history. On the monthly-partitioned
+table, old partitions left empty are dropped afterwards.
+
+Readers call transaction_source() instead of using the transactions table
+directly. It returns the hot table unless archived rows could fall in the
+requested user/date range (one probe on the archive's (user_id, date) index),
+in which case it returns a UNION ALL of both tables with the same columns. Both
+sides are filtered before the union, so each keeps its own index plan.
+"""
+import os
+from datetime import date, datetime, time, timedelta
+from typing import Callable, Optional
+
+from sqlalchemy import delete, exists, insert, select, text, union_all
+from sqlalchemy.orm import Session
+
+from database.models.transaction import Transaction
+from database.models.transaction_archive import TransactionArchive
+from services.partitions import existing_partitions, month_start, partition_name, partitioned_table
+
+ARCHIVE_AFTER_DAYS = int(os.getenv("TRANSACTION_ARCHIVE_AFTER_DAYS", "730"))
+ARCHIVE_BATCH_SIZE = 5000
+
+HOT_TABLE = Transaction.__table__
+ARCHIVE_TABLE = TransactionArchive.__table__
+# Columns the two tables share, in the hot table's order
+COLUMNS = [column.name for column in HOT_TABLE.columns]
+
+
+def archive_cutoff(older_than_days: Optional[int] = None, today: Optional[date] = None) -> datetime:
+    days = ARCHIVE_AFTER_DAYS if older_than_days is None else older_than_days
+    return datetime.combine((today or date.today()) - timedelta(days=days), time())
+
+
+def _ranged(table, stmt, user_id: Optional[int], start: Optional[datetime], end: Optional[datetime]):
+    if user_id is not None:
+        stmt = stmt.where(table.c.user_id == user_id)
+    if start is not None:
+        stmt = stmt.where(table.c.date >= start)
+    if end is not None:
+        stmt = stmt.where(table.c.date <= end)
+    return stmt
+
+
+def has_archived(db: Session, user_id: Optional[int] = None,
+                 start: Optional[datetime] = None, end: Optional[datetime] = None) -> bool:
+    """Whether any archived transaction matches the user and date range"""
+    probe = _ranged(ARCHIVE_TABLE, select(ARCHIVE_TABLE.c.id), user_id, start, end)
+    return db.execute(select(exists(probe))).scalar()
+
+
+def transaction_source(db: Session, user_id: Optional[int] = None,
+                       start: Optional[datetime] = None, end: Optional[datetime] = None):
+    """
+    Table-like source of transactions with the transactions columns: the hot
+    table, or hot + archive restricted to `user_id` and [start, end] when the
+    archive has rows there. Query it through `.c`.
+    """
+    if not has_archived(db, user_id, start, end):
+        return HOT_TABLE
+    hot = _ranged(HOT_TABLE, select(*(HOT_TABLE.c[name] for name in COLUMNS)), user_id, start, end)
+    cold = _ranged(ARCHIVE_TABLE, select(*(ARCHIVE_TABLE.c[name] for name in COLUMNS)), user_id, start, end)
+    return union_all(hot, cold).subquery("all_transactions")
+
+
+def find_archived(db: Session, transaction_id: int, user_id: int) -> Optional[TransactionArchive]:
+    return db.query(TransactionArchive).filter(
+        TransactionArchive.id == transaction_id,
+        TransactionArchive.user_id == user_id
+    ).first()
+
+
+def archive_transactions(db: Session, older_than_days: Optional[int] = None,
+                         batch_size: int = ARCHIVE_BATCH_SIZE, max_batches: Optional[int] = None,
+                         progress: Optional[Callable[[int], None]] = None) -> int:
+    """
+    Move transactions dated before the cutoff into the archive, committing
+    each batch of `batch_size`: copy, then delete from the hot table, in one
+    DB transaction. Returns the number of rows moved; `progress(moved)` is
+    called after every batch.
+    """
+    cutoff = archive_cutoff(older_than_days)
+    moved = 0
+    batches = 0
+    last_id = 0
+    while max_batches is None or batches < max_batches:
+        ids = db.execute(
+            select(HOT_TABLE.c.id).where(HOT_TABLE.c.id > last_id, HOT_TABLE.c.date < cutoff)
+            .order_by(HOT_TABLE.c.id).limit(batch_size).with_for_update()
+        ).scalars().all()
+        if not ids:
+            break
+        batch = (HOT_TABLE.c.id.in_(ids), HOT_TABLE.c.date < cutoff)
+        db.execute(insert(ARCHIVE_TABLE).from_select(
+            COLUMNS, select(*(HOT_TABLE.c[name] for name in COLUMNS)).where(*batch)
+        ))
+        db.execute(delete(HOT_TABLE).where(*batch))
+        db.commit()
+        moved += len(ids)
+        batches += 1
+        last_id = ids[-1]
+        if progress:
+            progress(moved)
+
+    if moved:
+        drop_empty_partitions(db, cutoff)
+    return moved
+
+
+def drop_empty_partitions(db: Session, cutoff: datetime) -> list[str]:
+    """
+    Drop monthly partitions that end before `cutoff` and have no rows left
+    (PostgreSQL only). Commits each one. Returns the names dropped.
+    """
+    parent = partitioned_table(db)
+    if parent is None:
+        return []
+    dropped = []
+    existing = existing_partitions(db, parent)
+    first_kept = month_start(cutoff.date())
+    for name in sorted(existing):
+        if not name.startswith("transactions_p") or name >= partition_name(first_kept):
+            continue
+        if db.execute(text(f'SELECT EXISTS (SELECT 1 FROM "{name}")')).scalar():
+            continue
+        db.execute(text(f'ALTER TABLE "{parent}" DETACH PARTITION "{name}"'))
+        db.execute(text(f'DROP TABLE "{name}"'))
+        db.commit()
+        dropped.append(name)
+    return dropped
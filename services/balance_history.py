@@ -0,0 +1,286 @@
+"""
+Daily account balance snapshots.
+
+apply_balance_changes() is called by every balance-changing write in the
+same DB transaction, including back-dated transactions. Changes are folded
+per (account, day) and applied with a fixed number of statements however many
+there are, so the request path and the recurring scheduler share one code path.
+Balance-as-of reads one snapshot row plus the same-day tail of transactions.
+"""
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Iterable, Optional
+
+import numpy as np
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.orm import Session
+
+from database.models.account import Account
+from database.models.balance_snapshot import AccountBalanceSnapshot as Snapshot
+from database.models.transaction import TransactionType
+from services.archive import transaction_source
+
+CHUNK_SIZE = 500
+
+
+@dataclass
+class BalanceChange:
+    """A signed change to one account's balance, dated by its transaction"""
+    account_id: int
+    day: date
+    delta: float
+
+
+def balance_effects(transaction_type, amount: float, account_id: int, to_account: Optional[int] = None) -> list[tuple[int, float]]:
+    """(account_id, delta) pairs a transaction applies to balances"""
+    if transaction_type == TransactionType.INCOME:
+        return [(account_id, amount)]
+    if transaction_type == TransactionType.EXPENSE:
+        return [(account_id, -amount)]
+    if transaction_type == TransactionType.TRANSFER:
+        effects = [(account_id, -amount)]
+        if to_account:
+            effects.append((to_account, amount))
+        return effects
+    return []
+
+
+def transaction_changes(transaction_type, amount: float, account_id: int, to_account: Optional[int],
+                        when: Optional[datetime], sign: int = 1) -> list[BalanceChange]:
+    """Balance changes for one transaction; sign=-1 reverses it"""
+    day = (when or datetime.now()).date()
+    return [BalanceChange(acc, day, sign * delta) for acc, delta in balance_effects(transaction_type, amount, account_id, to_account)]
+
+
+def _chunks(items: list, size: int = CHUNK_SIZE):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def apply_balance_changes(db: Session, changes: Iterable[BalanceChange], balances_after: dict[int, float]) -> None:
+    """
+    Fold balance changes into the snapshot table. Does not commit.
+
+    `balances_after` holds each affected account's balance with these
+    changes already applied; it is only needed for accounts that have no
+    snapshot rows yet.
+    """
+    per_account = defaultdict(lambda: defaultdict(float))
+    for change in changes:
+        if change.delta:
+            per_account[change.account_id][change.day] += change.delta
+    if not per_account:
+        return
+
+    for account_ids in _chunks(list(per_account)):
+        first_day = {acc: min(per_account[acc]) for acc in account_ids}
+
+        # Existing rows on or after each account's earliest changed day
+        existing = defaultdict(dict)
+        later = or_(*(and_(Snapshot.account_id == acc, Snapshot.day >= first_day[acc]) for acc in account_ids))
+        for acc, day, closing, net in db.execute(
+            select(Snapshot.account_id, Snapshot.day, Snapshot.closing_balance, Snapshot.net_change).where(later)
+        ):
+            existing[acc][day] = (closing, net)
+
+        # Closing balance of the last row before that day
+        earlier = or_(*(and_(Snapshot.account_id == acc, Snapshot.day < first_day[acc]) for acc in account_ids))
+        last_before = select(Snapshot.account_id, func.max(Snapshot.day).label("day")).where(earlier) \
+            .group_by(Snapshot.account_id).subquery()
+        previous = dict(db.execute(
+            select(Snapshot.account_id, Snapshot.closing_balance).join(
+                last_before,
+                and_(Snapshot.account_id == last_before.c.account_id, Snapshot.day == last_before.c.day)
+            )
+        ).all())
+
+        rows = []
+        for acc in account_ids:
+            deltas = per_account[acc]
+            rows_after = existing.get(acc, {})
+
+            if acc in previous:
+                opening = previous[acc]
+            elif rows_after:
+                first = rows_after[min(rows_after)]
+                opening = first[0] - first[1]
+            else:
+                opening = balances_after[acc] - sum(deltas.values())
+
+            # New closing = old closing + every delta dated on or before that day
+            cumulative = 0.0
+            old_closing = opening
+            for day in sorted(set(rows_after) | set(deltas)):
+                closing, net = rows_after.get(day, (old_closing, 0.0))
+                old_closing = closing
+                cumulative += deltas.get(day, 0.0)
+                rows.append({
+                    "account_id": acc,
+                    "day": day,
+                    "closing_balance": closing + cumulative,
+                    "net_change": net + deltas.get(day, 0.0),
+                    "updated_at": datetime.now(),
+                })
+
+        db.execute(Snapshot.__table__.delete().where(later))
+        db.execute(Snapshot.__table__.insert(), rows)
+
+
+def rebuild_balance_snapshots(db: Session, account_ids: Optional[list[int]] = None, batch_size: int = CHUNK_SIZE) -> int:
+    """
+    Recompute snapshots from the ledger, working back from each account's
+    current balance. Commits per batch of accounts. Returns rows written.
+    """
+    query = db.query(Account.id).order_by(Account.id)
+    if account_ids is not None:
+        query = query.filter(Account.id.in_(account_ids))
+    all_ids = [row.id for row in query.all()]
+    source = transaction_source(db)  # the whole ledger, archived history included
+
+    written = 0
+    for batch in _chunks(all_ids, batch_size):
+        balances = dict(db.query(Account.id, Account.balance).filter(Account.id.in_(batch)).all())
+
+        nets = defaultdict(lambda: defaultdict(float))
+        ledger = db.query(
+            source.c.account_id, source.c.to_account, source.c.transaction_type,
+            source.c.amount, source.c.date
+        ).filter(
+            or_(source.c.account_id.in_(batch), source.c.to_account.in_(batch))
+        ).yield_per(5000)
+        for account_id, to_account, transaction_type, amount, when in ledger:
+            for acc, delta in balance_effects(transaction_type, amount, account_id, to_account):
+                if acc in balances:
+                    nets[acc][when.date()] += delta
+
+        rows = []
+        for acc, by_day in nets.items():
+            days = sorted(by_day)
+            net = np.array([by_day[day] for day in days])
+            # closing(last day) is today's balance; walk back by subtracting later days' nets
+            later_nets = np.concatenate((np.cumsum(net[::-1])[::-1][1:], [0.0]))
+            closing = balances[acc] - later_nets
+            rows.extend(
+                {"account_id": acc, "day": day, "closing_balance": float(c), "net_change": float(n)}
+                for day, c, n in zip(days, closing, net)
+            )
+
+        db.query(Snapshot).filter(Snapshot.account_id.in_(batch)).delete(synchronize_session=False)
+        if rows:
+            db.bulk_insert_mappings(Snapshot, rows)
+        db.commit()
+        written += len(rows)
+
+    return written
+
+
+def _opening_balance(db: Session, account: Account, day: date) -> float:
+    """Balance at the start of `day`, from the nearest snapshot row"""
+    before = db.query(Snapshot.closing_balance).filter(
+        Snapshot.account_id == account.id,
+        Snapshot.day < day
+    ).order_by(Snapshot.day.desc()).first()
+    if before:
+        return before.closing_balance
+
+    first = db.query(Snapshot.closing_balance, Snapshot.net_change).filter(
+        Snapshot.account_id == account.id
+    ).order_by(Snapshot.day).first()
+    if first:
+        return first.closing_balance - first.net_change
+    return account.balance
+
+
+def balance_as_of(db: Session, account: Account, at: datetime) -> float:
+    """Balance at an instant: the previous day's closing plus that day's transactions up to `at`"""
+    day_start = datetime.combine(at.date(), time())
+    balance = _opening_balance(db, account, at.date())
+
+    source = transaction_source(db, start=day_start, end=at)
+    tail = db.query(
+        source.c.account_id, source.c.to_account, source.c.transaction_type, source.c.amount
+    ).filter(
+        or_(source.c.account_id == account.id, source.c.to_account == account.id),
+        source.c.date >= day_start,
+        source.c.date <= at
+    ).all()
+    for account_id, to_account, transaction_type, amount in tail:
+        for acc, delta in balance_effects(transaction_type, amount, account_id, to_account):
+            if acc == account.id:
+                balance += delta
+    return balance
+
+
+def opening_balances(db: Session, accounts: list[Account], day: date) -> dict[int, float]:
+    """Balance at the start of `day` for many accounts, with two queries per chunk"""
+    opening = {}
+    for chunk in _chunks([account.id for account in accounts]):
+        last_before = select(Snapshot.account_id, func.max(Snapshot.day).label("day")).where(
+            Snapshot.account_id.in_(chunk), Snapshot.day < day
+        ).group_by(Snapshot.account_id).subquery()
+        opening.update(db.execute(
+            select(Snapshot.account_id, Snapshot.closing_balance).join(
+                last_before,
+                and_(Snapshot.account_id == last_before.c.account_id, Snapshot.day == last_before.c.day)
+            )
+        ).all())
+
+        # No row before `day`: open at the first row's balance before its own changes
+        missing = [acc for acc in chunk if acc not in opening]
+        if missing:
+            first = select(Snapshot.account_id, func.min(Snapshot.day).label("day")).where(
+                Snapshot.account_id.in_(missing)
+            ).group_by(Snapshot.account_id).subquery()
+            for acc, closing, net in db.execute(
+                select(Snapshot.account_id, Snapshot.closing_balance, Snapshot.net_change).join(
+                    first,
+                    and_(Snapshot.account_id == first.c.account_id, Snapshot.day == first.c.day)
+                )
+            ):
+                opening[acc] = closing - net
+
+    for account in accounts:
+        opening.setdefault(account.id, account.balance)
+    return opening
+
+
+def closing_balance_matrix(db: Session, accounts: list[Account], start: date, end: date) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Closing balance of every account on every day in [start, end], forward-filled
+    from the snapshot rows. Returns (days, matrix) with one matrix row per account.
+    """
+    days = np.arange(np.datetime64(start, "D"), np.datetime64(end, "D") + 1)
+    opening = opening_balances(db, accounts, start)
+    matrix = np.repeat(np.array([opening[account.id] for account in accounts], dtype=np.float64)[:, None], len(days), axis=1)
+    position = {account.id: i for i, account in enumerate(accounts)}
+
+    for chunk in _chunks(list(position)):
+        rows = db.query(Snapshot.account_id, Snapshot.day, Snapshot.closing_balance).filter(
+            Snapshot.account_id.in_(chunk),
+            Snapshot.day >= start,
+            Snapshot.day <= end
+        ).order_by(Snapshot.account_id, Snapshot.day).all()
+        if not rows:
+            continue
+
+        account_ids, snap_days, snap_values = zip(*rows)
+        account_ids = np.array(account_ids)
+        snap_days = np.array(snap_days, dtype="datetime64[D]")
+        snap_values = np.array(snap_values, dtype=np.float64)
+        # Rows are sorted by account, so each account is one contiguous slice
+        accs, starts = np.unique(account_ids, return_index=True)
+        ends = np.append(starts[1:], len(account_ids))
+        for acc, lo, hi in zip(accs, starts, ends):
+            i = position[int(acc)]
+            # Index of the latest snapshot on or before each day (-1 = none yet)
+            idx = np.searchsorted(snap_days[lo:hi], days, side="right") - 1
+            matrix[i] = np.where(idx >= 0, snap_values[lo:hi][np.maximum(idx, 0)], matrix[i])
+
+    return days, matrix
+
+
+def balance_history(db: Session, account: Account, start: date, end: date) -> dict:
+    """Closing balance for every day in [start, end], forward-filled from the snapshot rows"""
+    days, matrix = closing_balance_matrix(db, [account], start, end)
+    return {"days": days.tolist(), "closing_balances": np.round(matrix[0], 2).tolist()}
@@ -0,0 +1,195 @@
+"""
+Budget spend counters.
+
+Every budget keeps one BudgetSpend row per period holding the amount spent
+so far. The transaction write paths call apply_budget_spend() inside their
+own DB transaction, so counters commit (or roll back) together with the
+ledger change and a status read never has to SUM the transactions table.
+"""
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Iterable, Optional
+
+from sqlalchemy.orm import Session
+
+from database.models.budget import Budget, BudgetPeriod, BudgetSpend
+from database.models.transaction import TransactionType
+from services.archive import transaction_source
+
+
+@dataclass
+class SpendEntry:
+    """One signed change to a user's spending in a category"""
+    user_id: int
+    category_id: int
+    amount: float          # positive adds spend, negative removes it
+    day: date
+    count: int = 1         # +1 for a new expense, -1 for a removed one
+
+
+def period_start(period: BudgetPeriod, day: date) -> date:
+    """First day of the budget period that contains `day`"""
+    if period == BudgetPeriod.WEEKLY:
+        return day - timedelta(days=day.weekday())
+    if period == BudgetPeriod.MONTHLY:
+        return day.replace(day=1)
+    return day.replace(month=1, day=1)
+
+
+def period_end(period: BudgetPeriod, start: date) -> date:
+    """First day after the period that begins at `start`"""
+    if period == BudgetPeriod.WEEKLY:
+        return start + timedelta(days=7)
+    if period == BudgetPeriod.MONTHLY:
+        if start.month == 12:
+            return start.replace(year=start.year + 1, month=1)
+        return start.replace(month=start.month + 1)
+    return start.replace(year=start.year + 1)
+
+
+def expense_entries(user_id: int, category_id: int, transaction_type, amount: float,
+                    when: Optional[datetime], sign: int = 1) -> list[SpendEntry]:
+    """Spend entries for a single transaction (only expenses count against budgets)"""
+    if transaction_type != TransactionType.EXPENSE:
+        return []
+    day = (when or datetime.now()).date()
+    return [SpendEntry(user_id, category_id, sign * amount, day, sign)]
+
+
+def apply_budget_spend(db: Session, entries: Iterable[SpendEntry]) -> None:
+    """
+    Add spend entries to the matching budget counters.
+
+    Does not commit - the caller commits together with the transaction
+    change. Entries are folded per (budget, period) first, so an update that
+    moves an expense within the same period touches each counter once.
+    """
+    entries = [e for e in entries if e.amount or e.count]
+    if not entries:
+        return
+
+    user_ids = {e.user_id for e in entries}
+    category_ids = {e.category_id for e in entries}
+    budgets = db.query(Budget.id, Budget.user_id, Budget.category_id, Budget.period).filter(
+        Budget.user_id.in_(user_ids),
+        Budget.category_id.in_(category_ids)
+    ).all()
+    if not budgets:
+        return
+
+    by_key = defaultdict(list)
+    for budget_id, user_id, category_id, period in budgets:
+        by_key[(user_id, category_id)].append((budget_id, period))
+
+    deltas = defaultdict(lambda: [0.0, 0])
+    for entry in entries:
+        for budget_id, period in by_key.get((entry.user_id, entry.category_id), ()):
+            delta = deltas[(budget_id, period_start(period, entry.day))]
+            delta[0] += entry.amount
+            delta[1] += entry.count
+
+    _upsert_spend(db, [
+        {"budget_id": budget_id, "period_start": start, "spent": spent, "transaction_count": count}
+        for (budget_id, start), (spent, count) in deltas.items()
+    ])
+
+
+def _upsert_spend(db: Session, rows: list[dict]) -> None:
+    """Increment counters atomically, creating missing period rows"""
+    if not rows:
+        return
+
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+
+        table = BudgetSpend.__table__
+        stmt = insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.budget_id, table.c.period_start],
+            set_={
+                "spent": table.c.spent + stmt.excluded.spent,
+                "transaction_count": table.c.transaction_count + stmt.excluded.transaction_count,
+                "updated_at": datetime.now(),
+            }
+        )
+        db.execute(stmt, rows)
+        return
+
+    # Generic fallback: read-modify-write through the ORM
+    for row in rows:
+        counter = db.get(BudgetSpend, (row["budget_id"], row["period_start"]))
+        if counter is None:
+            db.add(BudgetSpend(**row))
+        else:
+            counter.spent += row["spent"]
+            counter.transaction_count += row["transaction_count"]
+
+
+def rebuild_budget_spend(db: Session, user_id: Optional[int] = None,
+                         budget_ids: Optional[list[int]] = None) -> int:
+    """
+    Recompute budget counters from the transaction ledger.
+
+    Scoped to one user or a list of budgets when given, otherwise rebuilds
+    every budget. Does not commit. Returns the number of counters written.
+    """
+    budget_query = db.query(Budget.id)
+    if user_id is not None:
+        budget_query = budget_query.filter(Budget.user_id == user_id)
+    if budget_ids is not None:
+        budget_query = budget_query.filter(Budget.id.in_(budget_ids))
+    scope = [row.id for row in budget_query.all()]
+    if not scope:
+        return 0
+
+    db.query(BudgetSpend).filter(BudgetSpend.budget_id.in_(scope)).delete(synchronize_session=False)
+
+    source = transaction_source(db, user_id)  # archived history included
+    ledger = db.query(
+        Budget.id, Budget.period, source.c.date, source.c.amount
+    ).join(
+        source,
+        (source.c.user_id == Budget.user_id) & (source.c.category_id == Budget.category_id)
+    ).filter(
+        Budget.id.in_(scope),
+        source.c.transaction_type == TransactionType.EXPENSE
+    ).yield_per(5000)
+
+    totals = defaultdict(lambda: [0.0, 0])
+    for budget_id, period, when, amount in ledger:
+        total = totals[(budget_id, period_start(period, when.date()))]
+        total[0] += amount
+        total[1] += 1
+
+    db.bulk_insert_mappings(BudgetSpend, [
+        {"budget_id": budget_id, "period_start": start, "spent": spent, "transaction_count": count}
+        for (budget_id, start), (spent, count) in totals.items()
+    ])
+    return len(totals)
+
+
+def budget_status(db: Session, budget: Budget, today: Optional[date] = None) -> dict:
+    """Current-period status for a budget, read from its counter row"""
+    start = period_start(budget.period, today or date.today())
+    counter = db.get(BudgetSpend, (budget.id, start))
+    spent = counter.spent if counter else 0.0
+
+    return {
+        "budget_id": budget.id,
+        "name": budget.name,
+        "category_id": budget.category_id,
+        "period": budget.period,
+        "period_start": start,
+        "period_end": period_end(budget.period, start),
+        "amount": budget.amount,
+        "spent": spent,
+        "remaining": budget.amount - spent,
+        "percent_used": round(spent / budget.amount * 100, 2) if budget.amount else 0.0,
+        "transaction_count": counter.transaction_count if counter else 0,
+        "is_exceeded": spent > budget.amount,
+    }
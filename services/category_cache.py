@@ -0,0 +1,126 @@
+"""
+Per-user cache of GET /categories/my.
+
+Each user's active category list is cached after the first read, in an LRU
+bounded by both the number of users and the total number of cached rows. The
+category routes invalidate it on every assignment write, after committing. An
+admin edit to a system category fans out through a reverse index
+(category id -> cached user ids) to exactly the users holding it, so the
+edit never scans user_categories.
+
+A read that started before an invalidation is not stored, so a stale list
+can't be cached over a newer write. The TTL only matters when several
+processes serve requests, since each has its own cache.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Iterable, Optional
+
+CACHE_MAX_USERS = 10000
+CACHE_MAX_ROWS = 200000
+CACHE_TTL_SECONDS = 300
+
+
+class UserCategoryCache:
+    """LRU of user id -> tuple of category responses, with hit/miss statistics"""
+
+    def __init__(self, max_users: int = CACHE_MAX_USERS, max_rows: int = CACHE_MAX_ROWS,
+                 ttl: float = CACHE_TTL_SECONDS):
+        self.max_users = max_users
+        self.max_rows = max_rows
+        self.ttl = ttl
+        self._entries: OrderedDict[int, tuple[float, tuple]] = OrderedDict()
+        self._users_by_category: dict[int, set[int]] = {}
+        self._rows = 0
+        self._generation = 0      # Bumped by every invalidation
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def _drop(self, user_id: int) -> bool:
+        entry = self._entries.pop(user_id, None)
+        if entry is None:
+            return False
+        self._rows -= len(entry[1])
+        for item in entry[1]:
+            users = self._users_by_category.get(item.id)
+            if users is not None:
+                users.discard(user_id)
+                if not users:
+                    del self._users_by_category[item.id]
+        return True
+
+    def get_or_load(self, user_id: int, load: Callable[[], list]) -> list:
+        """The user's cached list, or load() it (outside the lock) and cache it"""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and time.monotonic() - entry[0] <= self.ttl:
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return list(entry[1])
+            self.misses += 1
+            generation = self._generation
+
+        items = tuple(load())
+
+        with self._lock:
+            if generation == self._generation and len(items) <= self.max_rows:
+                self._drop(user_id)
+                self._entries[user_id] = (time.monotonic(), items)
+                self._rows += len(items)
+                for item in items:
+                    self._users_by_category.setdefault(item.id, set()).add(user_id)
+                while len(self._entries) > self.max_users or self._rows > self.max_rows:
+                    self._drop(next(iter(self._entries)))
+                    self.evictions += 1
+        return list(items)
+
+    def invalidate_users(self, user_ids: Iterable[int]) -> None:
+        with self._lock:
+            self._generation += 1
+            for user_id in user_ids:
+                if self._drop(user_id):
+                    self.invalidations += 1
+
+    def invalidate_category(self, category_id: int) -> None:
+        """Drop every cached list that includes this category"""
+        with self._lock:
+            self._generation += 1
+            for user_id in tuple(self._users_by_category.get(category_id, ())):
+                if self._drop(user_id):
+                    self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._users_by_category.clear()
+            self._rows = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "users": len(self._entries),
+                "rows": self._rows,
+                "max_users": self.max_users,
+                "max_rows": self.max_rows,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+user_category_cache = UserCategoryCache()
+
+
+def invalidate_user_categories(*user_ids: int) -> None:
+    """Call after committing a change to these users' category assignments"""
+    user_category_cache.invalidate_users(user_ids)
+
+
+def invalidate_category(category_id: int) -> None:
+    """Call after committing a change to a category's own fields"""
+    user_category_cache.invalidate_category(category_id)
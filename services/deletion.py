@@ -0,0 +1,154 @@
+"""
+Chunked deletes for users and accounts.
+
+Deleting a user or account in one go means one transaction that locks its
+whole history, and through the ORM it would also load every related row first.
+Instead, the request only sets `pending_delete`, which hides the row from
+every lookup, and queues a job (request_*_delete). The job deletes the
+dependent rows, biggest tables first, in committed batches of
+DELETE_BATCH_SIZE, and then the row itself.
+
+Each batch of an account's transactions is deleted in the same DB
+transaction as the budget counters losing its expenses and a TRANSACTION
+tombstone per row for sync clients, so a retry only sees rows not yet
+handled. The user's other accounts are left as they are: their balances
+and snapshots keep transfers to or from the deleted account, and so do
+their own transaction rows.
+
+A write that raced the flag can leave a row behind. The final delete then
+fails on its foreign key, and the job's retry sweeps the remaining rows.
+"""
+from datetime import date
+from typing import Callable, Optional
+
+from sqlalchemy import delete, select, tuple_, update
+from sqlalchemy.orm import Session
+
+from database.models import (
+    Account, AccountBalanceSnapshot, BalanceRollup, Budget, BudgetSpend, ChangeLog, Holding, IdempotencyKey,
+    RecurringTransaction, SyncEntity, Transaction, TransactionArchive, TransactionVolumeRollup, User, user_category_association,
+)
+from services.budgets import apply_budget_spend, expense_entries
+from services.jobs import enqueue
+from services.rollups import recount_signup_months
+from services.sync import deleted as deleted_entries, record_changes
+
+DELETE_BATCH_SIZE = 5000
+
+Progress = Optional[Callable[[float, Optional[str]], None]]
+
+
+def delete_in_batches(db: Session, table, *criteria, batch_size: int = DELETE_BATCH_SIZE,
+                      on_batch: Optional[Callable] = None, progress: Optional[Callable[[int], None]] = None) -> int:
+    """
+    Delete the rows of `table` matching `criteria`, committing every `batch_size`;
+    returns rows deleted. `on_batch(db, rows)`, if given, sees each batch's rows
+    first and commits with their delete. `progress(deleted)` is called after
+    every batch.
+    """
+    key = list(table.primary_key.columns)
+    batch_key = key[0] if len(key) == 1 else tuple_(*key)
+    deleted = 0
+    while True:
+        if on_batch is None:
+            batch = select(*key).where(*criteria).limit(batch_size)
+        else:
+            rows = db.execute(select(table).where(*criteria).limit(batch_size)).all()
+            on_batch(db, rows)
+            batch = [row._mapping[key[0].name] if len(key) == 1 else tuple(row._mapping[c.name] for c in key) for row in rows]
+        count = db.execute(delete(table).where(batch_key.in_(batch))).rowcount
+        db.commit()
+        deleted += count
+        if progress:
+            progress(deleted)
+        if count < batch_size:
+            return deleted
+
+
+def _run_steps(db: Session, steps: list, batch_size: int, progress: Progress) -> dict:
+    """Run (name, table, criteria[, on_batch]) delete steps in order"""
+    deleted = {}
+    for number, (name, table, criteria, *on_batch) in enumerate(steps):
+        batch_progress = None
+        if progress:
+            progress(number / len(steps), f"Deleting {name}")
+            # Once per batch too: a long step must keep refreshing the job's lock
+            def batch_progress(count, number=number, name=name):
+                progress(number / len(steps), f"Deleting {name}: {count} rows")
+        deleted[name] = delete_in_batches(db, table, *criteria, batch_size=batch_size,
+                                          on_batch=next(iter(on_batch), None), progress=batch_progress)
+    return deleted
+
+
+def _forget_transactions(db: Session, rows: list) -> None:
+    """on_batch hook: take a batch's expenses off the budget counters and tombstone its rows"""
+    apply_budget_spend(db, [
+        entry for row in rows
+        for entry in expense_entries(row.user_id, row.category_id, row.transaction_type, row.amount, row.date, sign=-1)
+    ])
+    record_changes(db, [entry for row in rows for entry in deleted_entries(row.user_id, SyncEntity.TRANSACTION, row.id)])
+
+
+def request_account_delete(db: Session, account: Account, requested_by: int):
+    """Hide the account and queue its deletion; does not commit. Returns the job."""
+    account.pending_delete = True
+    return enqueue(db, "accounts.delete", {"account_id": account.id}, user_id=requested_by)
+
+
+def request_user_delete(db: Session, user: User, requested_by: int):
+    """Hide the user (their token stops working) and queue the deletion; does not commit. Returns the job."""
+    user.pending_delete = True
+    return enqueue(db, "users.delete", {"user_id": user.id}, user_id=requested_by)
+
+
+def delete_account(db: Session, account_id: int, batch_size: int = DELETE_BATCH_SIZE, progress: Progress = None) -> dict:
+    """Delete a pending-delete account and everything that belongs to it; returns rows deleted per table"""
+    account = db.query(Account.id, Account.user_id).filter(Account.id == account_id, Account.pending_delete == True).first()
+    if account is None:
+        return {}
+    deleted = _run_steps(db, [
+        ("transactions", Transaction.__table__, (Transaction.account_id == account_id,), _forget_transactions),
+        ("transactions_archive", TransactionArchive.__table__, (TransactionArchive.account_id == account_id,), _forget_transactions),
+        ("account_balance_snapshots", AccountBalanceSnapshot.__table__, (AccountBalanceSnapshot.account_id == account_id,)),
+        ("recurring_transactions", RecurringTransaction.__table__, (RecurringTransaction.account_id == account_id,)),
+        ("holdings", Holding.__table__, (Holding.account_id == account_id,)),
+    ], batch_size, progress)
+
+    # Rules elsewhere that transfer into this account would post into nothing
+    db.execute(update(RecurringTransaction).where(RecurringTransaction.to_account == account_id).values(is_active=False))
+    deleted["accounts"] = db.execute(delete(Account.__table__).where(Account.__table__.c.id == account_id)).rowcount
+    # Logged again now the rows are gone, so the admin rollups rebuild this user (services/rollups.py)
+    record_changes(db, deleted_entries(account.user_id, SyncEntity.ACCOUNT, account_id))
+    db.commit()
+    return deleted
+
+
+def delete_user(db: Session, user_id: int, batch_size: int = DELETE_BATCH_SIZE, progress: Progress = None) -> dict:
+    """Delete a pending-delete user and all of their data; returns rows deleted per table"""
+    user = db.query(User.created_at).filter(User.id == user_id, User.pending_delete == True).first()
+    if user is None:
+        return {}
+    accounts = select(Account.id).where(Account.user_id == user_id)
+    budgets = select(Budget.id).where(Budget.user_id == user_id)
+    deleted = _run_steps(db, [
+        ("transactions", Transaction.__table__, (Transaction.user_id == user_id,)),
+        ("transactions_archive", TransactionArchive.__table__, (TransactionArchive.user_id == user_id,)),
+        ("change_log", ChangeLog.__table__, (ChangeLog.user_id == user_id,)),
+        ("account_balance_snapshots", AccountBalanceSnapshot.__table__, (AccountBalanceSnapshot.account_id.in_(accounts),)),
+        ("recurring_transactions", RecurringTransaction.__table__, (RecurringTransaction.user_id == user_id,)),
+        ("holdings", Holding.__table__, (Holding.user_id == user_id,)),
+        ("budget_spend", BudgetSpend.__table__, (BudgetSpend.budget_id.in_(budgets),)),
+        ("budgets", Budget.__table__, (Budget.user_id == user_id,)),
+        ("idempotency_keys", IdempotencyKey.__table__, (IdempotencyKey.user_id == user_id,)),
+        ("rollup_transaction_volume", TransactionVolumeRollup.__table__, (TransactionVolumeRollup.user_id == user_id,)),
+        ("rollup_balances", BalanceRollup.__table__, (BalanceRollup.user_id == user_id,)),
+        ("user_categories", user_category_association, (user_category_association.c.user_id == user_id,)),
+        ("accounts", Account.__table__, (Account.user_id == user_id,)),
+    ], batch_size, progress)
+
+    deleted["users"] = db.execute(delete(User.__table__).where(User.__table__.c.id == user_id)).rowcount
+    if user.created_at:
+        # refresh_signups only looks past its watermark, so it would never see this month again
+        recount_signup_months(db, [date(user.created_at.year, user.created_at.month, 1)])
+    db.commit()
+    return deleted
@@ -0,0 +1,146 @@
+"""
+Per-user real-time events (transactions, balances, accounts).
+
+Write paths call publish() after committing. The event goes to the broker,
+and every worker's broker hands it to its local EventHub, which fans it out
+to that user's WebSocket/SSE subscribers. Each subscriber has a bounded
+queue. A subscriber that falls MAX_QUEUED_EVENTS behind is dropped rather
+than buffered; the client reconnects and re-reads current state.
+
+LocalBroker delivers in-process only. Running several workers needs a
+shared Broker (Redis pub/sub, Postgres LISTEN/NOTIFY) implementing the
+same three methods.
+"""
+import asyncio
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from datetime import datetime
+from typing import Callable, Iterable, Optional
+
+MAX_QUEUED_EVENTS = 100
+HEARTBEAT_SECONDS = 15.0
+
+
+def make_event(event_type: str, data: dict) -> dict:
+    return {"type": event_type, "data": data, "ts": datetime.now().isoformat()}
+
+
+def balance_events(balances: dict) -> list[dict]:
+    """One account.balance event per {account_id: balance} entry"""
+    return [
+        make_event("account.balance", {"account_id": account_id, "balance": balance})
+        for account_id, balance in balances.items()
+    ]
+
+
+class Subscription:
+    """One connected client's queue of pending events"""
+
+    def __init__(self, user_id: int, max_queued: int = MAX_QUEUED_EVENTS):
+        self.user_id = user_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queued)
+        self.dropped = False
+
+    def offer(self, event: dict) -> bool:
+        """Queue an event without waiting; returns False (and marks dropped) when full"""
+        if self.dropped:
+            return False
+        try:
+            self.queue.put_nowait(event)
+            return True
+        except asyncio.QueueFull:
+            self.dropped = True
+            return False
+
+    async def next_event(self, timeout: float = HEARTBEAT_SECONDS) -> Optional[dict]:
+        """Next event, or None if nothing arrived within `timeout` (time for a heartbeat)"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class EventHub:
+    """In-process fan-out from user id to that user's subscriptions"""
+
+    def __init__(self, max_queued: int = MAX_QUEUED_EVENTS):
+        self.max_queued = max_queued
+        self._subscribers: dict[int, set[Subscription]] = defaultdict(set)
+        self.dropped_count = 0
+
+    def subscribe(self, user_id: int) -> Subscription:
+        subscription = Subscription(user_id, self.max_queued)
+        self._subscribers[user_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscribers = self._subscribers.get(subscription.user_id)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[subscription.user_id]
+
+    def deliver(self, user_id: int, event: dict) -> None:
+        """Hand an event to every subscriber of `user_id`; slow ones are dropped"""
+        for subscription in list(self._subscribers.get(user_id, ())):
+            if not subscription.offer(event):
+                self.unsubscribe(subscription)
+                self.dropped_count += 1
+
+    def subscriber_count(self, user_id: Optional[int] = None) -> int:
+        if user_id is not None:
+            return len(self._subscribers.get(user_id, ()))
+        return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+
+class Broker(ABC):
+    """Carries events between workers; each worker's hub receives every user's events"""
+
+    @abstractmethod
+    async def start(self, deliver: Callable[[int, dict], None]) -> None:
+        """Begin passing received events to `deliver(user_id, event)`"""
+
+    @abstractmethod
+    async def publish(self, user_id: int, event: dict) -> None:
+        """Send an event to every worker"""
+
+    @abstractmethod
+    async def stop(self) -> None:
+        """Stop receiving"""
+
+
+class LocalBroker(Broker):
+    """Single-process broker: publishing delivers straight to this worker's hub"""
+
+    def __init__(self):
+        self._deliver: Optional[Callable[[int, dict], None]] = None
+
+    async def start(self, deliver: Callable[[int, dict], None]) -> None:
+        self._deliver = deliver
+
+    async def publish(self, user_id: int, event: dict) -> None:
+        if self._deliver is not None:
+            self._deliver(user_id, event)
+
+    async def stop(self) -> None:
+        self._deliver = None
+
+
+event_hub = EventHub()
+broker: Broker = LocalBroker()
+_started = False
+
+
+async def ensure_started() -> None:
+    """Connect the broker to this worker's hub (once, on first publish or subscribe)"""
+    global _started
+    if not _started:
+        await broker.start(event_hub.deliver)
+        _started = True
+
+
+async def publish(user_id: int, events: Iterable[dict]) -> None:
+    """Publish events for one user; call only after the write has committed"""
+    await ensure_started()
+    for event in events:
+        await broker.publish(user_id, event)
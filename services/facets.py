@@ -0,0 +1,114 @@
+"""
+Faceted transaction search: one page of transactions plus counts and totals
+per category, transaction type and account, all from one statement.
+
+The filtered transactions are a CTE, which is read twice: once for the page
+(newest first, with OFFSET/LIMIT) and once for the facets. The two
+results are combined with UNION ALL into one result set; a `kind` column
+tells page rows (0) from facet rows (1). On PostgreSQL the facets are one
+GROUP BY GROUPING SETS, so the filtered rows are aggregated in a single pass.
+SQLite has no GROUPING SETS, so there each facet is its own GROUP BY, UNION
+ALLed in. Either way it is one round trip.
+
+Facets are grouped by account currency as well, since amounts are not
+converted. Facets nobody asked for are not computed, and with no facets
+requested the caller should run its plain page query instead.
+"""
+from typing import Optional, Sequence
+
+from sqlalchemy import Float, Integer, String, cast, func, literal, null, select, tuple_, union_all
+from sqlalchemy.orm import Session
+
+from database.models.account import Account
+from services.fx import account_currency
+
+# Facet name -> transactions column it groups by
+FACETS = {
+    "category": "category_id",
+    "transaction_type": "transaction_type",
+    "account": "account_id",
+}
+
+
+def parse_facets(facets: Optional[str]) -> tuple[str, ...]:
+    """Validate a comma-separated facet list; raises ValueError on unknown names"""
+    if not facets:
+        return ()
+    names = tuple(dict.fromkeys(name.strip() for name in facets.split(",") if name.strip()))
+    unknown = [name for name in names if name not in FACETS]
+    if unknown:
+        raise ValueError(f"Unknown facets: {', '.join(unknown)}. Available: {', '.join(FACETS)}")
+    return names
+
+
+def faceted_statement(source, conditions: Sequence, fields: Sequence[str], facets: Sequence[str],
+                      skip: int, limit: int, grouping_sets: bool):
+    """
+    The combined page + facets statement over the transactions in `source`
+    matching `conditions`. `fields` must include id and date.
+    """
+    filtered = select(source, account_currency.label("currency")).select_from(source).join(
+        Account, Account.id == source.c.account_id
+    ).where(*conditions).cte("filtered")
+
+    # Each branch pads the other's columns with typed NULLs so the UNION lines up
+    def typed_null(column):
+        return cast(null(), column.type)
+
+    facet_columns = [FACETS[name] for name in facets]
+    page = select(
+        literal(0).label("kind"),
+        *(filtered.c[name] for name in fields),
+        *(typed_null(filtered.c[column]).label(f"facet_{column}") for column in facet_columns),
+        cast(null(), String).label("facet_currency"),
+        cast(null(), Integer).label("facet_count"),
+        cast(null(), Float).label("facet_total"),
+    ).order_by(filtered.c.date.desc(), filtered.c.id.desc()).offset(skip).limit(limit).subquery("page")
+
+    def facet_select(group_columns):
+        return select(
+            literal(1),
+            *(typed_null(filtered.c[name]) for name in fields),
+            *(filtered.c[column] if column in group_columns else typed_null(filtered.c[column]) for column in facet_columns),
+            filtered.c.currency,
+            func.count(),
+            func.coalesce(func.sum(filtered.c.amount), 0.0),
+        )
+
+    if grouping_sets:
+        sets = func.grouping_sets(*(tuple_(filtered.c[column], filtered.c.currency) for column in facet_columns))
+        facet_rows = [facet_select(facet_columns).group_by(sets)]
+    else:
+        facet_rows = [
+            facet_select((column,)).group_by(filtered.c[column], filtered.c.currency)
+            for column in facet_columns
+        ]
+
+    combined = union_all(select(page), *facet_rows).subquery("combined")
+    # UNION ALL keeps no order: put the page rows first, newest first again
+    return select(combined).order_by(combined.c.kind, combined.c.date.desc(), combined.c.id.desc())
+
+
+def faceted_page(db: Session, source, conditions: Sequence, fields: Sequence[str], facets: Sequence[str],
+                 skip: int, limit: int) -> tuple[list, dict]:
+    """
+    Dicts of `fields` for the page (newest first), and
+    {facet: [(value, currency, count, total), ...]} for each requested facet.
+    """
+    statement = faceted_statement(source, conditions, fields, facets, skip, limit,
+                                  grouping_sets=db.get_bind().dialect.name == "postgresql")
+    rows = db.execute(statement).all()
+    facet_columns = [FACETS[name] for name in facets]
+
+    items, buckets = [], {name: [] for name in facets}
+    for row in rows:
+        values = row._mapping
+        if values["kind"] == 0:
+            items.append({name: values[name] for name in fields})
+            continue
+        for name, column in zip(facets, facet_columns):
+            value = values[f"facet_{column}"]
+            if value is not None:
+                buckets[name].append((value, values["facet_currency"], values["facet_count"], values["facet_total"]))
+                break
+    return items, buckets
@@ -0,0 +1,198 @@
+"""
+Foreign exchange rates and bulk currency conversion.
+
+Rates live in the fx_rates table, quoted against FX_PIVOT_CURRENCY. The
+process-wide `fx_cache` loads all of them in one query into one sorted
+NumPy array per currency. A lookup is then np.searchsorted for "latest rate
+on or before this day". convert() converts a whole result set with one
+multiplication per distinct source currency, never a query per row.
+"""
+import csv
+import json
+import threading
+import time
+from datetime import date, datetime
+from pathlib import Path
+from typing import Iterable, Optional
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from database.connection import SessionLocal
+from database.models.account import Account
+from database.models.fx_rate import FX_PIVOT_CURRENCY, FxRate
+
+CACHE_TTL_SECONDS = 600
+
+# Accounts with no currency set use the column default
+DEFAULT_ACCOUNT_CURRENCY = Account.__table__.c.currency.default.arg
+
+# Account currency as a normalised code, for selecting alongside amounts
+account_currency = func.upper(func.coalesce(Account.currency, DEFAULT_ACCOUNT_CURRENCY))
+
+
+def reporting_currency(user, requested: Optional[str] = None) -> str:
+    """Currency to report in: the requested one, else the user's, else the pivot"""
+    return (requested or getattr(user, "currency", None) or FX_PIVOT_CURRENCY).upper()
+
+
+class FxRateMissing(LookupError):
+    """Raised when a conversion needs a currency that has no rates loaded"""
+
+    def __init__(self, currency: str):
+        super().__init__(f"No FX rates loaded for currency '{currency}'")
+        self.currency = currency
+
+
+class FxRateCache:
+    """In-memory, date-indexed rate table; reloads after CACHE_TTL_SECONDS or invalidate()"""
+
+    def __init__(self, ttl: float = CACHE_TTL_SECONDS):
+        self.ttl = ttl
+        self._series: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def invalidate(self) -> None:
+        self._loaded_at = None
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl:
+            return
+        with self._lock:
+            if self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl:
+                return
+            db = SessionLocal()
+            try:
+                rows = db.query(FxRate.currency, FxRate.day, FxRate.rate).order_by(FxRate.currency, FxRate.day).all()
+            finally:
+                db.close()
+            self._series = self._build(rows)
+            self._loaded_at = time.monotonic()
+
+    @staticmethod
+    def _build(rows) -> dict[str, tuple[np.ndarray, np.ndarray]]:
+        series = {}
+        if not rows:
+            return series
+        currencies, days, rates = zip(*rows)
+        currencies = np.array(currencies)
+        days = np.array(days, dtype="datetime64[D]")
+        rates = np.array(rates, dtype=np.float64)
+        # Rows arrive sorted by currency, so each currency is one contiguous slice
+        names, starts = np.unique(currencies, return_index=True)
+        ends = np.append(starts[1:], len(currencies))
+        for name, start, end in zip(names, starts, ends):
+            series[str(name)] = (days[start:end], rates[start:end])
+        return series
+
+    def currencies(self) -> list[str]:
+        self._ensure_loaded()
+        return sorted(set(self._series) | {FX_PIVOT_CURRENCY})
+
+    def rates(self, currency: str, days: np.ndarray) -> np.ndarray:
+        """Rate in force on each day (latest on or before it; the earliest known rate before that)"""
+        if currency == FX_PIVOT_CURRENCY:
+            return np.ones(len(days))
+        self._ensure_loaded()
+        if currency not in self._series:
+            raise FxRateMissing(currency)
+        known_days, known_rates = self._series[currency]
+        idx = np.searchsorted(known_days, days, side="right") - 1
+        return known_rates[np.clip(idx, 0, len(known_rates) - 1)]
+
+    def convert(self, amounts: np.ndarray, from_currencies: np.ndarray, days: np.ndarray, to_currency: str) -> np.ndarray:
+        """
+        Convert amounts[i] from from_currencies[i] into to_currency at the rate of days[i].
+        Loops over distinct currencies (a handful), never over rows.
+        """
+        amounts = np.asarray(amounts, dtype=np.float64)
+        if len(amounts) == 0:
+            return amounts
+        from_currencies = np.asarray(from_currencies)
+        days = np.asarray(days, dtype="datetime64[D]")
+
+        names, inverse = np.unique(from_currencies, return_inverse=True)
+        if len(names) == 1 and names[0] == to_currency:
+            return amounts.copy()
+
+        factors = np.empty(len(amounts))
+        target = None
+        for i, name in enumerate(names):
+            mask = inverse == i
+            if name == to_currency:
+                factors[mask] = 1.0
+                continue
+            if target is None:
+                target = self.rates(to_currency, days)
+            factors[mask] = target[mask] / self.rates(str(name), days[mask])
+        return amounts * factors
+
+
+fx_cache = FxRateCache()
+
+
+def parse_rates_file(path: str) -> list[dict]:
+    """
+    Read rates from CSV (columns: date,currency,rate) or JSON, either a list
+    of {"date", "currency", "rate"} objects or {"rates": {date: {currency: rate}}}.
+    Rates are units of currency per one FX_PIVOT_CURRENCY.
+    """
+    path = Path(path)
+    if path.suffix.lower() == ".csv":
+        with path.open(newline="") as f:
+            return [normalise_rate(row) for row in csv.DictReader(f)]
+
+    data = json.loads(path.read_text())
+    if isinstance(data, dict):
+        base = data.get("base", FX_PIVOT_CURRENCY)
+        if base != FX_PIVOT_CURRENCY:
+            raise ValueError(f"Rates must be quoted against {FX_PIVOT_CURRENCY}, got base '{base}'")
+        return [
+            normalise_rate({"date": day, "currency": currency, "rate": rate})
+            for day, quotes in data.get("rates", {}).items()
+            for currency, rate in quotes.items()
+        ]
+    return [normalise_rate(row) for row in data]
+
+
+def normalise_rate(row: dict) -> dict:
+    day = row.get("date") or row.get("day")
+    if isinstance(day, str):
+        day = date.fromisoformat(day[:10])
+    elif isinstance(day, datetime):
+        day = day.date()
+    rate = float(row["rate"])
+    if rate <= 0:
+        raise ValueError(f"Rate must be positive, got {rate} for {row.get('currency')} on {day}")
+    return {"currency": str(row["currency"]).upper(), "day": day, "rate": rate}
+
+
+def upsert_fx_rates(db: Session, rows: Iterable[dict]) -> int:
+    """Insert or replace rates in bulk and invalidate the cache. Commits."""
+    rows = list({(row["currency"], row["day"]): row for row in rows}.values())
+    if not rows:
+        return 0
+
+    dialect = db.get_bind().dialect.name
+    table = FxRate.__table__
+    if dialect in ("postgresql", "sqlite"):
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        stmt = insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.currency, table.c.day],
+            set_={"rate": stmt.excluded.rate}
+        )
+        for i in range(0, len(rows), 5000):
+            db.execute(stmt, rows[i:i + 5000])
+    else:
+        for row in rows:
+            db.merge(FxRate(**row))
+
+    db.commit()
+    fx_cache.invalidate()
+    return len(rows)
@@ -0,0 +1,151 @@
+"""
+Idempotency-Key support for write endpoints.
+
+A route takes `idem: IdempotencyContext = Depends(idempotency)` and calls
+idem.save(db, body, status_code) just before db.commit(), so the key row
+commits or rolls back together with the write.
+
+- First request with a key: the route runs and the key is saved with its response.
+- Retry with the same key and request: the dependency raises IdempotentReplay
+  before the route runs and the stored response is sent back.
+- Same key, different request: 422.
+- Two copies racing: the second one's key INSERT hits the unique constraint
+  when it flushes, its transaction is rolled back, and it replays the first.
+
+Keys live KEY_TTL_HOURS; sweep_expired_keys() deletes expired ones in
+bounded chunks using the expires_at index.
+"""
+import hashlib
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from fastapi import Depends, HTTPException, Request, Response, status
+from fastapi.responses import JSONResponse
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from auth.permissions import get_current_user
+from database.models import IdempotencyKey
+from database.session import get_db
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+KEY_TTL_HOURS = 24
+SWEEP_CHUNK_SIZE = 1000
+
+
+class IdempotentReplay(Exception):
+    """Raised to answer a retried request with the response stored for its key"""
+
+    def __init__(self, status_code: int, body: Any):
+        self.status_code = status_code
+        self.body = body
+
+
+def request_fingerprint(method: str, path: str, body: bytes) -> str:
+    return hashlib.sha256(b"\n".join([method.encode(), path.encode(), body])).hexdigest()
+
+
+def _stored(db: Session, user_id: int, key: str) -> Optional[IdempotencyKey]:
+    return db.query(IdempotencyKey).filter(IdempotencyKey.user_id == user_id, IdempotencyKey.key == key).first()
+
+
+def _check_stored(record: IdempotencyKey, request_hash: str) -> None:
+    if record.request_hash != request_hash:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"{IDEMPOTENCY_HEADER} was already used for a different request"
+        )
+    raise IdempotentReplay(record.status_code, record.response_body)
+
+
+class IdempotencyContext:
+    """The current request's key, if any; save() is a no-op without one"""
+
+    def __init__(self, user_id: int, key: Optional[str] = None, request_hash: Optional[str] = None):
+        self.user_id = user_id
+        self.key = key
+        self.request_hash = request_hash
+
+    def save(self, db: Session, body: Any = None, status_code: int = status.HTTP_200_OK) -> None:
+        """
+        Store the key with the response in the caller's transaction; call right
+        before commit. If another request with this key committed first, rolls
+        back and raises IdempotentReplay with its response.
+        """
+        if self.key is None:
+            return
+        db.add(IdempotencyKey(
+            user_id=self.user_id,
+            key=self.key,
+            request_hash=self.request_hash,
+            status_code=status_code,
+            response_body=body,
+            expires_at=datetime.now() + timedelta(hours=KEY_TTL_HOURS),
+        ))
+        try:
+            db.flush()
+        except IntegrityError:
+            db.rollback()
+            record = _stored(db, self.user_id, self.key)
+            if record is None:
+                raise
+            _check_stored(record, self.request_hash)
+
+
+async def idempotency(
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+) -> IdempotencyContext:
+    """Dependency for write routes: replays a retried request, or returns the context to save()"""
+    key = request.headers.get(IDEMPOTENCY_HEADER)
+    if key is None:
+        return IdempotencyContext(current_user.id)
+    key = key.strip()
+    if not key or len(key) > MAX_KEY_LENGTH:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{IDEMPOTENCY_HEADER} must be 1-{MAX_KEY_LENGTH} characters"
+        )
+
+    request_hash = request_fingerprint(request.method, request.url.path, await request.body())
+    record = _stored(db, current_user.id, key)
+    if record is not None:
+        if record.expires_at > datetime.now():
+            _check_stored(record, request_hash)
+        # Expired but not swept yet: the key is free again
+        db.delete(record)
+        db.flush()
+    return IdempotencyContext(current_user.id, key, request_hash)
+
+
+async def idempotent_replay_handler(request: Request, exc: IdempotentReplay) -> Response:
+    headers = {"Idempotent-Replayed": "true"}
+    if exc.status_code == status.HTTP_204_NO_CONTENT:
+        return Response(status_code=exc.status_code, headers=headers)
+    return JSONResponse(exc.body, status_code=exc.status_code, headers=headers)
+
+
+def sweep_expired_keys(db: Session, chunk_size: int = SWEEP_CHUNK_SIZE, max_chunks: Optional[int] = None) -> int:
+    """
+    Delete expired keys, committing after every chunk of `chunk_size` rows so
+    no single statement holds locks on a large range. Returns rows deleted.
+    """
+    removed = 0
+    chunks = 0
+    now = datetime.now()
+    while max_chunks is None or chunks < max_chunks:
+        expired = select(IdempotencyKey.id).where(
+            IdempotencyKey.expires_at < now
+        ).order_by(IdempotencyKey.expires_at).limit(chunk_size).scalar_subquery()
+        deleted = db.execute(
+            delete(IdempotencyKey).where(IdempotencyKey.id.in_(expired)).execution_options(synchronize_session=False)
+        ).rowcount
+        db.commit()
+        removed += deleted
+        chunks += 1
+        if deleted < chunk_size:
+            break
+    return removed
@@ -0,0 +1,238 @@
+"""
+Investment holdings: price ingestion, latest-price cache and valuation.
+
+Prices are bulk-upserted into security_prices from a CSV/JSON feed. The
+process-wide `price_cache` holds the latest close of every symbol as sorted
+NumPy arrays, loaded with one query. value_holdings() prices a whole set of
+holdings with a single vectorised lookup and conversion. Revaluing after a
+price update is therefore only a cache reload, not a pass over users.
+"""
+import csv
+import json
+import threading
+import time
+from datetime import date, datetime
+from pathlib import Path
+from typing import Iterable, Optional
+
+import numpy as np
+from sqlalchemy import and_, func, select
+from sqlalchemy.orm import Session
+
+from database.connection import SessionLocal
+from database.models.account import Account
+from database.models.investment import Holding, SecurityPrice
+from services.fx import account_currency, fx_cache
+
+CACHE_TTL_SECONDS = 300
+DEFAULT_PRICE_CURRENCY = SecurityPrice.__table__.c.currency.default.arg
+
+
+def normalise_symbol(symbol: str) -> str:
+    return symbol.strip().upper()
+
+
+class LatestPriceCache:
+    """Latest close per symbol; reloads after CACHE_TTL_SECONDS or invalidate()"""
+
+    def __init__(self, ttl: float = CACHE_TTL_SECONDS):
+        self.ttl = ttl
+        self._symbols = np.empty(0, dtype=str)
+        self._closes = np.empty(0)
+        self._days = np.empty(0, dtype="datetime64[D]")
+        self._currencies = np.empty(0, dtype=str)
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def invalidate(self) -> None:
+        self._loaded_at = None
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl:
+            return
+        with self._lock:
+            if self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl:
+                return
+            latest = select(SecurityPrice.symbol, func.max(SecurityPrice.day).label("day")) \
+                .group_by(SecurityPrice.symbol).subquery()
+            db = SessionLocal()
+            try:
+                rows = db.execute(
+                    select(SecurityPrice.symbol, SecurityPrice.day, SecurityPrice.close, SecurityPrice.currency)
+                    .join(latest, and_(SecurityPrice.symbol == latest.c.symbol, SecurityPrice.day == latest.c.day))
+                    .order_by(SecurityPrice.symbol)
+                ).all()
+            finally:
+                db.close()
+
+            if rows:
+                symbols, days, closes, currencies = zip(*rows)
+                self._symbols = np.array(symbols)
+                self._days = np.array(days, dtype="datetime64[D]")
+                self._closes = np.array(closes, dtype=np.float64)
+                self._currencies = np.array(currencies)
+            else:
+                self._symbols = np.empty(0, dtype=str)
+                self._days = np.empty(0, dtype="datetime64[D]")
+                self._closes = np.empty(0)
+                self._currencies = np.empty(0, dtype=str)
+            self._loaded_at = time.monotonic()
+
+    def lookup(self, symbols) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """(found, close, price day, currency) for each symbol, via one searchsorted"""
+        self._ensure_loaded()
+        symbols = np.asarray(symbols, dtype=str)
+        n = len(symbols)
+        if n == 0 or len(self._symbols) == 0:
+            return (np.zeros(n, dtype=bool), np.zeros(n), np.full(n, np.datetime64("NaT"), dtype="datetime64[D]"),
+                    np.full(n, DEFAULT_PRICE_CURRENCY))
+        idx = np.searchsorted(self._symbols, symbols)
+        idx = np.minimum(idx, len(self._symbols) - 1)
+        found = self._symbols[idx] == symbols
+        return (
+            found,
+            np.where(found, self._closes[idx], 0.0),
+            np.where(found, self._days[idx], np.datetime64("NaT")),
+            np.where(found, self._currencies[idx], DEFAULT_PRICE_CURRENCY),
+        )
+
+
+price_cache = LatestPriceCache()
+
+
+def parse_prices_file(path: str) -> list[dict]:
+    """
+    Read prices from CSV (columns: date,symbol,close[,currency]) or JSON, either
+    a list of {"date", "symbol", "close", "currency"} objects or
+    {"currency": "USD", "prices": {date: {symbol: close}}}.
+    """
+    path = Path(path)
+    if path.suffix.lower() == ".csv":
+        with path.open(newline="") as f:
+            return [normalise_price(row) for row in csv.DictReader(f)]
+
+    data = json.loads(path.read_text())
+    if isinstance(data, dict):
+        currency = data.get("currency", DEFAULT_PRICE_CURRENCY)
+        return [
+            normalise_price({"date": day, "symbol": symbol, "close": close, "currency": currency})
+            for day, quotes in data.get("prices", {}).items()
+            for symbol, close in quotes.items()
+        ]
+    return [normalise_price(row) for row in data]
+
+
+def normalise_price(row: dict) -> dict:
+    day = row.get("date") or row.get("day")
+    if isinstance(day, str):
+        day = date.fromisoformat(day[:10])
+    elif isinstance(day, datetime):
+        day = day.date()
+    close = float(row.get("close", row.get("price")))
+    if close < 0:
+        raise ValueError(f"Price must not be negative, got {close} for {row.get('symbol')} on {day}")
+    return {
+        "symbol": normalise_symbol(str(row["symbol"])),
+        "day": day,
+        "close": close,
+        "currency": str(row.get("currency") or DEFAULT_PRICE_CURRENCY).upper(),
+    }
+
+
+def upsert_prices(db: Session, rows: Iterable[dict]) -> int:
+    """Insert or replace prices in bulk and invalidate the latest-price cache. Commits."""
+    rows = list({(row["symbol"], row["day"]): row for row in rows}.values())
+    if not rows:
+        return 0
+
+    dialect = db.get_bind().dialect.name
+    table = SecurityPrice.__table__
+    if dialect in ("postgresql", "sqlite"):
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        stmt = insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.symbol, table.c.day],
+            set_={"close": stmt.excluded.close, "currency": stmt.excluded.currency}
+        )
+        for i in range(0, len(rows), 5000):
+            db.execute(stmt, rows[i:i + 5000])
+    else:
+        for row in rows:
+            db.merge(SecurityPrice(**row))
+
+    db.commit()
+    price_cache.invalidate()
+    return len(rows)
+
+
+def load_holdings(db: Session, user_id: int, account_id: Optional[int] = None) -> list:
+    """Holdings with their account currency, in one query"""
+    stmt = select(
+        Holding.id, Holding.account_id, Holding.symbol, Holding.quantity, Holding.cost_basis, account_currency
+    ).join(Account, Account.id == Holding.account_id).where(Holding.user_id == user_id)
+    if account_id is not None:
+        stmt = stmt.where(Holding.account_id == account_id)
+    return db.execute(stmt.order_by(Holding.account_id, Holding.symbol)).all()
+
+
+def value_holdings(rows: list, currency: str) -> dict:
+    """
+    Market value and unrealised P&L of every holding in `currency`, in one
+    vectorised pass. Holdings without a price are carried at cost.
+    """
+    n = len(rows)
+    ids, account_ids, symbols, quantities, costs, cost_currencies = zip(*rows) if n else ([],) * 6
+    quantities = np.array(quantities, dtype=np.float64)
+    today = np.full(n, np.datetime64(date.today(), "D"))
+
+    found, closes, price_days, price_currencies = price_cache.lookup(symbols)
+    market = fx_cache.convert(quantities * closes, price_currencies, today, currency) if n else np.empty(0)
+    cost = fx_cache.convert(np.array(costs, dtype=np.float64), cost_currencies, today, currency) if n else np.empty(0)
+    market = np.where(found, market, cost)
+    pnl = market - cost
+    pnl_pct = np.divide(pnl, cost, out=np.zeros(n), where=cost > 0)
+
+    # Per-account totals with one bincount each
+    accounts, account_idx = np.unique(np.array(account_ids, dtype=np.int64), return_inverse=True)
+    account_market = np.bincount(account_idx, weights=market, minlength=len(accounts))
+    account_cost = np.bincount(account_idx, weights=cost, minlength=len(accounts))
+
+    total_market, total_cost = float(market.sum()), float(cost.sum())
+    return {
+        "currency": currency,
+        "market_value": round(total_market, 2),
+        "cost_basis": round(total_cost, 2),
+        "unrealised_pnl": round(total_market - total_cost, 2),
+        "unrealised_pnl_pct": round((total_market - total_cost) / total_cost, 4) if total_cost > 0 else 0.0,
+        "unpriced_count": int((~found).sum()),
+        "accounts": [
+            {
+                "account_id": int(account_id),
+                "market_value": round(float(m), 2),
+                "cost_basis": round(float(c), 2),
+                "unrealised_pnl": round(float(m - c), 2),
+            }
+            for account_id, m, c in zip(accounts, account_market, account_cost)
+        ],
+        "holdings": [
+            {
+                "holding_id": holding_id,
+                "account_id": account_id,
+                "symbol": symbol,
+                "quantity": quantity,
+                "price": close if priced else None,
+                "price_date": day if priced else None,
+                "market_value": round(m, 2),
+                "cost_basis": round(c, 2),
+                "unrealised_pnl": round(p, 2),
+                "unrealised_pnl_pct": round(pct, 4),
+            }
+            for holding_id, account_id, symbol, quantity, priced, close, day, m, c, p, pct in zip(
+                ids, account_ids, symbols, quantities.tolist(), found.tolist(), closes.tolist(),
+                price_days.tolist(), market.tolist(), cost.tolist(), pnl.tolist(), pnl_pct.tolist()
+            )
+        ],
+    }
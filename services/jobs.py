@@ -0,0 +1,202 @@
+"""
+Database-backed background job queue.
+
+Request handlers call enqueue() and return the job id; worker processes
+started with `python manage.py run-worker` claim jobs with
+SELECT ... FOR UPDATE SKIP LOCKED, run the registered handler, and record
+progress, results, and retries with exponential backoff.
+
+A RUNNING job whose locked_at is older than STALE_LOCK_MINUTES is taken to
+have lost its worker and is requeued. JobContext.progress() refreshes
+locked_at, so long handlers should report progress at least once per batch.
+
+Handlers are plain functions registered with @job_handler("name") that take
+a JobContext. They live in services/tasks.py so the worker has one module
+to import.
+"""
+import os
+import random
+import socket
+import time
+import traceback
+from datetime import datetime, timedelta
+from typing import Any, Callable, Optional
+
+from sqlalchemy.orm import Session
+
+from database.connection import SessionLocal
+from database.models.job import Job, JobStatus
+
+JOB_HANDLERS: dict[str, Callable[["JobContext"], Any]] = {}
+
+BACKOFF_BASE_SECONDS = 10
+BACKOFF_MAX_SECONDS = 3600
+STALE_LOCK_MINUTES = 30
+
+
+def job_handler(job_type: str):
+    """Decorator that registers a function as the handler for a job type"""
+    def register(func):
+        JOB_HANDLERS[job_type] = func
+        return func
+    return register
+
+
+def enqueue(db: Session, job_type: str, payload: Optional[dict] = None, user_id: Optional[int] = None,
+            max_attempts: int = 5, run_after: Optional[datetime] = None) -> Job:
+    """Add a job to the queue. Does not commit, so it can share the caller's transaction."""
+    job = Job(
+        job_type=job_type,
+        payload=payload or {},
+        user_id=user_id,
+        max_attempts=max_attempts,
+        run_after=run_after or datetime.now(),
+        status=JobStatus.QUEUED
+    )
+    db.add(job)
+    db.flush()
+    return job
+
+
+def backoff_delay(attempts: int) -> float:
+    """Exponential backoff with jitter for the given number of attempts so far"""
+    delay = min(BACKOFF_BASE_SECONDS * 2 ** max(attempts - 1, 0), BACKOFF_MAX_SECONDS)
+    return delay * random.uniform(0.8, 1.2)
+
+
+class JobContext:
+    """What a handler sees: its payload, a work session, and a progress reporter"""
+
+    def __init__(self, job: Job, db: Session):
+        self.job_id = job.id
+        self.job_type = job.job_type
+        self.payload = job.payload or {}
+        self.user_id = job.user_id
+        self.attempt = job.attempts
+        self.db = db
+
+    def progress(self, fraction: float, message: Optional[str] = None) -> None:
+        """
+        Record progress in its own short transaction so it is visible while the
+        job runs. Also refreshes the worker's lock, so requeue_stale() leaves it be.
+        """
+        db = SessionLocal()
+        try:
+            db.query(Job).filter(Job.id == self.job_id).update({
+                Job.progress: max(0.0, min(fraction, 1.0)),
+                Job.progress_message: message,
+                Job.locked_at: datetime.now(),
+            }, synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+
+
+def claim_next(db: Session, worker_id: str, job_types: Optional[list[str]] = None) -> Optional[Job]:
+    """Lock and mark the next runnable job as RUNNING; returns None when the queue is empty"""
+    query = db.query(Job).filter(
+        Job.status == JobStatus.QUEUED,
+        Job.run_after <= datetime.now()
+    )
+    if job_types:
+        query = query.filter(Job.job_type.in_(job_types))
+
+    job = query.order_by(Job.run_after, Job.id).with_for_update(skip_locked=True).first()
+    if job is None:
+        db.rollback()
+        return None
+
+    now = datetime.now()
+    job.status = JobStatus.RUNNING
+    job.attempts += 1
+    job.locked_by = worker_id
+    job.locked_at = now
+    job.started_at = job.started_at or now
+    db.commit()
+    return job
+
+
+def requeue_stale(db: Session, stale_after: timedelta = timedelta(minutes=STALE_LOCK_MINUTES)) -> int:
+    """Put RUNNING jobs whose worker disappeared back on the queue"""
+    count = db.query(Job).filter(
+        Job.status == JobStatus.RUNNING,
+        Job.locked_at < datetime.now() - stale_after
+    ).update({
+        Job.status: JobStatus.QUEUED,
+        Job.locked_by: None,
+        Job.locked_at: None,
+        Job.last_error: "Worker lock expired",
+    }, synchronize_session=False)
+    db.commit()
+    return count
+
+
+def run_job(db: Session, job: Job) -> None:
+    """Run one claimed job and record its outcome (success, retry, or failure)"""
+    handler = JOB_HANDLERS.get(job.job_type)
+    work_db = SessionLocal()
+    try:
+        if handler is None:
+            raise LookupError(f"No handler registered for job type '{job.job_type}'")
+        result = handler(JobContext(job, work_db))
+        work_db.commit()
+    except Exception as e:
+        work_db.rollback()
+        error = f"{type(e).__name__}: {e}\n{traceback.format_exc(limit=5)}"
+        if job.attempts < job.max_attempts and handler is not None:
+            job.status = JobStatus.QUEUED
+            job.run_after = datetime.now() + timedelta(seconds=backoff_delay(job.attempts))
+        else:
+            job.status = JobStatus.FAILED
+            job.finished_at = datetime.now()
+        job.last_error = error[:4000]
+        job.locked_by = None
+        job.locked_at = None
+        db.commit()
+        return
+    finally:
+        work_db.close()
+
+    job.status = JobStatus.SUCCEEDED
+    job.result = result
+    job.progress = 1.0
+    job.finished_at = datetime.now()
+    job.locked_by = None
+    job.locked_at = None
+    db.commit()
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def work(worker_id: Optional[str] = None, poll_interval: float = 2.0, once: bool = False,
+         job_types: Optional[list[str]] = None) -> int:
+    """
+    Worker loop: claim and run jobs until the queue is empty (once=True) or forever.
+    Returns the number of jobs processed.
+    """
+    import services.tasks  # noqa: F401 - registers the handlers
+
+    worker_id = worker_id or default_worker_id()
+    processed = 0
+    last_stale_check = 0.0
+
+    while True:
+        db = SessionLocal()
+        try:
+            if time.monotonic() - last_stale_check > 60:
+                requeue_stale(db)
+                last_stale_check = time.monotonic()
+
+            job = claim_next(db, worker_id, job_types)
+            if job is not None:
+                run_job(db, job)
+                processed += 1
+        finally:
+            db.close()
+
+        if job is None:
+            if once:
+                return processed
+            time.sleep(poll_interval)
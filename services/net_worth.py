@@ -0,0 +1,168 @@
+"""
+Net worth: assets minus liabilities across a user's accounts.
+
+The current figure is one GROUP BY account_type, currency query, converted into
+the reporting currency in bulk. It is cached per user until the next
+balance-changing write calls invalidate_net_worth(). The TTL only matters
+when several processes serve requests, since each has its own cache.
+History comes from the daily balance snapshots.
+"""
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Iterable, Optional
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from database.models.account import Account, AccountType
+from services.balance_history import closing_balance_matrix
+from services.fx import DEFAULT_ACCOUNT_CURRENCY, account_currency, fx_cache
+
+LIABILITY_TYPES = (AccountType.CREDIT_CARD, AccountType.LOAN)
+
+CACHE_MAX_USERS = 10000
+CACHE_TTL_SECONDS = 300
+ADMIN_CHUNK_SIZE = 50000
+
+
+class NetWorthCache:
+    """Per-user LRU of computed net worth, keyed further by reporting currency"""
+
+    def __init__(self, max_users: int = CACHE_MAX_USERS, ttl: float = CACHE_TTL_SECONDS):
+        self.max_users = max_users
+        self.ttl = ttl
+        self._entries: OrderedDict[int, dict[str, tuple[float, dict]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int, currency: str) -> Optional[dict]:
+        with self._lock:
+            entry = self._entries.get(user_id, {}).get(currency)
+            if entry is None or time.monotonic() - entry[0] > self.ttl:
+                return None
+            self._entries.move_to_end(user_id)
+            return entry[1]
+
+    def put(self, user_id: int, currency: str, value: dict) -> None:
+        with self._lock:
+            self._entries.setdefault(user_id, {})[currency] = (time.monotonic(), value)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_users:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_ids: Iterable[int]) -> None:
+        with self._lock:
+            for user_id in user_ids:
+                self._entries.pop(user_id, None)
+
+
+net_worth_cache = NetWorthCache()
+
+
+def invalidate_net_worth(*user_ids: int) -> None:
+    """Call after committing any write that changes these users' account balances"""
+    net_worth_cache.invalidate(user_ids)
+
+
+def is_liability(account_type) -> bool:
+    return account_type in LIABILITY_TYPES
+
+
+def _summarise(groups: list, currency: str) -> dict:
+    """Fold (account_type, currency, total, count) groups into assets/liabilities in `currency`"""
+    totals = np.array([group[2] or 0.0 for group in groups], dtype=np.float64)
+    if groups:
+        today = np.full(len(groups), np.datetime64(date.today(), "D"))
+        totals = fx_cache.convert(totals, [group[1] for group in groups], today, currency)
+
+    by_type = {}
+    assets = liabilities = 0.0
+    for (account_type, _, _, count), total in zip(groups, totals.tolist()):
+        entry = by_type.setdefault(account_type or AccountType.SAVINGS, {"total": 0.0, "account_count": 0})
+        entry["total"] += total
+        entry["account_count"] += count
+        if is_liability(account_type):
+            liabilities += total
+        else:
+            assets += total
+
+    return {
+        "currency": currency,
+        "assets": round(assets, 2),
+        "liabilities": round(liabilities, 2),
+        "net_worth": round(assets - liabilities, 2),
+        "account_count": sum(entry["account_count"] for entry in by_type.values()),
+        "by_type": [
+            {"account_type": account_type, "total": round(entry["total"], 2), "account_count": entry["account_count"]}
+            for account_type, entry in sorted(by_type.items(), key=lambda item: item[0].value)
+        ],
+        "as_of": datetime.now(),
+    }
+
+
+def _grouped_balances(db: Session):
+    return db.query(Account.account_type, account_currency, func.sum(Account.balance), func.count(Account.id)) \
+        .filter(Account.pending_delete == False) \
+        .group_by(Account.account_type, account_currency)
+
+
+def net_worth(db: Session, user_id: int, currency: str) -> dict:
+    """Current net worth of one user, from the cache or one aggregate query"""
+    cached = net_worth_cache.get(user_id, currency)
+    if cached is not None:
+        return cached
+    groups = _grouped_balances(db).filter(Account.user_id == user_id).all()
+    result = _summarise(groups, currency)
+    net_worth_cache.put(user_id, currency, result)
+    return result
+
+
+def net_worth_all_users(db: Session, currency: str, chunk_size: int = ADMIN_CHUNK_SIZE) -> dict:
+    """Net worth summed over every account, aggregated in account-id range passes"""
+    low, high = db.query(func.min(Account.id), func.max(Account.id)).one()
+    groups = {}
+    if low is not None:
+        for start in range(low, high + 1, chunk_size):
+            for account_type, code, total, count in _grouped_balances(db).filter(
+                Account.id >= start, Account.id < start + chunk_size
+            ):
+                entry = groups.setdefault((account_type, code), [0.0, 0])
+                entry[0] += total or 0.0
+                entry[1] += count
+
+    result = _summarise([(t, c, total, count) for (t, c), (total, count) in groups.items()], currency)
+    result["user_count"] = db.query(func.count(func.distinct(Account.user_id))).scalar() or 0
+    return result
+
+
+def net_worth_history(db: Session, user_id: int, start: date, end: date, currency: str) -> dict:
+    """Daily assets, liabilities and net worth in `currency`, each day at that day's FX rate"""
+    accounts = db.query(Account).filter(Account.user_id == user_id).order_by(Account.id).all()
+    days, matrix = closing_balance_matrix(db, accounts, start, end)
+
+    if accounts:
+        # Nothing is owned in an account before it was opened
+        opened = np.array([(account.created_at or datetime.min).date() for account in accounts], dtype="datetime64[D]")
+        matrix = np.where(days[None, :] >= opened[:, None], matrix, 0.0)
+
+        # One conversion row per distinct account currency, broadcast over its accounts
+        codes = np.array([(account.currency or DEFAULT_ACCOUNT_CURRENCY).upper() for account in accounts])
+        for code in np.unique(codes):
+            rows = codes == code
+            matrix[rows] *= fx_cache.convert(np.ones(len(days)), np.full(len(days), code), days, currency)
+
+    liability = np.array([is_liability(account.account_type) for account in accounts], dtype=bool)
+    assets = matrix[~liability].sum(axis=0) if accounts else np.zeros(len(days))
+    liabilities = matrix[liability].sum(axis=0) if accounts else np.zeros(len(days))
+
+    return {
+        "currency": currency,
+        "start_date": start,
+        "end_date": end,
+        "days": days.tolist(),
+        "assets": np.round(assets, 2).tolist(),
+        "liabilities": np.round(liabilities, 2).tolist(),
+        "net_worth": np.round(assets - liabilities, 2).tolist(),
+    }
@@ -0,0 +1,56 @@
+"""
+Keyset pagination for large listings.
+
+Pages are ordered by primary key and continue after the last id the client
+saw (`id > after_id`), so every page is an index range scan however deep the
+client has paged, unlike OFFSET. The next page is advertised in a
+`Link: <...>; rel="next"` header, so the body stays a plain list.
+
+iter_batches() walks the same order in fixed-size batches for streamed
+dumps. It uses its own session (the request's may already be closed once a
+StreamingResponse starts) and ends the read transaction after every batch, so
+a long dump holds neither a snapshot nor more than one batch of rows.
+"""
+from typing import Callable, Iterator, Optional
+
+from fastapi import Request, Response
+from sqlalchemy.orm import Query, Session
+
+from database.connection import SessionLocal
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+STREAM_BATCH_SIZE = 1000
+
+
+def keyset_page(query: Query, id_column, after_id: Optional[int], limit: int) -> tuple[list, Optional[int]]:
+    """Up to `limit` rows after `after_id` in id order, and the after_id of the next page (None on the last)"""
+    if after_id is not None:
+        query = query.filter(id_column > after_id)
+    rows = query.order_by(id_column).limit(limit + 1).all()
+    if len(rows) > limit:
+        return rows[:limit], rows[limit - 1].id
+    return rows, None
+
+
+def iter_batches(build_query: Callable[[Session], Query], id_column, after_id: Optional[int] = None,
+                 batch_size: int = STREAM_BATCH_SIZE) -> Iterator[list]:
+    """Yield every row of build_query(session) after `after_id`, one keyset batch at a time"""
+    db = SessionLocal()
+    try:
+        while True:
+            rows, after_id = keyset_page(build_query(db), id_column, after_id, batch_size)
+            db.rollback()
+            if rows:
+                yield rows
+            if after_id is None:
+                return
+    finally:
+        db.close()
+
+
+def add_next_link(response: Response, request: Request, after_id: Optional[int]) -> Response:
+    """Point the Link header at the page after `after_id`, if there is one"""
+    if after_id is not None:
+        response.headers["Link"] = f'<{request.url.include_query_params(after_id=after_id)}>; rel="next"'
+    return response
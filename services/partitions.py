@@ -0,0 +1,144 @@
+"""
+Monthly range partitions for the transactions table (PostgreSQL only).
+
+Moving to a partitioned table happens in three steps while the app runs:
+
+1. Migration d7a2c5e8f134 creates `transactions_partitioned` (PARTITION BY
+   RANGE (date), one partition per month plus a default partition). It also
+   adds a trigger that mirrors every write on `transactions` into the new table.
+2. `python manage.py backfill-partitions` copies existing rows in id batches.
+   Each batch locks its source rows, so a concurrent update either lands
+   before the copy (and is copied) or waits and goes through the trigger.
+   Progress is kept in transactions_partition_backfill, so the command can
+   be stopped and restarted.
+3. Migration e9b4f1a6c273 swaps the tables under a short lock once the
+   backfill has caught up.
+
+After that, ensure_partitions() keeps monthly partitions created ahead of
+time. It runs from the scheduler, the partitions.ensure job and
+`manage.py ensure-partitions`. On other databases all of this is a no-op.
+"""
+import time
+from datetime import date
+from typing import Callable, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+PARENT_TABLE = "transactions"
+SHADOW_TABLE = "transactions_partitioned"
+DEFAULT_PARTITION = "transactions_default"
+BACKFILL_TABLE = "transactions_partition_backfill"
+MONTHS_AHEAD = 3
+BACKFILL_BATCH_SIZE = 5000
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def add_months(month: date, count: int) -> date:
+    year, index = divmod(month.year * 12 + month.month - 1 + count, 12)
+    return date(year, index + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"transactions_p{month.year:04d}_{month.month:02d}"
+
+
+def partitioned_table(db: Session) -> Optional[str]:
+    """Name of the partitioned transactions table (before or after cutover), or None"""
+    if db.get_bind().dialect.name != "postgresql":
+        return None
+    names = set(db.execute(text(
+        "SELECT c.relname FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid "
+        "WHERE c.relname IN (:parent, :shadow) AND c.relnamespace = 'public'::regnamespace"
+    ), {"parent": PARENT_TABLE, "shadow": SHADOW_TABLE}).scalars())
+    if PARENT_TABLE in names:
+        return PARENT_TABLE
+    return SHADOW_TABLE if SHADOW_TABLE in names else None
+
+
+def existing_partitions(db: Session, parent: str) -> set[str]:
+    return set(db.execute(text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid JOIN pg_class p ON p.oid = i.inhparent "
+        "WHERE p.relname = :parent"
+    ), {"parent": parent}).scalars())
+
+
+def create_partition(db: Session, parent: str, month: date) -> str:
+    """
+    Add the partition for `month`. Rows for that month already sitting in the
+    default partition are moved into it, so this also works after a
+    future-dated transaction got there first. Does not commit.
+    """
+    name = partition_name(month)
+    bounds = {"lo": month, "hi": add_months(month, 1)}
+    db.execute(text(f'CREATE TABLE "{name}" (LIKE "{parent}" INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'))
+    db.execute(text(
+        f'WITH moved AS (DELETE FROM "{DEFAULT_PARTITION}" WHERE date >= :lo AND date < :hi RETURNING *) '
+        f'INSERT INTO "{name}" SELECT * FROM moved'
+    ), bounds)
+    db.execute(text(
+        f'ALTER TABLE "{parent}" ATTACH PARTITION "{name}" '
+        f"FOR VALUES FROM ('{bounds['lo'].isoformat()}') TO ('{bounds['hi'].isoformat()}')"
+    ))
+    return name
+
+
+def ensure_partitions(db: Session, months_ahead: int = MONTHS_AHEAD, today: Optional[date] = None) -> list[str]:
+    """
+    Create any missing monthly partitions from this month through
+    `months_ahead` months ahead, committing each one. Returns the names created.
+    """
+    parent = partitioned_table(db)
+    if parent is None:
+        return []
+    existing = existing_partitions(db, parent)
+    first = month_start(today or date.today())
+    created = []
+    for offset in range(months_ahead + 1):
+        month = add_months(first, offset)
+        if partition_name(month) not in existing:
+            created.append(create_partition(db, parent, month))
+            db.commit()
+    return created
+
+
+def backfill_status(db: Session) -> Optional[dict]:
+    """Copied-through id and the current max id, or None when no backfill is pending"""
+    if partitioned_table(db) != SHADOW_TABLE:
+        return None
+    last_id = db.execute(text(f'SELECT last_id FROM "{BACKFILL_TABLE}"')).scalar() or 0
+    max_id = db.execute(text(f'SELECT max(id) FROM "{PARENT_TABLE}"')).scalar() or 0
+    return {"last_id": last_id, "max_id": max_id}
+
+
+def backfill(db: Session, batch_size: int = BACKFILL_BATCH_SIZE, pause_seconds: float = 0.0,
+             progress: Optional[Callable[[int, int], None]] = None) -> int:
+    """
+    Copy rows from transactions into transactions_partitioned in id order, one
+    committed batch at a time. Rows written after the backfill started are
+    already mirrored by the trigger, so it stops at the max id seen at the start.
+    Returns the number of rows copied.
+    """
+    status = backfill_status(db)
+    if status is None:
+        return 0
+    last_id, max_id = status["last_id"], status["max_id"]
+    copied = 0
+    while last_id < max_id:
+        upper = min(last_id + batch_size, max_id)
+        copied += db.execute(text(
+            f'WITH batch AS (SELECT * FROM "{PARENT_TABLE}" WHERE id > :lo AND id <= :hi FOR UPDATE) '
+            f'INSERT INTO "{SHADOW_TABLE}" SELECT * FROM batch ON CONFLICT (id, date) DO NOTHING'
+        ), {"lo": last_id, "hi": upper}).rowcount
+        db.execute(text(f'UPDATE "{BACKFILL_TABLE}" SET last_id = :hi, updated_at = now()'), {"hi": upper})
+        db.commit()
+        last_id = upper
+        if progress is not None:
+            progress(last_id, max_id)
+        if pause_seconds:
+            time.sleep(pause_seconds)
+    return copied
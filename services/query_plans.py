@@ -0,0 +1,261 @@
+"""
+Query-plan checks for the hot queries.
+
+Each @hot_query function returns a statement with the same shape (tables,
+filters, ordering) as a query the routers or services run on every request
+or job. check_plans() runs EXPLAIN on each one and reports any full scan of a
+LARGE_TABLES table, so a dropped index or a rewritten query that stops using
+one is caught before release. Run it with `python manage.py check-query-plans`
+against a local PostgreSQL, or a SQLite database as a stand-in.
+
+- PostgreSQL: EXPLAIN (FORMAT JSON) with enable_seqscan off, so a Seq Scan
+  only shows up when no index can serve the query, however small the tables.
+  Partitions are reported under their parent table.
+- SQLite: EXPLAIN QUERY PLAN; a "SCAN <table>" line is a full scan.
+
+When you add or change a hot query, add or update its entry here.
+"""
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable
+
+from sqlalchemy import exists, func, or_, select
+from sqlalchemy.orm import Session
+
+from database.models import (
+    Account, Budget, ChangeLog, IdempotencyKey, Job, RecurringTransaction, Transaction, TransactionArchive, User,
+)
+from database.models.change_log import SyncEntity
+from database.models.job import JobStatus
+from database.models.transaction import TransactionType
+from services.facets import FACETS, faceted_statement
+
+# Tables that grow with usage; a full scan of any of these fails the check
+LARGE_TABLES = {
+    "transactions", "transactions_archive", "accounts", "change_log", "idempotency_keys",
+    "jobs", "recurring_transactions", "account_balance_snapshots", "users",
+}
+
+# Sample parameters; the plan shape doesn't depend on the values
+USER_ID = 1
+ACCOUNT_IDS = [1, 2]
+SINCE = datetime(2024, 1, 1)
+UNTIL = datetime(2024, 12, 31, 23, 59, 59)
+
+HOT_QUERIES: dict[str, Callable] = {}
+
+
+def hot_query(name: str):
+    """Register a function returning a hot query's statement under `name`"""
+    def register(build: Callable):
+        HOT_QUERIES[name] = build
+        return build
+    return register
+
+
+def explain(db: Session, statement, prefix: str) -> list[tuple]:
+    """Raw rows of `prefix <statement>`, with the sample parameters rendered inline"""
+    sql = statement.compile(dialect=db.get_bind().dialect, compile_kwargs={"literal_binds": True})
+    return db.connection().exec_driver_sql(f"{prefix} {sql}").fetchall()
+
+
+@dataclass
+class PlanResult:
+    name: str
+    full_scans: list[str]
+    plan: list[str]
+
+    @property
+    def ok(self) -> bool:
+        return not self.full_scans
+
+
+# --- Hot queries -------------------------------------------------------------
+
+@hot_query("transaction.get_all")
+def _transaction_list():
+    return select(Transaction.__table__).where(
+        Transaction.user_id == USER_ID
+    ).order_by(Transaction.date.desc()).limit(100)
+
+
+@hot_query("transaction.get_all?account_id")
+def _transaction_list_by_account():
+    return select(Transaction.__table__).where(
+        Transaction.user_id == USER_ID, Transaction.account_id == ACCOUNT_IDS[0]
+    ).order_by(Transaction.date.desc()).limit(100)
+
+
+@hot_query("transaction.get_all?date range")
+def _transaction_list_by_date():
+    return select(Transaction.__table__).where(
+        Transaction.user_id == USER_ID, Transaction.date >= SINCE, Transaction.date <= UNTIL
+    ).order_by(Transaction.date.desc()).limit(100)
+
+
+@hot_query("transaction.search_facets")
+def _transaction_search_facets():
+    # The UNION ALL form; PostgreSQL runs the GROUPING SETS one, which reads the same rows
+    table = Transaction.__table__
+    return faceted_statement(
+        table, (table.c.user_id == USER_ID,), tuple(column.name for column in table.c), tuple(FACETS),
+        skip=0, limit=100, grouping_sets=False
+    )
+
+
+@hot_query("transaction.summary")
+def _transaction_summary():
+    return select(Transaction.amount, Transaction.transaction_type, Transaction.date, Account.currency).join(
+        Account, Account.id == Transaction.account_id
+    ).where(Transaction.user_id == USER_ID, Transaction.date >= SINCE, Transaction.date <= UNTIL)
+
+
+@hot_query("transaction.get")
+def _transaction_get():
+    return select(Transaction.__table__).where(Transaction.id == 1, Transaction.user_id == USER_ID)
+
+
+@hot_query("account.get_all")
+def _account_list():
+    return select(Account.__table__).where(Account.user_id == USER_ID)
+
+
+@hot_query("admin.users")
+def _admin_users_page():
+    return select(User.id, User.name, User.email).where(User.id > 100).order_by(User.id).limit(101)
+
+
+@hot_query("admin.accounts")
+def _admin_accounts_page():
+    return select(Account.__table__).where(Account.id > 100).order_by(Account.id).limit(101)
+
+
+@hot_query("rollups.changed_users")
+def _rollups_changed_users():
+    return select(ChangeLog.user_id).where(
+        ChangeLog.changed_at > SINCE, ChangeLog.changed_at <= UNTIL,
+        ChangeLog.entity.in_((SyncEntity.TRANSACTION, SyncEntity.ACCOUNT))
+    ).distinct().order_by(ChangeLog.user_id)
+
+
+@hot_query("rollups.user_volume")
+def _rollups_user_volume():
+    return select(
+        Transaction.transaction_type, Account.currency, func.count(), func.sum(Transaction.amount)
+    ).join(Account, Account.id == Transaction.account_id).where(
+        Transaction.user_id == USER_ID
+    ).group_by(Transaction.transaction_type, Account.currency)
+
+
+@hot_query("rollups.signup_month")
+def _rollups_signup_month():
+    return select(func.count(User.id)).where(User.created_at >= SINCE, User.created_at < UNTIL)
+
+
+@hot_query("balance.ledger")
+def _balance_ledger():
+    return select(
+        Transaction.account_id, Transaction.to_account, Transaction.transaction_type, Transaction.amount, Transaction.date
+    ).where(or_(Transaction.account_id.in_(ACCOUNT_IDS), Transaction.to_account.in_(ACCOUNT_IDS)))
+
+
+@hot_query("balance.as_of")
+def _balance_as_of():
+    return select(
+        Transaction.account_id, Transaction.to_account, Transaction.transaction_type, Transaction.amount
+    ).where(
+        or_(Transaction.account_id == ACCOUNT_IDS[0], Transaction.to_account == ACCOUNT_IDS[0]),
+        Transaction.date >= SINCE, Transaction.date <= UNTIL
+    )
+
+
+@hot_query("budgets.rebuild")
+def _budget_ledger():
+    return select(Budget.id, Budget.period, Transaction.date, Transaction.amount).join(
+        Transaction, (Transaction.user_id == Budget.user_id) & (Transaction.category_id == Budget.category_id)
+    ).where(Budget.user_id == USER_ID, Transaction.transaction_type == TransactionType.EXPENSE)
+
+
+@hot_query("archive.probe")
+def _archive_probe():
+    return select(exists(select(TransactionArchive.id).where(
+        TransactionArchive.user_id == USER_ID, TransactionArchive.date >= SINCE, TransactionArchive.date <= UNTIL
+    )))
+
+
+@hot_query("sync.changes")
+def _sync_changes():
+    return select(ChangeLog.__table__).where(
+        ChangeLog.user_id == USER_ID, ChangeLog.id > 0
+    ).order_by(ChangeLog.id).limit(500)
+
+
+@hot_query("idempotency.lookup")
+def _idempotency_lookup():
+    return select(IdempotencyKey.__table__).where(IdempotencyKey.user_id == USER_ID, IdempotencyKey.key == "key")
+
+
+@hot_query("recurring.due")
+def _recurring_due():
+    return select(RecurringTransaction.id).where(
+        RecurringTransaction.is_active == True, RecurringTransaction.next_run_date <= UNTIL.date(),
+        RecurringTransaction.id > 0
+    ).order_by(RecurringTransaction.id).limit(1000)
+
+
+@hot_query("jobs.claim")
+def _jobs_claim():
+    return select(Job.id).where(
+        Job.status == JobStatus.QUEUED, Job.run_after <= UNTIL
+    ).order_by(Job.run_after, Job.id).limit(1)
+
+
+# --- Plan inspection ---------------------------------------------------------
+
+def _table_of(relation: str) -> str:
+    """Partitions (transactions_p2026_03, transactions_default) count as their parent"""
+    return re.sub(r"_(p\d{4}_\d{2}|default)$", "", relation)
+
+
+def _pg_plan(db: Session, statement) -> tuple[list[str], list[str]]:
+    db.connection().exec_driver_sql("SET LOCAL enable_seqscan = off")
+    document = explain(db, statement, "EXPLAIN (FORMAT JSON)")[0][0]
+    lines, scans = [], []
+
+    def walk(node, depth=0):
+        relation = node.get("Relation Name")
+        lines.append("  " * depth + node["Node Type"] + (f" on {relation}" if relation else ""))
+        if node["Node Type"] == "Seq Scan" and _table_of(relation) in LARGE_TABLES:
+            scans.append(relation)
+        for child in node.get("Plans", ()):
+            walk(child, depth + 1)
+
+    walk(document[0]["Plan"])
+    return lines, scans
+
+
+def _sqlite_plan(db: Session, statement) -> tuple[list[str], list[str]]:
+    lines, scans = [], []
+    for row in explain(db, statement, "EXPLAIN QUERY PLAN"):
+        detail = row[-1]
+        lines.append(detail)
+        match = re.match(r"SCAN (\w+)", detail)
+        if match and match.group(1) in LARGE_TABLES:
+            scans.append(match.group(1))
+    return lines, scans
+
+
+def check_plans(db: Session, names=None) -> list[PlanResult]:
+    """EXPLAIN every registered hot query (or just `names`); rolls back afterwards"""
+    plan_of = _pg_plan if db.get_bind().dialect.name == "postgresql" else _sqlite_plan
+    results = []
+    try:
+        for name, build in HOT_QUERIES.items():
+            if names and name not in names:
+                continue
+            plan, scans = plan_of(db, build())
+            results.append(PlanResult(name, scans, plan))
+    finally:
+        db.rollback()
+    return results
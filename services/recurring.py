@@ -0,0 +1,226 @@
+"""
+Recurring transaction scheduler.
+
+materialise_due() posts every due occurrence of every active rule. Rules are
+read in keyset batches; for each batch the occurrences are expanded in memory,
+inserted with one multi-row INSERT that skips (rule, occurrence date) pairs
+already posted, and account balances move with one UPDATE. Re-running after a
+crash or downtime therefore catches up without double-posting.
+"""
+import calendar
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+
+from sqlalchemy import case, insert, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from database.models.account import Account
+from database.models.recurring import RecurrenceFrequency, RecurringTransaction
+from database.models.transaction import Transaction, TransactionType
+from services.budgets import SpendEntry, apply_budget_spend
+from services.balance_history import apply_balance_changes, balance_effects, transaction_changes
+from services.net_worth import invalidate_net_worth
+from services.sync import record_changes, upserted
+from database.models.change_log import SyncEntity
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+def occurrence(start: date, frequency: RecurrenceFrequency, interval: int, n: int) -> date:
+    """The n-th occurrence (0-based) of a schedule, computed from the start so month ends don't drift"""
+    if frequency == RecurrenceFrequency.DAILY:
+        return start + timedelta(days=n * interval)
+    if frequency == RecurrenceFrequency.WEEKLY:
+        return start + timedelta(weeks=n * interval)
+
+    months = n * interval * (12 if frequency == RecurrenceFrequency.YEARLY else 1)
+    year, month = divmod(start.month - 1 + months, 12)
+    year += start.year
+    last_day = calendar.monthrange(year, month + 1)[1]
+    return date(year, month + 1, min(start.day, last_day))
+
+
+def _first_index_on_or_after(rule: RecurringTransaction, day: date) -> int:
+    """Smallest n whose occurrence falls on or after `day`"""
+    if day <= rule.start_date:
+        return 0
+    if rule.frequency == RecurrenceFrequency.DAILY:
+        step_days = rule.interval
+    elif rule.frequency == RecurrenceFrequency.WEEKLY:
+        step_days = 7 * rule.interval
+    else:
+        step_months = rule.interval * (12 if rule.frequency == RecurrenceFrequency.YEARLY else 1)
+        months = (day.year - rule.start_date.year) * 12 + day.month - rule.start_date.month
+        n = max(months // step_months, 0)
+        while occurrence(rule.start_date, rule.frequency, rule.interval, n) < day:
+            n += 1
+        return n
+    return -(-(day - rule.start_date).days // step_days)
+
+
+def due_occurrences(rule: RecurringTransaction, as_of: date) -> tuple[list[date], Optional[date]]:
+    """Occurrence dates from next_run_date up to as_of, plus the following run date (None when finished)"""
+    last = min(as_of, rule.end_date) if rule.end_date else as_of
+    n = _first_index_on_or_after(rule, rule.next_run_date)
+
+    dates = []
+    current = occurrence(rule.start_date, rule.frequency, rule.interval, n)
+    while current <= last:
+        dates.append(current)
+        n += 1
+        current = occurrence(rule.start_date, rule.frequency, rule.interval, n)
+
+    if rule.end_date and current > rule.end_date:
+        return dates, None
+    return dates, current
+
+
+def balance_deltas(rows) -> dict[int, float]:
+    """Net balance change per account for a set of posted transactions"""
+    deltas = defaultdict(float)
+    for row in rows:
+        for account_id, delta in balance_effects(row.transaction_type, row.amount, row.account_id, row.to_account):
+            deltas[account_id] += delta
+    return deltas
+
+
+def apply_balance_deltas(db: Session, deltas: dict[int, float]) -> None:
+    """Move every account balance in a single UPDATE ... CASE statement"""
+    deltas = {account_id: delta for account_id, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    db.execute(
+        update(Account)
+        .where(Account.id.in_(list(deltas)))
+        .values(balance=Account.balance + case(deltas, value=Account.id, else_=0.0))
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _insert_ignoring_posted(db: Session, rows: list[dict]) -> list:
+    """Insert occurrence rows, skipping any (rule, date) already posted; returns the rows actually inserted"""
+    table = Transaction.__table__
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        dialect_insert = None
+
+    returning = (table.c.id, table.c.user_id, table.c.account_id, table.c.to_account,
+                 table.c.category_id, table.c.amount, table.c.transaction_type, table.c.date)
+
+    if dialect_insert is not None:
+        # No conflict target: the unique key is (recurring_id, occurrence_date), plus
+        # date once transactions is partitioned (services/partitions.py)
+        stmt = dialect_insert(table).on_conflict_do_nothing().returning(*returning)
+        return db.execute(stmt, rows).all()
+
+    # Generic fallback: filter out posted occurrences with one lookup first
+    rule_ids = {row["recurring_id"] for row in rows}
+    posted = set(db.query(Transaction.recurring_id, Transaction.occurrence_date).filter(
+        Transaction.recurring_id.in_(rule_ids)
+    ).all())
+    rows = [row for row in rows if (row["recurring_id"], row["occurrence_date"]) not in posted]
+    if not rows:
+        return []
+    return db.execute(insert(table).returning(*returning), rows).all()
+
+
+def _materialise_batch(db: Session, rules: list[RecurringTransaction], as_of: date) -> int:
+    """Post the due occurrences of one batch of rules; does not commit"""
+    rows = []
+    rule_updates = []
+    for rule in rules:
+        dates, next_run = due_occurrences(rule, as_of)
+        for day in dates:
+            rows.append({
+                "transaction_name": rule.transaction_name,
+                "amount": rule.amount,
+                "transaction_type": rule.transaction_type,
+                "to_account": rule.to_account,
+                "description": rule.description,
+                "date": datetime.combine(day, time()),
+                "user_id": rule.user_id,
+                "account_id": rule.account_id,
+                "category_id": rule.category_id,
+                "recurring_id": rule.id,
+                "occurrence_date": day,
+            })
+        rule_updates.append({
+            "id": rule.id,
+            "next_run_date": next_run or rule.next_run_date,
+            "last_run_date": dates[-1] if dates else rule.last_run_date,
+            "is_active": next_run is not None,
+        })
+
+    inserted = _insert_ignoring_posted(db, rows) if rows else []
+
+    deltas = balance_deltas(inserted)
+    apply_balance_deltas(db, deltas)
+    if deltas:
+        balances_after = dict(db.query(Account.id, Account.balance).filter(Account.id.in_(list(deltas))).all())
+        apply_balance_changes(db, [
+            change for row in inserted
+            for change in transaction_changes(row.transaction_type, row.amount, row.account_id, row.to_account, row.date)
+        ], balances_after)
+    apply_budget_spend(db, [
+        SpendEntry(row.user_id, row.category_id, row.amount, row.date.date())
+        for row in inserted if row.transaction_type == TransactionType.EXPENSE
+    ])
+    record_changes(db, [
+        change for row in inserted
+        for change in (
+            *upserted(row.user_id, SyncEntity.TRANSACTION, row.id),
+            *upserted(row.user_id, SyncEntity.ACCOUNT, row.account_id, row.to_account),
+        )
+    ])
+    # ORM bulk UPDATE by primary key - one executemany for the whole batch
+    db.execute(update(RecurringTransaction), rule_updates)
+    return len(inserted)
+
+
+def materialise_due(db: Session, as_of: Optional[date] = None, batch_size: int = DEFAULT_BATCH_SIZE) -> dict:
+    """
+    Post all occurrences due on or before `as_of` (default today).
+
+    Commits once per batch. A batch that fails (for example a balance check
+    constraint) is retried rule by rule so one bad rule cannot hold back the
+    rest; failed rules stay due and are picked up on the next run.
+    """
+    as_of = as_of or date.today()
+    stats = {"rules": 0, "posted": 0, "failed_rules": []}
+    last_id = 0
+
+    while True:
+        rules = db.query(RecurringTransaction).filter(
+            RecurringTransaction.is_active == True,
+            RecurringTransaction.next_run_date <= as_of,
+            RecurringTransaction.id > last_id
+        ).order_by(RecurringTransaction.id).limit(batch_size).all()
+        if not rules:
+            break
+        last_id = rules[-1].id
+        stats["rules"] += len(rules)
+
+        user_ids = {rule.user_id for rule in rules}
+        try:
+            stats["posted"] += _materialise_batch(db, rules, as_of)
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            for rule in rules:
+                try:
+                    stats["posted"] += _materialise_batch(db, [rule], as_of)
+                    db.commit()
+                except IntegrityError:
+                    db.rollback()
+                    stats["failed_rules"].append(rule.id)
+        invalidate_net_worth(*user_ids)
+
+        db.expunge_all()
+
+    return stats
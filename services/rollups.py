@@ -0,0 +1,202 @@
+"""
+System-wide rollups behind the /admin/analytics endpoints.
+
+The endpoints read only the rollup tables (database/models/admin_rollup.py),
+never the live transactions or accounts tables. refresh_rollups() keeps them
+up to date incrementally, from two watermarks in rollup_watermarks:
+
+- "users": users.created_at. Months with new signups are recounted as a
+  range on ix_users_created_at.
+- "change_log": change_log.changed_at. Every transaction and account write
+  (including deletes, which no updated_at column can show) logs a row for its
+  user. Only those users' volume and balance rows are rebuilt, each from the
+  user's own (user_id, date) index range, hot and archived history alike.
+
+Both stop SETTLE_SECONDS short of now, so rows committed late with an earlier
+timestamp are still picked up on the next run.
+
+A full rebuild reads every transaction. It runs on first use, with --full,
+or when the change_log watermark is older than the log's retention, and is
+deferred while inside ADMIN_BUSINESS_HOURS unless forced.
+"""
+import os
+from datetime import date, datetime, timedelta
+from typing import Callable, Iterable, Optional
+
+from sqlalchemy import Date, cast, delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from database.models.account import Account
+from database.models.admin_rollup import BalanceRollup, RollupWatermark, TransactionVolumeRollup, UserSignupRollup
+from database.models.change_log import ChangeLog, SyncEntity
+from database.models.user import User
+from services.archive import transaction_source
+from services.fx import account_currency
+from services.sync import RETENTION_DAYS
+
+SETTLE_SECONDS = 60
+USER_CHUNK_SIZE = 500
+
+# Local hours (start-end, 24h clock) during which full rebuilds are deferred
+ADMIN_BUSINESS_HOURS = os.getenv("ADMIN_BUSINESS_HOURS", "8-20")
+
+USERS_WATERMARK = "users"
+CHANGES_WATERMARK = "change_log"
+
+# progress(done, total) after each committed chunk
+Progress = Optional[Callable[[int, int], None]]
+
+
+def in_business_hours(now: Optional[datetime] = None) -> bool:
+    start, end = (int(hour) for hour in ADMIN_BUSINESS_HOURS.split("-"))
+    return start <= (now or datetime.now()).hour < end
+
+
+def month_of(db: Session, column):
+    """First day of the column's month, as a date"""
+    if db.get_bind().dialect.name == "postgresql":
+        return cast(func.date_trunc("month", column), Date)
+    return func.date(column, "start of month")
+
+
+def _next_month(month: date) -> date:
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def get_watermark(db: Session, name: str) -> Optional[datetime]:
+    return db.query(RollupWatermark.watermark).filter(RollupWatermark.name == name).scalar()
+
+
+def set_watermark(db: Session, name: str, watermark: datetime) -> None:
+    row = db.get(RollupWatermark, name)
+    if row is None:
+        db.add(RollupWatermark(name=name, watermark=watermark))
+    else:
+        row.watermark = watermark
+
+
+def refreshed_through(db: Session) -> Optional[datetime]:
+    """The oldest watermark: every rollup includes source changes up to this time"""
+    return db.query(func.min(RollupWatermark.watermark)).scalar()
+
+
+# --- Signups ---------------------------------------------------------------
+
+def recount_signup_months(db: Session, months: Iterable[date]) -> None:
+    """Recount the signup rollup rows of `months` (the caller commits)"""
+    for month in months:
+        count = db.query(func.count(User.id)).filter(
+            User.created_at >= month, User.created_at < _next_month(month)
+        ).scalar()
+        db.execute(delete(UserSignupRollup).where(UserSignupRollup.month == month))
+        if count:
+            db.add(UserSignupRollup(month=month, user_count=count))
+
+
+def refresh_signups(db: Session, upper: datetime, full: bool = False) -> int:
+    """Recount the months with signups after the watermark (or every month); returns months recounted"""
+    watermark = None if full else get_watermark(db, USERS_WATERMARK)
+    query = db.query(User.created_at).filter(User.created_at <= upper)
+    if watermark is not None:
+        query = query.filter(User.created_at > watermark)
+    months = {date(created.year, created.month, 1) for (created,) in query.yield_per(1000) if created}
+    if watermark is None:
+        db.execute(delete(UserSignupRollup))
+    recount_signup_months(db, sorted(months))
+    set_watermark(db, USERS_WATERMARK, upper)
+    db.commit()
+    return len(months)
+
+
+# --- Per-user volume and balances ------------------------------------------
+
+def _rebuild_users(db: Session, user_ids: list[int]) -> None:
+    """Replace the volume and balance rollup rows of `user_ids` (one DB transaction)"""
+    db.execute(delete(TransactionVolumeRollup).where(TransactionVolumeRollup.user_id.in_(user_ids)))
+    db.execute(delete(BalanceRollup).where(BalanceRollup.user_id.in_(user_ids)))
+
+    for user_id in user_ids:
+        source = transaction_source(db, user_id=user_id)
+        month = month_of(db, source.c.date)
+        db.execute(insert(TransactionVolumeRollup).from_select(
+            ["user_id", "month", "transaction_type", "currency", "transaction_count", "total_amount"],
+            select(
+                source.c.user_id, month, source.c.transaction_type, account_currency,
+                func.count(), func.coalesce(func.sum(source.c.amount), 0.0)
+            ).join(Account, Account.id == source.c.account_id)
+            .where(source.c.user_id == user_id)
+            .group_by(source.c.user_id, month, source.c.transaction_type, account_currency)
+        ))
+
+    db.execute(insert(BalanceRollup).from_select(
+        ["user_id", "account_type", "currency", "account_count", "total_balance"],
+        select(
+            Account.user_id, Account.account_type, account_currency,
+            func.count(), func.coalesce(func.sum(Account.balance), 0.0)
+        ).where(Account.user_id.in_(user_ids), Account.pending_delete == False)
+        .group_by(Account.user_id, Account.account_type, account_currency)
+    ))
+
+
+def _rebuild_in_chunks(db: Session, user_ids: list[int], chunk_size: int, progress: Progress = None) -> int:
+    rebuilt = 0
+    for start in range(0, len(user_ids), chunk_size):
+        chunk = user_ids[start:start + chunk_size]
+        _rebuild_users(db, chunk)
+        db.commit()
+        rebuilt += len(chunk)
+        if progress:
+            progress(rebuilt, len(user_ids))
+    return rebuilt
+
+
+def changed_users(db: Session, after: datetime, upper: datetime) -> list[int]:
+    """Users with transaction or account changes logged in (after, upper]"""
+    rows = db.query(ChangeLog.user_id).filter(
+        ChangeLog.changed_at > after, ChangeLog.changed_at <= upper,
+        ChangeLog.entity.in_((SyncEntity.TRANSACTION, SyncEntity.ACCOUNT))
+    ).distinct().order_by(ChangeLog.user_id).all()
+    return [user_id for (user_id,) in rows]
+
+
+def refresh_user_rollups(db: Session, upper: datetime, full: bool = False,
+                         chunk_size: int = USER_CHUNK_SIZE, progress: Progress = None) -> int:
+    """
+    Rebuild the changed users' volume and balance rows (or everyone's); returns
+    users rebuilt. `progress(done, total)` is called after every chunk.
+    """
+    if full:
+        # Chunks replace rows in place, so the rollups stay readable throughout;
+        # deleted users' rows go with them (ON DELETE CASCADE)
+        user_ids = [user_id for (user_id,) in db.query(User.id).order_by(User.id).all()]
+    else:
+        user_ids = changed_users(db, get_watermark(db, CHANGES_WATERMARK), upper)
+
+    rebuilt = _rebuild_in_chunks(db, user_ids, chunk_size, progress)
+    set_watermark(db, CHANGES_WATERMARK, upper)
+    db.commit()
+    return rebuilt
+
+
+def needs_full_refresh(db: Session, now: Optional[datetime] = None) -> bool:
+    """No change_log watermark yet, or one older than the log's retention (changes may be pruned)"""
+    watermark = get_watermark(db, CHANGES_WATERMARK)
+    return watermark is None or watermark < (now or datetime.now()) - timedelta(days=RETENTION_DAYS)
+
+
+def refresh_rollups(db: Session, full: bool = False, force: bool = False,
+                    now: Optional[datetime] = None, progress: Progress = None) -> dict:
+    """
+    Bring every rollup up to now - SETTLE_SECONDS. Runs incrementally unless
+    `full` or a full rebuild is required; a full rebuild inside business hours
+    is deferred (mode "deferred", nothing changed) unless `force`.
+    """
+    now = now or datetime.now()
+    upper = now - timedelta(seconds=SETTLE_SECONDS)
+    full = full or needs_full_refresh(db, now)
+    if full and in_business_hours(now) and not force:
+        return {"mode": "deferred", "months": 0, "users": 0, "refreshed_through": refreshed_through(db)}
+
+    months = refresh_signups(db, upper, full=full)
+    users = refresh_user_rollups(db, upper, full=full, progress=progress)
+    return {"mode": "full" if full else "incremental", "months": months, "users": users, "refreshed_through": upper}
@@ -0,0 +1,216 @@
+"""
+Delta sync for offline clients.
+
+Every write to a transaction, account or category assignment adds a row to
+change_log in the same DB transaction (record_changes). A client keeps the
+opaque cursor from its last sync; changes_since() reads the user's log rows
+after it with one range scan of (user_id, id), collapses them to the latest
+operation per entity, and loads the current rows for the upserts in one
+IN query per entity. DELETE rows come back as tombstones.
+
+Cursor safety: sequence ids are handed out at INSERT but become visible at
+COMMIT, so a later id can be visible before an earlier one. A sync stops at
+the first of the user's entries younger than SETTLE_SECONDS and never moves
+the cursor past it; record changes just before committing so the gap
+between the two stays well inside that window.
+
+Log rows older than the retention period are removed by prune_change_log().
+A cursor pointing before the oldest remaining row can't be served
+incrementally, so those clients get a full snapshot flagged `reset`.
+"""
+import base64
+from datetime import datetime, timedelta
+from typing import Iterable, NamedTuple, Optional
+
+from sqlalchemy import delete, func, insert, literal, select
+from sqlalchemy.orm import Session
+
+from database.models import (
+    Account, Category, ChangeLog, ChangeOperation, SyncEntity, user_category_association,
+)
+from Models.accounts import AccountResponse
+from Models.categories import UserCategoryResponse
+from Models.transactions import TransactionResponse
+from services.archive import transaction_source
+
+SETTLE_SECONDS = 2
+RETENTION_DAYS = 90
+CURSOR_VERSION = "v1"
+
+
+class ChangeEntry(NamedTuple):
+    user_id: int
+    entity: SyncEntity
+    entity_id: int
+    operation: ChangeOperation
+
+
+def upserted(user_id: int, entity: SyncEntity, *entity_ids: Optional[int]) -> list[ChangeEntry]:
+    return [ChangeEntry(user_id, entity, entity_id, ChangeOperation.UPSERT) for entity_id in entity_ids if entity_id is not None]
+
+
+def deleted(user_id: int, entity: SyncEntity, *entity_ids: Optional[int]) -> list[ChangeEntry]:
+    return [ChangeEntry(user_id, entity, entity_id, ChangeOperation.DELETE) for entity_id in entity_ids if entity_id is not None]
+
+
+def record_changes(db: Session, entries: Iterable[ChangeEntry]) -> None:
+    """Append change log rows in one multi-row INSERT; does not commit"""
+    now = datetime.now()
+    rows = [
+        {"user_id": user_id, "entity": entity, "entity_id": entity_id, "operation": operation, "changed_at": now}
+        for user_id, entity, entity_id, operation in dict.fromkeys(entries)
+    ]
+    if rows:
+        db.execute(insert(ChangeLog), rows)
+
+
+def record_category_update(db: Session, category_id: int) -> None:
+    """A system category changed: log an upsert for every user it's assigned to (one INSERT ... SELECT)"""
+    assigned = select(
+        user_category_association.c.user_id,
+        literal(SyncEntity.CATEGORY.name),
+        user_category_association.c.category_id,
+        literal(ChangeOperation.UPSERT.name),
+        literal(datetime.now()),
+    ).where(user_category_association.c.category_id == category_id)
+    db.execute(insert(ChangeLog).from_select(
+        ["user_id", "entity", "entity_id", "operation", "changed_at"], assigned
+    ))
+
+
+def encode_cursor(seq: int) -> str:
+    return base64.urlsafe_b64encode(f"{CURSOR_VERSION}:{seq}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """Change sequence a cursor points at; raises ValueError for anything we didn't issue"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        version, _, seq = raw.partition(":")
+        if version == CURSOR_VERSION and int(seq) >= 0:
+            return int(seq)
+    except (ValueError, UnicodeDecodeError):
+        pass
+    raise ValueError("Invalid sync cursor")
+
+
+def _settled_before() -> datetime:
+    return datetime.now() - timedelta(seconds=SETTLE_SECONDS)
+
+
+def _load_rows(db: Session, user_id: int, ids: dict[SyncEntity, set[int]]) -> dict:
+    """Current transactions, accounts and category assignments for the given ids (None = all of the user's)"""
+    def scoped(query, column, entity):
+        if ids is None:
+            return query
+        return query.filter(column.in_(ids.get(entity, ()))) if ids.get(entity) else None
+
+    result = {"transactions": [], "accounts": [], "categories": []}
+
+    # Archived transactions still exist for the client: read them too so they are not tombstoned
+    source = transaction_source(db, user_id)
+    query = scoped(
+        db.query(*(source.c[name] for name in TransactionResponse.model_fields)).filter(source.c.user_id == user_id),
+        source.c.id, SyncEntity.TRANSACTION,
+    )
+    if query is not None:
+        result["transactions"] = [TransactionResponse.model_validate(row) for row in query.order_by(source.c.id)]
+
+    # Accounts being deleted are already tombstoned
+    query = scoped(db.query(Account).filter(Account.user_id == user_id, Account.pending_delete == False), Account.id, SyncEntity.ACCOUNT)
+    if query is not None:
+        result["accounts"] = [AccountResponse.model_validate(row) for row in query.order_by(Account.id)]
+
+    query = scoped(
+        db.query(
+            Category.id, Category.name, user_category_association.c.custom_name, Category.description,
+            Category.category_type, Category.icon, user_category_association.c.is_active,
+            Category.is_system_category, user_category_association.c.created_at.label("assigned_at"),
+        ).join(user_category_association, Category.id == user_category_association.c.category_id)
+        .filter(user_category_association.c.user_id == user_id),
+        Category.id, SyncEntity.CATEGORY,
+    )
+    if query is not None:
+        result["categories"] = [UserCategoryResponse.model_validate(row._asdict()) for row in query.order_by(Category.id)]
+
+    return result
+
+
+def snapshot(db: Session, user_id: int, reset: bool = False) -> dict:
+    """Everything the user has now, with a cursor for the next incremental sync"""
+    # Changes after the cursor are sent again later; upserts are idempotent for the client
+    unsettled = db.query(func.min(ChangeLog.id)).filter(
+        ChangeLog.user_id == user_id, ChangeLog.changed_at > _settled_before()
+    ).scalar()
+    if unsettled is not None:
+        seq = unsettled - 1
+    else:
+        seq = db.query(func.max(ChangeLog.id)).filter(ChangeLog.user_id == user_id).scalar() or 0
+    return {
+        **_load_rows(db, user_id, None),
+        "deleted": [],
+        "cursor": encode_cursor(seq),
+        "has_more": False,
+        "reset": reset,
+    }
+
+
+def changes_since(db: Session, user_id: int, after_seq: int, limit: int = 500) -> dict:
+    """
+    Changes after `after_seq`, at most `limit` log rows per call. Follow the
+    returned cursor while has_more is true.
+    """
+    # Rows after the cursor were pruned: this client has to start over
+    oldest = db.query(func.min(ChangeLog.id)).scalar()
+    if oldest is not None and after_seq < oldest - 1:
+        return snapshot(db, user_id, reset=True)
+
+    log = db.query(ChangeLog.id, ChangeLog.entity, ChangeLog.entity_id, ChangeLog.operation, ChangeLog.changed_at).filter(
+        ChangeLog.user_id == user_id,
+        ChangeLog.id > after_seq,
+    ).order_by(ChangeLog.id).limit(limit + 1).all()
+
+    has_more = len(log) > limit
+    log = log[:limit]
+    settled_before = _settled_before()
+    for position, row in enumerate(log):
+        if row.changed_at > settled_before:
+            log, has_more = log[:position], False
+            break
+
+    # Latest operation wins for each entity
+    latest = {}
+    for _, entity, entity_id, operation, _ in log:
+        latest[(entity, entity_id)] = operation
+
+    upsert_ids: dict[SyncEntity, set[int]] = {}
+    for (entity, entity_id), operation in latest.items():
+        if operation == ChangeOperation.UPSERT:
+            upsert_ids.setdefault(entity, set()).add(entity_id)
+    rows = _load_rows(db, user_id, upsert_ids)
+
+    # Upserted rows that are gone by now were deleted after this page; report them as deleted too
+    found = {
+        SyncEntity.TRANSACTION: {row.id for row in rows["transactions"]},
+        SyncEntity.ACCOUNT: {row.id for row in rows["accounts"]},
+        SyncEntity.CATEGORY: {row.id for row in rows["categories"]},
+    }
+    tombstones = [
+        {"entity": entity, "id": entity_id}
+        for (entity, entity_id), operation in latest.items()
+        if operation == ChangeOperation.DELETE or entity_id not in found[entity]
+    ]
+
+    return {
+        **rows,
+        "deleted": tombstones,
+        "cursor": encode_cursor(log[-1].id if log else after_seq),
+        "has_more": has_more,
+        "reset": False,
+    }
+
+
+def prune_change_log(db: Session, older_than: Optional[datetime] = None) -> int:
+    """Delete log rows (and tombstones) older than the retention period; does not commit"""
+    cutoff = older_than or datetime.now() - timedelta(days=RETENTION_DAYS)
+    return db.execute(delete(ChangeLog).where(ChangeLog.changed_at < cutoff)).rowcount
@@ -0,0 +1,91 @@
+"""
+Background job handlers.
+
+Each handler receives a JobContext, does its work on ctx.db (committed by
+the worker when the handler returns), and returns a JSON-serialisable result.
+"""
+from datetime import date
+
+from services.jobs import JobContext, job_handler
+from services.budgets import rebuild_budget_spend
+from services.recurring import materialise_due
+from services.balance_history import rebuild_balance_snapshots
+from services.idempotency import sweep_expired_keys
+from services.partitions import ensure_partitions
+from services.archive import archive_transactions
+from services.rollups import refresh_rollups
+from services.deletion import delete_account, delete_user
+
+
+@job_handler("budgets.rebuild")
+def rebuild_budgets_job(ctx: JobContext):
+    """Recompute budget counters for payload user_id (or everyone)"""
+    ctx.progress(0.0, "Rebuilding budget counters")
+    counters = rebuild_budget_spend(ctx.db, user_id=ctx.payload.get("user_id"))
+    return {"counters": counters}
+
+
+@job_handler("recurring.materialise")
+def materialise_recurring_job(ctx: JobContext):
+    """Post recurring transactions due on or before payload as_of (default today)"""
+    as_of = date.fromisoformat(ctx.payload["as_of"]) if ctx.payload.get("as_of") else None
+    ctx.progress(0.0, "Posting due recurring transactions")
+    return materialise_due(ctx.db, as_of=as_of)
+
+
+@job_handler("snapshots.rebuild")
+def rebuild_snapshots_job(ctx: JobContext):
+    """Recompute daily balance snapshots for payload account_ids (or every account)"""
+    ctx.progress(0.0, "Rebuilding balance snapshots")
+    return {"rows": rebuild_balance_snapshots(ctx.db, account_ids=ctx.payload.get("account_ids"))}
+
+
+@job_handler("idempotency.sweep")
+def sweep_idempotency_keys_job(ctx: JobContext):
+    """Delete expired Idempotency-Key records in bounded chunks"""
+    ctx.progress(0.0, "Deleting expired idempotency keys")
+    return {"deleted": sweep_expired_keys(ctx.db, chunk_size=ctx.payload.get("chunk_size", 1000))}
+
+
+@job_handler("partitions.ensure")
+def ensure_partitions_job(ctx: JobContext):
+    """Create missing monthly transaction partitions through payload months_ahead"""
+    ctx.progress(0.0, "Creating transaction partitions")
+    return {"created": ensure_partitions(ctx.db, months_ahead=ctx.payload.get("months_ahead", 3))}
+
+
+@job_handler("transactions.archive")
+def archive_transactions_job(ctx: JobContext):
+    """Move transactions older than payload older_than_days (default from settings) into the archive"""
+    ctx.progress(0.0, "Archiving old transactions")
+    return {"moved": archive_transactions(
+        ctx.db,
+        older_than_days=ctx.payload.get("older_than_days"),
+        batch_size=ctx.payload.get("batch_size", 5000),
+        progress=lambda moved: ctx.progress(0.0, f"Archived {moved} transactions"),
+    )}
+
+
+@job_handler("analytics.refresh_rollups")
+def refresh_rollups_job(ctx: JobContext):
+    """Refresh the admin analytics rollups; payload full rebuilds, force runs it during business hours"""
+    ctx.progress(0.0, "Refreshing admin analytics rollups")
+    stats = refresh_rollups(ctx.db, full=ctx.payload.get("full", False), force=ctx.payload.get("force", False),
+                            progress=lambda done, total: ctx.progress(done / total, f"Rebuilt {done} of {total} users"))
+    return {**stats, "refreshed_through": stats["refreshed_through"] and stats["refreshed_through"].isoformat()}
+
+
+@job_handler("accounts.delete")
+def delete_account_job(ctx: JobContext):
+    """Delete pending-delete account payload account_id and its rows, in committed batches"""
+    ctx.progress(0.0, "Deleting account")
+    return {"deleted": delete_account(ctx.db, ctx.payload["account_id"], batch_size=ctx.payload.get("batch_size", 5000),
+                                      progress=ctx.progress)}
+
+
+@job_handler("users.delete")
+def delete_user_job(ctx: JobContext):
+    """Delete pending-delete user payload user_id and all their data, in committed batches"""
+    ctx.progress(0.0, "Deleting user")
+    return {"deleted": delete_user(ctx.db, ctx.payload["user_id"], batch_size=ctx.payload.get("batch_size", 5000),
+                                   progress=ctx.progress)}
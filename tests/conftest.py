@@ -0,0 +1,175 @@
+"""
+Shared fixtures: a database with the schema at the current migration head.
+
+By default that is a fresh SQLite file, created from the models the way
+`python manage.py create-tables` bootstraps one and stamped at the Alembic
+head (test_query_plans.py checks that every index a migration adds exists in
+it). Set TEST_DATABASE_URL to run against a PostgreSQL database that
+`alembic upgrade head` has been applied to instead; it must be at head.
+
+The app under test runs with QUERY_BUDGET on, and relationships use
+lazy="raise", so any lazy load or over-budget route fails the test that
+hits it.
+"""
+import os
+import uuid
+from pathlib import Path
+
+# Read when the models are defined, so set before anything imports them
+os.environ["ORM_LAZY_LOAD"] = "raise"
+
+import pytest
+from fastapi.testclient import TestClient
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+
+from database.connection import SessionLocal, configure_engine, create_tables, dispose_engine, get_engine
+from database.models import Category, User
+from database.models.user import Role
+from settings import Settings
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def alembic_config(url: str) -> Config:
+    # Built without alembic.ini so env.py leaves the test run's logging alone
+    config = Config()
+    config.set_main_option("script_location", str(ROOT / "alembic"))
+    config.set_main_option("sqlalchemy.url", url)
+    return config
+
+
+@pytest.fixture(scope="session")
+def database(tmp_path_factory):
+    """URL of the migrated test database; the app's engine points at it for the session"""
+    url = os.getenv("TEST_DATABASE_URL")
+    if url:
+        configure_engine(url)
+        head = ScriptDirectory.from_config(alembic_config(url)).get_current_head()
+        with get_engine().connect() as connection:
+            current = MigrationContext.configure(connection).get_current_revision()
+        if current != head:
+            pytest.fail(f"TEST_DATABASE_URL is at revision {current}, run `alembic upgrade head` ({head}) first")
+    else:
+        url = f"sqlite:///{tmp_path_factory.mktemp('db') / 'test.db'}"
+        configure_engine(url)
+        create_tables()
+        command.stamp(alembic_config(url), "head")
+    yield url
+    dispose_engine()
+
+
+@pytest.fixture
+def db(database):
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture(scope="session")
+def app(database):
+    from main import create_app
+    return create_app(Settings(database_url=database, rate_limit_enabled=False, warm_up=False, query_budget=True))
+
+
+@pytest.fixture(scope="session")
+def client(app):
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope="session")
+def categories(database):
+    """Ids of an expense, an income and a transfer category"""
+    session = SessionLocal()
+    try:
+        ids = {}
+        for name, category_type in (("Food", "EXPENSE"), ("Salary", "INCOME"), ("Move", "TRANSFER")):
+            category = session.query(Category).filter(Category.name == name).first()
+            if category is None:
+                category = Category(name=name, category_type=category_type)
+                session.add(category)
+                session.flush()
+            ids[category_type] = category.id
+        session.commit()
+        return ids
+    finally:
+        session.close()
+
+
+@pytest.fixture(scope="session")
+def register(client):
+    """register(admin=False) -> bearer headers for a new user"""
+    def register_user(admin: bool = False) -> dict:
+        name = f"user-{uuid.uuid4().hex[:12]}"
+        email = f"{name}@example.com"
+        response = client.post("/register", json={"name": name, "email": email, "age": 30, "gender": "MALE", "password": "secret"})
+        assert response.status_code == 200, response.text
+        if admin:
+            session = SessionLocal()
+            try:
+                session.query(User).filter(User.email == email).update({User.role: Role.ADMIN})
+                session.commit()
+            finally:
+                session.close()
+        response = client.post("/login", json={"email": email, "password": "secret"})
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+    return register_user
+
+
+@pytest.fixture
+def auth_headers(register):
+    """Bearer headers for a newly registered user"""
+    return register()
+
+
+@pytest.fixture
+def user_id(client, auth_headers):
+    return client.get("/user/me", headers=auth_headers).json()["id"]
+
+
+@pytest.fixture(scope="session")
+def make_account(client):
+    """make_account(headers, balance=1000, **fields) -> account id; names are unique across all users"""
+    def create(headers: dict, balance: float = 1000, account_type: str = "CHECKING", **fields) -> int:
+        body = {"account_name": f"Account {uuid.uuid4().hex[:10]}", "account_type": account_type, "balance": balance, **fields}
+        response = client.post("/account/create", json=body, headers=headers)
+        assert response.status_code == 200, response.text
+        return response.json()["id"]
+    return create
+
+
+@pytest.fixture(scope="session")
+def make_transaction(client):
+    """make_transaction(headers, account_id, category_id, amount, transaction_type="EXPENSE", **fields) -> response JSON"""
+    def create(headers: dict, account_id: int, category_id: int, amount: float, transaction_type: str = "EXPENSE", **fields) -> dict:
+        body = {"transaction_name": "Test", "amount": amount, "transaction_type": transaction_type,
+                "account_id": account_id, "category_id": category_id, **fields}
+        response = client.post("/transaction/create", json=body, headers=headers)
+        assert response.status_code == 200, response.text
+        return response.json()
+    return create
+
+
+@pytest.fixture
+def assigned(client, auth_headers, categories):
+    """The categories, assigned to the auth_headers user"""
+    for category_id in categories.values():
+        response = client.post("/categories/assign", json={"category_id": category_id, "is_active": True}, headers=auth_headers)
+        assert response.status_code == 200, response.text
+    return categories
+
+
+@pytest.fixture(scope="session")
+def run_jobs(database):
+    """run_jobs(*job_types) -> number of queued jobs run to completion or failure"""
+    import services.tasks  # noqa: F401 - registers the handlers
+    from services.jobs import work
+
+    def run(*job_types: str) -> int:
+        return work(worker_id="tests", once=True, job_types=list(job_types) or None)
+    return run
@@ -0,0 +1,66 @@
+"""
+Vectorised cash-flow analytics (services/analytics.py): the array series
+agree with a plain per-transaction tally.
+"""
+from datetime import date, datetime
+
+import numpy as np
+
+from services.analytics import bucket_edges, cash_flow_series, category_mix, frame_from_rows, rolling_mean
+
+ROWS = [
+    (datetime(2024, 1, 3, 9), 1000.0, "INCOME", 2),
+    (datetime(2024, 1, 5, 12), 120.0, "EXPENSE", 1),
+    (datetime(2024, 1, 31, 23), 30.0, "EXPENSE", 3),
+    (datetime(2024, 2, 1), 200.0, "TRANSFER", 4),
+    (datetime(2024, 2, 14), 80.0, "EXPENSE", 1),
+    (datetime(2024, 3, 30), 500.0, "INCOME", 2),
+]
+
+
+def test_monthly_series_match_a_plain_tally():
+    frame = frame_from_rows(ROWS, date(2024, 1, 1), date(2024, 3, 31))
+    series = cash_flow_series(frame, "month", window=2)
+
+    assert series["buckets"] == [date(2024, 1, 1), date(2024, 2, 1), date(2024, 3, 1)]
+    assert series["inflow"] == [1000, 0, 500]
+    assert series["outflow"] == [150, 80, 0]   # transfers are neither
+    assert series["net"] == [850, -80, 500]
+    assert series["savings_rate"] == [0.85, 0, 1]
+    assert series["rolling_outflow"] == [150, 115, 40]
+    assert series["overall_savings_rate"] == round((1500 - 230) / 1500, 4)
+
+
+def test_week_buckets_start_on_monday():
+    edges = bucket_edges(date(2024, 1, 3), date(2024, 1, 16), "week")
+    assert edges.tolist() == [date(2024, 1, 1), date(2024, 1, 8), date(2024, 1, 15)]
+    assert rolling_mean(np.array([2.0, 4.0, 6.0]), 2).tolist() == [2, 3, 5]
+
+
+def test_category_mix_matrix():
+    frame = frame_from_rows(ROWS, date(2024, 1, 1), date(2024, 2, 29))
+    mix = category_mix(frame, "month")
+    assert mix["category_ids"] == [1, 3]
+    assert mix["series"] == [[120, 80], [30, 0]]
+    assert mix["totals"] == [200, 30]
+    assert mix["shares"] == [round(200 / 230, 4), round(30 / 230, 4)]
+
+
+def test_empty_range():
+    frame = frame_from_rows([], date(2024, 1, 1), date(2024, 1, 3))
+    series = cash_flow_series(frame, "day")
+    assert series["inflow"] == [0, 0, 0] and series["overall_savings_rate"] == 0
+    assert category_mix(frame)["category_ids"] == []
+
+
+def test_cash_flow_endpoint(client, auth_headers, assigned, make_account, make_transaction):
+    account_id = make_account(auth_headers)
+    make_transaction(auth_headers, account_id, assigned["INCOME"], 300, "INCOME", date="2024-05-02T10:00:00")
+    make_transaction(auth_headers, account_id, assigned["EXPENSE"], 75, date="2024-05-20T10:00:00")
+    make_transaction(auth_headers, account_id, assigned["EXPENSE"], 25, date="2024-06-01T10:00:00")
+
+    response = client.get("/analytics/cash-flow", headers=auth_headers,
+                          params={"start_date": "2024-05-01", "end_date": "2024-06-30"})
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert (body["inflow"], body["outflow"]) == ([300, 0], [75, 25])
@@ -0,0 +1,51 @@
+"""
+App factory and lazy engine (main.py, database/connection.py): importing
+is cheap, and nothing connects until the app starts.
+"""
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def run_python(code: str) -> str:
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return result.stdout
+
+
+def test_import_main_is_cheap():
+    loaded = json.loads(run_python(
+        "import json, sys, main; "
+        "print(json.dumps([name for name in sys.modules if name.split('.')[0] in ('routers', 'services', 'sqlalchemy', 'numpy')]))"
+    ))
+    assert loaded == []
+
+
+def test_engine_is_created_on_first_use():
+    out = run_python(
+        "import database.connection as c, database.models, services.analytics; "
+        "print(c._engine is None); "
+        "c.configure_engine('sqlite://'); print(c._engine is None); "
+        "engine = c.get_engine(); print(engine is c.get_engine(), engine.url); "
+        "c.dispose_engine(); print(c._engine is None)"
+    )
+    assert out.split("\n")[:4] == ["True", "True", "True sqlite://", "True"]
+
+
+def test_lifespan_opens_and_disposes_the_engine(tmp_path):
+    # In a subprocess: configure_engine() is process-wide and the other tests share it
+    url = f"sqlite:///{tmp_path / 'factory.db'}"
+    out = run_python(
+        "from fastapi.testclient import TestClient\n"
+        "import database.connection as c\n"
+        "from main import create_app\n"
+        "from settings import Settings\n"
+        f"app = create_app(Settings(database_url={url!r}, rate_limit_enabled=False, warm_up=True))\n"
+        "print(c._engine is None, app.state.ready)\n"
+        "with TestClient(app) as client:\n"
+        "    print(c._engine is not None, client.get('/ready').status_code)\n"
+        "print(c._engine is None, app.state.ready)\n"
+    )
+    assert out.split("\n")[:3] == ["True False", "True 200", "True False"]
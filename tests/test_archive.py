@@ -0,0 +1,36 @@
+"""
+Cold-history tier (services/archive.py): archived transactions move out of
+the hot table but every read still sees them.
+"""
+from datetime import date, datetime
+
+from database.models import Transaction, TransactionArchive
+from services.archive import HOT_TABLE, archive_transactions, has_archived, transaction_source
+
+# Older than anything the other tests write, so only this test's rows move
+CUTOFF = date(2016, 1, 1)
+
+
+def test_archived_rows_stay_readable(client, db, auth_headers, user_id, assigned, make_account, make_transaction):
+    account_id = make_account(auth_headers, balance=1000)
+    old = make_transaction(auth_headers, account_id, assigned["EXPENSE"], 10, date="2015-06-01T12:00:00")
+    recent = make_transaction(auth_headers, account_id, assigned["EXPENSE"], 5)
+
+    reported = []
+    moved = archive_transactions(db, older_than_days=(date.today() - CUTOFF).days, batch_size=1, progress=reported.append)
+    assert moved >= 1 and reported[-1] == moved
+    assert db.get(Transaction, old["id"]) is None and db.get(TransactionArchive, old["id"]) is not None
+    assert db.get(Transaction, recent["id"]) is not None
+
+    # Only ranges that reach the archive pay for the UNION
+    assert has_archived(db, user_id)
+    assert transaction_source(db, user_id, start=datetime(2020, 1, 1)) is HOT_TABLE
+    assert transaction_source(db, user_id) is not HOT_TABLE
+
+    response = client.get(f"/transaction/get/{old['id']}", headers=auth_headers)
+    assert response.status_code == 200 and response.json()["amount"] == 10
+    listed = client.get("/transaction/get_all", params={"account_id": account_id}, headers=auth_headers).json()
+    assert [row["id"] for row in listed] == [recent["id"], old["id"]]
+    flow = client.get("/analytics/cash-flow", headers=auth_headers,
+                      params={"start_date": "2015-06-01", "end_date": "2015-06-30"}).json()
+    assert flow["total_outflow"] == 10
@@ -0,0 +1,51 @@
+"""
+Daily balance snapshots (services/balance_history.py): back-dated writes
+keep every later day right, and the incremental rows match a rebuild.
+"""
+from database.models import AccountBalanceSnapshot
+from services.balance_history import rebuild_balance_snapshots
+
+
+def snapshots(db, account_id: int) -> list[tuple]:
+    rows = db.query(AccountBalanceSnapshot).filter(AccountBalanceSnapshot.account_id == account_id) \
+        .order_by(AccountBalanceSnapshot.day)
+    return [(row.day, round(row.closing_balance, 2), round(row.net_change, 2)) for row in rows]
+
+
+def as_of(client, headers, account_id: int, at: str) -> float:
+    response = client.get(f"/account/{account_id}/balance/as-of", params={"at": at}, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()["balance"]
+
+
+def test_back_dated_writes_and_balance_as_of(client, db, auth_headers, assigned, make_account, make_transaction):
+    account_id = make_account(auth_headers, balance=1000)
+    make_transaction(auth_headers, account_id, assigned["INCOME"], 100, "INCOME", date="2024-03-01T12:00:00")
+    make_transaction(auth_headers, account_id, assigned["EXPENSE"], 40, date="2024-03-05T10:00:00")
+    # Back-dated between the two: every later closing balance moves
+    make_transaction(auth_headers, account_id, assigned["EXPENSE"], 10, date="2024-03-03T08:00:00")
+
+    assert as_of(client, auth_headers, account_id, "2024-02-28T00:00:00") == 1000
+    assert as_of(client, auth_headers, account_id, "2024-03-02T00:00:00") == 1100
+    assert as_of(client, auth_headers, account_id, "2024-03-05T09:00:00") == 1090
+    assert as_of(client, auth_headers, account_id, "2024-03-05T11:00:00") == 1050
+
+    response = client.get(f"/account/{account_id}/balance/history", headers=auth_headers,
+                          params={"start_date": "2024-03-01", "end_date": "2024-03-06"})
+    assert response.json()["closing_balances"] == [1100, 1100, 1090, 1090, 1050, 1050]
+
+    incremental = snapshots(db, account_id)
+    rebuild_balance_snapshots(db, [account_id])
+    assert snapshots(db, account_id) == incremental
+
+
+def test_deleted_transaction_leaves_the_snapshots(client, db, auth_headers, assigned, make_account, make_transaction):
+    account_id = make_account(auth_headers, balance=500)
+    expense = make_transaction(auth_headers, account_id, assigned["EXPENSE"], 60, date="2024-04-10T12:00:00")
+    assert as_of(client, auth_headers, account_id, "2024-04-11T00:00:00") == 440
+
+    assert client.delete(f"/transaction/{expense['id']}", headers=auth_headers).status_code in (200, 204)
+    assert as_of(client, auth_headers, account_id, "2024-04-11T00:00:00") == 500
+    incremental = snapshots(db, account_id)
+    rebuild_balance_snapshots(db, [account_id])
+    assert [row for row in incremental if row[2]] == snapshots(db, account_id)
@@ -0,0 +1,41 @@
+"""
+Batch endpoint (routers/batch.py): several reads in one round trip, each
+with its own status, under the caller's identity.
+"""
+
+
+def test_batch_runs_sub_requests_in_order(client, auth_headers, register, make_account):
+    account_id = make_account(auth_headers)
+    other_account = make_account(register())
+
+    response = client.post("/batch", headers=auth_headers, json={"requests": [
+        {"id": "accounts", "path": "/account/get_all"},
+        {"id": "one", "path": f"/account/get/{account_id}"},
+        {"id": "theirs", "path": f"/account/get/{other_account}"},
+        {"id": "missing", "path": "/no/such/route"},
+        {"id": "page", "path": "/transaction/get_all?limit=5"},
+    ]})
+    assert response.status_code == 200, response.text
+    results = response.json()["responses"]
+    assert [r["id"] for r in results] == ["accounts", "one", "theirs", "missing", "page"]
+    assert [r["status"] for r in results] == [200, 200, 404, 404, 200]
+    assert [a["id"] for a in results[0]["body"]] == [account_id]
+    assert results[1]["body"]["id"] == account_id
+
+
+def test_batch_refuses_streaming_and_nested_requests(client, auth_headers):
+    response = client.post("/batch", headers=auth_headers, json={"requests": [
+        {"path": "/account/get_all"}, {"path": "/events/stream"},
+    ]})
+    assert response.status_code == 400
+    assert "/events/stream" in response.json()["detail"]
+
+    response = client.post("/batch", headers=auth_headers, json={"requests": [{"path": "/batch"}]})
+    assert response.status_code == 422
+    response = client.post("/batch", headers=auth_headers, json={"requests": [{"method": "POST", "path": "/account/create"}]})
+    assert response.status_code == 422
+
+
+def test_batch_needs_authentication(client):
+    response = client.post("/batch", json={"requests": [{"path": "/account/get_all"}]})
+    assert response.status_code == 403
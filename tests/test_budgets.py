@@ -0,0 +1,52 @@
+"""
+Budget spend counters (services/budgets.py): every transaction write keeps
+them equal to a rebuild from the ledger.
+"""
+from database.models import Budget
+from services.budgets import budget_status, rebuild_budget_spend
+
+
+def status(client, headers, budget_id: int) -> tuple:
+    response = client.get(f"/budgets/{budget_id}/status", headers=headers)
+    assert response.status_code == 200, response.text
+    body = response.json()
+    return body["spent"], body["transaction_count"]
+
+
+def test_counters_follow_writes_and_match_a_rebuild(client, db, auth_headers, assigned, make_account, make_transaction):
+    account_id = make_account(auth_headers)
+    # Spending from before the budget existed is counted when it is created
+    make_transaction(auth_headers, account_id, assigned["EXPENSE"], 30)
+    response = client.post("/budgets/create", json={"name": "Food", "amount": 100, "category_id": assigned["EXPENSE"]},
+                           headers=auth_headers)
+    assert response.status_code == 200, response.text
+    budget_id = response.json()["id"]
+    assert status(client, auth_headers, budget_id) == (30, 1)
+
+    groceries = make_transaction(auth_headers, account_id, assigned["EXPENSE"], 50)
+    make_transaction(auth_headers, account_id, assigned["INCOME"], 500, "INCOME")
+    assert status(client, auth_headers, budget_id) == (80, 2)
+
+    assert client.put(f"/transaction/{groceries['id']}", json={"amount": 90}, headers=auth_headers).status_code == 200
+    budget = client.get(f"/budgets/{budget_id}/status", headers=auth_headers).json()
+    assert (budget["spent"], budget["remaining"], budget["is_exceeded"]) == (120, -20, True)
+
+    assert client.delete(f"/transaction/{groceries['id']}", headers=auth_headers).status_code in (200, 204)
+    assert status(client, auth_headers, budget_id) == (30, 1)
+
+    rebuild_budget_spend(db, budget_ids=[budget_id])
+    db.commit()
+    counter = budget_status(db, db.get(Budget, budget_id))
+    assert (counter["spent"], counter["transaction_count"]) == (30, 1)
+
+
+def test_period_change_rebuilds_counters(client, auth_headers, assigned, make_account, make_transaction):
+    account_id = make_account(auth_headers)
+    make_transaction(auth_headers, account_id, assigned["EXPENSE"], 25)
+    response = client.post("/budgets/create", json={"name": "Weekly food", "amount": 60, "period": "WEEKLY",
+                                                    "category_id": assigned["EXPENSE"]}, headers=auth_headers)
+    budget_id = response.json()["id"]
+
+    response = client.patch(f"/budgets/update/{budget_id}", json={"period": "YEARLY"}, headers=auth_headers)
+    assert response.status_code == 200, response.text
+    assert status(client, auth_headers, budget_id) == (25, 1)
@@ -0,0 +1,77 @@
+"""
+Per-user /categories/my cache (services/category_cache.py): every write
+that changes a user's list drops exactly the affected entries.
+"""
+import uuid
+from types import SimpleNamespace
+
+from services.category_cache import UserCategoryCache, user_category_cache
+
+
+def items(*ids):
+    return [SimpleNamespace(id=category_id) for category_id in ids]
+
+
+def test_cache_hits_and_targeted_invalidation():
+    cache = UserCategoryCache()
+    assert [item.id for item in cache.get_or_load(1, lambda: items(10, 11))] == [10, 11]
+    cache.get_or_load(2, lambda: items(12))
+    assert cache.get_or_load(1, lambda: items()) and cache.stats()["hits"] == 1
+
+    cache.invalidate_category(11)
+    assert cache.stats()["users"] == 1   # only user 1 held category 11
+    cache.invalidate_users([2])
+    assert cache.stats()["users"] == 0 and cache.stats()["rows"] == 0
+
+
+def test_read_racing_an_invalidation_is_not_stored():
+    cache = UserCategoryCache()
+
+    def load():
+        cache.invalidate_users([1])   # a write commits while the read is in flight
+        return items(10)
+
+    cache.get_or_load(1, load)
+    assert cache.stats()["users"] == 0
+
+
+def test_row_limit_evicts_least_recent():
+    cache = UserCategoryCache(max_rows=3)
+    cache.get_or_load(1, lambda: items(1, 2))
+    cache.get_or_load(2, lambda: items(3, 4))
+    assert cache.stats()["users"] == 1 and cache.stats()["evictions"] == 1
+
+
+def my_categories(client, headers) -> dict:
+    response = client.get("/categories/my", headers=headers)
+    assert response.status_code == 200, response.text
+    return {row["id"]: row for row in response.json()}
+
+
+def test_writes_invalidate_my_categories(client, register, auth_headers):
+    admin = register(admin=True)
+    response = client.post("/categories/system/create", headers=admin,
+                           json={"name": f"Pets {uuid.uuid4().hex[:8]}", "category_type": "EXPENSE"})
+    assert response.status_code == 200, response.text
+    category_id = response.json()["id"]
+
+    assert category_id not in my_categories(client, auth_headers)
+    response = client.post("/categories/assign", json={"category_id": category_id}, headers=auth_headers)
+    assert response.status_code == 200, response.text
+    assert category_id in my_categories(client, auth_headers)
+
+    response = client.put(f"/categories/my/{category_id}", json={"category_id": category_id, "custom_name": "Dog"},
+                          headers=auth_headers)
+    assert response.status_code == 200, response.text
+    assert my_categories(client, auth_headers)[category_id]["custom_name"] == "Dog"
+
+    # An admin edit reaches every user holding the category
+    hits = user_category_cache.stats()["hits"]
+    my_categories(client, auth_headers)
+    assert user_category_cache.stats()["hits"] == hits + 1
+    response = client.put(f"/categories/system/{category_id}", json={"description": "Vet and food"}, headers=admin)
+    assert response.status_code == 200, response.text
+    assert my_categories(client, auth_headers)[category_id]["description"] == "Vet and food"
+
+    assert client.delete(f"/categories/my/{category_id}", headers=auth_headers).status_code == 204
+    assert category_id not in my_categories(client, auth_headers)
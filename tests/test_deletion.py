@@ -0,0 +1,59 @@
+"""
+Background deletes (services/deletion.py): the request hides the row and
+queues a job; the job deletes in batches.
+"""
+from database.models import Account, Budget, BudgetSpend, ChangeLog, Transaction, User
+from database.models.change_log import ChangeOperation, SyncEntity
+
+
+def tombstones(db, entity: SyncEntity) -> set[int]:
+    return {row.entity_id for row in db.query(ChangeLog.entity_id).filter(
+        ChangeLog.entity == entity, ChangeLog.operation == ChangeOperation.DELETE
+    )}
+
+
+def test_delete_account_with_spent_transfers(client, db, auth_headers, user_id, assigned, make_account, make_transaction, run_jobs):
+    """Money moved to another account and spent there stays spent; only the deleted account's rows go"""
+    deleted_id = make_account(auth_headers, balance=1000)
+    kept_id = make_account(auth_headers, balance=1)
+    client.post("/budgets/create", json={"name": "Food", "amount": 500, "category_id": assigned["EXPENSE"]}, headers=auth_headers)
+
+    outbound = make_transaction(auth_headers, deleted_id, assigned["TRANSFER"], 500, "TRANSFER", to_account_id=kept_id)
+    make_transaction(auth_headers, kept_id, assigned["EXPENSE"], 450)
+    inbound = make_transaction(auth_headers, kept_id, assigned["TRANSFER"], 40, "TRANSFER", to_account_id=deleted_id)
+    expense = make_transaction(auth_headers, deleted_id, assigned["EXPENSE"], 30)
+
+    response = client.delete(f"/account/delete/{deleted_id}", headers=auth_headers)
+    assert response.status_code == 202
+    assert [a["id"] for a in client.get("/account/get_all", headers=auth_headers).json()] == [kept_id]
+    run_jobs("accounts.delete")
+
+    job = client.get(f"/jobs/{response.json()['job_id']}", headers=auth_headers).json()
+    assert job["status"] == "SUCCEEDED", job
+    assert db.get(Account, deleted_id) is None
+    # The kept account's balance and its own rows are untouched
+    assert db.get(Account, kept_id).balance == 1 + 500 - 450 - 40
+    remaining = {row.id for row in db.query(Transaction.id).filter(Transaction.user_id == user_id)}
+    assert inbound["id"] in remaining and outbound["id"] not in remaining and expense["id"] not in remaining
+    # The deleted rows are tombstoned and their expense leaves the budget counter
+    assert {outbound["id"], expense["id"]} <= tombstones(db, SyncEntity.TRANSACTION)
+    spent = db.query(BudgetSpend.spent).join(Budget, Budget.id == BudgetSpend.budget_id).filter(Budget.user_id == user_id)
+    assert sum(row.spent for row in spent) == 450
+
+
+def test_delete_user(client, db, register, make_account, make_transaction, categories, run_jobs):
+    admin = register(admin=True)
+    headers = register()
+    user = client.get("/user/me", headers=headers).json()
+    account_id = make_account(headers)
+    make_transaction(headers, account_id, categories["INCOME"], 10, "INCOME")
+
+    response = client.delete(f"/admin/users/{user['id']}", headers=admin)
+    assert response.status_code == 202
+    # The token stops working as soon as the user is hidden
+    assert client.get("/account/get_all", headers=headers).status_code == 401
+    run_jobs("users.delete")
+
+    assert db.get(User, user["id"]) is None
+    assert db.query(Account).filter(Account.user_id == user["id"]).count() == 0
+    assert db.query(Transaction).filter(Transaction.user_id == user["id"]).count() == 0
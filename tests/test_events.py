@@ -0,0 +1,52 @@
+"""
+Real-time events (services/events.py, routers/events.py).
+"""
+import asyncio
+
+import pytest
+from starlette.websockets import WebSocketDisconnect
+
+from services.events import EventHub, make_event
+
+
+def test_hub_delivers_per_user_and_drops_slow_subscribers():
+    async def scenario():
+        hub = EventHub(max_queued=2)
+        mine, slow, theirs = hub.subscribe(1), hub.subscribe(1), hub.subscribe(2)
+
+        hub.deliver(1, make_event("a", {}))
+        assert (await mine.next_event(0.1))["type"] == "a"
+        assert await theirs.next_event(0.01) is None   # heartbeat time
+
+        hub.deliver(1, make_event("b", {}))
+        hub.deliver(1, make_event("c", {}))
+        # `slow` never reads, so the third event overflows its queue; `mine` read one and has room
+        assert slow.dropped and not mine.dropped
+        assert hub.subscriber_count(1) == 1 and hub.dropped_count == 1
+
+        hub.unsubscribe(mine)
+        hub.unsubscribe(theirs)
+        assert hub.subscriber_count() == 0
+
+    asyncio.run(scenario())
+
+
+def test_websocket_pushes_the_users_writes(client, auth_headers, assigned, make_account, make_transaction):
+    account_id = make_account(auth_headers, balance=100)
+    token = auth_headers["Authorization"].split()[1]
+
+    with client.websocket_connect(f"/events/ws?token={token}") as websocket:
+        websocket.send_text("ping")
+        assert websocket.receive_json() == {"type": "pong"}
+
+        make_transaction(auth_headers, account_id, assigned["EXPENSE"], 30)
+        events = [websocket.receive_json() for _ in range(2)]
+        by_type = {event["type"]: event["data"] for event in events}
+        assert by_type["account.balance"] == {"account_id": account_id, "balance": 70}
+        assert by_type["transaction.created"]["amount"] == 30
+
+
+def test_websocket_rejects_a_bad_token(client):
+    with pytest.raises(WebSocketDisconnect):
+        with client.websocket_connect("/events/ws?token=nope") as websocket:
+            websocket.receive_json()
@@ -0,0 +1,56 @@
+"""
+Faceted search (services/facets.py): the page and the facet counts over
+every match come back from one statement.
+"""
+import pytest
+
+from services.facets import parse_facets
+
+
+def search(client, headers, **params) -> dict:
+    response = client.get("/transaction/search", params=params, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def buckets(body, facet) -> set[tuple]:
+    return {(row["value"], row["currency"], row["count"], row["total"]) for row in body["facets"][facet]}
+
+
+def test_parse_facets():
+    assert parse_facets(None) == ()
+    assert parse_facets("account, category,account") == ("account", "category")
+    with pytest.raises(ValueError, match="Unknown facets: merchant"):
+        parse_facets("category,merchant")
+
+
+def test_page_and_facets(client, auth_headers, assigned, make_account, make_transaction):
+    usd = make_account(auth_headers, balance=500, currency="USD")
+    eur = make_account(auth_headers, balance=500, currency="EUR")
+    make_transaction(auth_headers, usd, assigned["EXPENSE"], 10, date="2024-01-01T10:00:00")
+    make_transaction(auth_headers, usd, assigned["EXPENSE"], 20, date="2024-01-02T10:00:00")
+    make_transaction(auth_headers, eur, assigned["INCOME"], 100, "INCOME", date="2024-01-03T10:00:00")
+    make_transaction(auth_headers, usd, assigned["TRANSFER"], 5, "TRANSFER", to_account_id=eur, date="2024-01-04T10:00:00")
+
+    plain = search(client, auth_headers, limit=2)
+    body = search(client, auth_headers, limit=2, facets="transaction_type,account,category")
+    assert [row["id"] for row in body["items"]] == [row["id"] for row in plain["items"]]
+    assert [row["amount"] for row in body["items"]] == [5, 100]
+    assert plain["facets"] is None and body["total_count"] == 4
+
+    assert buckets(body, "transaction_type") == {("EXPENSE", "USD", 2, 30), ("INCOME", "EUR", 1, 100), ("TRANSFER", "USD", 1, 5)}
+    assert buckets(body, "account") == {(usd, "USD", 3, 35), (eur, "EUR", 1, 100)}
+    assert buckets(body, "category") == {
+        (assigned["EXPENSE"], "USD", 2, 30), (assigned["INCOME"], "EUR", 1, 100), (assigned["TRANSFER"], "USD", 1, 5),
+    }
+
+    # Filters narrow the facets too; a page past the end still counts every match
+    body = search(client, auth_headers, transaction_type="EXPENSE", skip=10, facets="account")
+    assert body["items"] == [] and body["total_count"] == 2
+    assert buckets(body, "account") == {(usd, "USD", 2, 30)}
+    assert body["facets"]["category"] is None
+
+
+def test_unknown_facet(client, auth_headers):
+    response = client.get("/transaction/search", params={"facets": "merchant"}, headers=auth_headers)
+    assert response.status_code == 400
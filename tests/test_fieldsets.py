@@ -0,0 +1,52 @@
+"""
+Sparse fieldsets (Models/fieldsets.py): ?fields= narrows both the payload
+and the SQL projection.
+"""
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from Models.fieldsets import parse_fields, subset_model
+from Models.transactions import TransactionResponse
+
+
+def test_parse_fields_keeps_declared_order_and_id():
+    assert parse_fields(None, TransactionResponse) is None
+    assert parse_fields("date, amount", TransactionResponse) == ("id", "amount", "date")
+    with pytest.raises(ValueError, match="Unknown fields: nope"):
+        parse_fields("amount,nope", TransactionResponse)
+
+
+def test_subset_model_is_built_once():
+    model = subset_model(TransactionResponse, ("id", "amount"))
+    assert model is subset_model(TransactionResponse, ("id", "amount"))
+    assert list(model.model_fields) == ["id", "amount"]
+
+
+@pytest.fixture
+def statements():
+    seen = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        seen.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", record)
+    yield seen
+    event.remove(Engine, "before_cursor_execute", record)
+
+
+def test_fields_shrink_payload_and_query(client, auth_headers, assigned, make_account, make_transaction, statements):
+    account_id = make_account(auth_headers)
+    make_transaction(auth_headers, account_id, assigned["EXPENSE"], 12, description="Lunch")
+    statements.clear()
+
+    response = client.get("/transaction/get_all", params={"fields": "amount,date"}, headers=auth_headers)
+    assert response.status_code == 200, response.text
+    assert [set(row) for row in response.json()] == [{"id", "amount", "date"}]
+    selects = [s for s in statements if s.lstrip().upper().startswith("SELECT") and "transactions" in s and "amount" in s]
+    assert selects and not any("description" in s for s in selects)
+
+    response = client.get("/account/get_all", params={"fields": "balance"}, headers=auth_headers)
+    assert response.json() == [{"id": account_id, "balance": 988}]
+    response = client.get("/account/get_all", params={"fields": "balance,secret"}, headers=auth_headers)
+    assert response.status_code == 400
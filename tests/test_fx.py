@@ -0,0 +1,64 @@
+"""
+FX rates (services/fx.py): date-indexed lookups and vectorised conversion
+through the USD pivot.
+"""
+import json
+from datetime import date
+
+import numpy as np
+import pytest
+
+from services.fx import FxRateMissing, fx_cache, parse_rates_file, upsert_fx_rates
+
+RATES = [
+    {"currency": "EUR", "day": date(2024, 1, 1), "rate": 0.9},
+    {"currency": "EUR", "day": date(2024, 2, 1), "rate": 0.8},
+    {"currency": "GBP", "day": date(2024, 1, 1), "rate": 0.75},
+]
+
+
+@pytest.fixture
+def rates(db):
+    upsert_fx_rates(db, RATES)
+    return fx_cache
+
+
+def test_rate_in_force_on_each_day(rates):
+    days = np.array(["2023-06-01", "2024-01-15", "2024-02-01", "2024-09-01"], dtype="datetime64[D]")
+    # Before the first quote the earliest known rate applies
+    assert rates.rates("EUR", days).tolist() == [0.9, 0.9, 0.8, 0.8]
+    assert rates.rates("USD", days).tolist() == [1, 1, 1, 1]
+
+
+def test_convert_mixed_currencies(rates):
+    converted = rates.convert(
+        np.array([90.0, 80.0, 75.0, 10.0]),
+        np.array(["EUR", "EUR", "GBP", "USD"]),
+        np.array(["2024-01-10", "2024-03-01", "2024-03-01", "2024-03-01"], dtype="datetime64[D]"),
+        "USD",
+    )
+    assert np.allclose(converted, [100, 100, 100, 10])
+    assert np.allclose(rates.convert([75.0], ["GBP"], np.array(["2024-03-01"], dtype="datetime64[D]"), "EUR"), [80])
+    with pytest.raises(FxRateMissing):
+        rates.convert([1.0], ["JPY"], np.array(["2024-03-01"], dtype="datetime64[D]"), "USD")
+
+
+def test_upsert_replaces_and_reloads(db, rates):
+    day = np.array(["2024-02-01"], dtype="datetime64[D]")
+    upsert_fx_rates(db, [{"currency": "EUR", "day": date(2024, 2, 1), "rate": 0.5}])
+    assert rates.rates("EUR", day).tolist() == [0.5]
+    upsert_fx_rates(db, RATES)
+    assert rates.rates("EUR", day).tolist() == [0.8]
+
+
+def test_parse_rates_file(tmp_path):
+    path = tmp_path / "rates.json"
+    path.write_text(json.dumps({"base": "USD", "rates": {"2024-01-01": {"eur": 0.9, "GBP": 0.75}}}))
+    assert parse_rates_file(str(path)) == [
+        {"currency": "EUR", "day": date(2024, 1, 1), "rate": 0.9},
+        {"currency": "GBP", "day": date(2024, 1, 1), "rate": 0.75},
+    ]
+    csv_path = tmp_path / "rates.csv"
+    csv_path.write_text("date,currency,rate\n2024-01-01,EUR,-1\n")
+    with pytest.raises(ValueError):
+        parse_rates_file(str(csv_path))
@@ -0,0 +1,51 @@
+"""
+Idempotency keys (services/idempotency.py): a retried write is answered
+from the stored response and applied once.
+"""
+from datetime import datetime, timedelta
+
+from database.models import Account, IdempotencyKey, Transaction
+from services.idempotency import sweep_expired_keys
+
+
+def create(client, headers, key, body):
+    return client.post("/transaction/create", json=body, headers={**headers, "Idempotency-Key": key})
+
+
+def test_retry_replays_and_mismatch_is_refused(client, db, auth_headers, user_id, assigned, make_account):
+    account_id = make_account(auth_headers, balance=100)
+    body = {"transaction_name": "Coffee", "amount": 4, "transaction_type": "EXPENSE",
+            "account_id": account_id, "category_id": assigned["EXPENSE"]}
+
+    first = create(client, auth_headers, "coffee-1", body)
+    assert first.status_code == 200, first.text
+    retry = create(client, auth_headers, "coffee-1", body)
+    assert retry.status_code == 200 and retry.headers["idempotent-replayed"] == "true"
+    assert retry.json() == first.json()
+    assert db.query(Transaction).filter(Transaction.account_id == account_id).count() == 1
+    assert db.get(Account, account_id).balance == 96
+
+    response = create(client, auth_headers, "coffee-1", {**body, "amount": 5})
+    assert response.status_code == 422
+    response = create(client, auth_headers, "x" * 300, body)
+    assert response.status_code == 400
+
+
+def test_expired_keys_are_free_and_swept(client, db, auth_headers, user_id, assigned, make_account):
+    account_id = make_account(auth_headers, balance=100)
+    body = {"transaction_name": "Tea", "amount": 3, "transaction_type": "EXPENSE",
+            "account_id": account_id, "category_id": assigned["EXPENSE"]}
+    assert create(client, auth_headers, "tea", body).status_code == 200
+    db.query(IdempotencyKey).filter(IdempotencyKey.user_id == user_id).update(
+        {IdempotencyKey.expires_at: datetime.now() - timedelta(minutes=1)})
+    db.commit()
+
+    response = create(client, auth_headers, "tea", body)
+    assert response.status_code == 200 and "idempotent-replayed" not in response.headers
+    assert db.query(Transaction).filter(Transaction.account_id == account_id).count() == 2
+
+    db.query(IdempotencyKey).filter(IdempotencyKey.user_id == user_id).update(
+        {IdempotencyKey.expires_at: datetime.now() - timedelta(minutes=1)})
+    db.commit()
+    assert sweep_expired_keys(db, chunk_size=1) >= 1
+    assert db.query(IdempotencyKey).filter(IdempotencyKey.user_id == user_id).count() == 0
@@ -0,0 +1,49 @@
+"""
+Holdings valuation (services/investments.py): latest prices come from the
+shared cache, and a price load revalues portfolios on the next read.
+"""
+from datetime import date
+
+from services.investments import price_cache, upsert_prices
+
+
+def portfolio(client, headers) -> dict:
+    response = client.get("/investments/portfolio", params={"currency": "USD"}, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_latest_price_lookup(db):
+    upsert_prices(db, [
+        {"symbol": "TSTA", "day": date(2024, 1, 2), "close": 10.0, "currency": "USD"},
+        {"symbol": "TSTA", "day": date(2024, 1, 3), "close": 11.0, "currency": "USD"},
+        {"symbol": "TSTB", "day": date(2024, 1, 2), "close": 5.0, "currency": "USD"},
+    ])
+    found, closes, days, _ = price_cache.lookup(["TSTB", "NOPE", "TSTA"])
+    assert found.tolist() == [True, False, True]
+    assert closes.tolist() == [5, 0, 11]
+    assert days[2] == date(2024, 1, 3)
+
+
+def test_portfolio_valuation_and_revaluation(client, db, auth_headers, make_account, register):
+    account_id = make_account(auth_headers, balance=10, account_type="INVESTMENT", currency="USD")
+    for symbol, quantity, cost in ((" tstc", 10, 1000), ("TSTD", 2, 500)):
+        response = client.post("/investments/holdings/create", headers=auth_headers,
+                               json={"account_id": account_id, "symbol": symbol, "quantity": quantity, "cost_basis": cost})
+        assert response.status_code == 200, response.text
+    upsert_prices(db, [{"symbol": "TSTC", "day": date(2024, 2, 1), "close": 150.0, "currency": "USD"}])
+
+    body = portfolio(client, auth_headers)
+    # TSTD has no price yet, so it is carried at cost
+    assert (body["market_value"], body["cost_basis"], body["unrealised_pnl"], body["unpriced_count"]) == (2000, 1500, 500, 1)
+    assert {row["symbol"]: row["price"] for row in body["holdings"]} == {"TSTC": 150, "TSTD": None}
+
+    admin = register(admin=True)
+    response = client.post("/admin/prices", headers=admin, json={"prices": [
+        {"symbol": "tstc", "date": "2024-02-02", "close": 160},
+        {"symbol": "TSTD", "date": "2024-02-02", "close": 250},
+    ]})
+    assert response.status_code == 200, response.text
+    body = portfolio(client, auth_headers)
+    assert (body["market_value"], body["unpriced_count"]) == (2100, 0)
+    assert body["accounts"] == [{"account_id": account_id, "market_value": 2100, "cost_basis": 1500, "unrealised_pnl": 600}]
@@ -0,0 +1,90 @@
+"""
+Background job queue (services/jobs.py): retries, stale-lock recovery and
+the lock heartbeat in JobContext.progress().
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from database.models import Transaction
+from database.models.job import Job, JobStatus
+from services.deletion import delete_in_batches
+from services.jobs import JobContext, claim_next, enqueue, job_handler, requeue_stale, run_job
+
+CALLS = []
+
+
+@job_handler("tests.echo")
+def echo_job(ctx: JobContext):
+    CALLS.append(ctx.payload)
+    return {"echo": ctx.payload["value"]}
+
+
+@job_handler("tests.broken")
+def broken_job(ctx: JobContext):
+    raise RuntimeError("always fails")
+
+
+def claim(db, job_type: str) -> Job:
+    job = claim_next(db, "tests", [job_type])
+    assert job is not None
+    return job
+
+
+def test_job_runs_and_records_result(db):
+    job = enqueue(db, "tests.echo", {"value": 7})
+    db.commit()
+    run_job(db, claim(db, "tests.echo"))
+    db.refresh(job)
+    assert job.status == JobStatus.SUCCEEDED
+    assert job.result == {"echo": 7}
+    assert job.progress == 1.0 and job.locked_at is None
+
+
+def test_failed_job_backs_off_then_fails(db):
+    job = enqueue(db, "tests.broken", max_attempts=2)
+    db.commit()
+    run_job(db, claim(db, "tests.broken"))
+    db.refresh(job)
+    assert job.status == JobStatus.QUEUED
+    assert job.run_after > datetime.now()
+    assert "always fails" in job.last_error
+
+    job.run_after = datetime.now()
+    db.commit()
+    run_job(db, claim(db, "tests.broken"))
+    db.refresh(job)
+    assert job.status == JobStatus.FAILED
+    assert job.attempts == 2
+
+
+def test_progress_keeps_a_long_job_from_being_requeued(db):
+    stale = datetime.now() - timedelta(hours=2)
+    heartbeat = enqueue(db, "tests.echo", {"value": 1})
+    silent = enqueue(db, "tests.echo", {"value": 2})
+    for job in (heartbeat, silent):
+        job.status, job.locked_by, job.locked_at = JobStatus.RUNNING, "gone", stale
+    db.commit()
+
+    JobContext(heartbeat, db).progress(0.5, "half way")
+    assert requeue_stale(db) >= 1
+    db.refresh(heartbeat)
+    db.refresh(silent)
+    assert heartbeat.status == JobStatus.RUNNING and heartbeat.locked_at > stale
+    assert silent.status == JobStatus.QUEUED and silent.locked_at is None
+
+    heartbeat.status = JobStatus.SUCCEEDED
+    silent.status = JobStatus.SUCCEEDED
+    db.commit()
+
+
+def test_delete_in_batches_reports_every_batch(db, auth_headers, user_id, assigned, make_account, make_transaction):
+    account_id = make_account(auth_headers)
+    for _ in range(5):
+        make_transaction(auth_headers, account_id, assigned["INCOME"], 1, "INCOME")
+
+    reported = []
+    deleted = delete_in_batches(db, Transaction.__table__, Transaction.account_id == account_id,
+                                batch_size=2, progress=reported.append)
+    assert deleted == 5
+    assert reported == [2, 4, 5]
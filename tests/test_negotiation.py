@@ -0,0 +1,67 @@
+"""
+Content negotiation (middleware/negotiation.py) and response compression
+(middleware/compression.py).
+"""
+import json
+
+import msgpack
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+from fastapi.testclient import TestClient
+
+from middleware import CompressionMiddleware
+from middleware.compression import choose_encoding
+from middleware.negotiation import COLUMNAR_JSON, JSON, MSGPACK, NDJSON, preferred_format
+
+
+def test_preferred_format():
+    assert preferred_format("") == (JSON, False)
+    assert preferred_format("text/html, application/x-msgpack") == (MSGPACK, False)
+    assert preferred_format("application/json;q=0.5, application/msgpack; layout=columnar") == (MSGPACK, True)
+    assert preferred_format("application/vnd.columnar+json, application/json;q=0.9") == (COLUMNAR_JSON, True)
+    assert preferred_format("application/x-ndjson;q=0, */*") == (JSON, False)
+    assert preferred_format("application/x-ndjson") == (NDJSON, False)
+
+
+def test_choose_encoding():
+    assert choose_encoding("") is None
+    assert choose_encoding("gzip;q=0, identity") is None
+    assert choose_encoding("deflate, gzip;q=0.5") == "gzip"
+    assert choose_encoding("*") in ("br", "gzip")
+
+
+def test_account_list_formats(client, auth_headers, make_account):
+    for _ in range(2):
+        make_account(auth_headers)
+    rows = client.get("/account/get_all", headers=auth_headers).json()
+
+    response = client.get("/account/get_all", headers={**auth_headers, "Accept": "application/msgpack"})
+    assert response.headers["content-type"].startswith(MSGPACK)
+    assert msgpack.unpackb(response.content) == rows
+
+    response = client.get("/account/get_all", headers={**auth_headers, "Accept": "application/msgpack; layout=columnar"})
+    columns = msgpack.unpackb(response.content)
+    assert columns["count"] == 2
+    assert columns["columns"]["id"] == [row["id"] for row in rows]
+
+    response = client.get("/account/get_all", headers={**auth_headers, "Accept": NDJSON})
+    assert [json.loads(line) for line in response.text.splitlines()] == rows
+
+
+def test_compression_threshold():
+    app = FastAPI()
+
+    @app.get("/text/{size}")
+    def text(size: int):
+        return PlainTextResponse("x" * size)
+
+    app.add_middleware(CompressionMiddleware, minimum_size=100)
+    client = TestClient(app)
+
+    small = client.get("/text/10", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers
+    large = client.get("/text/5000", headers={"Accept-Encoding": "gzip"})
+    assert large.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in large.headers["vary"]
+    assert int(large.headers["content-length"]) < 5000
+    assert large.text == "x" * 5000
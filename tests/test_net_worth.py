@@ -0,0 +1,40 @@
+"""
+Net worth (services/net_worth.py): assets minus liabilities from one
+aggregate, cached per user until a balance-changing write.
+"""
+from datetime import date
+
+from services.fx import upsert_fx_rates
+
+
+def net_worth(client, headers, currency: str = "USD") -> dict:
+    response = client.get("/account/net-worth", params={"currency": currency}, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_assets_minus_liabilities(client, auth_headers, assigned, make_account, make_transaction):
+    checking = make_account(auth_headers, balance=1000, currency="USD")
+    make_account(auth_headers, balance=500, account_type="SAVINGS", currency="USD")
+    make_account(auth_headers, balance=200, account_type="CREDIT_CARD", currency="USD")
+
+    body = net_worth(client, auth_headers)
+    assert (body["assets"], body["liabilities"], body["net_worth"], body["account_count"]) == (1500, 200, 1300, 3)
+    assert {row["account_type"]: row["total"] for row in body["by_type"]} == {"CHECKING": 1000, "SAVINGS": 500, "CREDIT_CARD": 200}
+
+    # The cached figure is dropped by the write
+    make_transaction(auth_headers, checking, assigned["EXPENSE"], 100)
+    assert net_worth(client, auth_headers)["net_worth"] == 1200
+    assert client.delete(f"/account/delete/{checking}", headers=auth_headers).status_code == 202
+    assert net_worth(client, auth_headers)["net_worth"] == 300
+
+
+def test_mixed_currencies_convert_to_the_reporting_currency(client, db, auth_headers, make_account):
+    upsert_fx_rates(db, [{"currency": "EUR", "day": date(2024, 1, 1), "rate": 0.8}])
+    make_account(auth_headers, balance=100, currency="USD")
+    make_account(auth_headers, balance=80, currency="EUR")
+
+    assert net_worth(client, auth_headers)["net_worth"] == 200
+    assert net_worth(client, auth_headers, "EUR")["net_worth"] == 160
+    response = client.get("/account/net-worth", params={"currency": "XYZ"}, headers=auth_headers)
+    assert response.status_code == 422
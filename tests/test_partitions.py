@@ -0,0 +1,37 @@
+"""
+Monthly partitions (services/partitions.py). The DDL only runs on
+PostgreSQL; elsewhere every entry point must be a no-op.
+"""
+from datetime import date
+
+import pytest
+
+from services.partitions import (
+    add_months, backfill, backfill_status, ensure_partitions, existing_partitions, partition_name, partitioned_table,
+)
+
+
+def test_month_arithmetic():
+    assert add_months(date(2024, 11, 1), 3) == date(2025, 2, 1)
+    assert add_months(date(2024, 1, 1), -1) == date(2023, 12, 1)
+    assert partition_name(date(2025, 2, 1)) == "transactions_p2025_02"
+
+
+def test_no_op_without_partitioned_table(db):
+    if db.get_bind().dialect.name == "postgresql":
+        pytest.skip("covered by test_ensure_partitions_is_idempotent")
+    assert partitioned_table(db) is None
+    assert ensure_partitions(db) == []
+    assert backfill_status(db) is None
+    assert backfill(db) == 0
+
+
+def test_ensure_partitions_is_idempotent(db):
+    parent = partitioned_table(db)
+    if parent is None:
+        pytest.skip("needs PostgreSQL with the partitioning migration applied")
+    today = date.today()
+    ensure_partitions(db, months_ahead=2, today=today)
+    names = {partition_name(add_months(today.replace(day=1), offset)) for offset in range(3)}
+    assert names <= existing_partitions(db, parent)
+    assert ensure_partitions(db, months_ahead=2, today=today) == []
@@ -0,0 +1,142 @@
+"""
+SQL statement budgets (middleware/query_budget.py) and lazy="raise"
+relationships (database/connection.py).
+
+The hot routes are called with QUERY_BUDGET on, so a change that adds an
+N+1 query, or a lazy load, to one of them fails here.
+"""
+import uuid
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import selectinload
+
+from database.connection import RELATIONSHIP_LAZY, SessionLocal
+from database.models import Transaction
+from middleware import QueryBudgetExceeded, QueryBudgetMiddleware, RouteBudget
+
+
+@pytest.fixture
+def ledger(client, auth_headers, categories):
+    """A user with two accounts, a food budget and one transaction of each kind"""
+    for category_id in categories.values():
+        response = client.post("/categories/assign", json={"category_id": category_id, "is_active": True}, headers=auth_headers)
+        assert response.status_code == 200, response.text
+
+    # Account names are unique across all users
+    suffix = uuid.uuid4().hex[:8]
+
+    def create(path, body):
+        response = client.post(path, json=body, headers=auth_headers)
+        assert response.status_code == 200, response.text
+        return response.json()["id"]
+
+    account_id = create("/account/create", {"account_name": f"Checking {suffix}", "account_type": "CHECKING", "balance": 1000})
+    other_id = create("/account/create", {"account_name": f"Savings {suffix}", "account_type": "SAVINGS", "balance": 1000})
+    budget_id = create("/budgets/create", {"name": "Food", "amount": 300, "category_id": categories["EXPENSE"]})
+    transaction_id = create("/transaction/create", {
+        "transaction_name": "Groceries", "amount": 40, "transaction_type": "EXPENSE",
+        "account_id": account_id, "category_id": categories["EXPENSE"],
+    })
+    create("/transaction/create", {
+        "transaction_name": "Salary", "amount": 500, "transaction_type": "INCOME",
+        "account_id": account_id, "category_id": categories["INCOME"],
+    })
+    create("/transaction/create", {
+        "transaction_name": "Savings", "amount": 100, "transaction_type": "TRANSFER",
+        "account_id": account_id, "to_account_id": other_id, "category_id": categories["TRANSFER"],
+    })
+    return {
+        "headers": auth_headers, "categories": categories, "account_id": account_id, "other_id": other_id,
+        "budget_id": budget_id, "transaction_id": transaction_id, "suffix": suffix,
+    }
+
+
+def transfer(ledger):
+    return {
+        "transaction_name": "Top up", "amount": 25, "transaction_type": "TRANSFER",
+        "account_id": ledger["other_id"], "to_account_id": ledger["account_id"], "category_id": ledger["categories"]["TRANSFER"],
+    }
+
+
+# (method, route path, query string, JSON body builder)
+HOT_ROUTES = [
+    ("GET", "/account/get_all", "", None),
+    ("GET", "/account/get/{account_id}", "", None),
+    ("GET", "/account/net-worth", "", None),
+    ("POST", "/account/create", "", lambda ledger: {"account_name": f"Brokerage {ledger['suffix']}", "account_type": "SAVINGS", "balance": 10}),
+    ("PATCH", "/account/update/{account_id}", "", lambda ledger: {"account_name": f"Main checking {ledger['suffix']}"}),
+    ("PUT", "/account/update/{account_id}", "", lambda ledger: {"account_name": f"Everyday {ledger['suffix']}", "account_type": "CHECKING", "balance": 900}),
+    ("DELETE", "/account/delete/{other_id}", "", None),
+    ("GET", "/transaction/get_all", "", None),
+    ("GET", "/transaction/get_all", "?account_id={account_id}", None),
+    ("GET", "/transaction/search", "?facets=category,transaction_type,account", None),
+    ("GET", "/transaction/summary", "", None),
+    ("GET", "/transaction/get/{transaction_id}", "", None),
+    ("POST", "/transaction/create", "", transfer),
+    ("PUT", "/transaction/{transaction_id}", "", lambda ledger: {"amount": 55, "account_id": ledger["other_id"]}),
+    ("DELETE", "/transaction/{transaction_id}", "", None),
+    ("GET", "/budgets/status", "", None),
+    ("GET", "/budgets/{budget_id}/status", "", None),
+    ("POST", "/budgets/create", "", lambda ledger: {"name": "Moves", "amount": 50, "category_id": ledger["categories"]["TRANSFER"]}),
+    ("PATCH", "/budgets/update/{budget_id}", "", lambda ledger: {"period": "WEEKLY"}),
+    ("GET", "/categories/my", "", None),
+    ("PUT", "/categories/my/{category_id}", "", lambda ledger: {"category_id": ledger["categories"]["EXPENSE"], "custom_name": "Meals", "is_active": True}),
+    ("GET", "/sync", "", None),
+]
+
+
+def route_budget(app, method: str, path: str) -> int:
+    [middleware] = [m for m in app.user_middleware if m.cls is QueryBudgetMiddleware]
+    return QueryBudgetMiddleware(None, *middleware.args, **middleware.kwargs).budget_for(method, path)
+
+
+@pytest.mark.parametrize("method, path, query, body", HOT_ROUTES, ids=[f"{m} {p}{q}" for m, p, q, _ in HOT_ROUTES])
+def test_hot_route_within_budget(app, client, ledger, method, path, query, body):
+    params = {**ledger, "category_id": ledger["categories"]["EXPENSE"]}
+    url = path.format(**params) + query.format(**params)
+    # An over-budget request raises QueryBudgetExceeded out of the client
+    response = client.request(method, url, json=body(ledger) if body else None, headers=ledger["headers"])
+    assert response.status_code < 400, response.text
+    assert int(response.headers["x-query-count"]) <= route_budget(app, method, path)
+
+
+def budget_app(budget: int) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(QueryBudgetMiddleware, default_budget=10, routes=[RouteBudget("/items", budget)])
+
+    @app.get("/items/{item_id}")
+    def read_item(item_id: int):
+        session = SessionLocal()
+        try:
+            # One statement per item, the way an N+1 loop would run them
+            return [session.execute(text("SELECT :n"), {"n": n}).scalar() for n in range(item_id)]
+        finally:
+            session.close()
+
+    return app
+
+
+def test_route_over_budget_fails(database):
+    client = TestClient(budget_app(budget=2))
+    assert client.get("/items/2").headers["x-query-count"] == "2"
+    with pytest.raises(QueryBudgetExceeded) as failure:
+        client.get("/items/3")
+    assert failure.value.count == 3
+    assert failure.value.budget == 2
+    assert "/items/{item_id}" in str(failure.value)
+
+
+def test_unplanned_lazy_load_fails(ledger, db):
+    assert RELATIONSHIP_LAZY == "raise"
+    transaction = db.get(Transaction, ledger["transaction_id"])
+    with pytest.raises(InvalidRequestError):
+        transaction.account
+
+    # Loading it up front is fine
+    db.expunge_all()
+    planned = db.query(Transaction).options(selectinload(Transaction.account)).filter(Transaction.id == ledger["transaction_id"]).one()
+    assert planned.account.id == ledger["account_id"]
@@ -0,0 +1,60 @@
+"""
+Every hot query (services/query_plans.py) must be served by an index on the
+migrated schema. A dropped index, or a rewritten query that can no longer
+use one, fails here before it reaches production.
+"""
+import ast
+import re
+from pathlib import Path
+
+import pytest
+from sqlalchemy import inspect
+
+from services.query_plans import HOT_QUERIES, check_plans
+
+VERSIONS = Path(__file__).resolve().parent.parent / "alembic" / "versions"
+
+# Plan lines that show an index (or the primary key) serving a lookup
+INDEX_ACCESS = {
+    "sqlite": re.compile(r"USING (COVERING )?INDEX|USING INTEGER PRIMARY KEY"),
+    "postgresql": re.compile(r"Index Scan|Index Only Scan|Bitmap Index Scan"),
+}
+
+
+def migration_indexes() -> set[str]:
+    """
+    Names of the indexes the migrations create: create_index() calls in
+    upgrade(), and the (name, table, columns) entries of an INDEXES list
+    that upgrade() loops over (a6e3d9c1f582).
+    """
+    names = set()
+    for path in VERSIONS.glob("*.py"):
+        module = ast.parse(path.read_text())
+        for statement in module.body:
+            if isinstance(statement, ast.Assign) and any(getattr(target, "id", None) == "INDEXES" for target in statement.targets):
+                names.update(entry.elts[0].value for entry in statement.value.elts)
+            if not (isinstance(statement, ast.FunctionDef) and statement.name == "upgrade"):
+                continue
+            for node in ast.walk(statement):
+                if isinstance(node, ast.Call) and getattr(node.func, "attr", None) == "create_index" and node.args:
+                    name = node.args[0]
+                    if isinstance(name, ast.Call) and name.args:   # op.f("ix_...")
+                        name = name.args[0]
+                    if isinstance(name, ast.Constant) and isinstance(name.value, str):
+                        names.add(name.value)
+    return names
+
+
+def test_migration_indexes_exist(database, db):
+    inspector = inspect(db.get_bind())
+    existing = {index["name"] for table in inspector.get_table_names() for index in inspector.get_indexes(table)}
+    missing = migration_indexes() - existing
+    assert not missing, f"indexes created by migrations but missing from the test schema: {sorted(missing)}"
+
+
+@pytest.mark.parametrize("name", list(HOT_QUERIES))
+def test_hot_query_uses_index(db, name):
+    [result] = check_plans(db, [name])
+    plan = "\n".join(result.plan)
+    assert result.ok, f"{name} does a full scan of {', '.join(result.full_scans)}:\n{plan}"
+    assert INDEX_ACCESS[db.get_bind().dialect.name].search(plan), f"{name} uses no index:\n{plan}"
@@ -0,0 +1,72 @@
+"""
+Token-bucket rate limiting (middleware/rate_limit.py).
+"""
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from middleware import rate_limit
+from middleware.rate_limit import InMemoryRateLimitBackend, RateLimit, RateLimitMiddleware, RouteLimit
+
+
+def consume(backend, key, limit):
+    return asyncio.run(backend.consume(key, limit))
+
+
+def test_bucket_refills_over_time(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: clock[0])
+    backend = InMemoryRateLimitBackend()
+    limit = RateLimit(capacity=2, refill_rate=0.5)
+
+    assert consume(backend, "k", limit) == (True, 0.0)
+    assert consume(backend, "k", limit) == (True, 0.0)
+    assert consume(backend, "k", limit) == (False, 2.0)
+    clock[0] += 2
+    assert consume(backend, "k", limit)[0]
+    # Refill never goes past capacity
+    clock[0] += 60
+    assert [consume(backend, "k", limit)[0] for _ in range(3)] == [True, True, False]
+
+
+def test_idle_keys_are_evicted():
+    backend = InMemoryRateLimitBackend(max_keys=2)
+    limit = RateLimit.per_minute(10)
+    for key in ("a", "b", "c"):
+        consume(backend, key, limit)
+    assert len(backend) == 2
+
+
+def make_client() -> TestClient:
+    app = FastAPI()
+
+    @app.get("/login")
+    def login():
+        return {"ok": True}
+
+    @app.get("/other")
+    def other():
+        return {"ok": True}
+
+    app.add_middleware(
+        RateLimitMiddleware,
+        backend=InMemoryRateLimitBackend(),
+        default_limit=RateLimit.per_minute(100),
+        ip_limit=RateLimit.per_minute(100),
+        routes=[RouteLimit("login", "/login", RateLimit.per_minute(2))],
+        trust_forwarded_for=True,
+    )
+    return TestClient(app)
+
+
+def test_route_limit_returns_429_per_client():
+    client = make_client()
+    first = {"X-Forwarded-For": "10.0.0.1"}
+    assert [client.get("/login", headers=first).status_code for _ in range(3)] == [200, 200, 429]
+    response = client.get("/login", headers=first)
+    assert response.status_code == 429 and int(response.headers["retry-after"]) >= 1
+
+    # Other routes and other clients have their own buckets
+    assert client.get("/other", headers=first).status_code == 200
+    assert client.get("/login", headers={"X-Forwarded-For": "10.0.0.2"}).status_code == 200
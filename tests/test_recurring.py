@@ -0,0 +1,61 @@
+"""
+Recurring transaction scheduler (services/recurring.py): catch-up without
+double-posting, and one failing rule not holding back its batch.
+"""
+from datetime import date, timedelta
+
+from database.models import Account, RecurringTransaction, Transaction
+from database.models.recurring import RecurrenceFrequency
+from services.recurring import materialise_due, occurrence
+
+
+def test_monthly_occurrences_clamp_to_month_end():
+    start = date(2024, 1, 31)
+    dates = [occurrence(start, RecurrenceFrequency.MONTHLY, 1, n) for n in range(4)]
+    assert dates == [date(2024, 1, 31), date(2024, 2, 29), date(2024, 3, 31), date(2024, 4, 30)]
+    assert occurrence(date(2024, 2, 29), RecurrenceFrequency.YEARLY, 1, 1) == date(2025, 2, 28)
+
+
+def create_rule(client, headers, **fields) -> int:
+    response = client.post("/recurring/create", json=fields, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
+
+
+def test_materialise_catches_up_once(client, db, auth_headers, assigned, make_account):
+    account_id = make_account(auth_headers, balance=100)
+    today = date.today()
+    rule_id = create_rule(client, auth_headers, transaction_name="Allowance", amount=5, transaction_type="INCOME",
+                          account_id=account_id, category_id=assigned["INCOME"], frequency="DAILY",
+                          start_date=str(today - timedelta(days=3)), end_date=str(today + timedelta(days=3)))
+
+    assert materialise_due(db, as_of=today)["posted"] >= 4
+    assert materialise_due(db, as_of=today)["posted"] == 0
+    posted = db.query(Transaction.occurrence_date).filter(Transaction.recurring_id == rule_id).all()
+    assert sorted(day for (day,) in posted) == [today - timedelta(days=n) for n in range(3, -1, -1)]
+    assert db.get(Account, account_id).balance == 120
+    assert db.get(RecurringTransaction, rule_id).next_run_date == today + timedelta(days=1)
+
+    # Past the end date the rule is finished
+    materialise_due(db, as_of=today + timedelta(days=10))
+    rule = db.get(RecurringTransaction, rule_id)
+    assert not rule.is_active and rule.last_run_date == today + timedelta(days=3)
+
+
+def test_failing_rule_does_not_block_its_batch(client, db, auth_headers, assigned, make_account):
+    account_id = make_account(auth_headers, balance=10)
+    start = str(date.today())
+    # Overdraws the account, which the balance check constraint refuses
+    bad = create_rule(client, auth_headers, transaction_name="Rent", amount=500, transaction_type="EXPENSE",
+                      account_id=account_id, category_id=assigned["EXPENSE"], start_date=start)
+    good = create_rule(client, auth_headers, transaction_name="Pay", amount=50, transaction_type="INCOME",
+                       account_id=account_id, category_id=assigned["INCOME"], start_date=start)
+
+    stats = materialise_due(db, batch_size=10)
+    assert bad in stats["failed_rules"]
+    assert db.query(Transaction).filter(Transaction.recurring_id == good).count() == 1
+    assert db.query(Transaction).filter(Transaction.recurring_id == bad).count() == 0
+    assert db.get(RecurringTransaction, bad).next_run_date == date.today()
+
+    db.execute(RecurringTransaction.__table__.update().where(RecurringTransaction.id == bad).values(is_active=False))
+    db.commit()
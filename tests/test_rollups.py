@@ -0,0 +1,61 @@
+"""
+Admin rollups (services/rollups.py): incremental refreshes agree with a full
+rebuild, and deletes are reflected without waiting for one.
+"""
+from datetime import date, datetime, timedelta
+
+from database.models import BalanceRollup, TransactionVolumeRollup, User, UserSignupRollup
+from services.rollups import SETTLE_SECONDS, refresh_rollups
+
+
+def refresh(db, full: bool = False) -> dict:
+    # Rows written by the test are younger than SETTLE_SECONDS: refresh up to the present instead
+    return refresh_rollups(db, full=full, force=True, now=datetime.now() + timedelta(seconds=SETTLE_SECONDS))
+
+
+def volume(db, user_id: int) -> set[tuple]:
+    rows = db.query(TransactionVolumeRollup).filter(TransactionVolumeRollup.user_id == user_id)
+    return {(row.month, row.transaction_type, row.currency, row.transaction_count, row.total_amount) for row in rows}
+
+
+def signups(db, month: date) -> int:
+    return db.query(UserSignupRollup.user_count).filter(UserSignupRollup.month == month).scalar() or 0
+
+
+def test_incremental_refresh_matches_full_rebuild(db, auth_headers, user_id, assigned, make_account, make_transaction):
+    account_id = make_account(auth_headers, balance=500)
+    refresh(db, full=True)
+    make_transaction(auth_headers, account_id, assigned["EXPENSE"], 40)
+    make_transaction(auth_headers, account_id, assigned["INCOME"], 15, "INCOME")
+
+    assert refresh(db)["users"] >= 1
+    incremental = volume(db, user_id)
+    assert {(kind.value, count, total) for _, kind, _, count, total in incremental} >= {("EXPENSE", 1, 40), ("INCOME", 1, 15)}
+    refresh(db, full=True)
+    assert volume(db, user_id) == incremental
+
+
+def test_balances_skip_accounts_pending_delete(client, db, auth_headers, user_id, make_account, run_jobs):
+    make_account(auth_headers, balance=300, account_type="SAVINGS")
+    doomed = make_account(auth_headers, balance=700, account_type="SAVINGS")
+    assert client.delete(f"/account/delete/{doomed}", headers=auth_headers).status_code == 202
+
+    refresh(db, full=True)
+    row = db.query(BalanceRollup).filter(BalanceRollup.user_id == user_id, BalanceRollup.account_type == "SAVINGS").one()
+    assert (row.account_count, row.total_balance) == (1, 300)
+    run_jobs("accounts.delete")
+
+
+def test_deleting_a_user_recounts_their_signup_month(client, db, register, run_jobs):
+    admin = register(admin=True)
+    headers = register()
+    user = client.get("/user/me", headers=headers).json()
+    created = db.get(User, user["id"]).created_at
+    month = date(created.year, created.month, 1)
+    refresh(db)
+    before = signups(db, month)
+
+    assert client.delete(f"/admin/users/{user['id']}", headers=admin).status_code == 202
+    run_jobs("users.delete")
+    db.expire_all()
+    assert signups(db, month) == before - 1